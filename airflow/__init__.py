@@ -39,13 +39,21 @@ import sys
 from airflow import utils
 from airflow import settings
 from airflow.configuration import conf
-from airflow.models import DAG
-from flask_admin import BaseView
 from importlib import import_module
 from airflow.exceptions import AirflowException
 
 settings.initialize()
 
+# On Python 3.7+ the heavy parts of the package (the ORM models, flask_admin,
+# operators, hooks, executors, macros and the plugins) are only imported when
+# they are first accessed, see PEP 562 and ``__getattr__`` below.
+LAZY_LOAD = sys.version_info >= (3, 7)
+
+_PLUGIN_PACKAGES = ('operators', 'sensors', 'hooks', 'executors', 'macros')
+_PLUGIN_MODULE_PARENTS = frozenset('airflow.' + package for package in _PLUGIN_PACKAGES)
+_plugins_integrated = False
+_integrating_plugins = False
+
 login = None  # type: Any
 
 
@@ -79,23 +87,97 @@ def load_login():
             raise AirflowException("Failed to import authentication backend")
 
 
-class AirflowViewPlugin(BaseView):
-    pass
-
-
 class AirflowMacroPlugin(object):
     def __init__(self, namespace):
         self.namespace = namespace
 
 
-from airflow import operators  # noqa: E402
-from airflow import sensors  # noqa: E402
-from airflow import hooks  # noqa: E402
-from airflow import executors  # noqa: E402
-from airflow import macros  # noqa: E402
-
-operators._integrate_plugins()
-sensors._integrate_plugins()  # noqa: E402
-hooks._integrate_plugins()
-executors._integrate_plugins()
-macros._integrate_plugins()
+def integrate_plugins():
+    """
+    Loads the plugins and integrates them into the ``operators``, ``sensors``,
+    ``hooks``, ``executors`` and ``macros`` packages. Plugins are only
+    integrated once per process.
+    """
+    global _plugins_integrated, _integrating_plugins
+    # Loading the plugins can import plugin modules, which would integrate
+    # the plugins again
+    if _plugins_integrated or _integrating_plugins:
+        return
+    _integrating_plugins = True
+    try:
+        for package in _PLUGIN_PACKAGES:
+            import_module('airflow.' + package)._integrate_plugins()
+    finally:
+        _integrating_plugins = False
+    # Only once all packages succeeded, a failure is retried on the next call
+    _plugins_integrated = True
+
+
+def _make_view_plugin_class():
+    from flask_admin import BaseView
+
+    class AirflowViewPlugin(BaseView):
+        pass
+
+    AirflowViewPlugin.__module__ = __name__
+    return AirflowViewPlugin
+
+
+class _PluginModuleFinder(object):
+    """
+    Meta path finder which integrates the plugins the first time a plugin
+    module such as ``airflow.operators.my_plugin`` is imported, so the
+    plugins do not have to be loaded by ``import airflow`` itself.
+    """
+
+    def find_spec(self, fullname, path=None, target=None):
+        package, _, name = fullname.rpartition('.')
+        if _plugins_integrated or package not in _PLUGIN_MODULE_PARENTS:
+            return None
+
+        integrate_plugins()
+        if fullname not in sys.modules:
+            return None
+
+        from importlib.util import spec_from_loader
+        return spec_from_loader(fullname, self)
+
+    @staticmethod
+    def create_module(spec):
+        return sys.modules[spec.name]
+
+    @staticmethod
+    def exec_module(module):
+        pass
+
+
+def __getattr__(name):
+    if name == 'DAG':
+        from airflow.models.dag import DAG
+        value = DAG
+    elif name == 'AirflowViewPlugin':
+        value = _make_view_plugin_class()
+    elif name in _PLUGIN_PACKAGES:
+        integrate_plugins()
+        value = import_module('airflow.' + name)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    globals()[name] = value
+    return value
+
+
+if not LAZY_LOAD or not conf.getboolean('core', 'lazy_load_plugins', fallback=True):
+    from airflow.models import DAG  # noqa: E402
+    from airflow import operators  # noqa: E402
+    from airflow import sensors  # noqa: E402
+    from airflow import hooks  # noqa: E402
+    from airflow import executors  # noqa: E402
+    from airflow import macros  # noqa: E402
+
+    AirflowViewPlugin = _make_view_plugin_class()
+    integrate_plugins()
+else:
+    # Appended so that regular modules are always found by the default finders
+    # first, and the plugins only get loaded for names that do not exist on disk.
+    sys.meta_path.append(_PluginModuleFinder())
@@ -17,12 +17,17 @@
 # specific language governing permissions and limitations
 # under the License.
 """Experimental APIs."""
+import base64
+import json
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 
-from airflow.exceptions import DagNotFound, TaskNotFound, DagRunNotFound
+from airflow.exceptions import AirflowBadRequest, DagNotFound, TaskNotFound, DagRunNotFound
 from airflow.models import DagBag, DagModel, DagRun
 
+# The number of items of a page of a list API when no limit is given
+DEFAULT_PAGE_LIMIT = 100
+
 
 def check_and_get_dag(dag_id, task_id=None):  # type: (str, Optional[str]) -> DagModel
     """Checks that DAG exists and in case it is specified that Task exist"""
@@ -45,3 +50,22 @@ def check_and_get_dagrun(dag, execution_date):  # type: (DagModel, datetime) ->
                          .format(execution_date, dag.dag_id))
         raise DagRunNotFound(error_message)
     return dagrun
+
+
+def encode_cursor(values):  # type: (List[Any]) -> str
+    """
+    Encodes the sort key of the last item of a page into the opaque cursor
+    used to fetch the next page.
+    """
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, size):  # type: (str, int) -> List[Any]
+    """Decodes a cursor returned by ``encode_cursor`` for a sort key of ``size`` values"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except (TypeError, ValueError, UnicodeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise AirflowBadRequest("Invalid cursor: {}".format(cursor))
+    return values
@@ -64,6 +64,7 @@ def delete_dag(dag_id, keep_records_in_log=True, session=None):
         for model in models.DagRun, TaskFail, models.TaskInstance:
             count += session.query(model).filter(model.dag_id == parent_dag_id,
                                                  model.task_id == task_id).delete()
+        models.DagStats.refresh_task_instance_stats([parent_dag_id], session=session)
 
     # Delete entries in Import Errors table for a deleted DAG
     # This handles the case when the dag_id is changed in the file
@@ -17,12 +17,16 @@
 # specific language governing permissions and limitations
 # under the License.
 """DAG runs APIs."""
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 from flask import url_for
+from sqlalchemy import and_, or_
 
-from airflow.api.common.experimental import check_and_get_dag
-from airflow.models import DagRun
+from airflow.api.common.experimental import decode_cursor, encode_cursor
+from airflow.exceptions import AirflowBadRequest, DagNotFound
+from airflow.models import DagModel, DagRun
+from airflow.utils import timezone
+from airflow.utils.db import provide_session
 
 
 def get_dag_runs(dag_id, state=None, run_url_route='Airflow.graph'):
@@ -35,11 +39,56 @@ def get_dag_runs(dag_id, state=None, run_url_route='Airflow.graph'):
     :return: List of DAG runs of a DAG with requested state,
         or all runs if the state is not specified
     """
-    check_and_get_dag(dag_id=dag_id)
+    dag_runs, _ = get_dag_runs_page(dag_id, state, run_url_route)
+    return dag_runs
+
+
+@provide_session
+def get_dag_runs_page(dag_id, state=None, run_url_route='Airflow.graph', limit=None,
+                      cursor=None, session=None):
+    # type: (str, Optional[str], str, Optional[int], Optional[str], Any) -> Tuple[List[Dict[str, Any]], Optional[str]]
+    """
+    Returns a page of the Dag Runs for a specific DAG ID, ordered by
+    execution date.
+
+    :param dag_id: String identifier of a DAG
+    :param state: queued|running|success...
+    :param limit: the maximum number of DAG runs returned, all if None
+    :param cursor: the cursor returned with the previous page, None for the first one
+    :return: the DAG runs of the page and the cursor of the next page, None
+        if it was the last one
+    """
+    if not session.query(DagModel.dag_id).filter(DagModel.dag_id == dag_id).scalar():
+        raise DagNotFound("Dag id {} not found".format(dag_id))
+    if limit is not None and limit <= 0:
+        raise AirflowBadRequest("The limit must be positive")
+
+    DR = DagRun
+    query = session.query(DR).filter(DR.dag_id == dag_id)
+    if state:
+        query = query.filter(DR.state == state.lower())
+    if cursor:
+        # Keyset pagination, the page starts after the last run of the previous one
+        execution_date, run_pk = decode_cursor(cursor, 2)
+        try:
+            execution_date = timezone.parse(execution_date)
+        except (TypeError, ValueError):
+            raise AirflowBadRequest("Invalid cursor: {}".format(cursor))
+        query = query.filter(or_(
+            DR.execution_date > execution_date,
+            and_(DR.execution_date == execution_date, DR.id > run_pk)))
+    query = query.order_by(DR.execution_date, DR.id)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    runs = query.all()
+
+    next_cursor = None
+    if limit is not None and len(runs) > limit:
+        runs = runs[:limit]
+        next_cursor = encode_cursor([runs[-1].execution_date.isoformat(), runs[-1].id])
 
     dag_runs = list()
-    state = state.lower() if state else None
-    for run in DagRun.find(dag_id=dag_id, state=state):
+    for run in runs:
         dag_runs.append({
             'id': run.id,
             'run_id': run.run_id,
@@ -52,4 +101,4 @@ def get_dag_runs(dag_id, state=None, run_url_route='Airflow.graph'):
                                    execution_date=run.execution_date)
         })
 
-    return dag_runs
+    return dag_runs, next_cursor
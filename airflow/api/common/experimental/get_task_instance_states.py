@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Task Instance states APIs."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+
+from airflow.configuration import conf
+from airflow.models import DagRun, TaskInstance
+from airflow.utils import helpers
+from airflow.utils.db import provide_session
+
+
+@provide_session
+def get_task_instance_states(keys, session=None):
+    # type: (List[Dict[str, Any]], Any) -> List[Dict[str, Any]]
+    """Returns the states of many task instances at once.
+
+    The task instances are looked up directly in the database, without
+    loading their DAGs, with one query per ``[scheduler] max_tis_per_query``
+    keys, plus as many to find the execution dates of the runs given by ID.
+
+    :param keys: the task instances, dicts with their ``dag_id``, ``task_id``
+        and either the ``execution_date`` or the ``run_id`` of their DAG run
+    :param session: ORM Session
+    :return: for each key in order, the ``dag_id``, ``task_id``,
+        ``execution_date`` and ``state`` of the task instance, with
+        ``exists`` set to False when there is no such task instance
+    """
+    chunk_size = conf.getint('scheduler', 'max_tis_per_query')
+
+    # The execution dates of the DAG runs given by run ID
+    run_keys = list(set((key['dag_id'], key['run_id'])
+                        for key in keys if key.get('execution_date') is None))
+
+    def query_runs(result, items):
+        filter_for_runs = or_(*[and_(DagRun.dag_id == dag_id, DagRun.run_id == run_id)
+                                for dag_id, run_id in items])
+        return result + (
+            session.query(DagRun.dag_id, DagRun.run_id, DagRun.execution_date)
+            .filter(filter_for_runs)
+            .all()
+        )
+    execution_dates = {
+        (dag_id, run_id): execution_date
+        for dag_id, run_id, execution_date
+        in helpers.reduce_in_chunks(query_runs, run_keys, [], chunk_size)}
+
+    ti_keys = []
+    for key in keys:
+        execution_date = key.get('execution_date')  # type: Optional[datetime]
+        if execution_date is None:
+            execution_date = execution_dates.get((key['dag_id'], key['run_id']))
+        ti_keys.append((key['dag_id'], key['task_id'], execution_date))
+
+    TI = TaskInstance
+
+    def query_tis(result, items):
+        filter_for_tis = or_(*[and_(TI.dag_id == dag_id,
+                                    TI.task_id == task_id,
+                                    TI.execution_date == execution_date)
+                               for dag_id, task_id, execution_date in items])
+        return result + (
+            session.query(TI.dag_id, TI.task_id, TI.execution_date, TI.state)
+            .filter(filter_for_tis)
+            .all()
+        )
+    found_keys = list(set(key for key in ti_keys if key[2] is not None))
+    states = {
+        (dag_id, task_id, execution_date): state
+        for dag_id, task_id, execution_date, state
+        in helpers.reduce_in_chunks(query_tis, found_keys, [], chunk_size)}
+
+    results = []
+    for key, (dag_id, task_id, execution_date) in zip(keys, ti_keys):
+        result = {
+            'dag_id': dag_id,
+            'task_id': task_id,
+            'execution_date': execution_date.isoformat() if execution_date else None,
+            'state': states.get((dag_id, task_id, execution_date)),
+            'exists': (dag_id, task_id, execution_date) in states,
+        }
+        if 'run_id' in key:
+            result['run_id'] = key['run_id']
+        results.append(result)
+    return results
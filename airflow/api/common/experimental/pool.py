@@ -17,6 +17,7 @@
 # specific language governing permissions and limitations
 # under the License.
 """Pool APIs."""
+from airflow.api.common.experimental import decode_cursor, encode_cursor
 from airflow.exceptions import AirflowBadRequest, PoolNotFound
 from airflow.models import Pool
 from airflow.utils.db import provide_session
@@ -41,6 +42,29 @@ def get_pools(session=None):
     return session.query(Pool).all()
 
 
+@provide_session
+def get_pools_page(limit, cursor=None, session=None):
+    """
+    Get a page of the pools, ordered by name.
+
+    :param limit: the maximum number of pools returned
+    :param cursor: the cursor returned with the previous page, None for the first one
+    :return: the pools of the page and the cursor of the next page, None if
+        it was the last one
+    """
+    if limit <= 0:
+        raise AirflowBadRequest("The limit must be positive")
+    query = session.query(Pool)
+    if cursor:
+        last_name, = decode_cursor(cursor, 1)
+        query = query.filter(Pool.pool > last_name)
+    pools = query.order_by(Pool.pool).limit(limit + 1).all()
+    if len(pools) > limit:
+        pools = pools[:limit]
+        return pools, encode_cursor([pools[-1].pool])
+    return pools, None
+
+
 @provide_session
 def create_pool(name, slots, description, session=None):
     """Create a pool with a given parameters."""
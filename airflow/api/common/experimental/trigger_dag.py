@@ -19,11 +19,17 @@
 """Triggering DAG runs APIs."""
 import json
 from datetime import datetime
-from typing import Union, Optional, List
+from typing import Any, Dict, Union, Optional, List
 
-from airflow.exceptions import DagRunAlreadyExists, DagNotFound
+from sqlalchemy import and_, or_
+
+from airflow.configuration import conf as airflow_conf
+from airflow.exceptions import (
+    AirflowBadRequest, AirflowException, DagRunAlreadyExists, DagNotFound
+)
 from airflow.models import DagRun, DagBag, DagModel
-from airflow.utils import timezone
+from airflow.utils import helpers, timezone
+from airflow.utils.db import provide_session
 from airflow.utils.state import State
 
 
@@ -70,13 +76,23 @@ def _trigger_dag(
             dag_id
         ))
 
+    return _create_dag_runs(dag, run_id, execution_date, _load_conf(conf))
+
+
+def _load_conf(conf):
+    # type: (Optional[Union[dict, str]]) -> Optional[dict]
     run_conf = None
     if conf:
         if isinstance(conf, dict):
             run_conf = conf
         else:
             run_conf = json.loads(conf)
+    return run_conf
 
+
+def _create_dag_runs(dag, run_id, execution_date, run_conf):
+    # type: (Any, str, datetime, Optional[dict]) -> List[DagRun]
+    """Creates the DAG run and the ones of the subdags"""
     triggers = list()
     dags_to_trigger = list()
     dags_to_trigger.append(dag)
@@ -127,3 +143,79 @@ def trigger_dag(
     )
 
     return triggers[0] if triggers else None
+
+
+@provide_session
+def trigger_dags(dag_runs, session=None):
+    # type: (List[Dict[str, Any]], Any) -> List[Union[DagRun, AirflowException]]
+    """Triggers several DAG runs at once.
+
+    Each DAG is loaded once, however many runs of it are triggered, and the
+    runs that already exist are looked up for all the requested runs at once.
+
+    :param dag_runs: the runs to trigger, dicts with the ``dag_id`` and the
+        optional ``run_id``, ``conf``, ``execution_date`` and
+        ``replace_microseconds`` of each, as taken by ``trigger_dag``
+    :param session: ORM Session
+    :return: for each requested run in order, the triggered DAG run or the
+        exception that prevented it
+    """
+    requested = []
+    for dag_run in dag_runs:
+        execution_date = dag_run.get('execution_date') or timezone.utcnow()
+        if dag_run.get('replace_microseconds', True):
+            execution_date = execution_date.replace(microsecond=0)
+        run_id = dag_run.get('run_id') or "manual__{0}".format(execution_date.isoformat())
+        requested.append((dag_run['dag_id'], run_id, execution_date, dag_run.get('conf')))
+
+    dag_ids = set(dag_id for dag_id, _, _, _ in requested)
+    filelocs = dict(
+        session.query(DagModel.dag_id, DagModel.fileloc)
+        .filter(DagModel.dag_id.in_(dag_ids), DagModel.is_active)
+    ) if dag_ids else {}
+
+    # The runs conflicting with the requested ones, on their ID or date
+    def query(result, items):
+        filter_for_runs = or_(*[and_(
+            DagRun.dag_id == dag_id,
+            or_(DagRun.run_id == run_id, DagRun.execution_date == execution_date))
+            for dag_id, run_id, execution_date, _ in items])
+        return result + (
+            session.query(DagRun.dag_id, DagRun.run_id, DagRun.execution_date)
+            .filter(filter_for_runs)
+            .all()
+        )
+    existing = helpers.reduce_in_chunks(
+        query, requested, [], airflow_conf.getint('scheduler', 'max_tis_per_query'))
+    existing_run_ids = set((dag_id, run_id) for dag_id, run_id, _ in existing)
+    existing_dates = set((dag_id, execution_date) for dag_id, _, execution_date in existing)
+
+    dagbags = {}
+    results = []
+    for dag_id, run_id, execution_date, run_conf in requested:
+        try:
+            if dag_id not in filelocs:
+                raise DagNotFound("Dag id {} not found in DagModel".format(dag_id))
+            fileloc = filelocs[dag_id]
+            if fileloc not in dagbags:
+                dagbags[fileloc] = DagBag(dag_folder=fileloc)
+            dag = dagbags[fileloc].get_dag(dag_id)
+            if dag is None:
+                raise DagNotFound("Dag id {} not found".format(dag_id))
+            if (dag_id, run_id) in existing_run_ids or \
+                    (dag_id, execution_date) in existing_dates:
+                raise DagRunAlreadyExists(
+                    "Run id {} or execution date {} already exists for dag id {}".format(
+                        run_id, execution_date.isoformat(), dag_id))
+            if not timezone.is_localized(execution_date):
+                raise AirflowBadRequest("The execution date {} has no timezone".format(
+                    execution_date.isoformat()))
+            run_conf = _load_conf(run_conf)
+        except (AirflowException, ValueError) as err:
+            results.append(err if isinstance(err, AirflowException)
+                           else AirflowException(str(err)))
+            continue
+        results.append(_create_dag_runs(dag, run_id, execution_date, run_conf)[0])
+        existing_run_ids.add((dag_id, run_id))
+        existing_dates.add((dag_id, execution_date))
+    return results
@@ -67,18 +67,21 @@ from airflow.utils import cli as cli_utils, db
 from airflow.utils.net import get_hostname
 from airflow.utils.log.logging_mixin import (LoggingMixin, redirect_stderr,
                                              redirect_stdout)
-from airflow.www.app import (cached_app, create_app)
-from airflow.www_rbac.app import cached_app as cached_app_rbac
-from airflow.www_rbac.app import create_app as create_app_rbac
-from airflow.www_rbac.app import cached_appbuilder
-
 from sqlalchemy.orm import exc
+import lazy_object_proxy
 import six
 
-api.load_auth()
-api_module = import_module(conf.get('cli', 'api_client'))  # type: Any
-api_client = api_module.Client(api_base_url=conf.get('cli', 'endpoint_url'),
-                               auth=api.API_AUTH.api_auth.CLIENT_AUTH)
+
+def _get_api_client():
+    api.load_auth()
+    api_module = import_module(conf.get('cli', 'api_client'))  # type: Any
+    return api_module.Client(api_base_url=conf.get('cli', 'endpoint_url'),
+                             auth=api.API_AUTH.api_auth.CLIENT_AUTH)
+
+
+# The API client and the web applications are only loaded by the commands
+# which use them, so that ``airflow run`` and friends start up quickly.
+api_client = lazy_object_proxy.Proxy(_get_api_client)
 
 log = LoggingMixin().log
 
@@ -141,7 +144,27 @@ def process_subdir(subdir):
         return subdir
 
 
-def get_dag(args):
+def _read_serialized_dags(args):
+    """
+    Whether a read-only command reads the DAGs from the serialized_dag table
+    instead of parsing the DAG files, which is the case when DAG serialization
+    is enabled unless ``--from-files`` or a ``--subdir`` other than the DAGs
+    folder is passed.
+    """
+    if not settings.STORE_SERIALIZED_DAGS or getattr(args, 'from_files', False):
+        return False
+    # The serialized DAGs are those of the DAGs folder
+    subdir = getattr(args, 'subdir', None)
+    return not subdir or process_subdir(subdir) == process_subdir(DAGS_FOLDER)
+
+
+def get_dag(args, read_only=False):
+    if read_only and _read_serialized_dags(args):
+        dag = DagBag(store_serialized_dags=True).get_dag(args.dag_id)
+        if dag is not None:
+            return dag
+        log.warning("DAG %s is not in the serialized_dag table, loading it from the "
+                    "DAG files", args.dag_id)
     dagbag = DagBag(process_subdir(args.subdir))
     if args.dag_id not in dagbag.dags:
         raise AirflowException(
@@ -558,7 +581,7 @@ def task_failed_deps(args):
     Trigger Rule: Task's trigger rule 'all_success' requires all upstream tasks
     to have succeeded, but found 1 non-success(es).
     """
-    dag = get_dag(args)
+    dag = get_dag(args, read_only=True)
     task = dag.get_task(task_id=args.task_id)
     ti = TaskInstance(task, args.execution_date)
 
@@ -580,7 +603,7 @@ def task_state(args):
     >>> airflow task_state tutorial sleep 2015-01-01
     success
     """
-    dag = get_dag(args)
+    dag = get_dag(args, read_only=True)
     task = dag.get_task(task_id=args.task_id)
     ti = TaskInstance(task, args.execution_date)
     print(ti.current_state())
@@ -593,7 +616,7 @@ def dag_state(args):
     >>> airflow dag_state tutorial 2015-01-01T00:00:00.000000
     running
     """
-    dag = get_dag(args)
+    dag = get_dag(args, read_only=True)
     dr = DagRun.find(dag.dag_id, execution_date=args.execution_date)
     print(dr[0].state if len(dr) > 0 else None)
 
@@ -605,7 +628,7 @@ def next_execution(args):
     >>> airflow next_execution tutorial
     2018-08-31 10:38:00
     """
-    dag = get_dag(args)
+    dag = get_dag(args, read_only=True)
 
     if dag.is_paused:
         print("[INFO] Please be reminded this DAG is PAUSED now.")
@@ -636,7 +659,12 @@ def rotate_fernet_key(args):
 
 @cli_utils.action_logging
 def list_dags(args):
-    dagbag = DagBag(process_subdir(args.subdir))
+    # The loading report is about parsing the DAG files
+    if _read_serialized_dags(args) and not args.report:
+        dagbag = DagBag(store_serialized_dags=True)
+        dagbag.collect_dags_from_db()
+    else:
+        dagbag = DagBag(process_subdir(args.subdir))
     s = textwrap.dedent("""\n
     -------------------------------------------------------------------
     DAGS
@@ -651,7 +679,7 @@ def list_dags(args):
 
 @cli_utils.action_logging
 def list_tasks(args, dag=None):
-    dag = dag or get_dag(args)
+    dag = dag or get_dag(args, read_only=True)
     if args.tree:
         dag.tree_view()
     else:
@@ -889,15 +917,22 @@ def webserver(args):
             "Starting the web server on port {0} and host {1}.".format(
                 args.port, args.hostname))
         if settings.RBAC:
+            from airflow.www_rbac.app import create_app as create_app_rbac
             app, _ = create_app_rbac(None, testing=conf.getboolean('core', 'unit_test_mode'))
         else:
+            from airflow.www.app import create_app
             app = create_app(None, testing=conf.getboolean('core', 'unit_test_mode'))
         app.run(debug=True, use_reloader=not app.config['TESTING'],
                 port=args.port, host=args.hostname,
                 ssl_context=(ssl_cert, ssl_key) if ssl_cert and ssl_key else None)
     else:
         os.environ['SKIP_DAGS_PARSING'] = 'True'
-        app = cached_app_rbac(None) if settings.RBAC else cached_app(None)
+        if settings.RBAC:
+            from airflow.www_rbac.app import cached_app as cached_app_rbac
+            app = cached_app_rbac(None)
+        else:
+            from airflow.www.app import cached_app
+            app = cached_app(None)
         pid, stdout, stderr, log_file = setup_locations(
             "webserver", args.pid, args.stdout, args.stderr, args.log_file)
         os.environ.pop('SKIP_DAGS_PARSING')
@@ -1193,6 +1228,30 @@ def upgradedb(args):  # noqa
     db.upgradedb()
 
 
+@cli_utils.action_logging
+def cleanupdb(args):
+    """Deletes, or archives, the metadata rows older than their retention"""
+    from airflow.utils import db_cleanup
+
+    print("DB: " + repr(settings.engine.url))
+    tables = [t.strip() for t in args.tables.split(',')] if args.tables else None
+    if not args.dry_run and not args.yes:
+        action = "archive and delete" if args.archive else "delete"
+        if input("This will {} old rows from the metadata database. "
+                 "Proceed? (y/n)".format(action)).upper() != "Y":
+            print("Bail.")
+            return
+
+    counts = db_cleanup.run_cleanup(
+        tables=tables,
+        retention_days=args.retention_days,
+        batch_size=args.batch_size,
+        archive=args.archive or None,
+        dry_run=args.dry_run)
+    header = "rows to delete" if args.dry_run else "rows deleted"
+    print(tabulate(list(counts.items()), headers=["table", header], tablefmt="fancy_grid"))
+
+
 def version(args):  # noqa
     py2_deprecation_waring()
     print(settings.HEADER + "  v" + airflow.__version__)
@@ -1428,6 +1487,7 @@ def create_user(args):
         raise SystemExit('Required arguments are missing: {}.'.format(
             ', '.join(empty_fields)))
 
+    from airflow.www_rbac.app import cached_appbuilder
     appbuilder = cached_appbuilder()
     role = appbuilder.sm.find_role(args.role)
     if not role:
@@ -1459,6 +1519,7 @@ def delete_user(args):
     if not args.username:
         raise SystemExit('Required arguments are missing: username')
 
+    from airflow.www_rbac.app import cached_appbuilder
     appbuilder = cached_appbuilder()
 
     try:
@@ -1474,6 +1535,7 @@ def delete_user(args):
 
 @cli_utils.action_logging
 def list_users(args):
+    from airflow.www_rbac.app import cached_appbuilder
     appbuilder = cached_appbuilder()
     users = appbuilder.sm.get_all_users()
     fields = ['id', 'username', 'email', 'first_name', 'last_name', 'roles']
@@ -1540,6 +1602,7 @@ def list_dag_runs(args, dag=None):
 @cli_utils.action_logging
 def sync_perm(args): # noqa
     if settings.RBAC:
+        from airflow.www_rbac.app import cached_appbuilder
         appbuilder = cached_appbuilder()
         print('Updating permission, view-menu for all existing roles')
         appbuilder.sm.sync_roles()
@@ -1604,6 +1667,23 @@ class CLIFactory(object):
             ("--stdout",), "Redirect stdout to this file"),
         'log_file': Arg(
             ("-l", "--log-file"), "Location of the log file"),
+        # cleanupdb
+        'tables': Arg(
+            ("-t", "--tables"),
+            "Comma separated list of the tables to clean up, defaults to all of them"),
+        'retention_days': Arg(
+            ("--retention_days",),
+            "Delete rows older than this number of days, overriding the "
+            "[db_cleanup] retention of every table",
+            type=int),
+        'batch_size': Arg(
+            ("--batch_size",),
+            "Number of rows deleted per transaction",
+            type=int),
+        'archive': Arg(
+            ("--archive",),
+            "Copy the rows to <table>_archive before deleting them",
+            "store_true"),
         'yes': Arg(
             ("-y", "--yes"),
             "Do not prompt to confirm reset. Use with care!",
@@ -1689,6 +1769,11 @@ class CLIFactory(object):
         # list_dags
         'report': Arg(
             ("-r", "--report"), "Show DagBag loading report", "store_true"),
+        'from_files': Arg(
+            ("--from-files",),
+            "Load the DAGs from the DAG files even when the DAGs are serialized "
+            "in the database, as set by [core] store_serialized_dags",
+            "store_true"),
         # clear
         'upstream': Arg(
             ("-u", "--upstream"), "Include upstream tasks", "store_true"),
@@ -2071,7 +2156,7 @@ class CLIFactory(object):
         }, {
             'func': list_tasks,
             'help': "List the tasks within a DAG",
-            'args': ('dag_id', 'tree', 'subdir'),
+            'args': ('dag_id', 'tree', 'subdir', 'from_files'),
         }, {
             'func': clear,
             'help': "Clear a set of task instance, as if they never ran",
@@ -2132,11 +2217,11 @@ class CLIFactory(object):
         }, {
             'func': list_dags,
             'help': "List all the DAGs",
-            'args': ('subdir', 'report'),
+            'args': ('subdir', 'from_files', 'report'),
         }, {
             'func': dag_state,
             'help': "Get the status of a dag run",
-            'args': ('dag_id', 'execution_date', 'subdir'),
+            'args': ('dag_id', 'execution_date', 'subdir', 'from_files'),
         }, {
             'func': task_failed_deps,
             'help': (
@@ -2144,11 +2229,11 @@ class CLIFactory(object):
                 "of the scheduler. In other words, why a task instance doesn't get "
                 "scheduled and then queued by the scheduler, and then run by an "
                 "executor)."),
-            'args': ('dag_id', 'task_id', 'execution_date', 'subdir'),
+            'args': ('dag_id', 'task_id', 'execution_date', 'subdir', 'from_files'),
         }, {
             'func': task_state,
             'help': "Get the status of a task instance",
-            'args': ('dag_id', 'task_id', 'execution_date', 'subdir'),
+            'args': ('dag_id', 'task_id', 'execution_date', 'subdir', 'from_files'),
         }, {
             'func': serve_logs,
             'help': "Serve logs generate by worker",
@@ -2175,6 +2260,11 @@ class CLIFactory(object):
             'func': upgradedb,
             'help': "Upgrade the metadata database to latest version",
             'args': tuple(),
+        }, {
+            'func': cleanupdb,
+            'help': "Delete, or archive, the rows of the metadata database older "
+                    "than the retention of their table, in small batches",
+            'args': ('tables', 'retention_days', 'batch_size', 'archive', 'dry_run', 'yes'),
         }, {
             'func': shell,
             'help': "Runs a shell to access the database",
@@ -2226,7 +2316,7 @@ class CLIFactory(object):
         {
             'func': next_execution,
             'help': "Get the next execution datetime of a DAG.",
-            'args': ('dag_id', 'subdir')
+            'args': ('dag_id', 'subdir', 'from_files')
         },
         {
             'func': rotate_fernet_key,
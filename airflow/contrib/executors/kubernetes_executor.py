@@ -22,6 +22,7 @@ from queue import Empty
 import re
 import json
 import multiprocessing
+from multiprocessing.pool import ThreadPool
 from uuid import uuid4
 
 from dateutil import parser
@@ -32,12 +33,13 @@ from kubernetes.client.rest import ApiException
 from urllib3.exceptions import HTTPError
 
 from airflow.configuration import conf
+from airflow.contrib.kubernetes.pod_cache import PodCache
 from airflow.contrib.kubernetes.pod_launcher import PodLauncher
 from airflow.contrib.kubernetes.kube_client import get_kube_client
 from airflow.contrib.kubernetes.worker_configuration import WorkerConfiguration
 from airflow.executors.base_executor import BaseExecutor
 from airflow.executors import Executors
-from airflow.models import KubeResourceVersion, KubeWorkerIdentifier, TaskInstance
+from airflow.models import DagStats, KubeResourceVersion, KubeWorkerIdentifier, TaskInstance
 from airflow.utils.state import State
 from airflow.utils.db import provide_session, create_session
 from airflow import settings
@@ -47,6 +49,9 @@ from airflow.utils.log.logging_mixin import LoggingMixin
 MAX_POD_ID_LEN = 253
 MAX_LABEL_LEN = 63
 
+# The states of the task instances of the worker pods that are done
+TERMINAL_POD_PHASES = {'Failed': State.FAILED, 'Succeeded': None}
+
 
 class KubernetesExecutorConfig:
     def __init__(self, image=None, image_pull_policy=None, request_memory=None,
@@ -162,6 +167,8 @@ class KubeConfig:
             self.kubernetes_section, 'delete_worker_pods')
         self.worker_pods_creation_batch_size = conf.getint(
             self.kubernetes_section, 'worker_pods_creation_batch_size')
+        self.worker_pods_creation_concurrency = conf.getint(
+            self.kubernetes_section, 'worker_pods_creation_concurrency', fallback=1)
         self.worker_service_account_name = conf.get(
             self.kubernetes_section, 'worker_service_account_name')
         self.image_pull_secrets = conf.get(self.kubernetes_section, 'image_pull_secrets')
@@ -366,7 +373,7 @@ class KubernetesJobWatcher(multiprocessing.Process, LoggingMixin):
                 return self.process_error(event)
             self.process_status(
                 task.metadata.name, task.status.phase, task.metadata.labels,
-                task.metadata.resource_version
+                task.metadata.resource_version, event['type']
             )
             last_resource_version = task.metadata.resource_version
 
@@ -391,16 +398,18 @@ class KubernetesJobWatcher(multiprocessing.Process, LoggingMixin):
             (raw_object['reason'], raw_object['code'], raw_object['message'])
         )
 
-    def process_status(self, pod_id, status, labels, resource_version):
-        """Process status response"""
+    def process_status(self, pod_id, status, labels, resource_version, event_type='MODIFIED'):
+        """
+        Process status response. Every event is passed on, so that the pod
+        cache of the scheduler follows the pods, the task instances are only
+        finished for the pods that are done.
+        """
         if status == 'Pending':
             self.log.info('Event: %s Pending', pod_id)
         elif status == 'Failed':
             self.log.info('Event: %s Failed', pod_id)
-            self.watcher_queue.put((pod_id, State.FAILED, labels, resource_version))
         elif status == 'Succeeded':
             self.log.info('Event: %s Succeeded', pod_id)
-            self.watcher_queue.put((pod_id, None, labels, resource_version))
         elif status == 'Running':
             self.log.info('Event: %s is Running', pod_id)
         else:
@@ -408,6 +417,7 @@ class KubernetesJobWatcher(multiprocessing.Process, LoggingMixin):
                 'Event: Invalid state: %s on pod: %s with labels: %s with '
                 'resource_version: %s', status, pod_id, labels, resource_version
             )
+        self.watcher_queue.put((pod_id, status, labels, resource_version, event_type))
 
 
 class AirflowKubernetesScheduler(LoggingMixin):
@@ -425,6 +435,7 @@ class AirflowKubernetesScheduler(LoggingMixin):
         self._manager = multiprocessing.Manager()
         self.watcher_queue = self._manager.Queue()
         self.worker_uuid = worker_uuid
+        self.pod_cache = PodCache()
         self.kube_watcher = self._make_kube_watcher()
 
     def _make_kube_watcher(self):
@@ -466,6 +477,7 @@ class AirflowKubernetesScheduler(LoggingMixin):
         )
         # the watcher will monitor pods, so we do not block.
         self.launcher.run_pod_async(pod, **self.kube_config.kube_client_request_args)
+        self.pod_cache.update('ADDED', pod.name, 'Pending', pod.labels)
         self.log.debug("Kubernetes Job created!")
 
     def delete_pod(self, pod_id):
@@ -478,6 +490,8 @@ class AirflowKubernetesScheduler(LoggingMixin):
             # If the pod is already deleted
             if e.status != 404:
                 raise
+        # Its DELETED event may never come if the watch restarts meanwhile
+        self.pod_cache.remove(pod_id)
 
     def sync(self):
         """
@@ -501,7 +515,11 @@ class AirflowKubernetesScheduler(LoggingMixin):
 
     def process_watcher_task(self, task):
         """Process the task by watcher."""
-        pod_id, state, labels, resource_version = task
+        pod_id, status, labels, resource_version, event_type = task
+        self.pod_cache.update(event_type, pod_id, status, labels, resource_version)
+        if status not in TERMINAL_POD_PHASES:
+            return
+        state = TERMINAL_POD_PHASES[status]
         self.log.info(
             'Attempting to finish pod; pod_id: %s; state: %s; labels: %s',
             pod_id, state, labels
@@ -671,7 +689,7 @@ class AirflowKubernetesScheduler(LoggingMixin):
         while True:
             try:
                 task = self.watcher_queue.get_nowait()
-                # Ignoring it since it can only have either FAILED or SUCCEEDED pods
+                # Ignoring it, the tasks of the pods are not tracked anymore
                 self.log.warning('Executor shutting down, IGNORING watcher task=%s', task)
                 self.watcher_queue.task_done()
             except Empty:
@@ -701,6 +719,7 @@ class KubernetesExecutor(BaseExecutor, LoggingMixin):
         self.kube_client = None
         self.worker_uuid = None
         self._manager = multiprocessing.Manager()
+        self._pod_creation_pool = None
         super(KubernetesExecutor, self).__init__(parallelism=self.kube_config.parallelism)
 
     @provide_session
@@ -716,6 +735,9 @@ class KubernetesExecutor(BaseExecutor, LoggingMixin):
         the task
         will be rescheduled
 
+        The pods of the executor are listed once, into the pod cache of the
+        scheduler, and the queued tasks are looked up in the cache.
+
         This will not be necessary in a future version of airflow in which there is
         proper support
         for State.LAUNCHED
@@ -727,28 +749,32 @@ class KubernetesExecutor(BaseExecutor, LoggingMixin):
             'When executor started up, found %s queued task instances',
             len(queued_tasks)
         )
+        if not queued_tasks:
+            return
 
+        kwargs = dict(label_selector='airflow-worker={}'.format(self.worker_uuid))
+        if self.kube_config.kube_client_request_args:
+            for key, value in self.kube_config.kube_client_request_args.items():
+                kwargs[key] = value
+        pod_list = self.kube_client.list_namespaced_pod(
+            self.kube_config.kube_namespace, **kwargs)
+        pod_cache = self.kube_scheduler.pod_cache
+        pod_cache.populate(pod_list)
+        self.log.info('Found %s pods of the executor', len(pod_cache))
+
+        transitions = []
         for task in queued_tasks:
             # noinspection PyProtectedMember
             # pylint: disable=protected-access
-            dict_string = (
-                "dag_id={},task_id={},execution_date={},airflow-worker={}".format(
-                    AirflowKubernetesScheduler._make_safe_label_value(task.dag_id),
-                    AirflowKubernetesScheduler._make_safe_label_value(task.task_id),
-                    AirflowKubernetesScheduler._datetime_to_label_safe_datestring(
-                        task.execution_date
-                    ),
-                    self.worker_uuid
-                )
+            pods = pod_cache.get_pods(
+                AirflowKubernetesScheduler._make_safe_label_value(task.dag_id),
+                AirflowKubernetesScheduler._make_safe_label_value(task.task_id),
+                AirflowKubernetesScheduler._datetime_to_label_safe_datestring(
+                    task.execution_date
+                ),
             )
             # pylint: enable=protected-access
-            kwargs = dict(label_selector=dict_string)
-            if self.kube_config.kube_client_request_args:
-                for key, value in self.kube_config.kube_client_request_args.items():
-                    kwargs[key] = value
-            pod_list = self.kube_client.list_namespaced_pod(
-                self.kube_config.kube_namespace, **kwargs)
-            if not pod_list.items:
+            if not pods:
                 self.log.info(
                     'TaskInstance: %s found in queued state but was not launched, '
                     'rescheduling', task
@@ -758,6 +784,9 @@ class KubernetesExecutor(BaseExecutor, LoggingMixin):
                     TaskInstance.task_id == task.task_id,
                     TaskInstance.execution_date == task.execution_date
                 ).update({TaskInstance.state: State.NONE})
+                transitions.append(
+                    (task.dag_id, task.execution_date, State.QUEUED, State.NONE))
+        DagStats.record_task_instance_transitions(transitions, session=session)
 
     def _inject_secrets(self):
         def _create_or_update_secret(secret_name, secret_path):
@@ -812,6 +841,9 @@ class KubernetesExecutor(BaseExecutor, LoggingMixin):
             self.kube_config, self.task_queue, self.result_queue,
             self.kube_client, self.worker_uuid
         )
+        if self.kube_config.worker_pods_creation_concurrency > 1:
+            self._pod_creation_pool = ThreadPool(
+                self.kube_config.worker_pods_creation_concurrency)
         self._inject_secrets()
         self.clear_not_launched_queued_tasks()
 
@@ -853,23 +885,32 @@ class KubernetesExecutor(BaseExecutor, LoggingMixin):
 
         KubeResourceVersion.checkpoint_resource_version(last_resource_version)
 
+        tasks = []
         for _ in range(self.kube_config.worker_pods_creation_batch_size):
             try:
-                task = self.task_queue.get_nowait()
-                try:
-                    self.kube_scheduler.run_next(task)
-                except ApiException as e:
-                    self.log.warning('ApiException when attempting to run task, re-queueing. '
-                                     'Message: %s' % json.loads(e.body)['message'])
-                    self.task_queue.put(task)
-                except HTTPError as e:
-                    self.log.warning('HTTPError when attempting to run task, re-queueing. '
-                                     'Exception: %s', str(e))
-                    self.task_queue.put(task)
-                finally:
-                    self.task_queue.task_done()
+                tasks.append(self.task_queue.get_nowait())
             except Empty:
                 break
+        if self._pod_creation_pool is not None and len(tasks) > 1:
+            # at most worker_pods_creation_concurrency pods are created at once
+            self._pod_creation_pool.map(self._run_next, tasks)
+        else:
+            for task in tasks:
+                self._run_next(task)
+
+    def _run_next(self, task):
+        try:
+            self.kube_scheduler.run_next(task)
+        except ApiException as e:
+            self.log.warning('ApiException when attempting to run task, re-queueing. '
+                             'Message: %s' % json.loads(e.body)['message'])
+            self.task_queue.put(task)
+        except HTTPError as e:
+            self.log.warning('HTTPError when attempting to run task, re-queueing. '
+                             'Exception: %s', str(e))
+            self.task_queue.put(task)
+        finally:
+            self.task_queue.task_done()
 
     def _change_state(self, key, state, pod_id):
         if state != State.RUNNING:
@@ -923,6 +964,9 @@ class KubernetesExecutor(BaseExecutor, LoggingMixin):
         # Both queues should be empty...
         self.task_queue.join()
         self.result_queue.join()
+        if self._pod_creation_pool is not None:
+            self._pod_creation_pool.close()
+            self._pod_creation_pool.join()
         if self.kube_scheduler:
             self.kube_scheduler.terminate()
         self._manager.shutdown()
@@ -22,9 +22,13 @@ This module contains a BigQuery Hook, as well as a very basic PEP 249
 implementation for BigQuery.
 """
 
+import threading
 import time
+from collections import deque
+
 import six
 from builtins import range
+from six.moves.queue import Full, Queue
 from copy import deepcopy
 from six import iteritems
 
@@ -72,7 +76,8 @@ class BigQueryHook(GoogleCloudBaseHook, DbApiHook):
             project_id=project,
             use_legacy_sql=self.use_legacy_sql,
             location=self.location,
-            num_retries=self.num_retries
+            num_retries=self.num_retries,
+            service_factory=self.get_service
         )
 
     def get_service(self):
@@ -1974,7 +1979,8 @@ class BigQueryCursor(BigQueryBaseCursor):
     https://github.com/dropbox/PyHive/blob/master/pyhive/common.py
     """
 
-    def __init__(self, service, project_id, use_legacy_sql=True, location=None, num_retries=5):
+    def __init__(self, service, project_id, use_legacy_sql=True, location=None, num_retries=5,
+                 prefetch_pages=0, service_factory=None):
         super(BigQueryCursor, self).__init__(
             service=service,
             project_id=project_id,
@@ -1985,8 +1991,23 @@ class BigQueryCursor(BigQueryBaseCursor):
         self.buffersize = None
         self.page_token = None
         self.job_id = None
-        self.buffer = []
+        self.buffer = deque()
         self.all_pages_loaded = False
+        # The number of pages of results fetched ahead, on a background thread
+        # with its own service object built by service_factory, as the HTTP
+        # client of a service object is not thread safe
+        self.prefetch_pages = prefetch_pages
+        self.service_factory = service_factory
+        self._pages = None
+        self._prefetcher = None
+        self._stop_prefetching = None
+
+    def __del__(self):
+        # The prefetcher doesn't reference the cursor, so that an abandoned
+        # cursor is garbage collected and stops it
+        stop_prefetching = getattr(self, '_stop_prefetching', None)
+        if stop_prefetching is not None:
+            stop_prefetching.set()
 
     @property
     def description(self):
@@ -1994,7 +2015,8 @@ class BigQueryCursor(BigQueryBaseCursor):
         raise NotImplementedError
 
     def close(self):
-        """ By default, do nothing """
+        """ Stops fetching the results of the last query ahead """
+        self._stop_prefetcher()
 
     @property
     def rowcount(self):
@@ -2012,6 +2034,7 @@ class BigQueryCursor(BigQueryBaseCursor):
         """
         sql = _bind_parameters(operation,
                                parameters) if parameters else operation
+        self.flush_results()
         self.job_id = self.run_query(sql)
 
     def executemany(self, operation, seq_of_parameters):
@@ -2029,10 +2052,71 @@ class BigQueryCursor(BigQueryBaseCursor):
 
     def flush_results(self):
         """ Flush results related cursor attributes. """
+        self._stop_prefetcher()
         self.page_token = None
         self.job_id = None
         self.all_pages_loaded = False
-        self.buffer = []
+        self.buffer = deque()
+
+    def _start_prefetcher(self):
+        self._pages = Queue(maxsize=self.prefetch_pages)
+        self._stop_prefetching = threading.Event()
+        self._prefetcher = threading.Thread(
+            target=_prefetch_result_pages,
+            args=(self.service_factory, self.project_id, self.job_id, self.num_retries,
+                  self._pages, self._stop_prefetching))
+        self._prefetcher.daemon = True
+        self._prefetcher.start()
+
+    def _stop_prefetcher(self):
+        if self._prefetcher is not None:
+            # The prefetcher stops waiting for room in the queue once stopped
+            self._stop_prefetching.set()
+            self._prefetcher.join()
+            self._prefetcher = None
+        self._pages = None
+
+    def _next_page(self):
+        """
+        Returns the next page of results as a list of columns, None once
+        all the pages were returned.
+        """
+        if self.prefetch_pages <= 0 or self.service_factory is None:
+            if self._pages is None:
+                self._pages = _iter_result_pages(
+                    self.service, self.project_id, self.job_id, self.num_retries)
+            return next(self._pages, None)
+
+        if self._prefetcher is None:
+            self._start_prefetcher()
+        page = self._pages.get()
+        if isinstance(page, Exception):
+            self._prefetcher.join()
+            self._prefetcher = None
+            self._pages = None
+            raise page
+        return page
+
+    def fetch_batches(self):
+        """
+        Yields the remaining results of the query in batches, one per page
+        of results. A batch is a list of columns in the order of the schema,
+        each column being the list of its values. With ``prefetch_pages``,
+        the pages are fetched ahead on a background thread.
+        """
+        if not self.job_id:
+            return
+        if self.buffer:
+            rows = self.buffer
+            self.buffer = deque()
+            yield [list(column) for column in zip(*rows)]
+        while not self.all_pages_loaded:
+            columns = self._next_page()
+            if columns is None:
+                # Reset all state since we've exhausted the results.
+                self.flush_results()
+                return
+            yield columns
 
     def fetchone(self):
         """ Fetch the next row of a query result set. """
@@ -2041,8 +2125,8 @@ class BigQueryCursor(BigQueryBaseCursor):
     def next(self):
         """
         Helper method for fetchone, which returns the next row from a buffer.
-        If the buffer is empty, attempts to paginate through the result set for
-        the next page, and load it into the buffer.
+        If the buffer is empty, loads the next page of the result set into
+        the buffer.
         """
         if not self.job_id:
             return None
@@ -2051,33 +2135,14 @@ class BigQueryCursor(BigQueryBaseCursor):
             if self.all_pages_loaded:
                 return None
 
-            query_results = (self.service.jobs().getQueryResults(
-                projectId=self.project_id,
-                jobId=self.job_id,
-                pageToken=self.page_token).execute(num_retries=self.num_retries))
-
-            if 'rows' in query_results and query_results['rows']:
-                self.page_token = query_results.get('pageToken')
-                fields = query_results['schema']['fields']
-                col_types = [field['type'] for field in fields]
-                rows = query_results['rows']
-
-                for dict_row in rows:
-                    typed_row = ([
-                        _bq_cast(vs['v'], col_types[idx])
-                        for idx, vs in enumerate(dict_row['f'])
-                    ])
-                    self.buffer.append(typed_row)
-
-                if not self.page_token:
-                    self.all_pages_loaded = True
-
-            else:
+            columns = self._next_page()
+            if columns is None:
                 # Reset all state since we've exhausted the results.
                 self.flush_results()
                 return None
+            self.buffer.extend(list(row) for row in zip(*columns))
 
-        return self.buffer.pop(0)
+        return self.buffer.popleft()
 
     def fetchmany(self, size=None):
         """
@@ -2094,12 +2159,14 @@ class BigQueryCursor(BigQueryBaseCursor):
         if size is None:
             size = self.arraysize
         result = []
-        for _ in range(size):
-            one = self.fetchone()
-            if one is None:
-                break
-            else:
+        while len(result) < size:
+            if not self.buffer:
+                one = self.fetchone()
+                if one is None:
+                    break
                 result.append(one)
+            wanted = min(size - len(result), len(self.buffer))
+            result.extend(self.buffer.popleft() for _ in range(wanted))
         return result
 
     def fetchall(self):
@@ -2108,17 +2175,13 @@ class BigQueryCursor(BigQueryBaseCursor):
         sequences (e.g. a list of tuples).
         """
         result = []
-        while True:
-            one = self.fetchone()
-            if one is None:
-                break
-            else:
-                result.append(one)
+        for columns in self.fetch_batches():
+            result.extend(list(row) for row in zip(*columns))
         return result
 
     def get_arraysize(self):
         """ Specifies the number of rows to fetch at a time with .fetchmany() """
-        return self._buffersize if self.buffersize else 1
+        return self.buffersize if self.buffersize else 1
 
     def set_arraysize(self, arraysize):
         """ Specifies the number of rows to fetch at a time with .fetchmany() """
@@ -2133,6 +2196,59 @@ class BigQueryCursor(BigQueryBaseCursor):
         """ Does nothing by default """
 
 
+def _iter_result_pages(service, project_id, job_id, num_retries, stop=None):
+    """
+    Yields the pages of results of a query job as lists of columns, cast to
+    the Python types of the columns.
+    """
+    page_token = None
+    while stop is None or not stop.is_set():
+        query_results = (service.jobs().getQueryResults(
+            projectId=project_id,
+            jobId=job_id,
+            pageToken=page_token).execute(num_retries=num_retries))
+
+        rows = query_results.get('rows')
+        if not rows:
+            return
+        fields = query_results['schema']['fields']
+        columns = zip(*[[cell['v'] for cell in row['f']] for row in rows])
+        yield [_bq_cast_column(values, field['type'])
+               for values, field in zip(columns, fields)]
+
+        page_token = query_results.get('pageToken')
+        if not page_token:
+            return
+
+
+def _put_unless_stopped(queue, item, stop):
+    """ Puts the item into the queue, unless stopped while waiting for room """
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def _prefetch_result_pages(service_factory, project_id, job_id, num_retries, pages, stop):
+    """
+    Puts the pages of results of a query job into the queue, then None,
+    until stopped. It runs on the background thread of a cursor.
+    """
+    try:
+        service = service_factory()
+        for page in _iter_result_pages(service, project_id, job_id, num_retries, stop):
+            if not _put_unless_stopped(pages, page, stop):
+                return
+    except Exception as e:  # pylint: disable=broad-except
+        # Raised again by the thread consuming the pages
+        _put_unless_stopped(pages, e, stop)
+        return
+    _put_unless_stopped(pages, None, stop)
+
+
 def _bind_parameters(operation, parameters):
     """ Helper method that binds parameters to a SQL query. """
     # inspired by MySQL Python Connector (conversion.py)
@@ -2178,6 +2294,21 @@ def _bq_cast(string_field, bq_type):
         return string_field
 
 
+def _bq_cast_column(string_fields, bq_type):
+    """
+    Helper method that casts the values of a column of BigQuery rows to the
+    Python type of the column, see ``_bq_cast``.
+    """
+    if bq_type == 'INTEGER':
+        return [None if v is None else int(v) for v in string_fields]
+    elif bq_type == 'FLOAT' or bq_type == 'TIMESTAMP':
+        return [None if v is None else float(v) for v in string_fields]
+    elif bq_type == 'BOOLEAN':
+        return [_bq_cast(v, bq_type) for v in string_fields]
+    else:
+        return list(string_fields)
+
+
 def _split_tablename(table_input, default_project_id, var_name=None):
 
     if '.' not in table_input:
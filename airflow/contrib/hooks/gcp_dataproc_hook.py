@@ -322,6 +322,21 @@ class DataProcHook(GoogleCloudBaseHook):
                                        self.num_retries)
         submitted.wait_for_done()
 
+    def is_operation_done(self, operation_name):
+        """
+        Checks once whether a Google Cloud Dataproc Operation is done, raises
+        if it failed.
+        """
+        dataproc_api = self.get_conn()
+        operation = (
+            dataproc_api.projects()
+            .regions()
+            .operations()
+            .get(name=operation_name)
+            .execute(num_retries=self.num_retries))
+        # pylint: disable=protected-access
+        return _DataProcOperation(dataproc_api, operation, self.num_retries)._check_done()
+
     def cancel(self, project_id, job_id, region='global'):
         """
         Cancel a Google Cloud DataProc job.
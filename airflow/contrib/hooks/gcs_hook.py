@@ -20,12 +20,43 @@
 import gzip as gz
 import os
 import shutil
+import uuid
 import warnings
+from multiprocessing.pool import ThreadPool
 
 from google.cloud import storage
 
 from airflow.contrib.hooks.gcp_api_base_hook import GoogleCloudBaseHook
 from airflow.exceptions import AirflowException
+from airflow.settings import Stats
+
+# The most source objects a single compose request accepts
+MAX_COMPOSE_SOURCES = 32
+
+
+class _ProgressFile(object):
+    """
+    Wraps a file object to count the bytes read from or written to it in
+    the ``gcs_hook.<direction>_bytes`` metric, as the chunks of a transfer
+    go through it.
+    """
+
+    def __init__(self, file_obj, direction):
+        self._file_obj = file_obj
+        self._stat = 'gcs_hook.{}_bytes'.format(direction)
+
+    def read(self, *args):
+        data = self._file_obj.read(*args)
+        if data:
+            Stats.incr(self._stat, len(data))
+        return data
+
+    def write(self, data):
+        Stats.incr(self._stat, len(data))
+        return self._file_obj.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._file_obj, name)
 
 
 class GoogleCloudStorageHook(GoogleCloudBaseHook):
@@ -151,14 +182,17 @@ class GoogleCloudStorageHook(GoogleCloudBaseHook):
                       destination_object, destination_bucket.name)
 
     # pylint:disable=redefined-builtin
-    def download(self, bucket, object, filename=None):
+    def download(self, bucket, object, filename=None, file_obj=None, chunk_size=None):
         """
         Downloads a file from Google Cloud Storage.
 
-        When no filename is supplied, the operator loads the file into memory and returns its
-        content. When a filename is supplied, it writes the file to the specified location and
-        returns the location. For file sizes that exceed the available memory it is recommended
-        to write to a file.
+        When neither a filename nor a file object is supplied, the operator loads the file
+        into memory and returns its content. When a filename is supplied, it writes the file
+        to the specified location and returns the location. When a file object is supplied,
+        it writes the file to it and returns it. For file sizes that exceed the available
+        memory it is recommended to write to a file.
+
+        The downloaded bytes are counted in the ``gcs_hook.download_bytes`` metric.
 
         :param bucket: The bucket to fetch from.
         :type bucket: str
@@ -166,25 +200,44 @@ class GoogleCloudStorageHook(GoogleCloudBaseHook):
         :type object: str
         :param filename: If set, a local file path where the file should be written to.
         :type filename: str
+        :param file_obj: If set, a binary file object the file should be written to.
+        :type file_obj: file-like object
+        :param chunk_size: If set, the file is downloaded in chunks of that many bytes,
+            a multiple of 256 KB, instead of in a single request.
+        :type chunk_size: int
         """
         client = self.get_conn()
         bucket = client.bucket(bucket)
-        blob = bucket.blob(blob_name=object)
-
-        if filename:
-            blob.download_to_filename(filename)
+        blob = bucket.blob(blob_name=object, chunk_size=chunk_size)
+
+        if file_obj is not None:
+            blob.download_to_file(_ProgressFile(file_obj, 'download'))
+            return file_obj
+        elif filename:
+            try:
+                with open(filename, 'wb') as f:
+                    blob.download_to_file(_ProgressFile(f, 'download'))
+            except Exception:
+                if os.path.exists(filename):
+                    os.remove(filename)
+                raise
             self.log.info('File downloaded to %s', filename)
             return filename
         else:
-            return blob.download_as_string()
+            data = blob.download_as_string()
+            Stats.incr('gcs_hook.download_bytes', len(data))
+            return data
 
     # pylint:disable=redefined-builtin
     def upload(self, bucket, object, filename,
                mime_type='application/octet-stream', gzip=False,
-               multipart=None, num_retries=None):
+               multipart=None, num_retries=None, chunk_size=None,
+               num_components=None):
         """
         Uploads a local file to Google Cloud Storage.
 
+        The uploaded bytes are counted in the ``gcs_hook.upload_bytes`` metric.
+
         :param bucket: The bucket to upload to.
         :type bucket: str
         :param object: The object name to set when uploading the local file.
@@ -195,6 +248,13 @@ class GoogleCloudStorageHook(GoogleCloudBaseHook):
         :type mime_type: str
         :param gzip: Option to compress file for upload
         :type gzip: bool
+        :param chunk_size: If set, the file is sent in a resumable upload, in
+            chunks of that many bytes, a multiple of 256 KB. An interrupted
+            chunk is sent again rather than the whole file.
+        :type chunk_size: int
+        :param num_components: If set to more than 1, the file is split in up to 32
+            components that are uploaded in parallel, then composed into the object.
+        :type num_components: int
         """
 
         if multipart is not None:
@@ -213,16 +273,80 @@ class GoogleCloudStorageHook(GoogleCloudBaseHook):
                     shutil.copyfileobj(f_in, f_out)
                     filename = filename_gz
 
-        client = self.get_conn()
-        bucket = client.bucket(bucket)
-        blob = bucket.blob(blob_name=object)
-        blob.upload_from_filename(filename=filename,
-                                  content_type=mime_type)
+        if num_components and num_components > 1:
+            self._upload_composite(bucket, object, filename, mime_type,
+                                   chunk_size, num_components)
+        else:
+            client = self.get_conn()
+            self._upload_range(client, bucket, object, filename, mime_type, chunk_size)
 
         if gzip:
             os.remove(filename)
         self.log.info('File %s uploaded to %s in %s bucket', filename, object, bucket)
 
+    @staticmethod
+    def _upload_range(client, bucket, object, filename, mime_type, chunk_size,
+                      offset=0, size=None):
+        """Uploads the size bytes of the file from offset, or all of it"""
+        blob = client.bucket(bucket).blob(blob_name=object, chunk_size=chunk_size)
+        with open(filename, 'rb') as f:
+            f.seek(offset)
+            blob.upload_from_file(_ProgressFile(f, 'upload'),
+                                  size=size,
+                                  content_type=mime_type)
+
+    def _upload_composite(self, bucket, object, filename, mime_type,
+                          chunk_size, num_components):
+        """
+        Uploads the parts of the file as components in parallel, then
+        composes them into the object and deletes them.
+        """
+        file_size = os.path.getsize(filename)
+        num_components = min(num_components, MAX_COMPOSE_SOURCES, file_size)
+        if num_components <= 1:
+            self._upload_range(self.get_conn(), bucket, object, filename, mime_type,
+                               chunk_size)
+            return
+        component_size = -(-file_size // num_components)
+        # The components are deleted in any case, they get names unique to the
+        # upload so that they never are existing objects
+        component_prefix = '{}_{}'.format(object, uuid.uuid4().hex)
+        components = [
+            ('{}_component_{}'.format(component_prefix, i), offset,
+             min(component_size, file_size - offset))
+            for i, offset in enumerate(range(0, file_size, component_size))
+        ]
+
+        def upload_component(component):
+            component_object, offset, size = component
+            # Every thread uses its own client, their connections are not shared
+            client = storage.Client(credentials=self._get_credentials(),
+                                    project=self.project_id)
+            self._upload_range(client, bucket, component_object, filename, mime_type,
+                               chunk_size, offset=offset, size=size)
+
+        self.log.info('Uploading %s in %s components', filename, len(components))
+        component_objects = [component[0] for component in components]
+        pool = ThreadPool(len(components))
+        client = self.get_conn()
+        try:
+            pool.map(upload_component, components)
+            # The composed object gets the content type of the destination
+            # blob, not of the components
+            destination_blob = client.bucket(bucket).blob(blob_name=object)
+            destination_blob.content_type = mime_type
+            destination_blob.compose(sources=[
+                client.bucket(bucket).blob(blob_name=component_object)
+                for component_object in component_objects
+            ])
+        finally:
+            pool.close()
+            pool.join()
+            for component_object in component_objects:
+                blob = client.bucket(bucket).blob(blob_name=component_object)
+                if blob.exists():
+                    blob.delete()
+
     # pylint:disable=redefined-builtin
     def exists(self, bucket, object):
         """
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Local cache of the worker pods, indexed on their task labels"""
+import threading
+
+# The labels identifying the task instance a worker pod runs
+TASK_LABELS = ('dag_id', 'task_id', 'execution_date')
+
+
+class PodCache(object):
+    """
+    Keeps the name, phase and labels of the worker pods, filled from a single
+    list call and kept up to date from the events of the pod watch stream,
+    so that finding the pods of a task instance does not need a round trip
+    to the Kubernetes API server.
+
+    The pods are indexed on their ``dag_id``, ``task_id`` and
+    ``execution_date`` labels, as set on the worker pods by the executor.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pods = {}
+        self._index = {}
+        self.resource_version = None
+
+    @staticmethod
+    def _task_key(labels):
+        if not labels:
+            return None
+        try:
+            return tuple(labels[label] for label in TASK_LABELS)
+        except KeyError:
+            return None
+
+    def _add(self, pod_id, phase, labels):
+        self._remove(pod_id)
+        labels = dict(labels or {})
+        self._pods[pod_id] = (phase, labels)
+        key = self._task_key(labels)
+        if key is not None:
+            self._index.setdefault(key, set()).add(pod_id)
+
+    def _remove(self, pod_id):
+        cached = self._pods.pop(pod_id, None)
+        if cached is None:
+            return
+        key = self._task_key(cached[1])
+        pod_ids = self._index.get(key)
+        if pod_ids is not None:
+            pod_ids.discard(pod_id)
+            if not pod_ids:
+                del self._index[key]
+
+    def populate(self, pod_list):
+        """
+        Replaces the content of the cache with the pods of a
+        ``list_namespaced_pod`` response.
+
+        :param pod_list: the response of the list call
+        :type pod_list: kubernetes.client.V1PodList
+        """
+        with self._lock:
+            self._pods = {}
+            self._index = {}
+            for pod in pod_list.items:
+                self._add(pod.metadata.name, pod.status.phase, pod.metadata.labels)
+            if pod_list.metadata is not None:
+                self.resource_version = pod_list.metadata.resource_version
+
+    def update(self, event_type, pod_id, phase, labels, resource_version=None):
+        """
+        Applies an event of the pod watch stream.
+
+        :param event_type: ``ADDED``, ``MODIFIED`` or ``DELETED``
+        :type event_type: str
+        :param pod_id: the name of the pod
+        :type pod_id: str
+        :param phase: the phase of the pod, e.g. ``Running``
+        :type phase: str
+        :param labels: the labels of the pod
+        :type labels: dict
+        :param resource_version: the resource version of the pod
+        :type resource_version: str
+        """
+        with self._lock:
+            if event_type == 'DELETED':
+                self._remove(pod_id)
+            else:
+                self._add(pod_id, phase, labels)
+            if resource_version:
+                self.resource_version = resource_version
+
+    def remove(self, pod_id):
+        """Forgets the pod, e.g. once it was deleted by the executor"""
+        with self._lock:
+            self._remove(pod_id)
+
+    def get_pods(self, dag_id, task_id, execution_date, **labels):
+        """
+        Returns the names and phases of the cached pods of a task instance.
+        The arguments are the label values, as made safe by the executor,
+        extra keyword arguments further filter on other labels.
+
+        :return: the ``(pod_id, phase)`` of the matching pods
+        :rtype: list[tuple[str, str]]
+        """
+        with self._lock:
+            pods = []
+            for pod_id in self._index.get((dag_id, task_id, execution_date), ()):
+                phase, pod_labels = self._pods[pod_id]
+                if all(pod_labels.get(label) == value for label, value in labels.items()):
+                    pods.append((pod_id, phase))
+            return pods
+
+    def __contains__(self, pod_id):
+        with self._lock:
+            return pod_id in self._pods
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pods)
@@ -23,7 +23,7 @@ import time
 
 from airflow.exceptions import AirflowException
 from airflow.contrib.hooks.databricks_hook import DatabricksHook
-from airflow.models import BaseOperator
+from airflow.models import BaseOperator, ResumableMixin
 from airflow.utils.decorators import apply_defaults
 
 
@@ -58,12 +58,10 @@ def _deep_string_coerce(content, json_path='json'):
         raise AirflowException(msg)
 
 
-def _handle_databricks_operator_execution(operator, hook, log, context):
+def _push_databricks_run_info(operator, hook, log, context):
     """
-    Handles the Airflow + Databricks lifecycle logic for a Databricks operator
-
-    :param operator: Databricks operator being handled
-    :param context: Airflow context
+    Pushes the id and page url of the run of a Databricks operator to XCom,
+    if it should, and returns the url.
     """
     if operator.do_xcom_push:
         context['ti'].xcom_push(key=XCOM_RUN_ID_KEY, value=operator.run_id)
@@ -73,26 +71,45 @@ def _handle_databricks_operator_execution(operator, hook, log, context):
         context['ti'].xcom_push(key=XCOM_RUN_PAGE_URL_KEY, value=run_page_url)
 
     log.info('View run status, Spark UI, and logs at %s', run_page_url)
-    while True:
-        run_state = hook.get_run_state(operator.run_id)
-        if run_state.is_terminal:
-            if run_state.is_successful:
-                log.info('%s completed successfully.', operator.task_id)
-                log.info('View run status, Spark UI, and logs at %s', run_page_url)
-                return
-            else:
-                error_message = '{t} failed with terminal state: {s}'.format(
-                    t=operator.task_id,
-                    s=run_state)
-                raise AirflowException(error_message)
-        else:
-            log.info('%s in run state: %s', operator.task_id, run_state)
+    return run_page_url
+
+
+def _check_databricks_run(operator, hook, log, run_page_url):
+    """
+    Checks the state of the run of a Databricks operator once
+
+    :return: whether the run completed successfully, raises if it failed
+    """
+    run_state = hook.get_run_state(operator.run_id)
+    if run_state.is_terminal:
+        if run_state.is_successful:
+            log.info('%s completed successfully.', operator.task_id)
             log.info('View run status, Spark UI, and logs at %s', run_page_url)
-            log.info('Sleeping for %s seconds.', operator.polling_period_seconds)
-            time.sleep(operator.polling_period_seconds)
+            return True
+        else:
+            error_message = '{t} failed with terminal state: {s}'.format(
+                t=operator.task_id,
+                s=run_state)
+            raise AirflowException(error_message)
+    log.info('%s in run state: %s', operator.task_id, run_state)
+    log.info('View run status, Spark UI, and logs at %s', run_page_url)
+    return False
+
 
+def _handle_databricks_operator_execution(operator, hook, log, context):
+    """
+    Handles the Airflow + Databricks lifecycle logic for a Databricks operator
+
+    :param operator: Databricks operator being handled
+    :param context: Airflow context
+    """
+    run_page_url = _push_databricks_run_info(operator, hook, log, context)
+    while not _check_databricks_run(operator, hook, log, run_page_url):
+        log.info('Sleeping for %s seconds.', operator.polling_period_seconds)
+        time.sleep(operator.polling_period_seconds)
 
-class DatabricksSubmitRunOperator(BaseOperator):
+
+class DatabricksSubmitRunOperator(ResumableMixin, BaseOperator):
     """
     Submits a Spark job run to Databricks using the
     `api/2.0/jobs/runs/submit
@@ -215,6 +232,10 @@ class DatabricksSubmitRunOperator(BaseOperator):
     :type databricks_retry_delay: float
     :param do_xcom_push: Whether we should push run_id and run_page_url to xcom.
     :type do_xcom_push: bool
+    :param resumable: Whether the task instance should be rescheduled, freeing
+        its worker slot, while the run isn't done, rather than wait for it. The
+        run is then checked every ``polling_period_seconds``.
+    :type resumable: bool
     """
     # Used in airflow.models.BaseOperator
     template_fields = ('json',)
@@ -238,6 +259,7 @@ class DatabricksSubmitRunOperator(BaseOperator):
             databricks_retry_limit=3,
             databricks_retry_delay=1,
             do_xcom_push=False,
+            resumable=False,
             **kwargs):
         """
         Creates a new ``DatabricksSubmitRunOperator``.
@@ -269,6 +291,8 @@ class DatabricksSubmitRunOperator(BaseOperator):
         # This variable will be used in case our task gets killed.
         self.run_id = None
         self.do_xcom_push = do_xcom_push
+        self.resumable = resumable
+        self.resume_interval = polling_period_seconds
 
     def get_hook(self):
         return DatabricksHook(
@@ -277,10 +301,22 @@ class DatabricksSubmitRunOperator(BaseOperator):
             retry_delay=self.databricks_retry_delay)
 
     def execute(self, context):
+        if self.resumable:
+            return self.execute_resumable(context)
         hook = self.get_hook()
         self.run_id = hook.submit_run(self.json)
         _handle_databricks_operator_execution(self, hook, self.log, context)
 
+    def submit(self, context):
+        self.run_id = self.get_hook().submit_run(self.json)
+        return self.run_id
+
+    def poll(self, context, resume_token):
+        hook = self.get_hook()
+        self.run_id = int(resume_token)
+        run_page_url = _push_databricks_run_info(self, hook, self.log, context)
+        return _check_databricks_run(self, hook, self.log, run_page_url)
+
     def on_kill(self):
         hook = self.get_hook()
         hook.cancel_run(self.run_id)
@@ -290,7 +326,7 @@ class DatabricksSubmitRunOperator(BaseOperator):
         )
 
 
-class DatabricksRunNowOperator(BaseOperator):
+class DatabricksRunNowOperator(ResumableMixin, BaseOperator):
     """
     Runs an existing Spark job run to Databricks using the
     `api/2.0/jobs/run-now
@@ -420,6 +456,10 @@ class DatabricksRunNowOperator(BaseOperator):
     :type databricks_retry_limit: int
     :param do_xcom_push: Whether we should push run_id and run_page_url to xcom.
     :type do_xcom_push: bool
+    :param resumable: Whether the task instance should be rescheduled, freeing
+        its worker slot, while the run isn't done, rather than wait for it. The
+        run is then checked every ``polling_period_seconds``.
+    :type resumable: bool
     """
     # Used in airflow.models.BaseOperator
     template_fields = ('json',)
@@ -440,6 +480,7 @@ class DatabricksRunNowOperator(BaseOperator):
             databricks_retry_limit=3,
             databricks_retry_delay=1,
             do_xcom_push=False,
+            resumable=False,
             **kwargs):
 
         """
@@ -465,6 +506,8 @@ class DatabricksRunNowOperator(BaseOperator):
         # This variable will be used in case our task gets killed.
         self.run_id = None
         self.do_xcom_push = do_xcom_push
+        self.resumable = resumable
+        self.resume_interval = polling_period_seconds
 
     def get_hook(self):
         return DatabricksHook(
@@ -473,10 +516,22 @@ class DatabricksRunNowOperator(BaseOperator):
             retry_delay=self.databricks_retry_delay)
 
     def execute(self, context):
+        if self.resumable:
+            return self.execute_resumable(context)
         hook = self.get_hook()
         self.run_id = hook.run_now(self.json)
         _handle_databricks_operator_execution(self, hook, self.log, context)
 
+    def submit(self, context):
+        self.run_id = self.get_hook().run_now(self.json)
+        return self.run_id
+
+    def poll(self, context, resume_token):
+        hook = self.get_hook()
+        self.run_id = int(resume_token)
+        run_page_url = _push_databricks_run_info(self, hook, self.log, context)
+        return _check_databricks_run(self, hook, self.log, run_page_url)
+
     def on_kill(self):
         hook = self.get_hook()
         hook.cancel_run(self.run_id)
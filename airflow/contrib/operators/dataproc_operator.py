@@ -32,20 +32,31 @@ from datetime import timedelta
 from airflow.contrib.hooks.gcp_dataproc_hook import DataProcHook
 from airflow.contrib.hooks.gcs_hook import GoogleCloudStorageHook
 from airflow.exceptions import AirflowException
-from airflow.models import BaseOperator
+from airflow.models import BaseOperator, ResumableMixin
 from airflow.utils.decorators import apply_defaults
 from airflow.version import version
 from airflow.utils import timezone
 
 
-class DataprocOperationBaseOperator(BaseOperator):
-    """The base class for operators that poll on a Dataproc Operation."""
+class DataprocOperationBaseOperator(ResumableMixin, BaseOperator):
+    """
+    The base class for operators that poll on a Dataproc Operation.
+
+    :param resumable: Whether the task instance should be rescheduled, freeing
+        its worker slot, while the operation isn't done, rather than wait for it.
+    :type resumable: bool
+    :param resume_interval: The seconds between the checks of the operation when
+        the operator is resumable.
+    :type resume_interval: int
+    """
     @apply_defaults
     def __init__(self,
                  project_id,
                  region='global',
                  gcp_conn_id='google_cloud_default',
                  delegate_to=None,
+                 resumable=False,
+                 resume_interval=60,
                  *args,
                  **kwargs):
         super(DataprocOperationBaseOperator, self).__init__(*args, **kwargs)
@@ -53,6 +64,8 @@ class DataprocOperationBaseOperator(BaseOperator):
         self.delegate_to = delegate_to
         self.project_id = project_id
         self.region = region
+        self.resumable = resumable
+        self.resume_interval = resume_interval
         self.hook = DataProcHook(
             gcp_conn_id=self.gcp_conn_id,
             delegate_to=self.delegate_to,
@@ -60,9 +73,18 @@ class DataprocOperationBaseOperator(BaseOperator):
         )
 
     def execute(self, context):
+        if self.resumable:
+            return self.execute_resumable(context)
         # pylint: disable=no-value-for-parameter
         self.hook.wait(self.start())
 
+    def submit(self, context):
+        # pylint: disable=no-value-for-parameter
+        return self.start()['name']
+
+    def poll(self, context, resume_token):
+        return self.hook.is_operation_done(resume_token)
+
     def start(self, context):
         raise AirflowException('Please submit an operation')
 
@@ -16,6 +16,7 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+from tempfile import NamedTemporaryFile
 
 from airflow.contrib.hooks.gcs_hook import GoogleCloudStorageHook
 from airflow.contrib.operators.gcs_list_operator import GoogleCloudStorageListOperator
@@ -124,14 +125,17 @@ class GoogleCloudStorageToS3Operator(GoogleCloudStorageListOperator):
             )
 
             for file in files:
-                file_bytes = hook.download(self.bucket, file)
-
                 dest_key = self.dest_s3_key + file
                 self.log.info("Saving file to %s", dest_key)
 
-                s3_hook.load_bytes(file_bytes,
-                                   key=dest_key,
-                                   replace=self.replace)
+                # Stream the file through a temporary file rather than memory
+                with NamedTemporaryFile() as f:
+                    hook.download(self.bucket, file, file_obj=f)
+                    f.flush()
+                    f.seek(0)
+                    s3_hook.load_file_obj(f,
+                                          key=dest_key,
+                                          replace=self.replace)
 
             self.log.info("All done, uploaded %d files to S3", len(files))
         else:
@@ -17,6 +17,7 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import logging
 from base64 import b64encode
 from select import select
 
@@ -25,6 +26,7 @@ from airflow.contrib.hooks.ssh_hook import SSHHook
 from airflow.exceptions import AirflowException
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
+from airflow.utils.log.output_capture import OutputCapture, get_output_max_bytes
 
 
 class SSHOperator(BaseOperator):
@@ -55,6 +57,11 @@ class SSHOperator(BaseOperator):
         The default is ``False`` but note that `get_pty` is forced to ``True``
         when the `command` starts with ``sudo``.
     :type get_pty: bool
+    :param output_max_bytes: The maximum number of bytes of the stdout and of
+        the stderr of the command copied to the log, defaults to
+        ``[core] task_output_max_bytes``. Their first and last halves are kept
+        when they are longer.
+    :type output_max_bytes: int
     """
 
     template_fields = ('command', 'remote_host')
@@ -70,6 +77,7 @@ class SSHOperator(BaseOperator):
                  do_xcom_push=False,
                  environment=None,
                  get_pty=False,
+                 output_max_bytes=None,
                  *args,
                  **kwargs):
         super(SSHOperator, self).__init__(*args, **kwargs)
@@ -81,6 +89,7 @@ class SSHOperator(BaseOperator):
         self.environment = environment
         self.do_xcom_push = do_xcom_push
         self.get_pty = self.command.startswith('sudo') or get_pty
+        self.output_max_bytes = output_max_bytes
 
     def execute(self, context):
         try:
@@ -123,6 +132,10 @@ class SSHOperator(BaseOperator):
 
                 agg_stdout = b''
                 agg_stderr = b''
+                max_bytes = get_output_max_bytes(self.output_max_bytes)
+                stdout_capture = OutputCapture(self.log, max_bytes=max_bytes)
+                stderr_capture = OutputCapture(self.log, level=logging.WARNING,
+                                               max_bytes=max_bytes)
 
                 # capture any initial output in case channel is closed already
                 stdout_buffer_length = len(stdout.channel.in_buffer)
@@ -138,14 +151,12 @@ class SSHOperator(BaseOperator):
                     for c in readq:
                         if c.recv_ready():
                             line = stdout.channel.recv(len(c.in_buffer))
-                            line = line
                             agg_stdout += line
-                            self.log.info(line.decode('utf-8').strip('\n'))
+                            stdout_capture.write(line)
                         if c.recv_stderr_ready():
                             line = stderr.channel.recv_stderr(len(c.in_stderr_buffer))
-                            line = line
                             agg_stderr += line
-                            self.log.warning(line.decode('utf-8').strip('\n'))
+                            stderr_capture.write(line)
                     if stdout.channel.exit_status_ready()\
                             and not stderr.channel.recv_stderr_ready()\
                             and not stdout.channel.recv_ready():
@@ -153,6 +164,8 @@ class SSHOperator(BaseOperator):
                         stdout.channel.close()
                         break
 
+                stdout_capture.close()
+                stderr_capture.close()
                 stdout.close()
                 stderr.close()
 
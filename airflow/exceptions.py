@@ -54,9 +54,13 @@ class AirflowRescheduleException(AirflowException):
 
     :param reschedule_date: The date when the task should be rescheduled
     :type reschedule_date: datetime.datetime
+    :param resume_token: The token a resumable operator resumes its
+        remote job with when it runs again
+    :type resume_token: str
     """
-    def __init__(self, reschedule_date):
+    def __init__(self, reschedule_date, resume_token=None):
         self.reschedule_date = reschedule_date
+        self.resume_token = resume_token
 
 
 class AirflowTaskTimeout(AirflowException):
@@ -16,6 +16,9 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+from multiprocessing.pool import ThreadPool
+
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
 from airflow.exceptions import AirflowException
@@ -26,12 +29,31 @@ from urllib.parse import urlparse
 import re
 import fnmatch
 
+# The most keys a single DeleteObjects request can delete
+MAX_KEYS_PER_DELETE = 1000
+
 
 class S3Hook(AwsHook):
     """
     Interact with AWS S3, using the boto3 library.
+
+    :param transfer_config_args: the arguments of the
+        ``boto3.s3.transfer.TransferConfig`` of the uploads and downloads,
+        e.g. ``multipart_threshold``, ``multipart_chunksize`` or
+        ``max_concurrency``
+    :type transfer_config_args: dict
+    :param max_workers: the number of objects the bulk methods
+        (``load_files``, ``copy_objects`` and ``delete_objects``) transfer at
+        the same time
+    :type max_workers: int
     """
 
+    def __init__(self, aws_conn_id='aws_default', verify=None,
+                 transfer_config_args=None, max_workers=8):
+        super(S3Hook, self).__init__(aws_conn_id=aws_conn_id, verify=verify)
+        self.transfer_config = TransferConfig(**(transfer_config_args or {}))
+        self.max_workers = max_workers
+
     def get_conn(self):
         return self.get_client_type('s3')
 
@@ -103,8 +125,62 @@ class S3Hook(AwsHook):
         prefix = prefix + delimiter if prefix[-1] != delimiter else prefix
         prefix_split = re.split(r'(\w+[{d}])$'.format(d=delimiter), prefix, 1)
         previous_level = prefix_split[0]
-        plist = self.list_prefixes(bucket_name, previous_level, delimiter)
-        return False if plist is None else prefix in plist
+        return any(p == prefix for p in
+                   self.iter_prefixes(bucket_name, previous_level, delimiter))
+
+    def _paginate(self, bucket_name, prefix, delimiter, page_size, max_items):
+        config = {
+            'PageSize': page_size,
+            'MaxItems': max_items,
+        }
+
+        paginator = self.get_conn().get_paginator('list_objects_v2')
+        return paginator.paginate(Bucket=bucket_name,
+                                  Prefix=prefix,
+                                  Delimiter=delimiter,
+                                  PaginationConfig=config)
+
+    def iter_prefixes(self, bucket_name, prefix='', delimiter='',
+                      page_size=None, max_items=None):
+        """
+        Yields the prefixes in a bucket under prefix, fetching the pages of
+        the listing as they are consumed
+
+        :param bucket_name: the name of the bucket
+        :type bucket_name: str
+        :param prefix: a key prefix
+        :type prefix: str
+        :param delimiter: the delimiter marks key hierarchy.
+        :type delimiter: str
+        :param page_size: pagination size
+        :type page_size: int
+        :param max_items: maximum items to return
+        :type max_items: int
+        """
+        for page in self._paginate(bucket_name, prefix, delimiter, page_size, max_items):
+            for p in page.get('CommonPrefixes', ()):
+                yield p['Prefix']
+
+    def iter_keys(self, bucket_name, prefix='', delimiter='',
+                  page_size=None, max_items=None):
+        """
+        Yields the keys in a bucket under prefix and not containing
+        delimiter, fetching the pages of the listing as they are consumed
+
+        :param bucket_name: the name of the bucket
+        :type bucket_name: str
+        :param prefix: a key prefix
+        :type prefix: str
+        :param delimiter: the delimiter marks key hierarchy.
+        :type delimiter: str
+        :param page_size: pagination size
+        :type page_size: int
+        :param max_items: maximum items to return
+        :type max_items: int
+        """
+        for page in self._paginate(bucket_name, prefix, delimiter, page_size, max_items):
+            for k in page.get('Contents', ()):
+                yield k['Key']
 
     def list_prefixes(self, bucket_name, prefix='', delimiter='',
                       page_size=None, max_items=None):
@@ -121,27 +197,11 @@ class S3Hook(AwsHook):
         :type page_size: int
         :param max_items: maximum items to return
         :type max_items: int
+        :return: the prefixes, None if there are none
         """
-        config = {
-            'PageSize': page_size,
-            'MaxItems': max_items,
-        }
-
-        paginator = self.get_conn().get_paginator('list_objects_v2')
-        response = paginator.paginate(Bucket=bucket_name,
-                                      Prefix=prefix,
-                                      Delimiter=delimiter,
-                                      PaginationConfig=config)
-
-        has_results = False
-        prefixes = []
-        for page in response:
-            if 'CommonPrefixes' in page:
-                has_results = True
-                for p in page['CommonPrefixes']:
-                    prefixes.append(p['Prefix'])
-
-        if has_results:
+        prefixes = list(self.iter_prefixes(bucket_name, prefix, delimiter,
+                                           page_size, max_items))
+        if prefixes:
             return prefixes
 
     def list_keys(self, bucket_name, prefix='', delimiter='',
@@ -159,27 +219,11 @@ class S3Hook(AwsHook):
         :type page_size: int
         :param max_items: maximum items to return
         :type max_items: int
+        :return: the keys, None if there are none
         """
-        config = {
-            'PageSize': page_size,
-            'MaxItems': max_items,
-        }
-
-        paginator = self.get_conn().get_paginator('list_objects_v2')
-        response = paginator.paginate(Bucket=bucket_name,
-                                      Prefix=prefix,
-                                      Delimiter=delimiter,
-                                      PaginationConfig=config)
-
-        has_results = False
-        keys = []
-        for page in response:
-            if 'Contents' in page:
-                has_results = True
-                for k in page['Contents']:
-                    keys.append(k['Key'])
-
-        if has_results:
+        keys = list(self.iter_keys(bucket_name, prefix, delimiter,
+                                   page_size, max_items))
+        if keys:
             return keys
 
     def check_for_key(self, key, bucket_name=None):
@@ -230,6 +274,24 @@ class S3Hook(AwsHook):
         obj = self.get_key(key, bucket_name)
         return obj.get()['Body'].read().decode('utf-8')
 
+    def download_file_obj(self, key, file_obj, bucket_name=None):
+        """
+        Writes the content of a key to a file object, downloading it in
+        parts, without holding the whole object in memory
+
+        :param key: S3 key that will point to the file
+        :type key: str
+        :param file_obj: the binary file-like object to write to
+        :type file_obj: file-like object
+        :param bucket_name: Name of the bucket in which the file is stored
+        :type bucket_name: str
+        """
+        if not bucket_name:
+            (bucket_name, key) = self.parse_s3_url(key)
+
+        self.get_conn().download_fileobj(bucket_name, key, file_obj,
+                                         Config=self.transfer_config)
+
     def select_key(self, key, bucket_name=None,
                    expression='SELECT * FROM S3Object',
                    expression_type='SQL',
@@ -307,11 +369,9 @@ class S3Hook(AwsHook):
             (bucket_name, wildcard_key) = self.parse_s3_url(wildcard_key)
 
         prefix = re.split(r'[*]', wildcard_key, 1)[0]
-        klist = self.list_keys(bucket_name, prefix=prefix, delimiter=delimiter)
-        if klist:
-            key_matches = [k for k in klist if fnmatch.fnmatch(k, wildcard_key)]
-            if key_matches:
-                return self.get_key(key_matches[0], bucket_name)
+        for k in self.iter_keys(bucket_name, prefix=prefix, delimiter=delimiter):
+            if fnmatch.fnmatch(k, wildcard_key):
+                return self.get_key(k, bucket_name)
 
     def load_file(self,
                   filename,
@@ -347,7 +407,68 @@ class S3Hook(AwsHook):
             extra_args['ServerSideEncryption'] = "AES256"
 
         client = self.get_conn()
-        client.upload_file(filename, bucket_name, key, ExtraArgs=extra_args)
+        client.upload_file(filename, bucket_name, key, ExtraArgs=extra_args,
+                           Config=self.transfer_config)
+
+    def load_files(self,
+                   filename_keys,
+                   bucket_name=None,
+                   replace=False,
+                   encrypt=False):
+        """
+        Loads local files to S3, ``max_workers`` of them at the same time
+
+        :param filename_keys: the ``(filename, key)`` pairs of the files to
+            load and of the S3 keys that will point to them
+        :type filename_keys: list[tuple[str, str]]
+        :param bucket_name: Name of the bucket in which to store the files
+        :type bucket_name: str
+        :param replace: A flag to decide whether or not to overwrite the keys
+            if they already exist. If replace is False and a key exists, an
+            error will be raised.
+        :type replace: bool
+        :param encrypt: If True, the files will be encrypted on the server-side
+            by S3 and will be stored in an encrypted form while at rest in S3.
+        :type encrypt: bool
+        """
+        client = self.get_conn()
+        extra_args = {}
+        if encrypt:
+            extra_args['ServerSideEncryption'] = "AES256"
+
+        def load(filename_key):
+            filename, key = filename_key
+            dest_bucket_name = bucket_name
+            if not dest_bucket_name:
+                (dest_bucket_name, key) = self.parse_s3_url(key)
+            if not replace and self._key_exists(client, dest_bucket_name, key):
+                raise ValueError("The key {key} already exists.".format(key=key))
+            client.upload_file(filename, dest_bucket_name, key, ExtraArgs=extra_args,
+                               Config=self.transfer_config)
+
+        self._map_concurrently(load, filename_keys)
+
+    def _map_concurrently(self, func, items):
+        """Calls func on every item, on a pool of max_workers threads"""
+        items = list(items)
+        if self.max_workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        pool = ThreadPool(min(self.max_workers, len(items)))
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.close()
+            pool.join()
+
+    @staticmethod
+    def _key_exists(client, bucket_name, key):
+        try:
+            client.head_object(Bucket=bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
 
     def load_string(self,
                     string_data,
@@ -448,7 +569,8 @@ class S3Hook(AwsHook):
             extra_args['ServerSideEncryption'] = "AES256"
 
         client = self.get_conn()
-        client.upload_fileobj(file_obj, bucket_name, key, ExtraArgs=extra_args)
+        client.upload_fileobj(file_obj, bucket_name, key, ExtraArgs=extra_args,
+                              Config=self.transfer_config)
 
     def copy_object(self,
                     source_bucket_key,
@@ -511,10 +633,55 @@ class S3Hook(AwsHook):
                                                CopySource=CopySource)
         return response
 
+    def copy_objects(self,
+                     source_dest_keys,
+                     source_bucket_name=None,
+                     dest_bucket_name=None,
+                     replace=True):
+        """
+        Creates copies of objects that are already stored in S3,
+        ``max_workers`` of them at the same time. Objects larger than the
+        ``multipart_threshold`` of the transfer config are copied in parts.
+
+        :param source_dest_keys: the ``(source_bucket_key, dest_bucket_key)``
+            pairs of the objects to copy, following the conventions of
+            ``copy_object``
+        :type source_dest_keys: list[tuple[str, str]]
+        :param source_bucket_name: Name of the S3 bucket where the source
+            objects are in
+        :type source_bucket_name: str
+        :param dest_bucket_name: Name of the S3 bucket to where the objects
+            are copied
+        :type dest_bucket_name: str
+        :param replace: A flag to decide whether or not to overwrite the
+            destination keys if they already exist. If replace is False and a
+            key exists, an error will be raised.
+        :type replace: bool
+        """
+        client = self.get_conn()
+
+        def copy(source_dest_key):
+            source_key, dest_key = source_dest_key
+            source_bucket = source_bucket_name
+            if source_bucket is None:
+                source_bucket, source_key = self.parse_s3_url(source_key)
+            dest_bucket = dest_bucket_name
+            if dest_bucket is None:
+                dest_bucket, dest_key = self.parse_s3_url(dest_key)
+            if not replace and self._key_exists(client, dest_bucket, dest_key):
+                raise ValueError("The key {key} already exists.".format(key=dest_key))
+            client.copy({'Bucket': source_bucket, 'Key': source_key},
+                        dest_bucket, dest_key, Config=self.transfer_config)
+
+        self._map_concurrently(copy, source_dest_keys)
+
     def delete_objects(self,
                        bucket,
                        keys):
         """
+        Deletes objects, in requests of at most 1000 keys sent
+        ``max_workers`` at the same time
+
         :param bucket: Name of the bucket in which you are going to delete object(s)
         :type bucket: str
         :param keys: The key(s) to delete from S3 bucket.
@@ -525,13 +692,29 @@ class S3Hook(AwsHook):
             When ``keys`` is a list, it's supposed to be the list of the
             keys to delete.
         :type keys: str or list
+        :return: the response of the requests, with the ``Deleted`` and
+            ``Errors`` of all of them
+        :rtype: dict
         """
         if isinstance(keys, list):
             keys = keys
         else:
             keys = [keys]
 
-        delete_dict = {"Objects": [{"Key": k} for k in keys]}
-        response = self.get_conn().delete_objects(Bucket=bucket,
-                                                  Delete=delete_dict)
-        return response
+        client = self.get_conn()
+
+        def delete(chunk):
+            delete_dict = {"Objects": [{"Key": k} for k in chunk]}
+            return client.delete_objects(Bucket=bucket, Delete=delete_dict)
+
+        chunks = [keys[i:i + MAX_KEYS_PER_DELETE]
+                  for i in range(0, len(keys), MAX_KEYS_PER_DELETE)] or [[]]
+        responses = self._map_concurrently(delete, chunks)
+        if len(responses) == 1:
+            return responses[0]
+        merged = {}
+        for response in responses:
+            for field in 'Deleted', 'Errors':
+                if field in response:
+                    merged.setdefault(field, []).extend(response[field])
+        return merged
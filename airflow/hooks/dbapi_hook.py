@@ -120,6 +120,48 @@ class DbApiHook(BaseHook):
                     cur.execute(sql)
                 return cur.fetchall()
 
+    def get_server_side_cursor(self, conn):
+        """
+        Returns a cursor that keeps the result set on the server and fetches
+        it as it is iterated, for the drivers that support it. Defaults to a
+        regular cursor, override for drivers buffering the whole result set
+        on the client otherwise.
+
+        :param conn: the connection to create the cursor on
+        :type conn: connection object
+        """
+        return conn.cursor()
+
+    def iter_records(self, sql, parameters=None, batch_size=1000):
+        """
+        Executes the sql and yields the resulting records, fetching them
+        ``batch_size`` at a time with a server side cursor where the driver
+        supports it, so the result set is never held in memory at once.
+
+        :param sql: the sql statement to be executed
+        :type sql: str
+        :param parameters: The parameters to render the SQL query with.
+        :type parameters: mapping or iterable
+        :param batch_size: number of records fetched per round trip
+        :type batch_size: int
+        """
+        if sys.version_info[0] < 3:
+            sql = sql.encode('utf-8')
+
+        with closing(self.get_conn()) as conn:
+            with closing(self.get_server_side_cursor(conn)) as cur:
+                cur.arraysize = batch_size
+                if parameters is not None:
+                    cur.execute(sql, parameters)
+                else:
+                    cur.execute(sql)
+                while True:
+                    records = cur.fetchmany(batch_size)
+                    if not records:
+                        break
+                    for record in records:
+                        yield record
+
     def get_first(self, sql, parameters=None):
         """
         Executes the sql and returns the first resulting row.
@@ -211,8 +253,15 @@ class DbApiHook(BaseHook):
         """
         return self.get_conn().cursor()
 
+    def _insert_many(self, cur, sql, values):
+        """
+        Executes the parametrized ``sql`` for every one of ``values`` in as
+        few round trips as the driver allows.
+        """
+        cur.executemany(sql, values)
+
     def insert_rows(self, table, rows, target_fields=None, commit_every=1000,
-                    replace=False):
+                    replace=False, executemany=False):
         """
         A generic way to insert a set of tuples into a table,
         a new transaction is created every commit_every rows
@@ -228,12 +277,33 @@ class DbApiHook(BaseHook):
         :type commit_every: int
         :param replace: Whether to replace instead of insert
         :type replace: bool
+        :param executemany: Insert the rows of every commit_every batch with
+            a single ``executemany`` call instead of one ``execute`` per row.
+            The rows are consumed one batch at a time, so passing an iterator
+            such as the one of :meth:`iter_records` keeps memory bounded.
+            commit_every must be greater than 0.
+        :type executemany: bool
         """
         if target_fields:
             target_fields = ", ".join(target_fields)
             target_fields = "({})".format(target_fields)
         else:
             target_fields = ''
+        if executemany and not commit_every:
+            raise AirflowException("commit_every must be greater than 0 with executemany")
+
+        def sql_for(values):
+            placeholders = ["%s", ] * len(values)
+            if not replace:
+                sql = "INSERT INTO "
+            else:
+                sql = "REPLACE INTO "
+            sql += "{0} {1} VALUES ({2})".format(
+                table,
+                target_fields,
+                ",".join(placeholders))
+            return sql
+
         i = 0
         with closing(self.get_conn()) as conn:
             if self.supports_autocommit:
@@ -242,26 +312,27 @@ class DbApiHook(BaseHook):
             conn.commit()
 
             with closing(conn.cursor()) as cur:
+                batch = []
                 for i, row in enumerate(rows, 1):
                     lst = []
                     for cell in row:
                         lst.append(self._serialize_cell(cell, conn))
                     values = tuple(lst)
-                    placeholders = ["%s", ] * len(values)
-                    if not replace:
-                        sql = "INSERT INTO "
+                    if executemany:
+                        batch.append(values)
+                        if len(batch) < commit_every:
+                            continue
+                        self._insert_many(cur, sql_for(values), batch)
+                        batch = []
                     else:
-                        sql = "REPLACE INTO "
-                    sql += "{0} {1} VALUES ({2})".format(
-                        table,
-                        target_fields,
-                        ",".join(placeholders))
-                    cur.execute(sql, values)
+                        cur.execute(sql_for(values), values)
                     if commit_every and i % commit_every == 0:
                         conn.commit()
                         self.log.info(
                             "Loaded %s into %s rows so far", i, table
                         )
+                if batch:
+                    self._insert_many(cur, sql_for(batch[0]), batch)
 
             conn.commit()
         self.log.info("Done loading. Loaded a total of %s rows", i)
@@ -23,6 +23,7 @@ import contextlib
 import os
 import re
 import subprocess
+import threading
 import time
 import socket
 from collections import OrderedDict
@@ -33,6 +34,7 @@ import unicodecsv as csv
 from past.builtins import basestring
 from past.builtins import unicode
 from six.moves import zip
+from six.moves.urllib.parse import unquote
 
 import airflow.security.utils as utils
 from airflow.configuration import conf
@@ -40,6 +42,7 @@ from airflow.exceptions import AirflowException
 from airflow.hooks.base_hook import BaseHook
 from airflow.utils.file import TemporaryDirectory
 from airflow.utils.helpers import as_flattened_list
+from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.operator_helpers import AIRFLOW_VAR_NAME_FORMAT_MAPPING
 
 HIVE_QUEUE_PRIORITIES = ['VERY_HIGH', 'HIGH', 'NORMAL', 'LOW', 'VERY_LOW']
@@ -483,26 +486,152 @@ class HiveCliHook(BaseHook):
                 self.sp.kill()
 
 
+class MetastoreClientPool(LoggingMixin):
+    """
+    Keeps open Hive thrift clients of a metastore to reuse them, rather than
+    opening a new connection, and SASL session, for every call.
+
+    :param client_factory: returns a new, not yet opened, client
+    :type client_factory: callable
+    :param max_idle: the most open clients kept while they are not used
+    :type max_idle: int
+    :param health_check_interval: the seconds a client can stay unused
+        before it is checked with a cheap call when it's taken again
+    :type health_check_interval: int
+    """
+
+    def __init__(self, client_factory, max_idle=5, health_check_interval=60):
+        self.client_factory = client_factory
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _take_idle(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return None, None
+
+    @staticmethod
+    def _close(client):
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, client, released_at):
+        if time.time() - released_at < self.health_check_interval:
+            return True
+        try:
+            client.get_database('default')
+            return True
+        except Exception as e:
+            self.log.info("Dropping a broken metastore client: %s", e)
+            self._close(client)
+            return False
+
+    def acquire(self):
+        """Returns an open client, reused if possible"""
+        client, released_at = self._take_idle()
+        while client is not None:
+            if self._is_healthy(client, released_at):
+                return client
+            client, released_at = self._take_idle()
+        client = self.client_factory()
+        client.open()
+        return client
+
+    def release(self, client, broken=False):
+        """Gives the client back, to be reused unless it's broken"""
+        if not broken:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append((client, time.time()))
+                    return
+        self._close(client)
+
+    @contextlib.contextmanager
+    def client(self):
+        """
+        Context manager lending a client. A client that raised an error is
+        closed rather than reused, the error may have broken its connection.
+        """
+        client = self.acquire()
+        try:
+            yield client
+        except Exception:
+            self.release(client, broken=True)
+            raise
+        else:
+            self.release(client)
+
+    def clear(self):
+        """Closes the idle clients"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for client, _ in idle:
+            self._close(client)
+
+
+# The client pools of the metastores, by process id and connection id, so that
+# forked processes such as the task runners never share the parent's sockets
+_metastore_client_pools = {}
+_metastore_client_pools_lock = threading.Lock()
+
+
 class HiveMetastoreHook(BaseHook):
-    """ Wrapper to interact with the Hive Metastore"""
+    """
+    Wrapper to interact with the Hive Metastore. The clients of a metastore
+    are shared, through a ``MetastoreClientPool``, by the hooks of its
+    connection in the process.
+    """
 
     # java short max val
     MAX_PART_COUNT = 32767
 
     def __init__(self, metastore_conn_id='metastore_default'):
         self.conn_id = metastore_conn_id
-        self.metastore = self.get_metastore_client()
+        self._metastore = None
+
+    @property
+    def metastore(self):
+        """A Hive thrift client of its own, opened with ``with``"""
+        if self._metastore is None:
+            self._metastore = self.get_metastore_client()
+        return self._metastore
 
     def __getstate__(self):
         # This is for pickling to work despite the thirft hive client not
         # being pickable
         d = dict(self.__dict__)
-        del d['metastore']
+        d['_metastore'] = None
         return d
 
     def __setstate__(self, d):
         self.__dict__.update(d)
-        self.__dict__['metastore'] = self.get_metastore_client()
+
+    def get_client_pool(self):
+        """Returns the client pool of the metastore of the hook"""
+        key = (os.getpid(), self.conn_id)
+        with _metastore_client_pools_lock:
+            pool = _metastore_client_pools.get(key)
+            if pool is None:
+                # Forget the pools inherited from the parent process, without
+                # closing the clients which are still used by the parent
+                for other_key in list(_metastore_client_pools):
+                    if other_key[0] != key[0]:
+                        del _metastore_client_pools[other_key]
+                pool = MetastoreClientPool(
+                    self.get_metastore_client,
+                    max_idle=conf.getint('hive', 'metastore_client_pool_size', fallback=5),
+                    health_check_interval=conf.getint(
+                        'hive', 'metastore_client_health_check_interval', fallback=60))
+                _metastore_client_pools[key] = pool
+            return pool
+
+    def _client(self):
+        return self.get_client_pool().client()
 
     def get_metastore_client(self):
         """
@@ -580,7 +709,7 @@ class HiveMetastoreHook(BaseHook):
         >>> hh.check_for_partition('airflow', t, "ds='2015-01-01'")
         True
         """
-        with self.metastore as client:
+        with self._client() as client:
             partitions = client.get_partitions_by_filter(
                 schema, table, partition, 1)
 
@@ -608,9 +737,44 @@ class HiveMetastoreHook(BaseHook):
         >>> hh.check_for_named_partition('airflow', t, "ds=xxx")
         False
         """
-        with self.metastore as client:
+        with self._client() as client:
             return client.check_for_named_partition(schema, table, partition_name)
 
+    def check_for_named_partitions(self, schema, table, partition_names):
+        """
+        Checks which of the partitions with the given names exist, fetching
+        up to ``MAX_PART_COUNT`` of them per call to the metastore
+
+        :param schema: Name of hive schema (database) @table belongs to
+        :type schema: str
+        :param table: Name of hive table @partition belongs to
+        :type table: str
+        :param partition_names: Names of the partitions to check for (eg `a=b/c=d`)
+        :type partition_names: list[str]
+        :return: the names of the partitions that exist, those of a missing
+            table don't
+        :rtype: set[str]
+        """
+        from hmsclient.genthrift.hive_metastore.ttypes import NoSuchObjectException
+
+        partition_names = list(partition_names)
+        by_values = {}
+        for name in partition_names:
+            values = tuple(unquote(part.split('=', 1)[-1]) for part in name.split('/'))
+            by_values.setdefault(values, []).append(name)
+
+        existing = set()
+        with self._client() as client:
+            try:
+                for i in range(0, len(partition_names), HiveMetastoreHook.MAX_PART_COUNT):
+                    partitions = client.get_partitions_by_names(
+                        schema, table, partition_names[i:i + HiveMetastoreHook.MAX_PART_COUNT])
+                    for partition in partitions:
+                        existing.update(by_values.get(tuple(partition.values), ()))
+            except NoSuchObjectException:
+                return set()
+        return existing
+
     def get_table(self, table_name, db='default'):
         """Get a metastore table object
 
@@ -623,14 +787,14 @@ class HiveMetastoreHook(BaseHook):
         """
         if db == 'default' and '.' in table_name:
             db, table_name = table_name.split('.')[:2]
-        with self.metastore as client:
+        with self._client() as client:
             return client.get_table(dbname=db, tbl_name=table_name)
 
     def get_tables(self, db, pattern='*'):
         """
         Get a metastore table object
         """
-        with self.metastore as client:
+        with self._client() as client:
             tables = client.get_tables(db_name=db, pattern=pattern)
             return client.get_table_objects_by_name(db, tables)
 
@@ -638,7 +802,7 @@ class HiveMetastoreHook(BaseHook):
         """
         Get a metastore table object
         """
-        with self.metastore as client:
+        with self._client() as client:
             return client.get_databases(pattern)
 
     def get_partitions(
@@ -656,7 +820,7 @@ class HiveMetastoreHook(BaseHook):
         >>> parts
         [{'ds': '2015-01-01'}]
         """
-        with self.metastore as client:
+        with self._client() as client:
             table = client.get_table(dbname=schema, tbl_name=table_name)
             if len(table.partitionKeys) == 0:
                 raise AirflowException("The table isn't partitioned")
@@ -738,7 +902,7 @@ class HiveMetastoreHook(BaseHook):
         ... table_name=t, field='ds', filter_map=filter_map)
         '2015-01-01'
         """
-        with self.metastore as client:
+        with self._client() as client:
             table = client.get_table(dbname=schema, tbl_name=table_name)
             key_name_set = set(key.name for key in table.partitionKeys)
             if len(table.partitionKeys) == 1:
@@ -978,6 +1142,33 @@ class HiveServer2Hook(BaseHook):
         """
         return self.get_results(hql, schema=schema)['data']
 
+    def iter_records(self, hql, schema='default', fetch_size=None, hive_conf=None,
+                     batch_size=None):
+        """
+        Yields the records of a Hive query as they are fetched, ``fetch_size``
+        at a time, instead of holding all of them in memory.
+
+        :param hql: hql to be executed.
+        :type hql: str or list
+        :param schema: target schema, default to 'default'.
+        :type schema: str
+        :param fetch_size: number of records fetched per round trip.
+        :type fetch_size: int
+        :param hive_conf: hive_conf to execute alone with the hql.
+        :type hive_conf: dict
+        :param batch_size: alias of ``fetch_size``, as taken by
+            ``DbApiHook.iter_records``, e.g. when called by ``GenericTransfer``
+        :type batch_size: int
+        """
+        if fetch_size is None:
+            fetch_size = batch_size
+        results_iter = self._get_results(hql, schema,
+                                         fetch_size=fetch_size, hive_conf=hive_conf)
+        # the first item is the description of the results
+        next(results_iter, None)
+        for record in results_iter:
+            yield record
+
     def get_pandas_df(self, hql, schema='default'):
         """
         Get a pandas dataframe from a Hive query
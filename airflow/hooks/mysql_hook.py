@@ -116,6 +116,13 @@ class MySqlHook(DbApiHook):
         conn = MySQLdb.connect(**conn_config)
         return conn
 
+    def get_server_side_cursor(self, conn):
+        """
+        Returns a ``MySQLdb.cursors.SSCursor``, which streams the rows from the
+        server instead of storing the whole result set on the client.
+        """
+        return conn.cursor(MySQLdb.cursors.SSCursor)
+
     def get_uri(self):
         conn = self.get_connection(getattr(self, self.conn_name_attr))
         uri = super(MySqlHook, self).get_uri()
@@ -23,6 +23,7 @@ from airflow.hooks.dbapi_hook import DbApiHook
 from builtins import str
 from past.builtins import basestring
 from datetime import datetime
+import itertools
 import numpy
 
 
@@ -114,7 +115,8 @@ class OracleHook(DbApiHook):
 
         return conn
 
-    def insert_rows(self, table, rows, target_fields=None, commit_every=1000):
+    def insert_rows(self, table, rows, target_fields=None, commit_every=1000,
+                    executemany=False):
         """
         A generic way to insert a set of tuples into a table,
         the whole set of inserts is treated as one transaction
@@ -136,7 +138,12 @@ class OracleHook(DbApiHook):
             Default 1000, Set greater than 0.
             Set 1 to insert each row in each single transaction
         :type commit_every: int
+        :param executemany: insert the rows with prepared statements through
+            :meth:`bulk_insert_rows` instead
+        :type executemany: bool
         """
+        if executemany:
+            return self.bulk_insert_rows(table, rows, target_fields, commit_every)
         if target_fields:
             target_fields = ', '.join(target_fields)
             target_fields = '({})'.format(target_fields)
@@ -201,9 +208,18 @@ class OracleHook(DbApiHook):
         """
         if not rows:
             raise ValueError("parameter rows could not be None or empty iterable")
+        if target_fields:
+            values_base = target_fields
+        else:
+            # peek at the first row, rows may be an iterator
+            rows = iter(rows)
+            first_row = next(rows, None)
+            if first_row is None:
+                raise ValueError("parameter rows could not be None or empty iterable")
+            values_base = first_row
+            rows = itertools.chain([first_row], rows)
         conn = self.get_conn()
         cursor = conn.cursor()
-        values_base = target_fields if target_fields else rows[0]
         prepared_stm = 'insert into {tablename} {columns} values ({values})'.format(
             tablename=table,
             columns='({})'.format(', '.join(target_fields)) if target_fields else '',
@@ -18,6 +18,7 @@
 # under the License.
 
 import os
+import uuid
 import psycopg2
 import psycopg2.extensions
 import psycopg2.extras
@@ -93,6 +94,20 @@ class PostgresHook(DbApiHook):
         self.conn = psycopg2.connect(**conn_args)
         return self.conn
 
+    def get_server_side_cursor(self, conn):
+        """
+        Returns a named cursor, whose result set is kept on the server and
+        fetched as it is iterated.
+        """
+        return conn.cursor(name='airflow_{}'.format(uuid.uuid4().hex))
+
+    def _insert_many(self, cur, sql, values):
+        """
+        psycopg2's ``executemany`` runs one statement per row, send all of
+        them in a single round trip instead.
+        """
+        psycopg2.extras.execute_batch(cur, sql, values, page_size=len(values))
+
     def copy_expert(self, sql, filename, open=open):
         """
         Executes SQL using psycopg2 copy_expert method.
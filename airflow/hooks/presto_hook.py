@@ -87,6 +87,17 @@ class PrestoHook(DbApiHook):
         except DatabaseError as e:
             raise PrestoException(self._get_pretty_exception_message(e))
 
+    def iter_records(self, hql, parameters=None, batch_size=1000):
+        """
+        Yields the records of a Presto query as they are fetched
+        """
+        try:
+            for record in super(PrestoHook, self).iter_records(
+                    self._strip_sql(hql), parameters, batch_size):
+                yield record
+        except DatabaseError as e:
+            raise PrestoException(self._get_pretty_exception_message(e))
+
     def get_first(self, hql, parameters=None):
         """
         Returns only the first row, regardless of how many rows the query
@@ -126,7 +137,7 @@ class PrestoHook(DbApiHook):
     # TODO Enable commit_every once PyHive supports transaction.
     # Unfortunately, PyHive 0.5.1 doesn't support transaction for now,
     # whereas Presto 0.132+ does.
-    def insert_rows(self, table, rows, target_fields=None):
+    def insert_rows(self, table, rows, target_fields=None, **kwargs):
         """
         A generic way to insert a set of tuples into a table.
 
@@ -137,4 +148,7 @@ class PrestoHook(DbApiHook):
         :param target_fields: The names of the columns to fill in the table
         :type target_fields: iterable of strings
         """
-        super(PrestoHook, self).insert_rows(table, rows, target_fields, 0)
+        # without transactions, rows can't be batched either
+        kwargs.pop('commit_every', None)
+        kwargs.pop('executemany', None)
+        super(PrestoHook, self).insert_rows(table, rows, target_fields, 0, **kwargs)
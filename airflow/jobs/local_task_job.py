@@ -30,6 +30,7 @@ from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.settings import Stats
 from airflow.task.task_runner import get_task_runner
+from airflow.task.task_runner.standard_task_runner import StandardTaskRunner
 from airflow.utils import timezone
 from airflow.utils.db import provide_session
 from airflow.utils.net import get_hostname
@@ -122,10 +123,20 @@ class LocalTaskJob(BaseJob):
                     self.log.debug("Time since last heartbeat(%.2f s) < heartrate(%s s)"
                                    ", sleeping for %s s", time_since_last_heartbeat,
                                    self.heartrate, sleep_for)
-                    time.sleep(sleep_for)
+                    self._wait_for_task(sleep_for)
         finally:
             self.on_kill()
 
+    def _wait_for_task(self, timeout):
+        """
+        Sleeps for ``timeout`` seconds, or until the task process exits when
+        the task runner can wait on it, so that its exit is noticed right away.
+        """
+        if isinstance(self.task_runner, StandardTaskRunner):
+            self.task_runner.return_code(timeout=timeout)
+        else:
+            time.sleep(timeout)
+
     def on_kill(self):
         self.task_runner.terminate()
         self.task_runner.on_finish()
@@ -28,6 +28,7 @@ import os
 import signal
 import sys
 import threading
+import itertools
 import time
 from collections import defaultdict
 from datetime import timedelta
@@ -43,7 +44,8 @@ from airflow.configuration import conf
 from airflow import executors, models, settings
 from airflow.exceptions import AirflowException
 from airflow.jobs.base_job import BaseJob
-from airflow.models import DagRun, SlaMiss, errors
+from airflow.models import DagRun, DagStats, SlaMiss, errors
+from airflow.operators.subdag_operator import get_flattening_root
 from airflow.settings import Stats
 from airflow.ti_deps.dep_context import DepContext, SCHEDULEABLE_STATES, SCHEDULED_DEPS
 from airflow.ti_deps.deps.pool_slots_available_dep import STATES_TO_COUNT_AS_RUNNING
@@ -51,10 +53,11 @@ from airflow.utils import asciiart, helpers, timezone
 from airflow.utils.dag_processing import (AbstractDagFileProcessor,
                                           DagFileProcessorAgent,
                                           SimpleDag,
-                                          SimpleDagBag,
                                           SimpleTaskInstance,
                                           list_py_file_paths)
 from airflow.utils.db import provide_session
+from airflow.utils.sharding import SCHEDULER_JOB_TYPE, get_live_scheduler_ids
+from airflow.utils.scheduler_wakeup import SchedulerWakeup
 from airflow.utils.email import get_email_address_list, send_email
 from airflow.utils.log.logging_mixin import LoggingMixin, StreamLogWriter, set_context
 from airflow.utils.state import State
@@ -280,6 +283,14 @@ class DagFileProcessor(AbstractDagFileProcessor, LoggingMixin):
 
         return False
 
+    def fileno(self):
+        """
+        The file descriptor of the channel the result comes through, readable
+        once the processor is done, so that the processors can be waited on
+        with ``select``.
+        """
+        return self._parent_channel.fileno()
+
     @property
     def result(self):
         """
@@ -388,6 +399,22 @@ class SchedulerJob(BaseJob):
             self.using_sqlite = True
 
         self.max_tis_per_query = conf.getint('scheduler', 'max_tis_per_query')
+        self.dag_stats_reconcile_interval = conf.getint(
+            'scheduler', 'dag_stats_reconcile_interval', fallback=300)
+        self.next_dagrun_recheck_interval = conf.getint(
+            'scheduler', 'next_dagrun_recheck_interval', fallback=300)
+        self.shard_dag_files = conf.getboolean('scheduler', 'shard_dag_files', fallback=False)
+        self.shard_refresh_interval = conf.getint(
+            'scheduler', 'shard_refresh_interval', fallback=10)
+        self.use_skip_locked = conf.getboolean('scheduler', 'use_skip_locked', fallback=False)
+        # The running schedulers, when the DAG files are split among them
+        self.live_scheduler_ids = []
+        self.sla_check_interval = conf.getint(
+            'scheduler', 'sla_check_interval', fallback=60)
+        self.db_cleanup_interval = conf.getint(
+            'db_cleanup', 'scheduler_interval', fallback=0)
+        self.event_driven_wakeups = conf.getboolean(
+            'scheduler', 'event_driven_wakeups', fallback=False)
         if run_duration is None:
             self.run_duration = conf.getint('scheduler',
                                             'run_duration')
@@ -428,71 +455,44 @@ class SchedulerJob(BaseJob):
         )
 
     @provide_session
-    def manage_slas(self, dag, session=None):
+    def manage_slas(self, dags, session=None):
         """
-        Finding all tasks that have SLAs defined, and sending alert emails
-        where needed. New SLA misses are also recorded in the database.
+        Sends the alert emails and calls the callbacks of the SLA misses of
+        ``dags`` that weren't notified yet. The misses themselves are recorded
+        by the scheduler from the SLA deadlines of the task instances, see
+        ``_record_sla_misses``, so this is a single query when there are none.
 
-        We are assuming that the scheduler runs often, so we only check for
-        tasks that should have succeeded in the past hour.
+        :param dags: the DAGs to notify the SLA misses of
+        :type dags: list[airflow.models.DAG]
         """
-        if not any([isinstance(ti.sla, timedelta) for ti in dag.tasks]):
-            self.log.info("Skipping SLA check for %s because no tasks in DAG have SLAs", dag)
+        dags = {dag.dag_id: dag for dag in dags
+                if any(isinstance(task.sla, timedelta) for task in dag.tasks)}
+        if not dags:
             return
 
-        # This is a temporary fix for 1.10.4 release.
-        # Background: AIRFLOW-4297
-        # TODO: refactor manage_slas() to handle related issues.
-        if dag._schedule_interval is None:
-            self.log.info("SLA check for DAGs with schedule_interval 'None'/'@once' are "
-                          "skipped in 1.10.4, due to related refactoring going on.")
-            return
-
-        TI = models.TaskInstance
-        sq = (
-            session
-            .query(
-                TI.task_id,
-                func.max(TI.execution_date).label('max_ti'))
-            .with_hint(TI, 'USE INDEX (PRIMARY)', dialect_name='mysql')
-            .filter(TI.dag_id == dag.dag_id)
-            .filter(or_(
-                TI.state == State.SUCCESS,
-                TI.state == State.SKIPPED))
-            .filter(TI.task_id.in_(dag.task_ids))
-            .group_by(TI.task_id).subquery('sq')
-        )
-
-        max_tis = session.query(TI).filter(
-            TI.dag_id == dag.dag_id,
-            TI.task_id == sq.c.task_id,
-            TI.execution_date == sq.c.max_ti,
-        ).all()
-
-        ts = timezone.utcnow()
-        for ti in max_tis:
-            task = dag.get_task(ti.task_id)
-            dttm = ti.execution_date
-            if isinstance(task.sla, timedelta):
-                dttm = dag.following_schedule(dttm)
-                while dttm < timezone.utcnow():
-                    following_schedule = dag.following_schedule(dttm)
-                    if following_schedule + task.sla < timezone.utcnow():
-                        session.merge(SlaMiss(
-                            task_id=ti.task_id,
-                            dag_id=ti.dag_id,
-                            execution_date=dttm,
-                            timestamp=ts))
-                    dttm = dag.following_schedule(dttm)
-        session.commit()
-
-        slas = (
+        pending = (
             session
             .query(SlaMiss)
-            .filter(SlaMiss.notification_sent == False, SlaMiss.dag_id == dag.dag_id)  # noqa pylint: disable=singleton-comparison
+            .filter(SlaMiss.notification_sent == False,  # noqa pylint: disable=singleton-comparison
+                    SlaMiss.dag_id.in_(dags.keys()))
+            .order_by(SlaMiss.dag_id)
             .all()
         )
+        for dag_id, slas in itertools.groupby(pending, key=lambda sla: sla.dag_id):
+            self._notify_sla_misses(dags[dag_id], list(slas), session=session)
 
+    def _notify_sla_misses(self, dag, slas, session):
+        """
+        Sends one alert email and calls the callback of ``dag`` for all the
+        given SLA misses of the DAG.
+        """
+        TI = models.TaskInstance
+        # Misses of tasks removed from the DAG since can't be notified anymore
+        for sla in slas:
+            if not dag.has_task(sla.task_id):
+                sla.notification_sent = True
+        slas = [sla for sla in slas if dag.has_task(sla.task_id)]
+        session.commit()
         if slas:
             sla_dates = [sla.execution_date for sla in slas]
             qry = (
@@ -691,8 +691,8 @@ class SchedulerJob(BaseJob):
                     dag.start_date, next_run_date
                 )
 
-            # don't ever schedule in the future or if next_run_date is None
-            if not next_run_date or next_run_date > timezone.utcnow():
+            # don't ever schedule if next_run_date is None
+            if not next_run_date:
                 return
 
             # this structure is necessary to avoid a TypeError from concatenating
@@ -702,6 +702,12 @@ class SchedulerJob(BaseJob):
             elif next_run_date:
                 period_end = dag.following_schedule(next_run_date)
 
+            # don't ever schedule in the future, remember when the run is due
+            # so that the DAG can be skipped until then
+            if next_run_date > timezone.utcnow():
+                self._set_next_dagrun(dag, next_run_date, period_end, session=session)
+                return
+
             # Don't schedule a dag beyond its end_date (as specified by the dag param)
             if next_run_date and dag.end_date and next_run_date > dag.end_date:
                 return
@@ -723,7 +729,50 @@ class SchedulerJob(BaseJob):
                     state=State.RUNNING,
                     external_trigger=False
                 )
+                if dag.schedule_interval != '@once':
+                    following_run_date = dag.following_schedule(next_run_date)
+                    self._set_next_dagrun(
+                        dag, following_run_date, dag.following_schedule(following_run_date),
+                        session=session)
                 return next_run
+            elif period_end:
+                self._set_next_dagrun(dag, next_run_date, period_end, session=session)
+
+    def _set_next_dagrun(self, dag, next_run_date, create_after, session):
+        """
+        Saves the execution date of the next scheduled run of the DAG and the
+        time from which it can be created, or from which it has to be
+        computed again, whichever comes first.
+        """
+        # The next run also depends on the start date and catchup of the DAG
+        # and on its runs, which can change without the scheduler noticing
+        recheck_after = timezone.utcnow() + timedelta(
+            seconds=self.next_dagrun_recheck_interval)
+        if create_after is None or create_after > recheck_after:
+            create_after = recheck_after
+        (
+            session.query(models.DagModel)
+            .filter(models.DagModel.dag_id == dag.dag_id)
+            .update({models.DagModel.next_dagrun: next_run_date,
+                     models.DagModel.next_dagrun_create_after: create_after},
+                    synchronize_session=False)
+        )
+        session.commit()
+
+    @provide_session
+    def _get_not_due_dag_ids(self, dag_ids, session=None):
+        """
+        Returns the ids of the DAGs whose next scheduled run can't be created
+        yet, with one indexed query instead of computing it for every DAG.
+        """
+        if not dag_ids:
+            return set()
+        DM = models.DagModel
+        return {dag_id for dag_id, in (
+            session.query(DM.dag_id)
+            .filter(DM.dag_id.in_(dag_ids),
+                    DM.next_dagrun_create_after > timezone.utcnow())
+        )}
 
     @provide_session
     def _process_task_instances(self, dag, task_instances_list, session=None):
@@ -822,6 +871,12 @@ class SchedulerJob(BaseJob):
                 ti.set_state(new_state, session=session)
                 tis_changed += 1
         else:
+            transitions = [
+                (dag_id, execution_date, old_state, new_state)
+                for dag_id, execution_date, old_state in query.with_entities(
+                    models.TaskInstance.dag_id, models.TaskInstance.execution_date,
+                    models.TaskInstance.state)
+            ]
             subq = query.subquery()
             tis_changed = session \
                 .query(models.TaskInstance) \
@@ -832,6 +887,7 @@ class SchedulerJob(BaseJob):
                     subq.c.execution_date)) \
                 .update({models.TaskInstance.state: new_state},
                         synchronize_session=False)
+            DagStats.record_task_instance_transitions(transitions, session=session)
             session.commit()
 
         if tis_changed > 0:
@@ -1083,9 +1139,11 @@ class SchedulerJob(BaseJob):
         else:
             ti_query = ti_query.filter(TI.state.in_(acceptable_states))
 
+        # Other schedulers may be queuing some of them, skip those instead of
+        # waiting for their transaction to end
         tis_to_set_to_queued = (
             ti_query
-            .with_for_update()
+            .with_for_update(skip_locked=self.use_skip_locked)
             .all())
 
         if len(tis_to_set_to_queued) == 0:
@@ -1097,6 +1155,7 @@ class SchedulerJob(BaseJob):
         for task_instance in tis_to_set_to_queued:
             task_instance.state = State.QUEUED
             task_instance.queued_dttm = timezone.utcnow()
+            task_instance.queued_by_job_id = self.id
             session.merge(task_instance)
 
         # Generate a list of SimpleTaskInstance for the use of queuing
@@ -1239,7 +1298,7 @@ class SchedulerJob(BaseJob):
 
         1. Create appropriate DagRun(s) in the DB.
         2. Create appropriate TaskInstance(s) in the DB.
-        3. Send emails for tasks that have missed SLAs.
+        3. Send emails for the SLA misses of the DAGs.
 
         :param dagbag: a collection of DAGs to process
         :type dagbag: airflow.models.DagBag
@@ -1249,19 +1308,30 @@ class SchedulerJob(BaseJob):
         :type tis_out: list[TaskInstance]
         :rtype: None
         """
+        not_due_dag_ids = self._get_not_due_dag_ids([dag.dag_id for dag in dags])
+        processed_dags = []
         for dag in dags:
             dag = dagbag.get_dag(dag.dag_id)
             if not dag:
                 self.log.error("DAG ID %s was not found in the DagBag", dag.dag_id)
                 continue
 
-            if dag.is_paused:
+            if (get_flattening_root(dag) or dag).is_paused:
                 self.log.info("Not processing DAG %s since it's paused", dag.dag_id)
                 continue
 
             self.log.info("Processing %s", dag.dag_id)
-
-            dag_run = self.create_dag_run(dag)
+            processed_dags.append(dag)
+
+            # The runs of subdags are created by their SubDagOperator
+            if dag.parent_dag:
+                dag_run = None
+            # Runs of DAGs with a timeout still have to be checked for it
+            elif dag.dag_id in not_due_dag_ids and not dag.dagrun_timeout:
+                self.log.debug("Not creating a DAG run for %s, the next one isn't due", dag.dag_id)
+                dag_run = None
+            else:
+                dag_run = self.create_dag_run(dag)
             if dag_run:
                 expected_start_date = dag.following_schedule(dag_run.execution_date)
                 if expected_start_date:
@@ -1271,16 +1341,20 @@ class SchedulerJob(BaseJob):
                         schedule_delay)
                 self.log.info("Created %s", dag_run)
             self._process_task_instances(dag, tis_out)
-            self.manage_slas(dag)
+
+        self.manage_slas(processed_dags)
 
     @provide_session
     def _process_executor_events(self, simple_dag_bag, session=None):
         """
-        Respond to executor events.
+        Respond to executor events. The task instances of the finished tasks
+        are loaded in batches of ``max_tis_per_query``, and the DAG file of the
+        tasks killed externally is loaded once per file to handle their failure.
         """
         # TODO: this shares quite a lot of code with _manage_executor_state
 
         TI = models.TaskInstance
+        finished = {}
         for key, state in list(self.executor.get_event_buffer(simple_dag_bag.dag_ids)
                                    .items()):
             dag_id, task_id, execution_date, try_number = key
@@ -1290,34 +1364,64 @@ class SchedulerJob(BaseJob):
                 dag_id, task_id, execution_date, state, try_number
             )
             if state == State.FAILED or state == State.SUCCESS:
-                qry = session.query(TI).filter(TI.dag_id == dag_id,
-                                               TI.task_id == task_id,
-                                               TI.execution_date == execution_date)
-                ti = qry.first()
-                if not ti:
-                    self.log.warning("TaskInstance %s went missing from the database", ti)
-                    continue
+                finished[key] = state
+
+        if not finished:
+            return
 
-                # TODO: should we fail RUNNING as well, as we do in Backfills?
-                if ti.try_number == try_number and ti.state == State.QUEUED:
-                    msg = ("Executor reports task instance {} finished ({}) "
-                           "although the task says its {}. Was the task "
-                           "killed externally?".format(ti, state, ti.state))
-                    Stats.incr('scheduler.tasks.killed_externally')
-                    self.log.error(msg)
-                    try:
-                        simple_dag = simple_dag_bag.get_dag(dag_id)
-                        dagbag = models.DagBag(simple_dag.full_filepath)
-                        dag = dagbag.get_dag(dag_id)
-                        ti.task = dag.get_task(task_id)
-                        ti.handle_failure(msg)
-                    except Exception:
-                        self.log.error("Cannot load the dag bag to handle failure for %s"
-                                       ". Setting task to FAILED without callbacks or "
-                                       "retries. Do you have enough resources?", ti)
-                        ti.state = State.FAILED
-                        session.merge(ti)
-                        session.commit()
+        def query(result, items):
+            filter_for_tis = ([and_(TI.dag_id == dag_id,
+                                    TI.task_id == task_id,
+                                    TI.execution_date == execution_date)
+                               for dag_id, task_id, execution_date, _ in items])
+            return result + session.query(TI).filter(or_(*filter_for_tis)).all()
+
+        tis = helpers.reduce_in_chunks(query, list(finished), [], self.max_tis_per_query)
+        tis_by_key = {(ti.dag_id, ti.task_id, ti.execution_date): ti for ti in tis}
+
+        # The task instances killed externally, by DAG file
+        killed_tis = defaultdict(list)
+        for key, state in finished.items():
+            dag_id, task_id, execution_date, try_number = key
+            ti = tis_by_key.get((dag_id, task_id, execution_date))
+            if not ti:
+                self.log.warning("TaskInstance %s.%s execution_date=%s went missing "
+                                 "from the database", dag_id, task_id, execution_date)
+                continue
+
+            # TODO: should we fail RUNNING as well, as we do in Backfills?
+            if ti.try_number == try_number and ti.state == State.QUEUED:
+                msg = ("Executor reports task instance {} finished ({}) "
+                       "although the task says its {}. Was the task "
+                       "killed externally?".format(ti, state, ti.state))
+                Stats.incr('scheduler.tasks.killed_externally')
+                self.log.error(msg)
+                simple_dag = simple_dag_bag.dag_id_to_simple_dag.get(dag_id)
+                fileloc = simple_dag.full_filepath if simple_dag else None
+                killed_tis[fileloc].append((ti, msg))
+
+        failed_without_callbacks = []
+        for fileloc, tis_msgs in killed_tis.items():
+            try:
+                dagbag = models.DagBag(fileloc) if fileloc else None
+            except Exception:
+                dagbag = None
+            for ti, msg in tis_msgs:
+                try:
+                    dag = dagbag.get_dag(ti.dag_id)
+                    ti.task = dag.get_task(ti.task_id)
+                    ti.handle_failure(msg)
+                except Exception:
+                    self.log.error("Cannot load the dag bag to handle failure for %s"
+                                   ". Setting task to FAILED without callbacks or "
+                                   "retries. Do you have enough resources?", ti)
+                    failed_without_callbacks.append(ti)
+
+        if failed_without_callbacks:
+            for ti in failed_without_callbacks:
+                ti.state = State.FAILED
+                session.merge(ti)
+            session.commit()
 
     def _execute(self):
         self.log.info("Starting the scheduler")
@@ -1353,7 +1457,8 @@ class SchedulerJob(BaseJob):
                                                      self.num_runs,
                                                      processor_factory,
                                                      processor_timeout,
-                                                     async_mode)
+                                                     async_mode,
+                                                     scheduler_job_id=self.id)
 
         try:
             self._execute_helper()
@@ -1385,16 +1490,29 @@ class SchedulerJob(BaseJob):
         """
         self.executor.start()
 
-        self.log.info("Resetting orphaned tasks for active dag runs")
-        self.reset_state_for_orphaned_tasks()
+        if self.shard_dag_files and set(get_live_scheduler_ids()) - {self.id}:
+            # The executors of the other schedulers know their tasks, the tasks
+            # of the schedulers that died are reset by the oldest running one
+            self.log.info("Not resetting orphaned tasks since other schedulers are running")
+        else:
+            self.log.info("Resetting orphaned tasks for active dag runs")
+            self.reset_state_for_orphaned_tasks()
 
         # Start after resetting orphaned tasks to avoid stressing out DB.
         self.processor_agent.start()
 
+        wakeup = None
+        if self.event_driven_wakeups:
+            wakeup = SchedulerWakeup()
+            wakeup.start()
+
         execute_start_time = timezone.utcnow()
 
-        # Last time that self.heartbeat() was called.
-        last_self_heartbeat_time = timezone.utcnow()
+        # Last time the DAG statistics were reconciled, None to do it right away
+        last_dag_stats_reconcile_time = None
+        last_db_cleanup_time = timezone.utcnow()
+        last_sla_check_time = None
+        last_shard_refresh_time = None
 
         # For the execute duration, parse and schedule DAGs
         while (timezone.utcnow() - execute_start_time).total_seconds() < \
@@ -1414,19 +1532,46 @@ class SchedulerJob(BaseJob):
             simple_dags = self._get_simple_dags()
             self.log.debug("Harvested {} SimpleDAGs".format(len(simple_dags)))
 
-            # Send tasks for execution if available
-            simple_dag_bag = SimpleDagBag(simple_dags)
+            # Send tasks for execution if available. The bag holds the DAGs
+            # of all the processed files, updated in place by the harvest.
+            simple_dag_bag = self.processor_agent.simple_dag_bag
 
             if not self._validate_and_run_task_instances(simple_dag_bag=simple_dag_bag):
                 continue
 
             # Heartbeat the scheduler periodically
-            time_since_last_heartbeat = (timezone.utcnow() -
-                                         last_self_heartbeat_time).total_seconds()
-            if time_since_last_heartbeat > self.heartrate:
-                self.log.debug("Heartbeating the scheduler")
-                self.heartbeat()
-                last_self_heartbeat_time = timezone.utcnow()
+            self._heartbeat_if_due()
+
+            if self.shard_dag_files and (
+                    last_shard_refresh_time is None or
+                    (timezone.utcnow() - last_shard_refresh_time).total_seconds() >
+                    self.shard_refresh_interval):
+                self._refresh_live_schedulers()
+                last_shard_refresh_time = timezone.utcnow()
+
+            # The maintenance of the whole metadata database is left to one
+            # of the schedulers when there are several
+            is_leader = self._is_leader()
+
+            if is_leader and self.dag_stats_reconcile_interval > 0 and (
+                    last_dag_stats_reconcile_time is None or
+                    (timezone.utcnow() - last_dag_stats_reconcile_time).total_seconds() >
+                    self.dag_stats_reconcile_interval):
+                self._reconcile_dag_stats()
+                last_dag_stats_reconcile_time = timezone.utcnow()
+
+            if is_leader and self.sla_check_interval > 0 and (
+                    last_sla_check_time is None or
+                    (timezone.utcnow() - last_sla_check_time).total_seconds() >
+                    self.sla_check_interval):
+                self._record_sla_misses()
+                last_sla_check_time = timezone.utcnow()
+
+            if is_leader and self.db_cleanup_interval > 0 and (
+                    (timezone.utcnow() - last_db_cleanup_time).total_seconds() >
+                    self.db_cleanup_interval):
+                self._cleanup_db()
+                last_db_cleanup_time = timezone.utcnow()
 
             is_unit_test = conf.getboolean('core', 'unit_test_mode')
             loop_end_time = time.time()
@@ -1435,7 +1580,7 @@ class SchedulerJob(BaseJob):
                 "Ran scheduling loop in %.2f seconds",
                 loop_duration)
 
-            if not is_unit_test:
+            if not is_unit_test and wakeup is None:
                 self.log.debug("Sleeping for %.2f seconds", self._processor_poll_interval)
                 time.sleep(self._processor_poll_interval)
 
@@ -1444,13 +1589,19 @@ class SchedulerJob(BaseJob):
                               " have been processed {} times".format(self.num_runs))
                 break
 
-            if loop_duration < 1 and not is_unit_test:
+            if wakeup is not None:
+                if not is_unit_test:
+                    self._wait_for_wakeup(wakeup)
+            elif loop_duration < 1 and not is_unit_test:
                 sleep_length = 1 - loop_duration
                 self.log.debug(
                     "Sleeping for {0:.2f} seconds to prevent excessive logging"
                     .format(sleep_length))
                 sleep(sleep_length)
 
+        if wakeup is not None:
+            wakeup.close()
+
         # Stop any processors
         self.processor_agent.terminate()
 
@@ -1468,6 +1619,205 @@ class SchedulerJob(BaseJob):
 
         settings.Session.remove()
 
+    def _wait_for_wakeup(self, wakeup):
+        """
+        Sleeps until a task instance finishes, or the DAG file processor
+        manager sends parsing results, rather than for a fixed interval. The
+        files of the DAGs of the finished task instances are processed again
+        right away, to schedule their downstream tasks.
+
+        The executor only reports the state of its tasks when polled, so
+        while it has tasks the wait lasts at most ``processor_poll_interval``,
+        otherwise at most until the scheduler is due to heartbeat.
+        """
+        if self.executor.queued_tasks or self.executor.running:
+            timeout = self._processor_poll_interval
+        else:
+            timeout = self.heartrate
+        dag_ids = wakeup.wait(timeout, [self.processor_agent])
+        if not dag_ids:
+            return
+        simple_dag_bag = self.processor_agent.simple_dag_bag
+        file_paths = {simple_dag_bag.get_dag(dag_id).full_filepath
+                      for dag_id in dag_ids if dag_id in simple_dag_bag.dag_ids}
+        if file_paths:
+            self.log.debug("Woken up to process %s", ", ".join(sorted(file_paths)))
+            self.processor_agent.request_file_processing(file_paths)
+
+    def _is_leader(self):
+        """
+        Whether this is the oldest of the running schedulers, always true
+        when the DAG files aren't split among several schedulers.
+        """
+        if not self.shard_dag_files:
+            return True
+        return min(set(self.live_scheduler_ids) | {self.id}) == self.id
+
+    def _refresh_live_schedulers(self):
+        """
+        Refreshes the running schedulers. The oldest one resets the task
+        instances queued by the schedulers that died, so that they are
+        queued again by the schedulers that now own their DAG files.
+        """
+        try:
+            live_scheduler_ids = get_live_scheduler_ids()
+        except Exception:
+            self.log.exception("Error getting the running schedulers")
+            return
+        if live_scheduler_ids != self.live_scheduler_ids:
+            self.log.info("Running schedulers: %s", live_scheduler_ids)
+        self.live_scheduler_ids = live_scheduler_ids
+        Stats.gauge('scheduler.live_schedulers', len(live_scheduler_ids))
+
+        if self._is_leader():
+            try:
+                self._reset_tis_queued_by_dead_schedulers(live_scheduler_ids)
+            except Exception:
+                self.log.exception("Error resetting the tasks of the schedulers that died")
+
+    @provide_session
+    def _reset_tis_queued_by_dead_schedulers(self, live_scheduler_ids, session=None):
+        """
+        Resets the state of the task instances still queued by scheduler jobs
+        that aren't running anymore, so that they are scheduled again.
+
+        :param live_scheduler_ids: the ids of the running scheduler jobs
+        :type live_scheduler_ids: list[int]
+        :return: the number of task instances reset
+        :rtype: int
+        """
+        TI = models.TaskInstance
+        live_scheduler_ids = set(live_scheduler_ids) | {self.id}
+        tis = (
+            session
+            .query(TI)
+            .join(BaseJob, TI.queued_by_job_id == BaseJob.id)
+            .filter(TI.state == State.QUEUED,
+                    BaseJob.job_type == SCHEDULER_JOB_TYPE,
+                    BaseJob.id.notin_(live_scheduler_ids))
+            .with_for_update(skip_locked=self.use_skip_locked)
+            .all()
+        )
+        for ti in tis:
+            ti.state = State.NONE
+            ti.queued_by_job_id = None
+        session.commit()
+
+        if tis:
+            self.log.info("Reset the following %s tasks queued by schedulers that died:\n\t%s",
+                          len(tis), "\n\t".join(repr(ti) for ti in tis))
+        return len(tis)
+
+    def _reconcile_dag_stats(self):
+        """
+        Corrects drift in the incrementally maintained DAG statistics, e.g.
+        from changes made to the database outside of Airflow.
+        """
+        self.log.debug("Reconciling DAG statistics")
+        self._heartbeat_if_due()
+        start_time = time.time()
+        try:
+            fixed = DagStats.reconcile()
+        except Exception:
+            self.log.exception("Error reconciling DAG statistics")
+            return
+        finally:
+            self._heartbeat_if_due()
+        Stats.gauge('scheduler.dag_stats.corrected', fixed)
+        Stats.timing('scheduler.dag_stats.reconcile_duration',
+                     (time.time() - start_time) * 1000)
+
+    @provide_session
+    def _record_sla_misses(self, session=None):
+        """
+        Records an SLA miss for every task instance, of any DAG, whose SLA
+        deadline has passed without it succeeding in time. The deadline of
+        the checked task instances is cleared so that each of them is only
+        looked at once, which keeps the deadline index small. The
+        notifications are sent by the DAG file processors, which have the
+        callbacks and email addresses of the tasks.
+        """
+        TI = models.TaskInstance
+        now = timezone.utcnow()
+        start_time = time.time()
+        num_misses = 0
+        try:
+            while True:
+                query = (
+                    session
+                    .query(TI.dag_id, TI.task_id, TI.execution_date, TI.state,
+                           TI.end_date, TI.sla_deadline)
+                    .filter(TI.sla_deadline <= now)
+                )
+                if self.max_tis_per_query > 0:
+                    query = query.limit(self.max_tis_per_query)
+                expired = query.all()
+                if not expired:
+                    break
+
+                for dag_id, task_id, execution_date, state, end_date, deadline in expired:
+                    if (state in (State.SUCCESS, State.SKIPPED) and
+                            end_date is not None and end_date <= deadline):
+                        continue
+                    session.merge(SlaMiss(
+                        task_id=task_id,
+                        dag_id=dag_id,
+                        execution_date=execution_date,
+                        timestamp=now))
+                    num_misses += 1
+
+                session.query(TI).filter(or_(*[
+                    and_(TI.dag_id == dag_id,
+                         TI.task_id == task_id,
+                         TI.execution_date == execution_date)
+                    for dag_id, task_id, execution_date, _, _, _ in expired
+                ])).update({TI.sla_deadline: None}, synchronize_session=False)
+                session.commit()
+
+                if self.max_tis_per_query <= 0 or len(expired) < self.max_tis_per_query:
+                    break
+        except Exception:
+            session.rollback()
+            self.log.exception("Error checking the SLA deadlines")
+            return
+
+        if num_misses:
+            self.log.info("Recorded %s SLA misses", num_misses)
+            Stats.incr('scheduler.sla_misses', num_misses)
+        Stats.timing('scheduler.sla_check_duration', (time.time() - start_time) * 1000)
+
+    def _heartbeat_if_due(self):
+        """
+        Heartbeats the scheduler once ``heartrate`` seconds passed since its
+        last heartbeat. It is also called during the long maintenance tasks of
+        the leader, so that the other schedulers don't take it for dead and
+        take over its DAG files meanwhile.
+        """
+        if self.latest_heartbeat is None or (
+                (timezone.utcnow() - self.latest_heartbeat).total_seconds() >= self.heartrate):
+            self.log.debug("Heartbeating the scheduler")
+            self.heartbeat()
+
+    def _cleanup_db(self):
+        """
+        Deletes the metadata rows older than their retention. The number of
+        batches per table is bounded so the scheduler is never kept away
+        from scheduling for long, a backlog is worked through over several
+        intervals.
+        """
+        from airflow.utils import db_cleanup
+
+        self.log.info("Cleaning up the metadata database")
+        try:
+            counts = db_cleanup.run_cleanup(
+                max_batches=conf.getint('db_cleanup', 'scheduler_max_batches', fallback=10),
+                heartbeat=self._heartbeat_if_due)
+        except Exception:
+            self.log.exception("Error cleaning up the metadata database")
+            return
+        self.log.info("Deleted %s old rows from the metadata database",
+                      sum(counts.values()))
+
     def _validate_and_run_task_instances(self, simple_dag_bag):
         if len(simple_dag_bag.simple_dags) > 0:
             try:
@@ -1558,8 +1908,16 @@ class SchedulerJob(BaseJob):
         for dag in dagbag.dags.values():
             dag.sync_to_db()
 
+        # The flattened subdags are paused with the DAG they belong to
+        flattened_roots = {}
+        for dag in dagbag.dags.values():
+            root_dag = get_flattening_root(dag)
+            if root_dag:
+                flattened_roots[dag.dag_id] = root_dag.dag_id
         paused_dag_ids = [dag.dag_id for dag in dagbag.dags.values()
-                          if dag.is_paused]
+                          if dag.dag_id not in flattened_roots and dag.is_paused]
+        paused_dag_ids += [dag_id for dag_id, root_dag_id in flattened_roots.items()
+                           if root_dag_id in paused_dag_ids]
 
         # Pickle the DAGs (if necessary) and put them into a SimpleDag
         for dag_id in dagbag.dags:
@@ -1577,7 +1935,7 @@ class SchedulerJob(BaseJob):
                     dag.dag_id not in paused_dag_ids]
         else:
             dags = [dag for dag in dagbag.dags.values()
-                    if not dag.parent_dag and
+                    if (not dag.parent_dag or dag.dag_id in flattened_roots) and
                     dag.dag_id not in paused_dag_ids]
 
         # Not using multiprocessing.Queue() since it's no longer a separate
@@ -0,0 +1,61 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add next_dagrun and next_dagrun_create_after to dag
+
+Revision ID: 3e5a7b9c0d12
+Revises: 8a6d1c2f4b71
+Create Date: 2026-10-18 15:02:44.871022
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = '3e5a7b9c0d12'
+down_revision = '8a6d1c2f4b71'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the columns the scheduler keeps the next DAG run of every DAG in"""
+    # See 0e2a74e0fc9f_add_time_zone_awareness
+    conn = op.get_bind()
+    if conn.dialect.name == 'mysql':
+        timestamp = mysql.TIMESTAMP(fsp=6)
+    elif conn.dialect.name == 'mssql':
+        timestamp = sa.DateTime()
+    else:
+        timestamp = sa.TIMESTAMP(timezone=True)
+
+    with op.batch_alter_table('dag') as batch_op:
+        batch_op.add_column(sa.Column('next_dagrun', timestamp, nullable=True))
+        batch_op.add_column(sa.Column('next_dagrun_create_after', timestamp, nullable=True))
+        batch_op.create_index('idx_next_dagrun_create_after', ['next_dagrun_create_after'],
+                              unique=False)
+
+
+def downgrade():
+    """Drop the next DAG run columns"""
+    with op.batch_alter_table('dag') as batch_op:
+        batch_op.drop_index('idx_next_dagrun_create_after')
+        batch_op.drop_column('next_dagrun_create_after')
+        batch_op.drop_column('next_dagrun')
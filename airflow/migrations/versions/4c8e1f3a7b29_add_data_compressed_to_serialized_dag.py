@@ -0,0 +1,64 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add data_compressed to serialized_dag
+
+Revision ID: 4c8e1f3a7b29
+Revises: 9d4e2b7f1a63
+Create Date: 2026-10-18 21:12:53.640127
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = '4c8e1f3a7b29'
+down_revision = '9d4e2b7f1a63'
+branch_labels = None
+depends_on = None
+
+
+def _json_type():
+    # See d38e04c12aa2_add_serialized_dag_table
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        try:
+            conn.execute("SELECT JSON_VALID(1)").fetchone()
+        except (sa.exc.OperationalError, sa.exc.ProgrammingError):
+            return sa.Text
+    return sa.JSON
+
+
+def upgrade():
+    """Store the serialized DAGs compressed, data is empty for those"""
+    with op.batch_alter_table('serialized_dag') as batch_op:
+        batch_op.alter_column('data', existing_type=_json_type(), nullable=True)
+        batch_op.add_column(sa.Column(
+            'data_compressed',
+            sa.LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql'),
+            nullable=True))
+
+
+def downgrade():
+    """Drop the compressed serialized DAGs, the scheduler writes them again"""
+    op.execute("DELETE FROM serialized_dag WHERE data IS NULL")
+    with op.batch_alter_table('serialized_dag') as batch_op:
+        batch_op.drop_column('data_compressed')
+        batch_op.alter_column('data', existing_type=_json_type(), nullable=False)
@@ -0,0 +1,65 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add dag_state_stats table and dag.last_dagrun_execution_date
+
+Revision ID: 51d686432c24
+Revises: fe461863935f
+Create Date: 2026-10-18 09:12:31.402911
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = '51d686432c24'
+down_revision = 'fe461863935f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the table and column backing the home page DAG statistics"""
+    # See 0e2a74e0fc9f_add_time_zone_awareness
+    conn = op.get_bind()
+    if conn.dialect.name == 'mysql':
+        timestamp = mysql.TIMESTAMP(fsp=6)
+    elif conn.dialect.name == 'mssql':
+        timestamp = sa.DateTime()
+    else:
+        timestamp = sa.TIMESTAMP(timezone=True)
+
+    op.create_table(
+        'dag_state_stats',
+        sa.Column('dag_id', sa.String(length=250), nullable=False),
+        sa.Column('stat_type', sa.String(length=20), nullable=False),
+        sa.Column('state', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('dag_id', 'stat_type', 'state')
+    )
+    with op.batch_alter_table('dag') as batch_op:
+        batch_op.add_column(sa.Column('last_dagrun_execution_date', timestamp, nullable=True))
+
+
+def downgrade():
+    """Drop the table and column backing the home page DAG statistics"""
+    with op.batch_alter_table('dag') as batch_op:
+        batch_op.drop_column('last_dagrun_execution_date')
+    op.drop_table('dag_state_stats')
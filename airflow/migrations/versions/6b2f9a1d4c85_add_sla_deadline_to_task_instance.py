@@ -0,0 +1,58 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add sla_deadline to task_instance
+
+Revision ID: 6b2f9a1d4c85
+Revises: 3e5a7b9c0d12
+Create Date: 2026-10-18 17:26:09.513840
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = '6b2f9a1d4c85'
+down_revision = '3e5a7b9c0d12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the indexed SLA deadline of the task instances"""
+    # See 0e2a74e0fc9f_add_time_zone_awareness
+    conn = op.get_bind()
+    if conn.dialect.name == 'mysql':
+        timestamp = mysql.TIMESTAMP(fsp=6)
+    elif conn.dialect.name == 'mssql':
+        timestamp = sa.DateTime()
+    else:
+        timestamp = sa.TIMESTAMP(timezone=True)
+
+    with op.batch_alter_table('task_instance') as batch_op:
+        batch_op.add_column(sa.Column('sla_deadline', timestamp, nullable=True))
+        batch_op.create_index('ti_sla_deadline', ['sla_deadline'], unique=False)
+
+
+def downgrade():
+    """Drop the SLA deadline of the task instances"""
+    with op.batch_alter_table('task_instance') as batch_op:
+        batch_op.drop_index('ti_sla_deadline')
+        batch_op.drop_column('sla_deadline')
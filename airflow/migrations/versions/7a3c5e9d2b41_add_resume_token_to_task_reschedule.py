@@ -0,0 +1,46 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add resume_token to task_reschedule
+
+Revision ID: 7a3c5e9d2b41
+Revises: 4c8e1f3a7b29
+Create Date: 2026-10-18 22:52:07.318204
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7a3c5e9d2b41'
+down_revision = '4c8e1f3a7b29'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the token resumable operators resume their remote job with"""
+    with op.batch_alter_table('task_reschedule') as batch_op:
+        batch_op.add_column(sa.Column('resume_token', sa.Text(), nullable=True))
+
+
+def downgrade():
+    """Drop the resume tokens of the resumable operators"""
+    with op.batch_alter_table('task_reschedule') as batch_op:
+        batch_op.drop_column('resume_token')
@@ -0,0 +1,72 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add rendered_task_instance_fields table
+
+Revision ID: 8a6d1c2f4b71
+Revises: c1d1a7d3b2e4
+Create Date: 2026-10-18 14:21:07.553190
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = '8a6d1c2f4b71'
+down_revision = 'c1d1a7d3b2e4'
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = 'rendered_task_instance_fields'
+
+
+def upgrade():
+    """Add the rendered_task_instance_fields table"""
+    json_type = sa.JSON
+    conn = op.get_bind()
+    # See 0e2a74e0fc9f_add_time_zone_awareness
+    if conn.dialect.name == 'mysql':
+        timestamp = mysql.TIMESTAMP(fsp=6)
+    elif conn.dialect.name == 'mssql':
+        timestamp = sa.DateTime()
+    else:
+        timestamp = sa.TIMESTAMP(timezone=True)
+
+    if conn.dialect.name != "postgresql":
+        # Mysql 5.7+/MariaDB 10.2.3 has JSON support. Rather than checking for
+        # versions, check for the function existing.
+        try:
+            conn.execute("SELECT JSON_VALID(1)").fetchone()
+        except (sa.exc.OperationalError, sa.exc.ProgrammingError):
+            json_type = sa.Text
+
+    op.create_table(
+        TABLE_NAME,
+        sa.Column('dag_id', sa.String(length=250), nullable=False),
+        sa.Column('task_id', sa.String(length=250), nullable=False),
+        sa.Column('execution_date', timestamp, nullable=False),
+        sa.Column('rendered_fields', json_type(), nullable=False),
+        sa.PrimaryKeyConstraint('dag_id', 'task_id', 'execution_date')
+    )
+
+
+def downgrade():
+    """Drop the rendered_task_instance_fields table"""
+    op.drop_table(TABLE_NAME)
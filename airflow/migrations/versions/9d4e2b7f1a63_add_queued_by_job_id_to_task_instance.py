@@ -0,0 +1,46 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""add queued_by_job_id to task_instance
+
+Revision ID: 9d4e2b7f1a63
+Revises: 6b2f9a1d4c85
+Create Date: 2026-10-18 19:41:27.306518
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9d4e2b7f1a63'
+down_revision = '6b2f9a1d4c85'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the id of the scheduler job that queued the task instance"""
+    with op.batch_alter_table('task_instance') as batch_op:
+        batch_op.add_column(sa.Column('queued_by_job_id', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    """Drop the id of the scheduler job that queued the task instance"""
+    with op.batch_alter_table('task_instance') as batch_op:
+        batch_op.drop_column('queued_by_job_id')
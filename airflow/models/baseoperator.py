@@ -51,6 +51,7 @@ from airflow.utils import timezone
 from airflow.utils.db import provide_session
 from airflow.utils.decorators import apply_defaults
 from airflow.utils.helpers import validate_key
+from airflow.utils.jinja import get_default_template_env
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.operator_resources import Resources
 from airflow.utils.trigger_rule import TriggerRule
@@ -781,7 +782,7 @@ class BaseOperator(LoggingMixin):
 
     def get_template_env(self):  # type: () -> jinja2.Environment
         """Fetch a Jinja template environment from the DAG or instantiate empty environment if no DAG."""
-        return self.dag.get_template_env() if self.has_dag() else jinja2.Environment(cache_size=0)
+        return self.dag.get_template_env() if self.has_dag() else get_default_template_env()
 
     def prepare_template(self):
         """
@@ -43,7 +43,6 @@ from airflow import settings, utils
 from airflow.configuration import conf
 from airflow.dag.base_dag import BaseDag
 from airflow.exceptions import AirflowException, AirflowDagCycleException, DagNotFound
-from airflow.executors import LocalExecutor, get_default_executor
 from airflow.models.base import Base, ID_LEN
 from airflow.models.dagbag import DagBag
 from airflow.models.dagpickle import DagPickle
@@ -51,10 +50,10 @@ from airflow.models.dagrun import DagRun
 from airflow.models.taskinstance import TaskInstance, clear_task_instances
 from airflow.settings import STORE_SERIALIZED_DAGS, MIN_SERIALIZED_DAG_UPDATE_INTERVAL
 from airflow.utils import timezone
-from airflow.utils.dag_processing import correct_maybe_zipped
 from airflow.utils.dates import cron_presets, date_range as utils_date_range
 from airflow.utils.db import provide_session
 from airflow.utils.helpers import validate_key
+from airflow.utils.jinja import CachingEnvironment, TEMPLATE_CACHE_SIZE, get_cached_template_env
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.sqlalchemy import UtcDateTime, Interval
 from airflow.utils.state import State
@@ -753,6 +752,19 @@ class DAG(BaseDag, LoggingMixin):
             t.resolve_template_files()
 
     def get_template_env(self):  # type: () -> jinja2.Environment
+        """
+        Returns the Jinja2 environment of the DAG. It is built once per
+        version of the DAG file, so the templates it compiles are reused
+        across the templated fields, tasks and runs of the DAG.
+        """
+        # A reparsed DAG file creates new DAG objects, with a new last_loaded
+        key = (id(self), self.fileloc, self.last_loaded,
+               tuple(self.template_searchpath or ()), self.template_undefined,
+               id(self.jinja_environment_kwargs), id(self.user_defined_macros),
+               id(self.user_defined_filters))
+        return get_cached_template_env(key, self._build_template_env)
+
+    def _build_template_env(self):  # type: () -> jinja2.Environment
         """Build a Jinja2 environment."""
 
         # Collect directories to search for template files
@@ -765,12 +777,12 @@ class DAG(BaseDag, LoggingMixin):
             'loader': jinja2.FileSystemLoader(searchpath),
             'undefined': self.template_undefined,
             'extensions': ["jinja2.ext.do"],
-            'cache_size': 0
+            'cache_size': TEMPLATE_CACHE_SIZE,
         }
         if self.jinja_environment_kwargs:
             jinja_env_options.update(self.jinja_environment_kwargs)
 
-        env = jinja2.Environment(**jinja_env_options)  # type: ignore
+        env = CachingEnvironment(**jinja_env_options)  # type: ignore
 
         # Add any user defined items. Safe to edit globals as long as no templates are rendered yet.
         # http://jinja.pocoo.org/docs/2.10/api/#jinja2.Environment.globals
@@ -1266,6 +1278,7 @@ class DAG(BaseDag, LoggingMixin):
         :type: bool
 
         """
+        from airflow.executors import LocalExecutor, get_default_executor
         from airflow.jobs import BackfillJob
         if not executor and local:
             executor = LocalExecutor()
@@ -1334,6 +1347,16 @@ class DAG(BaseDag, LoggingMixin):
             state=state
         )
         session.add(run)
+        session.flush()
+
+        (
+            session.query(DagModel)
+            .filter(DagModel.dag_id == self.dag_id,
+                    or_(DagModel.last_dagrun_execution_date.is_(None),
+                        DagModel.last_dagrun_execution_date < run.execution_date))
+            .update({DagModel.last_dagrun_execution_date: run.execution_date},
+                    synchronize_session=False)
+        )
 
         session.commit()
 
@@ -1361,6 +1384,7 @@ class DAG(BaseDag, LoggingMixin):
         :return: None
         """
         from airflow.models.serialized_dag import SerializedDagModel
+        from airflow.operators.subdag_operator import get_flattening_root
 
         if owner is None:
             owner = self.owner
@@ -1381,11 +1405,23 @@ class DAG(BaseDag, LoggingMixin):
         else:
             orm_dag.is_subdag = False
             orm_dag.fileloc = self.fileloc
+        root_dag = get_flattening_root(self)
+        if root_dag is not None:
+            # The tasks of a flattened subdag are scheduled with its top level
+            # DAG, so it is paused with it rather than on its own
+            root_is_paused = session.query(DagModel.is_paused) \
+                .filter(DagModel.dag_id == root_dag.dag_id).scalar()
+            if root_is_paused is not None:
+                orm_dag.is_paused = root_is_paused
         orm_dag.owners = owner
         orm_dag.is_active = True
         orm_dag.last_scheduler_run = sync_time
         orm_dag.default_view = self._default_view
         orm_dag.description = self.description
+        if orm_dag.schedule_interval != self.schedule_interval:
+            # the next run has to be computed again with the new schedule
+            orm_dag.next_dagrun = None
+            orm_dag.next_dagrun_create_after = None
         orm_dag.schedule_interval = self.schedule_interval
         session.merge(orm_dag)
         session.commit()
@@ -1573,9 +1609,17 @@ class DagModel(Base):
     default_view = Column(String(25))
     # Schedule interval
     schedule_interval = Column(Interval)
+    # Execution date of the most recent DAG run, maintained with DagStats
+    last_dagrun_execution_date = Column(UtcDateTime)
+    # Execution date of the next scheduled DAG run, and the time from which
+    # the scheduler can create it or has to compute it again, kept by the
+    # scheduler so it can skip the DAGs that aren't due
+    next_dagrun = Column(UtcDateTime)
+    next_dagrun_create_after = Column(UtcDateTime)
 
     __table_args__ = (
         Index('idx_root_dag_id', root_dag_id, unique=False),
+        Index('idx_next_dagrun_create_after', next_dagrun_create_after, unique=False),
     )
 
     def __repr__(self):
@@ -1595,6 +1639,24 @@ class DagModel(Base):
     def get_current(cls, dag_id, session=None):
         return session.query(cls).filter(cls.dag_id == dag_id).first()
 
+    @classmethod
+    @provide_session
+    def reset_next_dagrun(cls, dag_ids, session=None):
+        """
+        Makes the scheduler compute the next run of the DAGs again, e.g. once
+        some of their runs were deleted.
+
+        :param dag_ids: the IDs of the DAGs
+        :type dag_ids: list[str]
+        """
+        dag_ids = list(set(dag_ids))
+        if not dag_ids:
+            return
+        session.query(cls).filter(cls.dag_id.in_(dag_ids)).update(
+            {cls.next_dagrun: None, cls.next_dagrun_create_after: None},
+            synchronize_session=False)
+        session.commit()
+
     def get_default_view(self):
         if self.default_view is None:
             return conf.get('webserver', 'dag_default_view').lower()
@@ -1700,6 +1762,8 @@ class DagModel(Base):
         :param alive_dag_filelocs: file paths of alive DAGs
         :param session: ORM Session
         """
+        from airflow.utils.dag_processing import correct_maybe_zipped
+
         log = LoggingMixin().log
         log.debug("Deactivating DAGs (for which DAG files are deleted) from %s table ",
                   cls.__tablename__)
@@ -37,10 +37,8 @@ from airflow import settings
 from airflow.configuration import conf
 from airflow.dag.base_dag import BaseDagBag
 from airflow.exceptions import AirflowDagCycleException
-from airflow.executors import get_default_executor
 from airflow.settings import Stats
 from airflow.utils import timezone
-from airflow.utils.dag_processing import list_py_file_paths, correct_maybe_zipped
 from airflow.utils.db import provide_session
 from airflow.utils.helpers import pprinttable
 from airflow.utils.log.logging_mixin import LoggingMixin
@@ -92,6 +90,7 @@ class DagBag(BaseDagBag, LoggingMixin):
 
         # do not use default arg in signature, to fix import cycle on plugin load
         if executor is None:
+            from airflow.executors import get_default_executor
             executor = get_default_executor()
         dag_folder = dag_folder or settings.DAGS_FOLDER
         self.dag_folder = dag_folder
@@ -128,6 +127,7 @@ class DagBag(BaseDagBag, LoggingMixin):
         :type from_file_only: bool
         """
         from airflow.models.dag import DagModel  # Avoid circular import
+        from airflow.utils.dag_processing import correct_maybe_zipped
 
         # Only read DAGs from DB if this dagbag is store_serialized_dags.
         # from_file_only is an exception, currently it is for renderring templates
@@ -190,8 +190,15 @@ class DagBag(BaseDagBag, LoggingMixin):
         Given a path to a python module or zip file, this method imports
         the module and look for dag objects within it.
         """
+        from airflow import integrate_plugins
         from airflow.models.dag import DAG  # Avoid circular import
 
+        # DAG files and their templates may refer to plugin operators and
+        # macros as attributes of the ``airflow.operators`` or
+        # ``airflow.macros`` packages, which only works once the plugins are
+        # integrated.
+        integrate_plugins()
+
         found_dags = []
 
         # if the source file no longer exists in the DB or in the filesystem,
@@ -397,6 +404,8 @@ class DagBag(BaseDagBag, LoggingMixin):
         **Note**: The patterns in .airflowignore are treated as
         un-anchored regexes, not shell-like glob patterns.
         """
+        from airflow.utils.dag_processing import list_py_file_paths, correct_maybe_zipped
+
         if self.store_serialized_dags:
             return
 
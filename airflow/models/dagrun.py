@@ -21,7 +21,7 @@ from typing import Optional, cast
 import six
 from sqlalchemy import (
     Column, Integer, String, Boolean, PickleType, Index, UniqueConstraint, func, DateTime, or_,
-    and_
+    and_, event
 )
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import synonym
@@ -446,3 +446,10 @@ class DagRun(Base, LoggingMixin):
             .all()
         )
         return dagruns
+
+
+# The old state is loaded when the state is replaced, so that the transition
+# is recorded in the DAG statistics when flushed
+@event.listens_for(DagRun._state, 'set', active_history=True)
+def _load_old_state(target, value, oldvalue, initiator):
+    pass
@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""DagStats keeps the per DAG state counters shown on the home page."""
+from collections import defaultdict
+
+from sqlalchemy import Column, Integer, String, and_, event, func, inspect, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from airflow.models.base import Base, ID_LEN
+from airflow.utils.db import provide_session
+from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.state import State
+
+log = LoggingMixin().log
+
+_ABSENT = object()
+
+
+class DagStats(Base):
+    """
+    Number of DAG runs, and of task instances of the running and most recent
+    DAG runs, per DAG and state.
+
+    The counters are kept up to date incrementally in the transactions
+    creating, deleting or changing the state of DAG runs and task instances,
+    so that the home page can read them with a single query instead of
+    aggregating the ``dag_run`` and ``task_instance`` tables on every request.
+    The changes made through the ORM are recorded when they are committed,
+    the bulk updates record theirs with :meth:`record_dag_run_transition` and
+    :meth:`record_task_instance_transitions`. :meth:`reconcile`, which the
+    scheduler runs periodically, only corrects the drift left by the changes
+    made outside of Airflow.
+    """
+
+    __tablename__ = "dag_state_stats"
+
+    DAG_RUN = 'dag_run'
+    TASK_INSTANCE = 'task_instance'
+
+    # The state column is part of the primary key, so the "no state" state of
+    # task instances is stored under this name
+    NO_STATE = 'none'
+
+    # The "state" of a DAG run or task instance which is created or deleted
+    ABSENT = _ABSENT
+
+    dag_id = Column(String(ID_LEN), primary_key=True)
+    stat_type = Column(String(20), primary_key=True)
+    state = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return "<DagStats {self.dag_id} {self.stat_type} {self.state}: {self.count}>".format(
+            self=self)
+
+    @classmethod
+    def _to_db_state(cls, state):
+        return cls.NO_STATE if state is None else state
+
+    @classmethod
+    def _from_db_state(cls, state):
+        return None if state == cls.NO_STATE else state
+
+    @classmethod
+    @provide_session
+    def incr(cls, dag_id, stat_type, state, count=1, session=None):
+        """
+        Adds ``count`` (which may be negative) to a counter. The change is
+        applied with a single ``UPDATE`` so concurrent writers do not lose
+        each other's updates, and is committed together with the caller's
+        transaction. A missing counter is inserted in a savepoint, so that
+        losing the race to insert it falls back to updating it.
+        """
+        state = cls._to_db_state(state)
+        counter = session.query(cls).filter(
+            cls.dag_id == dag_id, cls.stat_type == stat_type, cls.state == state)
+        updated = counter.update({cls.count: cls.count + count}, synchronize_session=False)
+        if updated or count <= 0:
+            return
+        # Only the insert of the counter may fail in the savepoint
+        session.flush()
+        try:
+            with session.begin_nested():
+                session.add(cls(dag_id=dag_id, stat_type=stat_type, state=state, count=count))
+        except IntegrityError:
+            # Inserted by another writer since the update
+            counter.update({cls.count: cls.count + count}, synchronize_session=False)
+
+    @classmethod
+    @provide_session
+    def record_dag_run_transition(cls, dag_id, old_state, new_state, session=None):
+        """
+        Moves a DAG run from ``old_state`` to ``new_state`` in the counters.
+        ``old_state`` is ``DagStats.ABSENT`` for a created DAG run and
+        ``new_state`` for a deleted one.
+
+        The state changes of the DAG runs made through the ORM are recorded
+        when they are committed, this is for the other ones, e.g. bulk
+        deletes. As the counted task instances are those of the running and
+        latest DAG runs, it also recomputes the task instance counters of the
+        DAG when the DAG run starts or stops running.
+        """
+        if old_state == new_state:
+            return
+        if old_state is not cls.ABSENT:
+            cls.incr(dag_id, cls.DAG_RUN, old_state, -1, session=session)
+        if new_state is not cls.ABSENT:
+            cls.incr(dag_id, cls.DAG_RUN, new_state, 1, session=session)
+        if (old_state == State.RUNNING) != (new_state == State.RUNNING) or \
+                cls.ABSENT in (old_state, new_state):
+            cls.refresh_task_instance_stats([dag_id], session=session)
+
+    @staticmethod
+    def _is_counted_run(dag_id, execution_date, session):
+        """
+        Whether the task instances of a DAG run are counted, which is the case
+        for the running DAG runs of the active DAGs and the latest one which is
+        not running.
+        """
+        from airflow.models.dag import DagModel
+        from airflow.models.dagrun import DagRun
+
+        run = (
+            session.query(DagRun.state)
+            .join(DagModel, DagModel.dag_id == DagRun.dag_id)
+            .filter(DagRun.dag_id == dag_id, DagRun.execution_date == execution_date)
+            .filter(DagModel.is_active == True)  # noqa: E712
+            .first()
+        )
+        if run is None:
+            return False
+        if run.state == State.RUNNING:
+            return True
+        latest = (
+            session.query(func.max(DagRun.execution_date))
+            .filter(DagRun.dag_id == dag_id, DagRun.state != State.RUNNING)
+            .scalar()
+        )
+        return latest == execution_date
+
+    @classmethod
+    @provide_session
+    def record_task_instance_transitions(cls, transitions, session=None):
+        """
+        Moves task instances between states in the counters, for the state
+        changes not made through the ORM, e.g. bulk updates, the other ones
+        are recorded when they are committed.
+
+        :param transitions: the ``(dag_id, execution_date, old_state,
+            new_state)`` of the task instances, ``old_state`` is
+            ``DagStats.ABSENT`` for a created task instance and ``new_state``
+            for a deleted one
+        :type transitions: collections.Iterable[tuple]
+        """
+        counted_runs = {}
+        deltas = defaultdict(int)
+        for dag_id, execution_date, old_state, new_state in transitions:
+            if old_state == new_state:
+                continue
+            run = (dag_id, execution_date)
+            if run not in counted_runs:
+                counted_runs[run] = cls._is_counted_run(dag_id, execution_date, session)
+            if not counted_runs[run]:
+                continue
+            if old_state is not cls.ABSENT:
+                deltas[(dag_id, cls._to_db_state(old_state))] -= 1
+            if new_state is not cls.ABSENT:
+                deltas[(dag_id, cls._to_db_state(new_state))] += 1
+        # Always in the same order, so that concurrent writers don't deadlock
+        for (dag_id, state), count in sorted(deltas.items()):
+            if count:
+                cls.incr(dag_id, cls.TASK_INSTANCE, cls._from_db_state(state), count,
+                         session=session)
+
+    @classmethod
+    @provide_session
+    def refresh_task_instance_stats(cls, dag_ids, session=None):
+        """
+        Recomputes the task instance counters of the given DAGs, once their
+        running or latest DAG runs changed.
+
+        :param dag_ids: the IDs of the DAGs
+        :type dag_ids: collections.Iterable[str]
+        """
+        dag_ids = sorted(set(dag_ids))
+        if dag_ids:
+            cls._sync(cls.TASK_INSTANCE, cls._count_task_instances(dag_ids, session),
+                      dag_ids, session)
+
+    @classmethod
+    @provide_session
+    def get_counts(cls, stat_type, dag_ids=None, session=None):
+        """
+        Returns the counters of the given type as ``{dag_id: {state: count}}``.
+
+        :param stat_type: ``DagStats.DAG_RUN`` or ``DagStats.TASK_INSTANCE``
+        :param dag_ids: only return the counters of these DAGs
+        :type dag_ids: collections.Iterable[str]
+        """
+        qry = session.query(cls.dag_id, cls.state, cls.count).filter(cls.stat_type == stat_type)
+        if dag_ids is not None:
+            dag_ids = list(dag_ids)
+            if not dag_ids:
+                return {}
+            qry = qry.filter(cls.dag_id.in_(dag_ids))
+
+        counts = defaultdict(dict)
+        for dag_id, state, count in qry:
+            counts[dag_id][cls._from_db_state(state)] = count
+        return dict(counts)
+
+    @staticmethod
+    def _count_dag_runs(dag_ids, session):
+        from airflow.models.dagrun import DagRun
+
+        qry = (
+            session.query(DagRun.dag_id, DagRun.state, func.count())
+            .group_by(DagRun.dag_id, DagRun.state)
+        )
+        if dag_ids is not None:
+            qry = qry.filter(DagRun.dag_id.in_(dag_ids))
+        return qry
+
+    @staticmethod
+    def _count_task_instances(dag_ids, session):
+        """
+        Counts the states of the task instances of all running DAG runs and
+        of the most recent DAG run which is not running.
+        """
+        from airflow.models.dag import DagModel
+        from airflow.models.dagrun import DagRun
+        from airflow.models.taskinstance import TaskInstance as TI
+
+        last_dag_run = (
+            session.query(DagRun.dag_id, func.max(DagRun.execution_date).label('execution_date'))
+            .join(DagModel, DagModel.dag_id == DagRun.dag_id)
+            .filter(DagRun.state != State.RUNNING)
+            .filter(DagModel.is_active == True)  # noqa: E712
+            .group_by(DagRun.dag_id)
+        )
+        running_dag_run = (
+            session.query(DagRun.dag_id, DagRun.execution_date)
+            .join(DagModel, DagModel.dag_id == DagRun.dag_id)
+            .filter(DagRun.state == State.RUNNING)
+            .filter(DagModel.is_active == True)  # noqa: E712
+        )
+        if dag_ids is not None:
+            last_dag_run = last_dag_run.filter(DagRun.dag_id.in_(dag_ids))
+            running_dag_run = running_dag_run.filter(DagRun.dag_id.in_(dag_ids))
+
+        last_dag_run = last_dag_run.subquery('last_dag_run')
+        running_dag_run = running_dag_run.subquery('running_dag_run')
+
+        last_ti = (
+            session.query(TI.dag_id.label('dag_id'), TI.state.label('state'))
+            .join(last_dag_run, and_(last_dag_run.c.dag_id == TI.dag_id,
+                                     last_dag_run.c.execution_date == TI.execution_date))
+        )
+        running_ti = (
+            session.query(TI.dag_id.label('dag_id'), TI.state.label('state'))
+            .join(running_dag_run, and_(running_dag_run.c.dag_id == TI.dag_id,
+                                        running_dag_run.c.execution_date == TI.execution_date))
+        )
+        if dag_ids is not None:
+            last_ti = last_ti.filter(TI.dag_id.in_(dag_ids))
+            running_ti = running_ti.filter(TI.dag_id.in_(dag_ids))
+
+        union_ti = union_all(last_ti, running_ti).alias('union_ti')
+        return (
+            session.query(union_ti.c.dag_id, union_ti.c.state, func.count())
+            .group_by(union_ti.c.dag_id, union_ti.c.state)
+        )
+
+    @classmethod
+    def _sync(cls, stat_type, actual, dag_ids, session):
+        """
+        Brings the stored counters of ``stat_type`` in line with ``actual``,
+        only writing the rows that differ. Returns the number of rows fixed.
+        """
+        actual = {
+            (dag_id, cls._to_db_state(state)): count
+            for dag_id, state, count in actual
+        }
+        # The counters may have been changed by bulk updates since loaded
+        stored = session.query(cls).filter(cls.stat_type == stat_type).populate_existing()
+        if dag_ids is not None:
+            stored = stored.filter(cls.dag_id.in_(dag_ids))
+
+        fixed = 0
+        for row in stored:
+            count = actual.pop((row.dag_id, row.state), 0)
+            if count == 0:
+                session.delete(row)
+                fixed += 1
+            elif row.count != count:
+                row.count = count
+                fixed += 1
+        for (dag_id, state), count in actual.items():
+            session.add(cls(dag_id=dag_id, stat_type=stat_type, state=state, count=count))
+            fixed += 1
+        return fixed
+
+    @classmethod
+    @provide_session
+    def reconcile(cls, session=None):
+        """
+        Recomputes all counters and the last DAG run dates from the
+        ``dag_run`` and ``task_instance`` tables, to correct drift caused by
+        state changes which were not recorded.
+
+        :return: the number of corrected rows
+        :rtype: int
+        """
+        from airflow.models.dag import DagModel
+        from airflow.models.dagrun import DagRun
+
+        fixed = cls._sync(cls.DAG_RUN, cls._count_dag_runs(None, session), None, session)
+        fixed += cls._sync(
+            cls.TASK_INSTANCE, cls._count_task_instances(None, session), None, session)
+
+        last_runs = dict(
+            session.query(DagRun.dag_id, func.max(DagRun.execution_date))
+            .group_by(DagRun.dag_id)
+        )
+        for dag_model in session.query(DagModel):
+            last_run = last_runs.get(dag_model.dag_id)
+            if dag_model.last_dagrun_execution_date != last_run:
+                dag_model.last_dagrun_execution_date = last_run
+                fixed += 1
+
+        session.commit()
+        if fixed:
+            log.info("Corrected %s DAG statistics", fixed)
+        return fixed
+
+
+class _PendingStats(object):
+    """The state changes flushed in a transaction, recorded when it commits"""
+
+    def __init__(self):
+        self.dag_run_transitions = []
+        self.ti_transitions = []
+        # The DAGs with state changes of unknown old states, recounted instead
+        self.unknown_dag_ids = set()
+
+
+_PENDING_KEY = 'airflow_dag_stats_pending'
+_RECORDING_KEY = 'airflow_dag_stats_recording'
+
+
+def _get_state_change(obj, attr, deleted):
+    """
+    Returns the ``(old_state, new_state)`` of a persistent DAG run or task
+    instance being flushed, with ``None`` as new state when unchanged, and
+    ``_ABSENT`` as old state when it is unknown.
+    """
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        old_state = history.deleted[0]
+    elif history.unchanged:
+        old_state = history.unchanged[0]
+    elif deleted:
+        old_state = getattr(obj, attr)
+    else:
+        return _ABSENT, None
+    if deleted:
+        return old_state, DagStats.ABSENT
+    if not history.added or history.added[0] == old_state:
+        return old_state, None
+    return old_state, history.added[0]
+
+
+@event.listens_for(Session, 'before_flush')
+def _collect_state_changes(session, flush_context, instances):
+    from airflow.models.dagrun import DagRun
+    from airflow.models.taskinstance import TaskInstance
+
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, DagRun):
+            # None is the default of the column
+            changes.append((obj, DagStats.ABSENT, obj._state or State.RUNNING))
+        elif isinstance(obj, TaskInstance):
+            changes.append((obj, DagStats.ABSENT, obj.state))
+    for objs, deleted in ((session.dirty, False), (session.deleted, True)):
+        for obj in objs:
+            if isinstance(obj, (DagRun, TaskInstance)):
+                attr = '_state' if isinstance(obj, DagRun) else 'state'
+                old_state, new_state = _get_state_change(obj, attr, deleted)
+                if old_state is _ABSENT or new_state is not None:
+                    changes.append((obj, old_state, new_state))
+    if not changes:
+        return
+
+    pending = session.info.setdefault(_PENDING_KEY, _PendingStats())
+    for obj, old_state, new_state in changes:
+        if old_state is _ABSENT and not inspect(obj).pending:
+            pending.unknown_dag_ids.add(obj.dag_id)
+        elif isinstance(obj, DagRun):
+            pending.dag_run_transitions.append((obj.dag_id, old_state, new_state))
+        else:
+            pending.ti_transitions.append(
+                (obj.dag_id, obj.execution_date, old_state, new_state))
+
+
+@event.listens_for(Session, 'before_commit')
+def _record_state_changes(session):
+    # The savepoints of the counters commit in the session too
+    if session.info.get(_RECORDING_KEY):
+        return
+    session.flush()
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+
+    unknown_dag_ids = sorted(pending.unknown_dag_ids)
+    # The DAGs of which the counted task instances change are recounted
+    refreshed_dag_ids = set(unknown_dag_ids)
+    session.info[_RECORDING_KEY] = True
+    try:
+        with session.begin_nested():
+            for dag_id, old_state, new_state in pending.dag_run_transitions:
+                if dag_id not in pending.unknown_dag_ids:
+                    DagStats.record_dag_run_transition(
+                        dag_id, old_state, new_state, session=session)
+                    if (old_state == State.RUNNING) != (new_state == State.RUNNING) or \
+                            DagStats.ABSENT in (old_state, new_state):
+                        refreshed_dag_ids.add(dag_id)
+            DagStats.record_task_instance_transitions(
+                [t for t in pending.ti_transitions if t[0] not in refreshed_dag_ids],
+                session=session)
+            if unknown_dag_ids:
+                DagStats._sync(DagStats.DAG_RUN, DagStats._count_dag_runs(unknown_dag_ids, session),
+                               unknown_dag_ids, session)
+                DagStats.refresh_task_instance_stats(unknown_dag_ids, session=session)
+    except Exception:
+        log.warning("Could not update the DAG statistics, they will be corrected by "
+                    "the next reconciliation", exc_info=True)
+    finally:
+        del session.info[_RECORDING_KEY]
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_state_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Save Rendered Template Fields"""
+from typing import Optional
+
+import sqlalchemy_jsonfield
+from sqlalchemy import Column, String, desc
+
+from airflow.configuration import conf
+from airflow.models.base import ID_LEN, Base
+from airflow.settings import json
+from airflow.utils.db import provide_session
+from airflow.utils.sqlalchemy import UtcDateTime
+
+MAX_NUM_RENDERED_TI_FIELDS_PER_TASK = conf.getint(
+    'core', 'max_num_rendered_ti_fields_per_task', fallback=30)
+
+
+def serialize_template_field(template_field):
+    """
+    Returns the rendered value of a template field as is if it can be stored
+    as JSON, as its string representation otherwise.
+    """
+    try:
+        json.dumps(template_field)
+    except (TypeError, ValueError, OverflowError):
+        return str(template_field)
+    return template_field
+
+
+class RenderedTaskInstanceFields(Base):
+    """
+    The rendered template fields of the last
+    ``[core] max_num_rendered_ti_fields_per_task`` runs of every task, saved
+    when the task instance runs so that the webserver can show them without
+    loading the DAG file and rendering them again.
+    """
+
+    __tablename__ = "rendered_task_instance_fields"
+
+    dag_id = Column(String(ID_LEN), primary_key=True)
+    task_id = Column(String(ID_LEN), primary_key=True)
+    execution_date = Column(UtcDateTime, primary_key=True)
+    rendered_fields = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=False)
+
+    def __init__(self, ti, render_templates=True):
+        self.dag_id = ti.dag_id
+        self.task_id = ti.task_id
+        self.task = ti.task
+        self.execution_date = ti.execution_date
+        if render_templates:
+            ti.render_templates()
+        self.rendered_fields = {
+            field: serialize_template_field(getattr(self.task, field))
+            for field in self.task.template_fields
+        }
+
+    def __repr__(self):
+        return "<{}: {}.{} {}>".format(
+            self.__class__.__name__, self.dag_id, self.task_id, self.execution_date)
+
+    @classmethod
+    @provide_session
+    def get_templated_fields(cls, ti, session=None):
+        # type: (...) -> Optional[dict]
+        """
+        Returns the saved rendered template fields of the task instance.
+
+        :param ti: the task instance
+        :type ti: airflow.models.TaskInstance
+        :return: the rendered fields by name, None if they weren't saved
+        :rtype: dict or None
+        """
+        result = session.query(cls.rendered_fields).filter(
+            cls.dag_id == ti.dag_id,
+            cls.task_id == ti.task_id,
+            cls.execution_date == ti.execution_date,
+        ).one_or_none()
+        return result.rendered_fields if result else None
+
+    @provide_session
+    def write(self, session=None):
+        """Saves the rendered fields, replacing those of a previous try"""
+        session.merge(self)
+        session.flush()
+
+    @classmethod
+    @provide_session
+    def delete_old_records(cls, task_id, dag_id,
+                           num_to_keep=MAX_NUM_RENDERED_TI_FIELDS_PER_TASK, session=None):
+        """
+        Keeps the rendered fields of the last ``num_to_keep`` runs of the task
+        only.
+        """
+        if num_to_keep <= 0:
+            return
+        oldest_kept = session.query(cls.execution_date).filter(
+            cls.dag_id == dag_id,
+            cls.task_id == task_id,
+        ).order_by(desc(cls.execution_date)).offset(num_to_keep - 1).limit(1).scalar()
+        if oldest_kept is None:
+            return
+        session.query(cls).filter(
+            cls.dag_id == dag_id,
+            cls.task_id == task_id,
+            cls.execution_date < oldest_kept,
+        ).delete(synchronize_session=False)
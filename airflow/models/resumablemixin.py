@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Operators that release their worker slot while waiting on a remote job"""
+from datetime import timedelta
+
+from airflow.exceptions import AirflowRescheduleException
+from airflow.models.taskreschedule import TaskReschedule
+from airflow.ti_deps.deps.ready_to_reschedule import ReadyToRescheduleDep
+from airflow.utils import timezone
+
+
+class ResumableMixin(object):
+    """
+    Mixin for operators that start a remote job and wait for it to finish.
+
+    Operators implement ``submit``, which starts the job and returns a
+    token identifying it, and ``poll``, which checks the job once. When the
+    operator is ``resumable``, ``execute_resumable`` submits the job and
+    reschedules the task instance, like a sensor in ``reschedule`` mode,
+    instead of holding a worker slot while it waits. The token is kept with
+    the reschedule request, and every later run of the try polls the job
+    once with it, then completes or reschedules again in
+    ``resume_interval`` seconds.
+
+    Operators set the ``resumable`` and ``resume_interval`` attributes.
+    """
+
+    resumable = False
+    resume_interval = 60
+
+    def submit(self, context):
+        """
+        Starts the remote job.
+
+        :return: the token identifying the job, e.g. its id
+        :rtype: str
+        """
+        raise NotImplementedError()
+
+    def poll(self, context, resume_token):
+        """
+        Checks the remote job once, raises if it failed.
+
+        :param resume_token: the token returned by ``submit``
+        :type resume_token: str
+        :return: whether the job is done
+        :rtype: bool
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def get_resume_token(ti):
+        """
+        Returns the token of the remote job of the current try of the task
+        instance, None if it wasn't submitted yet.
+        """
+        for task_reschedule in reversed(TaskReschedule.find_for_task_instance(ti)):
+            if task_reschedule.resume_token is not None:
+                return task_reschedule.resume_token
+        return None
+
+    def execute_resumable(self, context):
+        """
+        Submits the job on the first run of the try, then polls it once and
+        reschedules the task instance until it's done.
+        """
+        resume_token = self.get_resume_token(context['ti'])
+        if resume_token is None:
+            resume_token = str(self.submit(context))
+            self.log.info("Submitted the remote job %s", resume_token)
+        else:
+            self.log.info("Resuming the remote job %s", resume_token)
+
+        if self.poll(context, resume_token):
+            return
+        reschedule_date = timezone.utcnow() + timedelta(seconds=self.resume_interval)
+        self.log.info("The remote job %s is not done yet, checking again at %s",
+                      resume_token, reschedule_date)
+        raise AirflowRescheduleException(reschedule_date, resume_token=resume_token)
+
+    @property
+    def deps(self):
+        """
+        Adds the dependency checking that a rescheduled task instance can
+        run again to the resumable operators.
+        """
+        deps = super(ResumableMixin, self).deps
+        if self.resumable:
+            return deps | {ReadyToRescheduleDep()}
+        return deps
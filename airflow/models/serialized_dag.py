@@ -20,14 +20,17 @@
 """Serialzed DAG table in database."""
 
 import hashlib
+import zlib
 from datetime import timedelta
 from typing import Any, Optional
 
 import sqlalchemy_jsonfield
-from sqlalchemy import Column, Index, Integer, String, and_
+from sqlalchemy import Column, Index, Integer, LargeBinary, String, and_
+from sqlalchemy.dialects import mysql
 from sqlalchemy.sql import exists
 
 from airflow import DAG
+from airflow.configuration import conf
 from airflow.models.base import ID_LEN, Base
 from airflow.serialization.serialized_objects import SerializedDAG
 from airflow.settings import json
@@ -38,6 +41,8 @@ from airflow.utils.sqlalchemy import UtcDateTime
 
 log = LoggingMixin().log
 
+COMPRESS_SERIALIZED_DAGS = conf.getboolean('core', 'compress_serialized_dags', fallback=False)
+
 
 class SerializedDagModel(Base):
     """A table for serialized DAGs.
@@ -52,6 +57,8 @@ class SerializedDagModel(Base):
     * ``[scheduler] dag_dir_list_interval = 300`` (s):
       interval of deleting serialized DAGs in DB when the files are deleted, suggest
       to use a smaller interval such as 60
+    * ``[core] compress_serialized_dags = False``: store the serialized DAGs
+      compressed, in ``data_compressed`` rather than ``data``
 
     It is used by webserver to load dagbags when ``store_serialized_dags=True``.
     Because reading from database is lightweight compared to importing from files,
@@ -63,7 +70,8 @@ class SerializedDagModel(Base):
     fileloc = Column(String(2000), nullable=False)
     # The max length of fileloc exceeds the limit of indexing.
     fileloc_hash = Column(Integer, nullable=False)
-    data = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=False)
+    data = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=True)
+    data_compressed = Column(LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql'), nullable=True)
     last_updated = Column(UtcDateTime, nullable=False)
 
     __table_args__ = (
@@ -74,7 +82,13 @@ class SerializedDagModel(Base):
         self.dag_id = dag.dag_id
         self.fileloc = dag.full_filepath
         self.fileloc_hash = self.dag_fileloc_hash(self.fileloc)
-        self.data = SerializedDAG.to_dict(dag)
+        dag_data = SerializedDAG.to_dict(dag)
+        if COMPRESS_SERIALIZED_DAGS:
+            self.data = None
+            self.data_compressed = zlib.compress(json.dumps(dag_data).encode('utf-8'))
+        else:
+            self.data = dag_data
+            self.data_compressed = None
         self.last_updated = timezone.utcnow()
 
     @staticmethod
@@ -144,9 +158,12 @@ class SerializedDagModel(Base):
 
     @property
     def dag(self):
-        """The DAG deserialized from the ``data`` column"""
-        if isinstance(self.data, dict):
-            dag = SerializedDAG.from_dict(self.data)  # type: Any
+        """The DAG deserialized from the ``data`` or ``data_compressed`` column"""
+        if self.data_compressed is not None:
+            dag = SerializedDAG.from_json(
+                zlib.decompress(self.data_compressed).decode('utf-8'))  # type: Any
+        elif isinstance(self.data, dict):
+            dag = SerializedDAG.from_dict(self.data)
         else:
             # noinspection PyTypeChecker
             dag = SerializedDAG.from_json(self.data)
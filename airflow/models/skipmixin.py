@@ -17,6 +17,7 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from airflow.models.dagstats import DagStats
 from airflow.models.taskinstance import TaskInstance
 from airflow.utils import timezone
 from airflow.utils.db import provide_session
@@ -45,14 +46,20 @@ class SkipMixin(LoggingMixin):
         now = timezone.utcnow()
 
         if dag_run:
-            session.query(TaskInstance).filter(
+            tis = session.query(TaskInstance).filter(
                 TaskInstance.dag_id == dag_run.dag_id,
                 TaskInstance.execution_date == dag_run.execution_date,
                 TaskInstance.task_id.in_(task_ids)
-            ).update({TaskInstance.state: State.SKIPPED,
-                      TaskInstance.start_date: now,
-                      TaskInstance.end_date: now},
-                     synchronize_session=False)
+            )
+            transitions = [
+                (dag_run.dag_id, dag_run.execution_date, old_state, State.SKIPPED)
+                for old_state, in tis.with_entities(TaskInstance.state)
+            ]
+            tis.update({TaskInstance.state: State.SKIPPED,
+                        TaskInstance.start_date: now,
+                        TaskInstance.end_date: now},
+                       synchronize_session=False)
+            DagStats.record_task_instance_transitions(transitions, session=session)
             session.commit()
         else:
             assert execution_date is not None, "Execution date is None and no dag run"
@@ -34,7 +34,7 @@ import dill
 import lazy_object_proxy
 import pendulum
 from six.moves.urllib.parse import quote_plus
-from sqlalchemy import Column, String, Float, Integer, PickleType, Index, func
+from sqlalchemy import Column, String, Float, Integer, PickleType, Index, event, func
 from sqlalchemy.orm import reconstructor
 from sqlalchemy.orm.session import Session
 
@@ -46,6 +46,8 @@ from airflow.exceptions import (
 from airflow.models.base import Base, ID_LEN
 from airflow.models.log import Log
 from airflow.models.pool import Pool
+from airflow.models.renderedtifields import (
+    MAX_NUM_RENDERED_TI_FIELDS_PER_TASK, RenderedTaskInstanceFields)
 from airflow.models.taskfail import TaskFail
 from airflow.models.taskreschedule import TaskReschedule
 from airflow.models.variable import Variable
@@ -59,6 +61,7 @@ from airflow.utils.email import send_email
 from airflow.utils.helpers import is_container
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.net import get_hostname
+from airflow.utils.scheduler_wakeup import notify_scheduler
 from airflow.utils.sqlalchemy import UtcDateTime
 from airflow.utils.state import State
 from airflow.utils.timeout import timeout
@@ -158,6 +161,12 @@ class TaskInstance(Base, LoggingMixin):
     queued_dttm = Column(UtcDateTime)
     pid = Column(Integer)
     executor_config = Column(PickleType(pickler=dill))
+    updated_at = Column(UtcDateTime, default=timezone.utcnow, onupdate=timezone.utcnow)
+    # When the task must have succeeded by, cleared once the scheduler has
+    # checked it, see SchedulerJob._record_sla_misses
+    sla_deadline = Column(UtcDateTime)
+    # The scheduler job that queued the task instance
+    queued_by_job_id = Column(Integer)
     # If adding new fields here then remember to add them to
     # refresh_from_db() or they wont display in the UI correctly
 
@@ -168,6 +177,7 @@ class TaskInstance(Base, LoggingMixin):
         Index('ti_state_lkp', dag_id, task_id, execution_date, state),
         Index('ti_pool', pool, state, priority_weight),
         Index('ti_job_id', job_id),
+        Index('ti_sla_deadline', sla_deadline),
     )
 
     def __init__(self, task, execution_date, state=None):
@@ -201,11 +211,26 @@ class TaskInstance(Base, LoggingMixin):
             self.state = state
         self.hostname = ''
         self.executor_config = task.executor_config
+        self.sla_deadline = self.get_sla_deadline(task, execution_date)
         self.init_on_load()
         # Is this TaskInstance being currently running within `airflow run --raw`.
         # Not persisted to the database so only valid for the current process
         self.raw = False
 
+    @staticmethod
+    def get_sla_deadline(task, execution_date):
+        """
+        Returns the time the task instance of ``task`` for ``execution_date``
+        must have succeeded by: the end of its schedule period plus the SLA
+        of the task, None if the task has no SLA or its DAG no schedule.
+        """
+        if not isinstance(task.sla, timedelta) or not task.has_dag() or not execution_date:
+            return None
+        period_end = task.dag.following_schedule(execution_date)
+        if period_end is None:
+            return None
+        return period_end + task.sla
+
     @reconstructor
     def init_on_load(self):
         """ Initialize the attributes that aren't stored in the DB. """
@@ -494,6 +519,8 @@ class TaskInstance(Base, LoggingMixin):
             self.operator = ti.operator
             self.queued_dttm = ti.queued_dttm
             self.pid = ti.pid
+            self.sla_deadline = ti.sla_deadline
+            self.queued_by_job_id = ti.queued_by_job_id
             if refresh_executor_config:
                 self.executor_config = ti.executor_config
         else:
@@ -938,6 +965,11 @@ class TaskInstance(Base, LoggingMixin):
                 start_time = time.time()
 
                 self.render_templates(context=context)
+                if MAX_NUM_RENDERED_TI_FIELDS_PER_TASK > 0:
+                    RenderedTaskInstanceFields(ti=self, render_templates=False).write(session=session)
+                    RenderedTaskInstanceFields.delete_old_records(
+                        self.task_id, self.dag_id, session=session)
+                    session.commit()
                 task_copy.pre_execute(context=context)
 
                 # If a timeout is specified for the task, make it fail
@@ -1011,6 +1043,8 @@ class TaskInstance(Base, LoggingMixin):
             session.add(Log(self.state, self))
             session.merge(self)
         session.commit()
+        if not test_mode:
+            notify_scheduler(task.dag, session)
 
     @provide_session
     def run(
@@ -1065,7 +1099,8 @@ class TaskInstance(Base, LoggingMixin):
         # Log reschedule request
         session.add(TaskReschedule(self.task, self.execution_date, self._try_number,
                     actual_start_date, self.end_date,
-                    reschedule_exception.reschedule_date))
+                    reschedule_exception.reschedule_date,
+                    reschedule_exception.resume_token))
 
         # set state
         self.state = State.UP_FOR_RESCHEDULE
@@ -1136,6 +1171,8 @@ class TaskInstance(Base, LoggingMixin):
         if not test_mode:
             session.merge(self)
         session.commit()
+        if not test_mode:
+            notify_scheduler(task.dag if task.has_dag() else None, session)
 
     def is_eligible_to_retry(self):
         """Is task instance is eligible for retry"""
@@ -1461,3 +1498,10 @@ class TaskInstance(Base, LoggingMixin):
         """
         self.raw = raw
         self._set_context(self)
+
+
+# The old state is loaded when the state is replaced, so that the transition
+# is recorded in the DAG statistics when flushed
+@event.listens_for(TaskInstance.state, 'set', active_history=True)
+def _load_old_state(target, value, oldvalue, initiator):
+    pass
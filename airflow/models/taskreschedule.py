@@ -17,7 +17,7 @@
 # specific language governing permissions and limitations
 # under the License.
 """TaskReschedule tracks rescheduled task instances."""
-from sqlalchemy import Column, ForeignKeyConstraint, Index, Integer, String, asc
+from sqlalchemy import Column, ForeignKeyConstraint, Index, Integer, String, Text, asc
 
 from airflow.models.base import Base, ID_LEN
 from airflow.utils.db import provide_session
@@ -40,6 +40,8 @@ class TaskReschedule(Base):
     end_date = Column(UtcDateTime, nullable=False)
     duration = Column(Integer, nullable=False)
     reschedule_date = Column(UtcDateTime, nullable=False)
+    # The token a resumable operator resumes its remote job with
+    resume_token = Column(Text)
 
     __table_args__ = (
         Index('idx_task_reschedule_dag_task_date', dag_id, task_id, execution_date,
@@ -52,7 +54,7 @@ class TaskReschedule(Base):
     )
 
     def __init__(self, task, execution_date, try_number, start_date, end_date,
-                 reschedule_date):
+                 reschedule_date, resume_token=None):
         self.dag_id = task.dag_id
         self.task_id = task.task_id
         self.execution_date = execution_date
@@ -60,6 +62,7 @@ class TaskReschedule(Base):
         self.start_date = start_date
         self.end_date = end_date
         self.reschedule_date = reschedule_date
+        self.resume_token = resume_token
         self.duration = (self.end_date - self.start_date).total_seconds()
 
     @staticmethod
@@ -29,6 +29,7 @@ from airflow.exceptions import AirflowException
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
 from airflow.utils.file import TemporaryDirectory
+from airflow.utils.log.output_capture import OutputCapture, get_output_max_bytes
 from airflow.utils.operator_helpers import context_to_airflow_vars
 
 
@@ -53,6 +54,10 @@ class BashOperator(BaseOperator):
     :type env: dict
     :param output_encoding: Output encoding of bash command
     :type output_encoding: str
+    :param output_max_bytes: The maximum number of bytes of the output of the
+        command copied to the log, defaults to ``[core] task_output_max_bytes``.
+        Its first and last halves are kept when the output is longer.
+    :type output_max_bytes: int
     """
     template_fields = ('bash_command', 'env')
     template_ext = ('.sh', '.bash',)
@@ -65,6 +70,7 @@ class BashOperator(BaseOperator):
             xcom_push=False,
             env=None,
             output_encoding='utf-8',
+            output_max_bytes=None,
             *args, **kwargs):
 
         super(BashOperator, self).__init__(*args, **kwargs)
@@ -72,6 +78,7 @@ class BashOperator(BaseOperator):
         self.env = env
         self.xcom_push_flag = xcom_push
         self.output_encoding = output_encoding
+        self.output_max_bytes = output_max_bytes
 
     def execute(self, context):
         """
@@ -122,10 +129,11 @@ class BashOperator(BaseOperator):
                 self.sp = sp
 
                 self.log.info("Output:")
-                line = ''
-                for line in iter(sp.stdout.readline, b''):
-                    line = line.decode(self.output_encoding).rstrip()
-                    self.log.info(line)
+                with OutputCapture(self.log, encoding=self.output_encoding,
+                                   max_bytes=get_output_max_bytes(
+                                       self.output_max_bytes)) as capture:
+                    capture.copy_stream(sp.stdout)
+                line = capture.last_line
                 sp.wait()
                 self.log.info(
                     "Command exited with return code %s",
@@ -29,6 +29,7 @@ from airflow.exceptions import AirflowException
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
 from airflow.utils.file import TemporaryDirectory
+from airflow.utils.log.output_capture import OutputCapture, get_output_max_bytes
 
 
 class DockerOperator(BaseOperator):
@@ -123,6 +124,10 @@ class DockerOperator(BaseOperator):
     :param tty: Allocate pseudo-TTY to the container
         This needs to be set see logs of the Docker container.
     :type tty: bool
+    :param output_max_bytes: The maximum number of bytes of the output of the
+        container copied to the log, defaults to ``[core] task_output_max_bytes``.
+        Its first and last halves are kept when the output is longer.
+    :type output_max_bytes: int
     """
     template_fields = ('command', 'environment', 'container_name')
     template_ext = ('.sh', '.bash',)
@@ -158,6 +163,7 @@ class DockerOperator(BaseOperator):
             auto_remove=False,
             shm_size=None,
             tty=False,
+            output_max_bytes=None,
             *args,
             **kwargs):
 
@@ -190,6 +196,7 @@ class DockerOperator(BaseOperator):
         self.docker_conn_id = docker_conn_id
         self.shm_size = shm_size
         self.tty = tty
+        self.output_max_bytes = output_max_bytes
 
         self.cli = None
         self.container = None
@@ -231,15 +238,13 @@ class DockerOperator(BaseOperator):
             )
             self.cli.start(self.container['Id'])
 
-            line = ''
-            for line in self.cli.attach(container=self.container['Id'],
-                                        stdout=True,
-                                        stderr=True,
-                                        stream=True):
-                line = line.strip()
-                if hasattr(line, 'decode'):
-                    line = line.decode('utf-8')
-                self.log.info(line)
+            with OutputCapture(self.log, max_bytes=get_output_max_bytes(
+                    self.output_max_bytes)) as capture:
+                for chunk in self.cli.attach(container=self.container['Id'],
+                                             stdout=True,
+                                             stderr=True,
+                                             stream=True):
+                    capture.write(chunk)
 
             result = self.cli.wait(self.container['Id'])
             if result['StatusCode'] != 0:
@@ -247,7 +252,7 @@ class DockerOperator(BaseOperator):
 
             if self.xcom_push_flag:
                 return self.cli.logs(container=self.container['Id']) \
-                    if self.xcom_all else str(line)
+                    if self.xcom_all else str(capture.last_line)
 
     def execute(self, context):
 
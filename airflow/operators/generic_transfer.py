@@ -29,7 +29,10 @@ class GenericTransfer(BaseOperator):
     needs to expose a `get_records` method, and the destination a
     `insert_rows` method.
 
-    This is meant to be used on small-ish datasets that fit in memory.
+    When the source hook exposes an `iter_records` method, as all the
+    DbApiHook do, the records are streamed from the source and inserted
+    ``batch_size`` at a time, so memory use stays bounded whatever the size
+    of the dataset. Otherwise the whole dataset is loaded in memory.
 
     :param sql: SQL query to execute against the source database. (templated)
     :type sql: str
@@ -42,6 +45,9 @@ class GenericTransfer(BaseOperator):
     :param preoperator: sql statement or list of statements to be
         executed prior to loading the data. (templated)
     :type preoperator: str or list[str]
+    :param batch_size: number of records fetched from the source and
+        inserted into the destination at a time
+    :type batch_size: int
     """
 
     template_fields = ('sql', 'destination_table', 'preoperator')
@@ -56,6 +62,7 @@ class GenericTransfer(BaseOperator):
             source_conn_id,
             destination_conn_id,
             preoperator=None,
+            batch_size=1000,
             *args, **kwargs):
         super(GenericTransfer, self).__init__(*args, **kwargs)
         self.sql = sql
@@ -63,13 +70,19 @@ class GenericTransfer(BaseOperator):
         self.source_conn_id = source_conn_id
         self.destination_conn_id = destination_conn_id
         self.preoperator = preoperator
+        self.batch_size = batch_size
 
     def execute(self, context):
         source_hook = BaseHook.get_hook(self.source_conn_id)
 
         self.log.info("Extracting data from %s", self.source_conn_id)
         self.log.info("Executing: \n %s", self.sql)
-        results = source_hook.get_records(self.sql)
+        streaming = hasattr(source_hook, 'iter_records')
+        if streaming:
+            # the query only runs once the records are consumed, after the preoperator
+            results = source_hook.iter_records(self.sql, batch_size=self.batch_size)
+        else:
+            results = source_hook.get_records(self.sql)
 
         destination_hook = BaseHook.get_hook(self.destination_conn_id)
         if self.preoperator:
@@ -78,4 +91,8 @@ class GenericTransfer(BaseOperator):
             destination_hook.run(self.preoperator)
 
         self.log.info("Inserting rows into %s", self.destination_conn_id)
-        destination_hook.insert_rows(table=self.destination_table, rows=results)
+        if streaming:
+            destination_hook.insert_rows(table=self.destination_table, rows=results,
+                                         commit_every=self.batch_size, executemany=True)
+        else:
+            destination_hook.insert_rows(table=self.destination_table, rows=results)
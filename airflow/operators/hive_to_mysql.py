@@ -28,9 +28,9 @@ from airflow.utils.operator_helpers import context_to_airflow_vars
 
 class HiveToMySqlTransfer(BaseOperator):
     """
-    Moves data from Hive to MySQL, note that for now the data is loaded
-    into memory before being pushed to MySQL, so this operator should
-    be used for smallish amount of data.
+    Moves data from Hive to MySQL. The records are streamed from Hive and
+    inserted into MySQL ``batch_size`` at a time, or go through a local file
+    with ``bulk_load``, so memory use stays bounded.
 
     :param sql: SQL query to execute against Hive server. (templated)
     :type sql: str
@@ -55,6 +55,9 @@ class HiveToMySqlTransfer(BaseOperator):
         This option requires an extra connection parameter for the
         destination MySQL connection: {'local_infile': true}.
     :type bulk_load: bool
+    :param batch_size: number of records fetched from Hive and inserted into
+        MySQL at a time
+    :type batch_size: int
     """
 
     template_fields = ('sql', 'mysql_table', 'mysql_preoperator',
@@ -72,6 +75,7 @@ class HiveToMySqlTransfer(BaseOperator):
             mysql_preoperator=None,
             mysql_postoperator=None,
             bulk_load=False,
+            batch_size=1000,
             *args, **kwargs):
         super(HiveToMySqlTransfer, self).__init__(*args, **kwargs)
         self.sql = sql
@@ -81,6 +85,7 @@ class HiveToMySqlTransfer(BaseOperator):
         self.mysql_postoperator = mysql_postoperator
         self.hiveserver2_conn_id = hiveserver2_conn_id
         self.bulk_load = bulk_load
+        self.batch_size = batch_size
 
     def execute(self, context):
         hive = HiveServer2Hook(hiveserver2_conn_id=self.hiveserver2_conn_id)
@@ -92,7 +97,8 @@ class HiveToMySqlTransfer(BaseOperator):
                         lineterminator='\n', output_header=False,
                         hive_conf=context_to_airflow_vars(context))
         else:
-            results = hive.get_records(self.sql)
+            # the query only runs once the records are consumed, after the preoperator
+            results = hive.iter_records(self.sql, fetch_size=self.batch_size)
 
         mysql = MySqlHook(mysql_conn_id=self.mysql_conn_id)
         if self.mysql_preoperator:
@@ -105,7 +111,8 @@ class HiveToMySqlTransfer(BaseOperator):
             mysql.bulk_load(table=self.mysql_table, tmp_file=tmpfile.name)
             tmpfile.close()
         else:
-            mysql.insert_rows(table=self.mysql_table, rows=results)
+            mysql.insert_rows(table=self.mysql_table, rows=results,
+                              commit_every=self.batch_size, executemany=True)
 
         if self.mysql_postoperator:
             self.log.info("Running MySQL postoperator")
@@ -120,7 +120,8 @@ class MySqlToHiveTransfer(BaseOperator):
 
         self.log.info("Dumping MySQL query results to local file")
         conn = mysql.get_conn()
-        cursor = conn.cursor()
+        # stream the rows to the file rather than buffering them all
+        cursor = mysql.get_server_side_cursor(conn)
         cursor.execute(self.sql)
         with NamedTemporaryFile("wb") as f:
             csv_writer = csv.writer(f, delimiter=self.delimiter,
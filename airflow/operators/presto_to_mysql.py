@@ -25,9 +25,8 @@ from airflow.utils.decorators import apply_defaults
 
 class PrestoToMySqlTransfer(BaseOperator):
     """
-    Moves data from Presto to MySQL, note that for now the data is loaded
-    into memory before being pushed to MySQL, so this operator should
-    be used for smallish amount of data.
+    Moves data from Presto to MySQL. The records are streamed from Presto and
+    inserted into MySQL ``batch_size`` at a time, so memory use stays bounded.
 
     :param sql: SQL query to execute against Presto. (templated)
     :type sql: str
@@ -43,6 +42,9 @@ class PrestoToMySqlTransfer(BaseOperator):
         of the data coming in, allowing the task to be idempotent (running
         the task twice won't double load data). (templated)
     :type mysql_preoperator: str
+    :param batch_size: number of records fetched from Presto and inserted
+        into MySQL at a time
+    :type batch_size: int
     """
 
     template_fields = ('sql', 'mysql_table', 'mysql_preoperator')
@@ -57,6 +59,7 @@ class PrestoToMySqlTransfer(BaseOperator):
             presto_conn_id='presto_default',
             mysql_conn_id='mysql_default',
             mysql_preoperator=None,
+            batch_size=1000,
             *args, **kwargs):
         super(PrestoToMySqlTransfer, self).__init__(*args, **kwargs)
         self.sql = sql
@@ -64,11 +67,13 @@ class PrestoToMySqlTransfer(BaseOperator):
         self.mysql_conn_id = mysql_conn_id
         self.mysql_preoperator = mysql_preoperator
         self.presto_conn_id = presto_conn_id
+        self.batch_size = batch_size
 
     def execute(self, context):
         presto = PrestoHook(presto_conn_id=self.presto_conn_id)
         self.log.info("Extracting data from Presto: %s", self.sql)
-        results = presto.get_records(self.sql)
+        # the query only runs once the records are consumed, after the preoperator
+        results = presto.iter_records(self.sql, batch_size=self.batch_size)
 
         mysql = MySqlHook(mysql_conn_id=self.mysql_conn_id)
         if self.mysql_preoperator:
@@ -77,4 +82,5 @@ class PrestoToMySqlTransfer(BaseOperator):
             mysql.run(self.mysql_preoperator)
 
         self.log.info("Inserting rows into MySQL")
-        mysql.insert_rows(table=self.mysql_table, rows=results)
+        mysql.insert_rows(table=self.mysql_table, rows=results,
+                          commit_every=self.batch_size, executemany=True)
@@ -18,18 +18,28 @@
 # under the License.
 
 from airflow import settings
+from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.executors.sequential_executor import SequentialExecutor
-from airflow.models import BaseOperator, Pool
+from airflow.models import BaseOperator, DagRun, Pool, ResumableMixin, TaskInstance
+from airflow.utils import timezone
 from airflow.utils.decorators import apply_defaults
-from airflow.utils.db import provide_session
+from airflow.utils.db import create_session, provide_session
+from airflow.utils.state import State
 
 
-class SubDagOperator(BaseOperator):
+class SubDagOperator(ResumableMixin, BaseOperator):
     """
     This runs a sub dag. By convention, a sub dag's dag_id
     should be prefixed by its parent and a dot. As in `parent.child`.
 
+    By default the sub dag is run by a backfill job inside the worker running
+    this task. When ``flatten`` is set, the operator instead creates a DAG run
+    of the sub dag, whose tasks are then scheduled by the scheduler like the
+    tasks of any DAG, honouring the pools and the parallelism, and the task
+    instance is rescheduled every ``resume_interval`` seconds until the run
+    is done, without holding a worker slot while it waits.
+
     :param subdag: the DAG object to run as a subdag of the current DAG.
     :type subdag: airflow.models.DAG
     :param dag: the parent DAG for the subdag.
@@ -37,6 +47,13 @@ class SubDagOperator(BaseOperator):
     :param executor: the executor for this subdag. Default to use SequentialExecutor.
         Please find AIRFLOW-74 for more details.
     :type executor: airflow.executors.base_executor.BaseExecutor
+    :param flatten: whether the tasks of the subdag are scheduled by the
+        scheduler instead of a backfill job, defaults to the
+        ``[core] flatten_subdags`` setting. The executor is not used then.
+    :type flatten: bool
+    :param resume_interval: the seconds between the checks of the DAG run of
+        the subdag, when it is flattened.
+    :type resume_interval: int
     """
 
     ui_color = '#555'
@@ -48,6 +65,8 @@ class SubDagOperator(BaseOperator):
             self,
             subdag,
             executor=SequentialExecutor(),
+            flatten=None,
+            resume_interval=60,
             *args, **kwargs):
         dag = kwargs.get('dag') or settings.CONTEXT_MANAGER_DAG
         if not dag:
@@ -64,9 +83,15 @@ class SubDagOperator(BaseOperator):
                 "'{d}.{t}'; received '{rcvd}'.".format(
                     d=dag.dag_id, t=kwargs['task_id'], rcvd=subdag.dag_id))
 
+        if flatten is None:
+            flatten = conf.getboolean('core', 'flatten_subdags', fallback=False)
+        self.flatten = flatten
+        self.resumable = flatten
+        self.resume_interval = resume_interval
+
         # validate that subdag operator and subdag tasks don't have a
-        # pool conflict
-        if self.pool:
+        # pool conflict, the flattened ones release their slot while waiting
+        if self.pool and not self.flatten:
             conflicts = [t for t in subdag.tasks if t.pool == self.pool]
             if conflicts:
                 # only query for pool conflicts if one may exist
@@ -96,7 +121,77 @@ class SubDagOperator(BaseOperator):
         self.executor = executor
 
     def execute(self, context):
+        if self.flatten:
+            return self.execute_resumable(context)
         ed = context['execution_date']
         self.subdag.run(
             start_date=ed, end_date=ed, donot_pickle=True,
             executor=self.executor)
+
+    def submit(self, context):
+        """
+        Creates the DAG run of the subdag for the execution date, for the
+        scheduler to schedule its tasks. The failed task instances of an
+        existing failed run are cleared, so that a retry runs them again.
+        """
+        execution_date = context['execution_date']
+        with create_session() as session:
+            dag_run = self.subdag.get_dagrun(execution_date, session=session)
+            if dag_run is None:
+                dag_run = self.subdag.create_dagrun(
+                    run_id=DagRun.ID_FORMAT_PREFIX.format(execution_date.isoformat()),
+                    execution_date=execution_date,
+                    start_date=timezone.utcnow(),
+                    state=State.RUNNING,
+                    external_trigger=True,
+                    session=session,
+                )
+                self.log.info("Created the DAG run %s of %s", dag_run.run_id,
+                              self.subdag.dag_id)
+            elif dag_run.is_backfill:
+                raise AirflowException(
+                    "The DAG run {} of {} was created by a backfill job, it can't be "
+                    "scheduled by the scheduler".format(dag_run.run_id, self.subdag.dag_id))
+            elif dag_run.state == State.FAILED:
+                self.log.info("Clearing the failed task instances of the DAG run %s of %s",
+                              dag_run.run_id, self.subdag.dag_id)
+                TI = TaskInstance
+                session.query(TI).filter(
+                    TI.dag_id == self.subdag.dag_id,
+                    TI.execution_date == execution_date,
+                    TI.state.in_([State.FAILED, State.UPSTREAM_FAILED]),
+                ).update({TI.state: State.NONE}, synchronize_session=False)
+                dag_run.state = State.RUNNING
+                session.merge(dag_run)
+            return dag_run.run_id
+
+    def poll(self, context, resume_token):
+        dag_run = DagRun.find(dag_id=self.subdag.dag_id, run_id=resume_token)
+        if not dag_run:
+            raise AirflowException("The DAG run {} of {} does not exist anymore".format(
+                resume_token, self.subdag.dag_id))
+        state = dag_run[0].get_state()
+        if state == State.FAILED:
+            raise AirflowException("The DAG run {} of {} failed".format(
+                resume_token, self.subdag.dag_id))
+        return state == State.SUCCESS
+
+
+def get_flattening_root(dag):
+    """
+    Returns the top level DAG whose scheduling includes the tasks of the
+    given subdag, when its SubDagOperator flattens it, None otherwise.
+
+    :param dag: the DAG, e.g. a subdag
+    :type dag: airflow.models.DAG
+    :rtype: airflow.models.DAG
+    """
+    if dag.parent_dag is None:
+        return None
+    parent_dag = dag.parent_dag
+    task = parent_dag.task_dict.get(dag.dag_id[len(parent_dag.dag_id) + 1:])
+    if not getattr(task, 'flatten', False):
+        return None
+    while parent_dag.parent_dag is not None:
+        parent_dag = parent_dag.parent_dag
+    return parent_dag
@@ -17,6 +17,8 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from collections import OrderedDict
+
 from past.builtins import basestring
 
 from airflow.sensors.base_sensor_operator import BaseSensorOperator
@@ -94,9 +96,28 @@ class NamedHivePartitionSensor(BaseSensorOperator):
             schema, table, partition)
 
     def poke(self, context):
+        if not self.hook:
+            from airflow.hooks.hive_hooks import HiveMetastoreHook
+            self.hook = HiveMetastoreHook(
+                metastore_conn_id=self.metastore_conn_id)
+
+        # The partitions of a table are checked in a single call
+        partitions_by_table = OrderedDict()
+        for partition_name in self.partition_names:
+            schema, table, partition = self.parse_partition_name(partition_name)
+            partitions_by_table.setdefault((schema, table), []).append(
+                (partition_name, partition))
+
+        missing = set()
+        for (schema, table), partitions in partitions_by_table.items():
+            self.log.info('Poking for %s partitions of %s.%s', len(partitions), schema, table)
+            existing = self.hook.check_for_named_partitions(
+                schema, table, [partition for _, partition in partitions])
+            missing.update(partition_name for partition_name, partition in partitions
+                           if partition not in existing)
 
         self.partition_names = [
             partition_name for partition_name in self.partition_names
-            if not self.poke_partition(partition_name)
+            if partition_name in missing
         ]
         return not self.partition_names
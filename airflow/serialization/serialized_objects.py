@@ -22,6 +22,7 @@
 import datetime
 import enum
 import logging
+import weakref
 import six
 from typing import TYPE_CHECKING, Optional, Union, Dict
 
@@ -30,12 +31,12 @@ import pendulum
 from dateutil import relativedelta
 
 from airflow import DAG, AirflowException, LoggingMixin
+from airflow.configuration import conf
 from airflow.models.baseoperator import BaseOperator, BaseOperatorLink
 from airflow.models.connection import Connection
 from airflow.serialization.enums import DagAttributeTypes as DAT, Encoding
 from airflow.serialization.json_schema import Validator, load_dag_schema
 from airflow.settings import json
-from airflow.www.utils import get_python_source
 
 try:
     from inspect import signature
@@ -45,6 +46,19 @@ except ImportError:
 if TYPE_CHECKING:
     from inspect import Parameter
 
+# Whether the serialized DAGs are validated against the JSON schema, which
+# costs about as much as the serialization itself
+VALIDATE_SERIALIZED_DAGS = conf.getboolean('core', 'validate_serialized_dags', fallback=True)
+
+# Constructor default of the fields without one
+_NO_DEFAULT = object()
+
+# Source of the callables serialized, they are usually shared by many tasks
+_callable_sources = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
+# Types serialized as they are
+_PLAIN_TYPES = frozenset((str, six.text_type, bool, float) + six.integer_types)
+
 
 class BaseSerialization:
     """BaseSerialization provides utils for serialization."""
@@ -65,6 +79,9 @@ class BaseSerialization:
 
     SERIALIZER_VERSION = 1
 
+    # Fields to serialize per serializer and object class, see _get_field_plan
+    _field_plans = {}  # type: Dict[tuple, tuple]
+
     @classmethod
     def to_json(cls, var):
         # type: (Union[DAG, BaseOperator, dict, list, set, tuple]) -> str
@@ -127,18 +144,54 @@ class BaseSerialization:
             cls._value_is_hardcoded_default(attrname, var)
         )
 
+    @classmethod
+    def _needs_exclusion_check(cls, attrname):
+        """
+        Whether ``attrname`` can be excluded from serialization for other
+        reasons than being None, of an excluded type or its default value.
+        """
+        return False
+
+    @classmethod
+    def _get_field_plan(cls, object_type, decorated_fields):
+        """
+        Returns the fields of ``object_type`` to serialize, sorted, as
+        ``(name, constructor default, is decorated, needs exclusion check)``
+        tuples. They are computed once per class rather than for every
+        object serialized.
+        """
+        plan_key = (cls, object_type, frozenset(decorated_fields))
+        plan = cls._field_plans.get(plan_key)
+        if plan is None:
+            plan = tuple(
+                (key,
+                 cls._CONSTRUCTOR_PARAMS[key].default if key in cls._CONSTRUCTOR_PARAMS
+                 else _NO_DEFAULT,
+                 key in decorated_fields,
+                 cls._needs_exclusion_check(key))
+                for key in sorted(object_type.get_serialized_fields())
+            )
+            cls._field_plans[plan_key] = plan
+        return plan
+
     @classmethod
     def serialize_to_json(cls, object_to_serialize, decorated_fields):
         """Serializes an object to json"""
         serialized_object = {}
-        keys_to_serialize = object_to_serialize.get_serialized_fields()
-        for key in keys_to_serialize:
+        excluded_types = cls._excluded_types
+        for key, default, decorated, check_exclusion in cls._get_field_plan(
+                type(object_to_serialize), decorated_fields):
             # None is ignored in serialized form and is added back in deserialization.
             value = getattr(object_to_serialize, key, None)
-            if cls._is_excluded(value, key, object_to_serialize):
+            # Same checks as _is_excluded, see _value_is_hardcoded_default for the default
+            if value is None or value is default or isinstance(value, excluded_types):
+                continue
+            if check_exclusion and cls._is_excluded(value, key, object_to_serialize):
                 continue
 
-            if key in decorated_fields:
+            if type(value) in _PLAIN_TYPES:
+                serialized_object[key] = value
+            elif decorated:
                 serialized_object[key] = cls._serialize(value)
             else:
                 value = cls._serialize(value)
@@ -147,6 +200,23 @@ class BaseSerialization:
                 serialized_object[key] = value
         return serialized_object
 
+    @staticmethod
+    def _serialize_callable(var):
+        """The source of a callable, looked up once per callable"""
+        try:
+            return _callable_sources[var]
+        except (KeyError, TypeError):
+            pass
+        # Only needed to serialize, importing the web UI utils is slow
+        from airflow.www.utils import get_python_source
+        source = str(get_python_source(var, return_none_if_x_none=True))
+        try:
+            _callable_sources[var] = source
+        except TypeError:
+            # Not weakly referenceable
+            pass
+        return source
+
     @classmethod
     def _serialize(cls, var):  # pylint: disable=too-many-return-statements
         """Helper function of depth first search for serialization.
@@ -195,7 +265,7 @@ class BaseSerialization:
                     encoded['weekday'] = [var.weekday.weekday]
                 return cls._encode(encoded, type_=DAT.RELATIVEDELTA)
             elif callable(var):
-                return str(get_python_source(var, return_none_if_x_none=True))
+                return cls._serialize_callable(var)
             elif isinstance(var, set):
                 # FIXME: casts set to list in customized serialization in future.
                 return cls._encode(
@@ -231,7 +301,7 @@ class BaseSerialization:
         elif type_ == DAT.OP:
             return SerializedBaseOperator.deserialize_operator(var)
         elif type_ == DAT.DATETIME:
-            return pendulum.from_timestamp(var)
+            return cls._deserialize_datetime(var)
         elif type_ == DAT.TIMEDELTA:
             return datetime.timedelta(seconds=var)
         elif type_ == DAT.TIMEZONE:
@@ -247,7 +317,17 @@ class BaseSerialization:
         else:
             raise TypeError('Invalid type {!s} in deserialization.'.format(type_))
 
-    _deserialize_datetime = pendulum.from_timestamp
+    # Deserialized dates by timestamp, most tasks share their dates
+    _datetimes = {}  # type: Dict[float, datetime.datetime]
+
+    @classmethod
+    def _deserialize_datetime(cls, timestamp):
+        dttm = BaseSerialization._datetimes.get(timestamp)
+        if dttm is None:
+            if len(BaseSerialization._datetimes) >= 1024:
+                BaseSerialization._datetimes.clear()
+            dttm = BaseSerialization._datetimes[timestamp] = pendulum.from_timestamp(timestamp)
+        return dttm
 
     @classmethod
     def _deserialize_timezone(cls, name):
@@ -273,6 +353,49 @@ class BaseSerialization:
         return False
 
 
+def _copy_containers(value):
+    """Copies the dicts, lists and sets in ``value``, faster than deepcopy"""
+    if isinstance(value, dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    elif isinstance(value, set):
+        return set(value)
+    return value
+
+
+class _LazyField(object):
+    """
+    Attribute of the deserialized operators kept in its serialized form until
+    it is first read, see SerializedBaseOperator.deserialize_operator.
+
+    :param name: the name of the attribute
+    :type name: str
+    :param decode: decodes the serialized value, called with the operator
+        and the serialized value
+    :type decode: callable
+    """
+
+    def __init__(self, name, decode):
+        self.name = name
+        self.decode = decode
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        encoded_fields = instance.__dict__.get('_encoded_fields')
+        if encoded_fields and self.name in encoded_fields:
+            instance.__dict__[self.name] = self.decode(instance, encoded_fields[self.name])
+            encoded_fields.pop(self.name, None)
+        return instance.__dict__.get(self.name)
+
+    def __set__(self, instance, value):
+        encoded_fields = instance.__dict__.get('_encoded_fields')
+        if encoded_fields:
+            encoded_fields.pop(self.name, None)
+        instance.__dict__[self.name] = value
+
+
 class SerializedBaseOperator(BaseOperator, BaseSerialization):
     """A JSON serializable representation of operator.
 
@@ -286,6 +409,16 @@ class SerializedBaseOperator(BaseOperator, BaseSerialization):
         if v.default is not v.empty and v.default is not None
     }
 
+    # Attributes set by the constructor, copied to the deserialized operators
+    _constructor_attrs = None  # type: Optional[tuple]
+
+    # These are only decoded when read, the subdag of a SubDagOperator is a
+    # whole DAG and the extra links may have to be looked up in the plugins
+    subdag = _LazyField('subdag', lambda op, v: op._deserialize_subdag(v))
+    executor_config = _LazyField('executor_config', lambda op, v: op._deserialize(v))
+    operator_extra_links = _LazyField(
+        'operator_extra_links', lambda op, v: op._deserialize_extra_links(v))
+
     def __init__(self, *args, **kwargs):
         super(SerializedBaseOperator, self).__init__(*args, **kwargs)
         # task_type is used by UI to display the correct class type, because UI only
@@ -326,61 +459,112 @@ class SerializedBaseOperator(BaseOperator, BaseSerialization):
                 cls._serialize_operator_extra_links(op.operator_extra_links)
         return serialize_op
 
+    @classmethod
+    def _new_operator(cls, task_id):
+        # type: (str) -> SerializedBaseOperator
+        """
+        Returns a new operator with the attributes set by the constructor,
+        copied from those of an operator built once, since running the
+        constructor for every task is what deserialization spent most of its
+        time on.
+        """
+        if cls._constructor_attrs is None:
+            attrs = dict(vars(SerializedBaseOperator(task_id=task_id)))
+            attrs.pop('_dag', None)
+            attrs.pop('_log', None)
+            # The dicts, lists and sets are copied for every operator
+            SerializedBaseOperator._constructor_attrs = (
+                {k: v for k, v in attrs.items() if not isinstance(v, (dict, list, set))},
+                {k: v for k, v in attrs.items() if isinstance(v, (dict, list, set))},
+            )
+
+        op = SerializedBaseOperator.__new__(SerializedBaseOperator)
+        immutable_attrs, container_attrs = cls._constructor_attrs
+        op_attrs = op.__dict__
+        op_attrs.update(immutable_attrs)
+        for k, v in container_attrs.items():
+            op_attrs[k] = _copy_containers(v)
+        op.task_id = task_id
+        return op
+
     @classmethod
     def deserialize_operator(cls, encoded_op):
         # type: (dict) -> BaseOperator
         """Deserializes an operator from a JSON object.
         """
-        from airflow.plugins_manager import operator_extra_links
-
-        op = SerializedBaseOperator(task_id=encoded_op['task_id'])
-
-        # Extra Operator Links defined in Plugins
-        op_extra_links_from_plugin = {}
-
-        for ope in operator_extra_links:
-            for operator in ope.operators:
-                if operator.__name__ == encoded_op["_task_type"] and \
-                        operator.__module__ == encoded_op["_task_module"]:
-                    op_extra_links_from_plugin.update({ope.name: ope})
-
-        # If OperatorLinks are defined in Plugins but not in the Operator that is being Serialized
-        # set the Operator links attribute
-        # The case for "If OperatorLinks are defined in the operator that is being Serialized"
-        # is handled in the deserialization loop where it matches k == "_operator_extra_links"
-        if op_extra_links_from_plugin and "_operator_extra_links" not in encoded_op:
-            setattr(op, "operator_extra_links", list(op_extra_links_from_plugin.values()))
+        op = cls._new_operator(encoded_op['task_id'])
+        # The extra links defined by the operator are merged with those
+        # defined in plugins when read
+        encoded_fields = {'operator_extra_links': encoded_op.get('_operator_extra_links')}
+        serialized_fields = op.get_serialized_fields()
 
         for k, v in encoded_op.items():
 
             if k == "_downstream_task_ids":
                 v = set(v)
-            elif k == "subdag":
-                v = SerializedDAG.deserialize_dag(v)
+            elif k in {"subdag", "executor_config"}:
+                encoded_fields[k] = v
+                continue
             elif k in {"retry_delay", "execution_timeout"}:
                 v = cls._deserialize_timedelta(v)
             elif k.endswith("_date"):
                 v = cls._deserialize_datetime(v)
             elif k == "_operator_extra_links":
-                op_predefined_extra_links = cls._deserialize_operator_extra_links(v)
-
-                # If OperatorLinks with the same name exists, Links via Plugin have higher precedence
-                op_predefined_extra_links.update(op_extra_links_from_plugin)
-
-                v = list(op_predefined_extra_links.values())
-                k = "operator_extra_links"
-            elif k in cls._decorated_fields or k not in op.get_serialized_fields():
+                continue
+            elif k in cls._decorated_fields or k not in serialized_fields:
                 v = cls._deserialize(v)
             # else use v as it is
 
             setattr(op, k, v)
 
-        for k in op.get_serialized_fields() - set(encoded_op.keys()) - set(
+        for k in serialized_fields - set(encoded_op.keys()) - set(
                 cls._CONSTRUCTOR_PARAMS.keys()):
             setattr(op, k, None)
 
+        op._encoded_fields = encoded_fields
         return op
 
+    def _deserialize_subdag(self, encoded_subdag):
+        """Decodes the subdag of the operator, linked to the DAG of the operator"""
+        subdag = SerializedDAG.deserialize_dag(encoded_subdag)
+        if self.has_dag():
+            subdag.parent_dag = self.dag
+        subdag.is_subdag = True
+        return subdag
+
+    def _deserialize_extra_links(self, encoded_op_links):
+        """
+        Decodes the extra links of the operator, the links defined in plugins
+        for the class of the operator take precedence.
+        """
+        from airflow.plugins_manager import operator_extra_links
+
+        # Extra Operator Links defined in Plugins
+        op_extra_links_from_plugin = {}
+        for ope in operator_extra_links:
+            for operator in ope.operators:
+                if operator.__name__ == self._task_type and \
+                        operator.__module__ == getattr(self, '_task_module', None):
+                    op_extra_links_from_plugin.update({ope.name: ope})
+
+        if encoded_op_links is None:
+            # If OperatorLinks are defined in Plugins but not in the Operator
+            # that is being Serialized set the Operator links attribute
+            if op_extra_links_from_plugin:
+                return list(op_extra_links_from_plugin.values())
+            return BaseOperator.operator_extra_links
+
+        op_predefined_extra_links = self._deserialize_operator_extra_links(encoded_op_links)
+
+        # If OperatorLinks with the same name exists, Links via Plugin have higher precedence
+        op_predefined_extra_links.update(op_extra_links_from_plugin)
+
+        return list(op_predefined_extra_links.values())
+
+    @classmethod
+    def _needs_exclusion_check(cls, attrname):
+        return attrname.endswith("_date") or attrname in {"executor_config", "params"}
+
     @classmethod
     def _is_excluded(cls, var, attrname, op):
         if var is not None and op.has_dag() and attrname.endswith("_date"):
@@ -553,10 +737,6 @@ class SerializedDAG(DAG, BaseSerialization):
                 if getattr(serializable_task, date_attr) is None:
                     setattr(serializable_task, date_attr, getattr(dag, date_attr))
 
-            if serializable_task.subdag is not None:
-                setattr(serializable_task.subdag, 'parent_dag', dag)
-                serializable_task.subdag.is_subdag = True
-
             for task_id in serializable_task.downstream_task_ids:
                 # Bypass set_upstream etc here - it does more than we want
                 # noinspection PyProtectedMember
@@ -565,17 +745,24 @@ class SerializedDAG(DAG, BaseSerialization):
         return dag
 
     @classmethod
-    def to_dict(cls, var):
+    def to_dict(cls, var, validate=None):
         # type: (...) -> dict
         """Stringifies DAGs and operators contained by var and returns a dict of var.
+
+        :param validate: whether to validate the result against the JSON schema,
+            ``[core] validate_serialized_dags`` by default
+        :type validate: bool
         """
         json_dict = {
             "__version": cls.SERIALIZER_VERSION,
             "dag": cls.serialize_dag(var)
         }
 
-        # Validate Serialized DAG with Json Schema. Raises Error if it mismatches
-        cls.validate_schema(json_dict)
+        if validate is None:
+            validate = VALIDATE_SERIALIZED_DAGS
+        if validate:
+            # Validate Serialized DAG with Json Schema. Raises Error if it mismatches
+            cls.validate_schema(json_dict)
         return json_dict
 
     @classmethod
@@ -27,6 +27,7 @@ import json
 import logging
 import os
 import pendulum
+import lazy_object_proxy
 import sys
 from typing import Any
 
@@ -150,6 +151,7 @@ LOGGING_CLASS_PATH = None
 
 engine = None
 Session = None
+_engine_created = False
 
 # The JSON library to use for DAG Serialization and De-Serialization
 json = json
@@ -213,6 +215,7 @@ def configure_orm(disable_connection_pool=False):
     log.debug("Setting up DB connection pool (PID %s)" % os.getpid())
     global engine
     global Session
+    global _engine_created
     engine_args = {}
 
     pool_connections = conf.getboolean('core', 'SQL_ALCHEMY_POOL_ENABLED')
@@ -264,8 +267,11 @@ def configure_orm(disable_connection_pool=False):
     # For Python2 we get back a newstr and need a str
     engine_args['encoding'] = engine_args['encoding'].__str__()
 
-    engine = create_engine(SQL_ALCHEMY_CONN, **engine_args)
-    setup_event_handlers(engine)
+    # The engine, and with it the database driver and the connection pool, is
+    # only created the first time something talks to the metadata database, so
+    # CLI commands that never touch the database do not pay for it.
+    engine = lazy_object_proxy.Proxy(lambda: _create_engine(SQL_ALCHEMY_CONN, engine_args))
+    _engine_created = False
 
     Session = scoped_session(
         sessionmaker(autocommit=False,
@@ -274,18 +280,30 @@ def configure_orm(disable_connection_pool=False):
                      expire_on_commit=False))
 
 
+def _create_engine(sql_alchemy_conn, engine_args):
+    global _engine_created
+    new_engine = create_engine(sql_alchemy_conn, **engine_args)
+    setup_event_handlers(new_engine)
+    _engine_created = True
+    return new_engine
+
+
 def dispose_orm():
     """ Properly close pooled database connections """
     log.debug("Disposing DB connection pool (PID %s)", os.getpid())
     global engine
     global Session
+    global _engine_created
 
     if Session:
         Session.remove()
         Session = None
-    if engine:
-        engine.dispose()
+    if engine is not None:
+        # Do not create the engine just to throw it away again
+        if _engine_created:
+            engine.dispose()
         engine = None
+        _engine_created = False
 
 
 def configure_adapters():
@@ -22,10 +22,12 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import hashlib
 import logging
 import multiprocessing
 import os
 import re
+import select
 import signal
 import sys
 import time
@@ -55,6 +57,7 @@ from airflow.utils import timezone
 from airflow.utils.helpers import reap_process_group
 from airflow.utils.db import provide_session
 from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.sharding import get_live_scheduler_ids, get_owned_file_paths
 from airflow.utils.state import State
 
 if six.PY2:
@@ -86,6 +89,23 @@ class SimpleDag(BaseDag):
                 special_args['task_concurrency'] = task.task_concurrency
             if len(special_args) > 0:
                 self._task_special_args[task.task_id] = special_args
+        self._dag_hash = self._compute_hash()
+
+    def _compute_hash(self):
+        special_args = sorted((task_id, sorted(args.items()))
+                              for task_id, args in self._task_special_args.items())
+        state = (self._dag_id, self._task_ids, self._full_filepath, self._is_paused,
+                 self._concurrency, self._pickle_id, special_args)
+        return hashlib.sha1(repr(state).encode('utf-8')).hexdigest()
+
+    @property
+    def dag_hash(self):
+        """
+        :return: a hash of the attributes of this SimpleDag, which changes
+            whenever one of them does
+        :rtype: str
+        """
+        return self._dag_hash
 
     @property
     def dag_id(self):
@@ -246,6 +266,9 @@ class SimpleTaskInstance(object):
 class SimpleDagBag(BaseDagBag):
     """
     A collection of SimpleDag objects with some convenience methods.
+
+    The bag can be kept and updated in place with the DAGs of each processed
+    file, see ``sync_file``.
     """
 
     def __init__(self, simple_dags):
@@ -255,12 +278,74 @@ class SimpleDagBag(BaseDagBag):
         :param simple_dags: SimpleDag objects that should be in this
         :type list(airflow.utils.dag_processing.SimpleDagBag)
         """
-        self.simple_dags = simple_dags
         self.dag_id_to_simple_dag = {}
+        # The IDs of the DAGs of each file synced into the bag
+        self._file_dag_ids = {}
 
         for simple_dag in simple_dags:
             self.dag_id_to_simple_dag[simple_dag.dag_id] = simple_dag
 
+    @property
+    def simple_dags(self):
+        """
+        :return: the SimpleDags in this bag
+        :rtype: list[airflow.utils.dag_processing.SimpleDag]
+        """
+        return list(self.dag_id_to_simple_dag.values())
+
+    def sync_file(self, file_path, simple_dags, unchanged_dag_ids=()):
+        """
+        Replaces the DAGs of a file with the ones found when it was last
+        processed.
+
+        :param file_path: the path to the processed file
+        :type file_path: unicode
+        :param simple_dags: the SimpleDags of the file that are new or changed
+        :type simple_dags: list[airflow.utils.dag_processing.SimpleDag]
+        :param unchanged_dag_ids: the IDs of the other DAGs of the file, whose
+            SimpleDag in the bag is still current
+        :type unchanged_dag_ids: list[unicode]
+        :return: the SimpleDags of the file
+        :rtype: list[airflow.utils.dag_processing.SimpleDag]
+        """
+        dag_ids = set(dag_id for dag_id in unchanged_dag_ids
+                      if dag_id in self.dag_id_to_simple_dag)
+        for simple_dag in simple_dags:
+            self.dag_id_to_simple_dag[simple_dag.dag_id] = simple_dag
+            dag_ids.add(simple_dag.dag_id)
+        self._remove_dags(file_path, self._file_dag_ids.get(file_path, set()) - dag_ids)
+        self._file_dag_ids[file_path] = dag_ids
+        return [self.dag_id_to_simple_dag[dag_id] for dag_id in dag_ids]
+
+    def remove_files(self, file_paths):
+        """
+        Removes the DAGs of the files that were synced into the bag, e.g. as
+        they were deleted.
+
+        :param file_paths: the paths to the removed files
+        :type file_paths: collections.Iterable[unicode]
+        """
+        for file_path in file_paths:
+            self._remove_dags(file_path, self._file_dag_ids.pop(file_path, set()))
+
+    def _remove_dags(self, file_path, dag_ids):
+        for dag_id in dag_ids:
+            simple_dag = self.dag_id_to_simple_dag.get(dag_id)
+            # The DAG may have moved to another file since
+            if simple_dag is not None and not any(
+                    dag_id in other_dag_ids
+                    for other_file_path, other_dag_ids in self._file_dag_ids.items()
+                    if other_file_path != file_path):
+                del self.dag_id_to_simple_dag[dag_id]
+
+    @property
+    def file_paths(self):
+        """
+        :return: the paths to the files synced into the bag
+        :rtype: list[unicode]
+        """
+        return list(self._file_dag_ids)
+
     @property
     def dag_ids(self):
         """
@@ -467,6 +552,19 @@ DagParsingStat = NamedTuple('DagParsingStat', [
     ('done', bool),
     ('all_files_processed', bool)
 ])
+# The DAGs found in a processed file, sent by the DagFileProcessorManager.
+# Only the SimpleDags that changed since the last result of the file are
+# sent in full, the others are listed by ID.
+DagFileResult = NamedTuple('DagFileResult', [
+    ('file_path', str),
+    ('simple_dags', list),
+    ('unchanged_dag_ids', list),
+])
+# The files to process again right away, sent by the DagFileProcessorAgent
+# when task instances of their DAGs changed state.
+DagFileRequest = NamedTuple('DagFileRequest', [
+    ('file_paths', list),
+])
 DagFileStat = NamedTuple('DagFileStat', [
     ('num_dags', int),
     ('import_errors', int),
@@ -498,7 +596,8 @@ class DagFileProcessorAgent(LoggingMixin):
                  max_runs,
                  processor_factory,
                  processor_timeout,
-                 async_mode):
+                 async_mode,
+                 scheduler_job_id=None):
         """
         :param dag_directory: Directory where DAG definitions are kept. All
             files in file_paths should be under this directory
@@ -515,6 +614,9 @@ class DagFileProcessorAgent(LoggingMixin):
         :type processor_timeout: timedelta
         :param async_mode: Whether to start agent in async mode
         :type async_mode: bool
+        :param scheduler_job_id: the id of the scheduler job, the DAG files are
+            split among the running schedulers if ``[scheduler] shard_dag_files``
+        :type scheduler_job_id: int
         """
         self._file_paths = file_paths
         self._file_path_queue = []
@@ -523,6 +625,7 @@ class DagFileProcessorAgent(LoggingMixin):
         self._processor_factory = processor_factory
         self._processor_timeout = processor_timeout
         self._async_mode = async_mode
+        self._scheduler_job_id = scheduler_job_id
         # Map from file path to the processor
         self._processors = {}
         # Pipe for communicating signals
@@ -533,6 +636,8 @@ class DagFileProcessorAgent(LoggingMixin):
 
         self._parent_signal_conn = None
         self._collected_dag_buffer = []
+        # The DAGs of all the processed files, kept up to date in place
+        self._simple_dag_bag = SimpleDagBag([])
 
     def start(self):
         """
@@ -549,6 +654,7 @@ class DagFileProcessorAgent(LoggingMixin):
                 self._processor_timeout,
                 child_signal_conn,
                 self._async_mode,
+                self._scheduler_job_id,
             )
         )
         self._process.start()
@@ -574,6 +680,30 @@ class DagFileProcessorAgent(LoggingMixin):
             # when harvest_simple_dags calls _heartbeat_manager.
             pass
 
+    def request_file_processing(self, file_paths):
+        """
+        Asks the manager to process the files again as soon as possible,
+        regardless of ``[scheduler] min_file_process_interval``. In sync mode
+        they are processed along with the next heartbeat.
+
+        :param file_paths: the paths of the files
+        :type file_paths: list[unicode]
+        """
+        if not self._process or not self._process.is_alive():
+            return
+        try:
+            self._parent_signal_conn.send(DagFileRequest(list(file_paths)))
+        except ConnectionError:
+            pass
+
+    def fileno(self):
+        """
+        The file descriptor of the connection to the manager, readable when
+        the manager sent parsing results, so that the agent can be waited on
+        with ``select``.
+        """
+        return self._parent_signal_conn.fileno()
+
     def wait_until_finished(self):
         while self._parent_signal_conn.poll():
             try:
@@ -593,7 +723,8 @@ class DagFileProcessorAgent(LoggingMixin):
                                processor_factory,
                                processor_timeout,
                                signal_conn,
-                               async_mode):
+                               async_mode,
+                               scheduler_job_id=None):
 
         # Make this process start as a new process group - that makes it easy
         # to kill all sub-process of this at the OS-level, rather than having
@@ -619,15 +750,27 @@ class DagFileProcessorAgent(LoggingMixin):
                                                     processor_factory,
                                                     processor_timeout,
                                                     signal_conn,
-                                                    async_mode)
+                                                    async_mode,
+                                                    scheduler_job_id)
 
         processor_manager.start()
 
+    @property
+    def simple_dag_bag(self):
+        """
+        The SimpleDags of all the processed files, updated by
+        ``harvest_simple_dags``.
+
+        :rtype: airflow.utils.dag_processing.SimpleDagBag
+        """
+        return self._simple_dag_bag
+
     def harvest_simple_dags(self):
         """
         Harvest DAG parsing results from result queue and sync metadata from stat queue.
 
-        :return: List of parsing result in SimpleDag format.
+        :return: List of parsing result in SimpleDag format, for the files
+            processed since the last harvest.
         """
         # Receive any pending messages before checking if the process has exited.
         while self._parent_signal_conn.poll():
@@ -648,6 +791,9 @@ class DagFileProcessorAgent(LoggingMixin):
         self.log.debug("Received message of type %s", type(message).__name__)
         if isinstance(message, DagParsingStat):
             self._sync_metadata(message)
+        elif isinstance(message, DagFileResult):
+            self._collected_dag_buffer.extend(self._simple_dag_bag.sync_file(
+                message.file_path, message.simple_dags, message.unchanged_dag_ids))
         else:
             self._collected_dag_buffer.append(message)
 
@@ -669,6 +815,8 @@ class DagFileProcessorAgent(LoggingMixin):
         Sync metadata from stat queue and only keep the latest stat.
         """
         self._file_paths = stat.file_paths
+        self._simple_dag_bag.remove_files(
+            set(self._simple_dag_bag.file_paths) - set(stat.file_paths))
         self._done = stat.done
         self._all_files_processed = stat.all_files_processed
 
@@ -733,6 +881,10 @@ class DagFileProcessorManager(LoggingMixin):
     :type signal_conn: airflow.models.connection.Connection
     :param async_mode: whether to start the manager in async mode
     :type async_mode: bool
+    :param scheduler_job_id: the id of the scheduler job, only the DAG files it
+        owns among the running schedulers are processed if
+        ``[scheduler] shard_dag_files``
+    :type scheduler_job_id: int
     """
 
     def __init__(self,
@@ -742,7 +894,10 @@ class DagFileProcessorManager(LoggingMixin):
                  processor_factory,
                  processor_timeout,
                  signal_conn,
-                 async_mode=True):
+                 async_mode=True,
+                 scheduler_job_id=None):
+        # All the files in the DAGs folder, and those processed by this manager
+        self._all_file_paths = file_paths
         self._file_paths = file_paths
         self._file_path_queue = []
         self._dag_directory = dag_directory
@@ -750,6 +905,12 @@ class DagFileProcessorManager(LoggingMixin):
         self._processor_factory = processor_factory
         self._signal_conn = signal_conn
         self._async_mode = async_mode
+        # Wait for the processors to finish rather than on a fixed interval
+        self._event_driven_wakeups = conf.getboolean(
+            'scheduler', 'event_driven_wakeups', fallback=False)
+        # The files to process again as soon as their running processor is done
+        self._requested_file_paths = set()
+        self._last_dag_parsing_stat = None
 
         self._parallelism = conf.getint('scheduler', 'max_threads')
         if 'sqlite' in conf.get('core', 'sql_alchemy_conn') and self._parallelism > 1:
@@ -776,6 +937,10 @@ class DagFileProcessorManager(LoggingMixin):
 
         # Map from file path to stats about the file
         self._file_stats = {}  # type: dict(str, DagFileStat)
+        # The SimpleDags of the files processed since they were last sent
+        self._file_results = []
+        # Map from file path to the hashes of the SimpleDags last sent for it
+        self._sent_dag_hashes = {}
 
         self._last_zombie_query_time = None
         # Last time that the DAG dir was traversed to look for files
@@ -792,6 +957,15 @@ class DagFileProcessorManager(LoggingMixin):
         self.dag_dir_list_interval = conf.getint('scheduler',
                                                  'dag_dir_list_interval')
 
+        self._scheduler_job_id = scheduler_job_id
+        self._shard_dag_files = scheduler_job_id is not None and conf.getboolean(
+            'scheduler', 'shard_dag_files', fallback=False)
+        # How often to check which schedulers are running to rebalance the files
+        self._shard_refresh_interval = conf.getint(
+            'scheduler', 'shard_refresh_interval', fallback=10)
+        self._last_shard_refresh_time = None
+        self._live_scheduler_ids = None
+
         self._log = logging.getLogger('airflow.processor_manager')
 
         signal.signal(signal.SIGINT, self._exit_gracefully)
@@ -838,7 +1012,7 @@ class DagFileProcessorManager(LoggingMixin):
         while True:
             loop_start_time = time.time()
 
-            if self._signal_conn.poll(poll_time):
+            if self._wait_for_signal(poll_time):
                 agent_signal = self._signal_conn.recv()
                 self.log.debug("Recived %s singal from DagFileProcessorAgent", agent_signal)
                 if agent_signal == DagParsingSignal.TERMINATE_MANAGER:
@@ -850,6 +1024,13 @@ class DagFileProcessorManager(LoggingMixin):
                 elif agent_signal == DagParsingSignal.AGENT_HEARTBEAT:
                     # continue the loop to parse dags
                     pass
+                elif isinstance(agent_signal, DagFileRequest):
+                    self._requested_file_paths.update(
+                        file_path for file_path in agent_signal.file_paths
+                        if file_path in self._file_paths)
+                    if not self._async_mode:
+                        # Processed along with the next heartbeat of the agent
+                        continue
             elif not self._async_mode:
                 # In "sync" mode we don't want to parse the DAGs until we
                 # are told to (as that would open another connection to the
@@ -857,11 +1038,11 @@ class DagFileProcessorManager(LoggingMixin):
                 continue
 
             self._refresh_dag_dir()
+            self._refresh_shard()
             self._find_zombies()
 
-            simple_dags = self.heartbeat()
-            for simple_dag in simple_dags:
-                self._signal_conn.send(simple_dag)
+            self.heartbeat()
+            self._send_file_results()
 
             if not self._async_mode:
                 self.log.debug(
@@ -873,9 +1054,8 @@ class DagFileProcessorManager(LoggingMixin):
                 self.wait_until_finished()
 
                 # Collect anything else that has finished, but don't kick off any more processors
-                simple_dags = self.collect_results()
-                for simple_dag in simple_dags:
-                    self._signal_conn.send(simple_dag)
+                self.collect_results()
+                self._send_file_results()
 
             self._print_stat()
 
@@ -886,7 +1066,13 @@ class DagFileProcessorManager(LoggingMixin):
                                               max_runs_reached,
                                               all_files_processed,
                                               )
-            self._signal_conn.send(dag_parsing_stat)
+            # The agent waits on the connection with event driven wakeups, so
+            # an unchanged stat is not sent to not wake the scheduler up. In
+            # sync mode the stat marks the end of the loop, it is always sent.
+            if (not self._async_mode or not self._event_driven_wakeups or
+                    dag_parsing_stat != self._last_dag_parsing_stat):
+                self._signal_conn.send(dag_parsing_stat)
+                self._last_dag_parsing_stat = dag_parsing_stat
 
             if max_runs_reached:
                 self.log.info("Exiting dag parsing loop as all files "
@@ -900,6 +1086,26 @@ class DagFileProcessorManager(LoggingMixin):
                 else:
                     poll_time = 0.0
 
+    def _wait_for_signal(self, timeout):
+        """
+        Waits for a signal of the agent for at most ``timeout`` seconds, or
+        until a processor is done with ``[scheduler] event_driven_wakeups``,
+        so that its results are sent to the agent right away.
+
+        :return: whether a signal of the agent can be received
+        :rtype: bool
+        """
+        if not self._event_driven_wakeups or not timeout:
+            return self._signal_conn.poll(timeout)
+        waitables = [self._signal_conn] + [
+            processor for processor in self._processors.values()
+            if hasattr(processor, 'fileno')]
+        try:
+            select.select(waitables, [], [], timeout)
+        except (select.error, IOError, OSError, ValueError) as e:
+            self.log.debug("Wait for the processors interrupted: %s", e)
+        return self._signal_conn.poll()
+
     def _refresh_dag_dir(self):
         """
         Refresh file paths from dag dir if we haven't done it for too long.
@@ -909,10 +1115,10 @@ class DagFileProcessorManager(LoggingMixin):
         if elapsed_time_since_refresh > self.dag_dir_list_interval:
             # Build up a list of Python files that could contain DAGs
             self.log.info("Searching for files in %s", self._dag_directory)
-            self._file_paths = list_py_file_paths(self._dag_directory)
+            self._all_file_paths = list_py_file_paths(self._dag_directory)
             self.last_dag_dir_refresh_time = now
-            self.log.info("There are %s files in %s", len(self._file_paths), self._dag_directory)
-            self.set_file_paths(self._file_paths)
+            self.log.info("There are %s files in %s", len(self._all_file_paths), self._dag_directory)
+            self._set_owned_file_paths()
 
             try:
                 self.log.debug("Removing old import errors")
@@ -923,8 +1129,49 @@ class DagFileProcessorManager(LoggingMixin):
             if STORE_SERIALIZED_DAGS:
                 from airflow.models.serialized_dag import SerializedDagModel
                 from airflow.models.dag import DagModel
-                SerializedDagModel.remove_deleted_dags(self._file_paths)
-                DagModel.deactivate_deleted_dags(self._file_paths)
+                SerializedDagModel.remove_deleted_dags(self._all_file_paths)
+                DagModel.deactivate_deleted_dags(self._all_file_paths)
+
+    def _refresh_shard(self):
+        """
+        Refresh the running schedulers if we haven't done it for too long, and
+        rebalance the DAG files among them if they changed.
+        """
+        if not self._shard_dag_files:
+            return
+        now = timezone.utcnow()
+        if (self._last_shard_refresh_time is not None and
+                (now - self._last_shard_refresh_time).total_seconds() <
+                self._shard_refresh_interval):
+            return
+        self._last_shard_refresh_time = now
+
+        try:
+            live_scheduler_ids = get_live_scheduler_ids()
+        except Exception:
+            self.log.exception("Error getting the running schedulers")
+            return
+        if live_scheduler_ids != self._live_scheduler_ids:
+            self.log.info("Running schedulers changed from %s to %s, rebalancing the DAG files",
+                          self._live_scheduler_ids, live_scheduler_ids)
+            self._live_scheduler_ids = live_scheduler_ids
+            self._set_owned_file_paths()
+
+    def _set_owned_file_paths(self):
+        """
+        Process the files this scheduler owns among the running ones, all the
+        files if the DAG files aren't sharded.
+        """
+        file_paths = self._all_file_paths
+        if self._shard_dag_files:
+            file_paths = get_owned_file_paths(file_paths,
+                                              self._dag_directory,
+                                              self._scheduler_job_id,
+                                              self._live_scheduler_ids or [])
+            self.log.info("Scheduler %s owns %s of the %s files in %s",
+                          self._scheduler_job_id, len(file_paths),
+                          len(self._all_file_paths), self._dag_directory)
+        self.set_file_paths(file_paths)
 
     def _print_stat(self):
         """
@@ -944,9 +1191,9 @@ class DagFileProcessorManager(LoggingMixin):
         :type session: sqlalchemy.orm.session.Session
         """
         query = session.query(errors.ImportError)
-        if self._file_paths:
+        if self._all_file_paths:
             query = query.filter(
-                ~errors.ImportError.filename.in_(self._file_paths)
+                ~errors.ImportError.filename.in_(self._all_file_paths)
             )
         query.delete(synchronize_session='fetch')
         session.commit()
@@ -1129,6 +1376,11 @@ class DagFileProcessorManager(LoggingMixin):
         self._file_paths = new_file_paths
         self._file_path_queue = [x for x in self._file_path_queue
                                  if x in new_file_paths]
+        self._requested_file_paths.intersection_update(new_file_paths)
+        # The agent drops the DAGs of the removed files with their hashes
+        self._sent_dag_hashes = {file_path: dag_hashes
+                                 for file_path, dag_hashes in self._sent_dag_hashes.items()
+                                 if file_path in new_file_paths}
         # Stop processors that are working on deleted files
         filtered_processors = {}
         for file_path, processor in self._processors.items():
@@ -1200,9 +1452,30 @@ class DagFileProcessorManager(LoggingMixin):
             else:
                 for simple_dag in processor.result[0]:
                     simple_dags.append(simple_dag)
+                self._file_results.append((file_path, processor.result[0]))
 
         return simple_dags
 
+    def _send_file_results(self):
+        """
+        Sends the DAGs found in the files processed since the last call to
+        the agent. Only the SimpleDags that changed since they were last sent
+        are sent in full, which spares pickling them again and again.
+        """
+        for file_path, simple_dags in self._file_results:
+            sent_dag_hashes = self._sent_dag_hashes.get(file_path, {})
+            changed_dags = []
+            unchanged_dag_ids = []
+            for simple_dag in simple_dags:
+                if sent_dag_hashes.get(simple_dag.dag_id) == simple_dag.dag_hash:
+                    unchanged_dag_ids.append(simple_dag.dag_id)
+                else:
+                    changed_dags.append(simple_dag)
+            self._signal_conn.send(DagFileResult(file_path, changed_dags, unchanged_dag_ids))
+            self._sent_dag_hashes[file_path] = {
+                simple_dag.dag_id: simple_dag.dag_hash for simple_dag in simple_dags}
+        self._file_results = []
+
     def heartbeat(self):
         """
         This should be periodically called by the manager loop. This method will
@@ -1259,6 +1532,19 @@ class DagFileProcessorManager(LoggingMixin):
 
             self._file_path_queue.extend(files_paths_to_queue)
 
+        # The requested files go first, once their running processor is done
+        # as it may have read the state of their DAGs before the request
+        requested_file_paths = [file_path for file_path in self._requested_file_paths
+                                if file_path not in self._processors]
+        if requested_file_paths:
+            self._requested_file_paths.difference_update(requested_file_paths)
+            self._file_path_queue = requested_file_paths + [
+                file_path for file_path in self._file_path_queue
+                if file_path not in requested_file_paths]
+            for file_path in requested_file_paths:
+                if file_path not in self._file_stats:
+                    self._file_stats[file_path] = DagFileStat(0, 0, None, None, 0)
+
         # Start more processors if we have enough slots and files to process
         while (self._parallelism - len(self._processors) > 0 and
                len(self._file_path_queue) > 0):
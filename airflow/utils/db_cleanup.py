@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Retention of the metadata database.
+
+Rows older than the retention of their table are deleted, optionally after
+being copied to an ``<table>_archive`` table, in small batches that each
+run in their own transaction so that no lock is ever held for long.
+"""
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from sqlalchemy import Column, MetaData, Table, and_, exists, func, or_
+from sqlalchemy.orm import aliased
+
+from airflow.configuration import conf
+from airflow.exceptions import AirflowConfigException
+from airflow.settings import Stats
+from airflow.utils import timezone
+from airflow.utils.db import provide_session
+from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.state import State
+
+log = LoggingMixin().log
+
+# The states of the task instances which may still run, kept with their rows
+ACTIVE_TI_STATES = [
+    State.SCHEDULED, State.QUEUED, State.RUNNING, State.SHUTDOWN,
+    State.UP_FOR_RETRY, State.UP_FOR_RESCHEDULE,
+]
+
+ARCHIVE_SUFFIX = '_archive'
+
+
+def _not_in_running_run(model):
+    """
+    Keeps the rows of ``model``, keyed by ``dag_id`` and ``execution_date``,
+    of the running DAG runs: they are still used by their task instances,
+    and deleted task instances would be created and run again.
+    """
+    from airflow.models import DagRun
+
+    running_run = aliased(DagRun)
+    return ~exists().where(and_(
+        running_run.dag_id == model.dag_id,
+        running_run.execution_date == model.execution_date,
+        running_run.state == State.RUNNING,
+    )).correlate(model.__table__)
+
+
+def _before_latest_run(model):
+    """
+    Keeps the rows of ``model`` of the latest DAG run of every DAG, which
+    the scheduler computes the next run from and whose task instances are
+    the previous ones of the next run.
+    """
+    from airflow.models import DagRun
+
+    latest_run = aliased(DagRun)
+    return model.execution_date < (
+        func.max(latest_run.execution_date)
+        .select()
+        .where(latest_run.dag_id == model.dag_id)
+        .correlate(model.__table__)
+        .as_scalar()
+    )
+
+
+def _not_of_active_ti(model, by_task=True):
+    """
+    Keeps the rows of ``model``, keyed by ``dag_id``, ``task_id`` and
+    ``execution_date``, of the task instances which may still run, e.g. the
+    reschedules a sensor measures its timeout from, or the resume token of
+    a resumable operator. Without ``by_task``, keeps the rows of the DAG
+    runs with such task instances.
+    """
+    from airflow.models import TaskInstance
+
+    ti = aliased(TaskInstance)
+    clauses = [
+        ti.dag_id == model.dag_id,
+        ti.execution_date == model.execution_date,
+        ti.state.in_(ACTIVE_TI_STATES),
+    ]
+    if by_task:
+        clauses.append(ti.task_id == model.task_id)
+    return ~exists().where(and_(*clauses)).correlate(model.__table__)
+
+
+def _run_keep_clauses(model):
+    return [_not_in_running_run(model), _before_latest_run(model)]
+
+
+def _cleanup_tables():
+    """
+    The tables to clean up, mapped to their model, the column their age is
+    measured on and the rows that must be kept regardless of their age.
+    Tables are listed so that referencing rows are deleted first.
+    """
+    from airflow.jobs import BaseJob
+    from airflow.models import (
+        DagRun, Log, SlaMiss, TaskFail, TaskInstance, TaskReschedule, XCom)
+
+    TI = TaskInstance
+    DR = DagRun
+    return OrderedDict([
+        ('task_reschedule', (TaskReschedule, TaskReschedule.execution_date,
+                             _run_keep_clauses(TaskReschedule) +
+                             [_not_of_active_ti(TaskReschedule)])),
+        ('task_fail', (TaskFail, TaskFail.execution_date,
+                       _run_keep_clauses(TaskFail) + [_not_of_active_ti(TaskFail)])),
+        ('xcom', (XCom, XCom.execution_date,
+                  _run_keep_clauses(XCom) + [_not_of_active_ti(XCom)])),
+        ('sla_miss', (SlaMiss, SlaMiss.execution_date, _run_keep_clauses(SlaMiss))),
+        ('log', (Log, Log.dttm, [])),
+        ('job', (BaseJob, BaseJob.latest_heartbeat, [
+            or_(BaseJob.state.is_(None), BaseJob.state != State.RUNNING),
+        ])),
+        ('task_instance', (TI, TI.execution_date, [
+            or_(TI.state.is_(None), TI.state.notin_(ACTIVE_TI_STATES)),
+        ] + _run_keep_clauses(TI))),
+        ('dag_run', (DR, DR.execution_date, [
+            or_(DR.state.is_(None), DR.state != State.RUNNING),
+            _before_latest_run(DR),
+            _not_of_active_ti(DR, by_task=False),
+        ])),
+    ])
+
+
+CLEANUP_TABLES = [
+    'task_reschedule', 'task_fail', 'xcom', 'sla_miss', 'log', 'job',
+    'task_instance', 'dag_run',
+]
+
+# The tables whose rows belong to a row of another table, which they must not
+# outlive: task_reschedule references task_instance with a foreign key
+PARENT_TABLES = {
+    'task_reschedule': 'task_instance',
+    'task_fail': 'task_instance',
+    'xcom': 'task_instance',
+    'task_instance': 'dag_run',
+}
+
+
+def get_retention_days():
+    """
+    Returns the retention in days of every table, from ``[db_cleanup]
+    retention_days`` and the per table ``table_retention_days`` overrides.
+    """
+    default = conf.getint('db_cleanup', 'retention_days', fallback=90)
+    retention = OrderedDict((table, default) for table in CLEANUP_TABLES)
+    overrides = conf.get('db_cleanup', 'table_retention_days', fallback='')
+    for override in filter(None, (o.strip() for o in overrides.split(','))):
+        table, _, days = override.partition(':')
+        table = table.strip()
+        if table not in retention or not days.strip().isdigit():
+            raise AirflowConfigException(
+                "Invalid [db_cleanup] table_retention_days entry {!r}, expected "
+                "<table>:<days> with table one of {}".format(
+                    override, ', '.join(CLEANUP_TABLES)))
+        retention[table] = int(days)
+    for table, parent in PARENT_TABLES.items():
+        if retention[table] > retention[parent]:
+            raise AirflowConfigException(
+                "Invalid [db_cleanup] retention, {} rows ({} days) can't be kept longer "
+                "than the {} rows they belong to ({} days)".format(
+                    table, retention[table], parent, retention[parent]))
+    return retention
+
+
+def _get_archive_table(table, session):
+    """Returns the archive table of ``table``, creating it if needed"""
+    archive = Table(
+        table.name + ARCHIVE_SUFFIX,
+        MetaData(),
+        *[Column(c.name, c.type, nullable=True) for c in table.columns]
+    )
+    archive.create(bind=session.get_bind(), checkfirst=True)
+    return archive
+
+
+def _pk_clause(pk_columns, rows):
+    """A where clause matching the rows with the given primary keys"""
+    if len(pk_columns) == 1:
+        return pk_columns[0].in_([row[0] for row in rows])
+    return or_(*[
+        and_(*[col == value for col, value in zip(pk_columns, row)])
+        for row in rows
+    ])
+
+
+@provide_session
+def cleanup_table(table_name, older_than, batch_size=1000, archive=False,
+                  dry_run=False, max_batches=None, heartbeat=None, session=None):
+    """
+    Deletes the rows of ``table_name`` older than ``older_than`` in batches of
+    ``batch_size`` rows, committing after each batch.
+
+    :param table_name: the name of the table to clean up
+    :type table_name: str
+    :param older_than: rows older than this date are deleted
+    :type older_than: datetime.datetime
+    :param batch_size: number of rows deleted per transaction
+    :type batch_size: int
+    :param archive: copy the rows to ``<table_name>_archive`` before deleting them
+    :type archive: bool
+    :param dry_run: only count the rows that would be deleted
+    :type dry_run: bool
+    :param max_batches: stop after this many batches, None to clean up all rows
+    :type max_batches: int
+    :param heartbeat: called after every batch, e.g. to heartbeat the job
+        running the cleanup
+    :type heartbeat: callable
+    :return: the number of rows deleted, or that would be deleted on a dry run
+    :rtype: int
+    """
+    model, recency_column, keep = _cleanup_tables()[table_name]
+    table = model.__table__
+    filters = [recency_column < older_than] + keep
+
+    if dry_run:
+        return session.query(func.count()).select_from(model).filter(*filters).scalar()
+
+    pk_columns = list(table.primary_key.columns)
+    archive_table = _get_archive_table(table, session) if archive else None
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        rows = session.query(*pk_columns).filter(*filters).limit(batch_size).all()
+        if not rows:
+            break
+        where = _pk_clause(pk_columns, rows)
+        if archive_table is not None:
+            session.execute(archive_table.insert().from_select(
+                [c.name for c in table.columns], table.select().where(where)))
+        session.execute(table.delete().where(where))
+        session.commit()
+
+        total += len(rows)
+        batches += 1
+        Stats.incr('db_cleanup.{}.rows'.format(table_name), len(rows))
+        log.info("Deleted %s rows older than %s from %s (%s so far)",
+                 len(rows), older_than, table_name, total)
+        if heartbeat is not None:
+            heartbeat()
+        if len(rows) < batch_size:
+            break
+    return total
+
+
+def run_cleanup(tables=None, retention_days=None, batch_size=None, archive=None,
+                dry_run=False, max_batches=None, heartbeat=None):
+    """
+    Cleans up ``tables`` (all of them by default), with the retention, batch
+    size and archival configured in the ``[db_cleanup]`` section unless given.
+
+    :param retention_days: overrides the configured retention of all tables
+    :type retention_days: int
+    :param heartbeat: called after every batch, e.g. to heartbeat the job
+        running the cleanup
+    :type heartbeat: callable
+    :return: the number of rows deleted, or that would be deleted, per table
+    :rtype: collections.OrderedDict
+    """
+    retention = get_retention_days()
+    if batch_size is None:
+        batch_size = conf.getint('db_cleanup', 'batch_size', fallback=1000)
+    if archive is None:
+        archive = conf.getboolean('db_cleanup', 'archive', fallback=False)
+    tables = tables or CLEANUP_TABLES
+    for table_name in tables:
+        if table_name not in retention:
+            raise ValueError("Can't clean up unknown table {!r}, expected one of {}"
+                             .format(table_name, ', '.join(CLEANUP_TABLES)))
+
+    now = timezone.utcnow()
+    counts = OrderedDict()
+    # Keep the order of CLEANUP_TABLES, rows referencing others go first
+    for table_name in [t for t in CLEANUP_TABLES if t in tables]:
+        days = retention_days if retention_days is not None else retention[table_name]
+        older_than = now - timedelta(days=days)
+        start_time = time.time()
+        counts[table_name] = cleanup_table(
+            table_name, older_than, batch_size=batch_size, archive=archive,
+            dry_run=dry_run, max_batches=max_batches, heartbeat=heartbeat)
+        if not dry_run:
+            Stats.timing('db_cleanup.{}.duration'.format(table_name),
+                         (time.time() - start_time) * 1000)
+
+    if not dry_run and (counts.get('dag_run') or counts.get('task_instance')):
+        from airflow.models import DagStats
+        DagStats.reconcile()
+    return counts
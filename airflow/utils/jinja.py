@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Jinja environments reused across renders of the templated fields"""
+
+import jinja2
+import six
+from jinja2.utils import LRUCache
+
+from airflow.configuration import conf
+
+TEMPLATE_CACHE_SIZE = conf.getint('core', 'template_cache_size', fallback=400)
+
+
+class CachingEnvironment(jinja2.Environment):
+    """
+    Jinja environment that also keeps the templates compiled from strings,
+    keyed on their source, in a bounded LRU cache. Templates loaded from
+    files are cached by Jinja itself, up to ``cache_size`` of them, and
+    recompiled when the file changes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        string_cache_size = kwargs.pop('string_cache_size', TEMPLATE_CACHE_SIZE)
+        super(CachingEnvironment, self).__init__(*args, **kwargs)
+        self.string_cache = LRUCache(string_cache_size) if string_cache_size else None
+
+    def from_string(self, source, globals=None, template_class=None):
+        if (self.string_cache is None or globals or template_class or
+                not isinstance(source, six.string_types)):
+            return super(CachingEnvironment, self).from_string(
+                source, globals=globals, template_class=template_class)
+        template = self.string_cache.get(source)
+        if template is None:
+            template = super(CachingEnvironment, self).from_string(source)
+            self.string_cache[source] = template
+        return template
+
+
+# Environments of the DAGs, see DAG.get_template_env
+_dag_template_envs = LRUCache(256)
+_default_template_env = None
+
+
+def get_cached_template_env(key, build):
+    """
+    Returns the environment cached under ``key``, built by calling ``build``
+    if there is none yet.
+    """
+    env = _dag_template_envs.get(key)
+    if env is None:
+        env = build()
+        _dag_template_envs[key] = env
+    return env
+
+
+def get_default_template_env():
+    """The environment of the templates of tasks without a DAG"""
+    global _default_template_env
+    if _default_template_env is None:
+        _default_template_env = CachingEnvironment(cache_size=0)
+    return _default_template_env
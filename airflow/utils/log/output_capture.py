@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Copies the output of subprocesses and remote commands to the task log"""
+import logging
+import os
+
+from airflow.configuration import conf
+
+# The bytes read from a stream at once
+READ_SIZE = 64 * 1024
+
+
+def get_output_max_bytes(output_max_bytes=None):
+    """
+    Returns the cap on the output of a task kept in its log, the
+    ``[core] task_output_max_bytes`` setting unless given, None if unlimited.
+    """
+    if output_max_bytes is None:
+        output_max_bytes = conf.getint('core', 'task_output_max_bytes', fallback=0)
+    return output_max_bytes or None
+
+
+class OutputCapture(object):
+    """
+    Copies the output of a subprocess or remote command to a logger. The
+    output is logged in chunks of complete lines, one record per chunk read,
+    instead of one record per line, so that chatty commands do not spend
+    most of their time in the logging handlers and formatters.
+
+    When ``max_bytes`` is set, only the first and last bytes of the output
+    are logged, the last ``tail_bytes`` ones being kept in memory until the
+    capture is closed, with a note of how many bytes were left out between.
+
+    :param log: the logger to copy the output to
+    :type log: logging.Logger
+    :param level: the level of the records
+    :type level: int
+    :param encoding: the encoding of the output
+    :type encoding: str
+    :param max_bytes: the maximum number of bytes logged, unlimited if None
+    :type max_bytes: int
+    :param tail_bytes: the number of bytes logged from the end of the output
+        when it exceeds ``max_bytes``, half of ``max_bytes`` by default
+    :type tail_bytes: int
+    """
+
+    def __init__(self, log, level=logging.INFO, encoding='utf-8', max_bytes=None,
+                 tail_bytes=None):
+        self.log = log
+        self.level = level
+        self.encoding = encoding
+        self.max_bytes = max_bytes or None
+        if self.max_bytes is None:
+            tail_bytes = 0
+        elif tail_bytes is None:
+            tail_bytes = self.max_bytes // 2
+        self.tail_bytes = min(tail_bytes, self.max_bytes or 0)
+        self.bytes_read = 0
+        self._logged = 0
+        self._partial = b''
+        self._tail = bytearray()
+        self._last_line = b''
+        self._closed = False
+
+    @property
+    def truncated_bytes(self):
+        """The number of bytes of the output that were not logged so far"""
+        return (self.bytes_read - len(self._partial) -
+                self._logged - len(self._tail))
+
+    @property
+    def last_line(self):
+        """The last line of the output, without its trailing whitespace"""
+        return self._last_line.decode(self.encoding, 'replace').rstrip()
+
+    def write(self, data):
+        """
+        Logs the complete lines of the data, keeping a trailing partial line
+        until the next write or the capture is closed.
+
+        :param data: output of the command
+        :type data: bytes
+        """
+        if not data:
+            return
+        self.bytes_read += len(data)
+        data = self._partial + data
+        end = data.rfind(b'\n') + 1
+        # Very long lines are logged in pieces rather than held in memory
+        if not end and len(data) >= READ_SIZE:
+            end = len(data)
+        self._partial = data[end:]
+        if end:
+            lines = data[:end]
+            if lines.endswith(b'\n'):
+                lines = lines[:-1]
+            self._last_line = lines.rsplit(b'\n', 1)[-1]
+            self._emit(data[:end])
+
+    def copy_stream(self, stream):
+        """
+        Logs the content of the stream, e.g. the stdout pipe of a subprocess,
+        until its end, reading whatever is available up to ``READ_SIZE``
+        bytes at a time.
+
+        :param stream: a binary stream backed by a file descriptor
+        """
+        fileno = stream.fileno()
+        while True:
+            data = os.read(fileno, READ_SIZE)
+            if not data:
+                break
+            self.write(data)
+
+    def close(self):
+        """Logs the pending partial line and the tail of the output"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._partial:
+            self._last_line = self._partial
+            partial, self._partial = self._partial, b''
+            self._emit(partial)
+        truncated_bytes = self.truncated_bytes
+        if truncated_bytes:
+            # The tail starts at the first line it holds entirely
+            del self._tail[:self._tail.find(b'\n') + 1]
+            truncated_bytes = self.truncated_bytes
+            self.log.warning("... %s bytes of output left out ...", truncated_bytes)
+        if self._tail:
+            self._logged += len(self._tail)
+            self._log(bytes(self._tail))
+            self._tail = bytearray()
+
+    def _emit(self, data):
+        if self.max_bytes is None:
+            self._logged += len(data)
+            self._log(data)
+            return
+        room = self.max_bytes - self.tail_bytes - self._logged
+        if room > 0:
+            head = data[:room]
+            self._logged += len(head)
+            self._log(head)
+            data = data[room:]
+        if data and self.tail_bytes:
+            self._tail += data
+            if len(self._tail) > self.tail_bytes:
+                del self._tail[:len(self._tail) - self.tail_bytes]
+
+    def _log(self, data):
+        text = data.decode(self.encoding, 'replace').rstrip('\n')
+        if text:
+            self.log.log(self.level, text)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
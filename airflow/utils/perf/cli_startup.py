@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Measures how long the read-only CLI commands take when they parse the DAG
+files and when they read the DAGs from the serialized_dag table.
+
+Example::
+
+    python -m airflow.utils.perf.cli_startup --serialize --dag-id example_bash_operator
+
+Every command runs in a fresh interpreter, once with ``--from-files`` and
+once with ``[core] store_serialized_dags`` enabled. With ``--serialize`` the
+DAGs of the DAG folder are first written to the serialized_dag table, as the
+scheduler does, so that both modes see the same DAGs.
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from tabulate import tabulate
+
+
+def serialize_dags(dag_folder=None):
+    """
+    Parses the DAG files and writes their DAGs to the serialized_dag table.
+
+    :param dag_folder: the folder of the DAG files, ``[core] dags_folder`` by default
+    :type dag_folder: str
+    :return: the IDs of the serialized DAGs
+    :rtype: list[str]
+    """
+    from airflow.models import DagBag
+    from airflow.models.serialized_dag import SerializedDagModel
+
+    dagbag = DagBag(dag_folder)
+    dag_ids = []
+    for dag in dagbag.dags.values():
+        if not dag.is_subdag:
+            SerializedDagModel.write_dag(dag)
+            dag_ids.append(dag.dag_id)
+    return sorted(dag_ids)
+
+
+def measure_command(command, from_files, repeat=3):
+    """
+    Runs an ``airflow`` command in fresh interpreters.
+
+    :param command: the arguments of the command, e.g. ``['list_dags']``
+    :type command: list[str]
+    :param from_files: whether the DAGs are parsed from the DAG files,
+        otherwise they are read from the serialized_dag table
+    :type from_files: bool
+    :param repeat: the number of runs, the fastest one is reported
+    :type repeat: int
+    :return: the wall time of the fastest run in seconds
+    :rtype: float
+    """
+    import airflow
+
+    env = os.environ.copy()
+    env['AIRFLOW__CORE__STORE_SERIALIZED_DAGS'] = 'True'
+    script = os.path.join(os.path.dirname(airflow.__file__), 'bin', 'airflow')
+    args = [sys.executable, script] + list(command)
+    if from_files:
+        args.append('--from-files')
+
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                env=env, universal_newlines=True)
+        _, stderr = proc.communicate()
+        timings.append(time.time() - start)
+        if proc.returncode != 0:
+            raise RuntimeError("{} failed:\n{}".format(' '.join(command), stderr))
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dag-id', help="DAG used by the per DAG commands, defaults "
+                                         "to the first serialized DAG")
+    parser.add_argument('--task-id', help="Task used by the per task commands, "
+                                          "defaults to the first task of the DAG")
+    parser.add_argument('--execution-date', default='2020-01-01',
+                        help="Execution date used by the per run commands")
+    parser.add_argument('--serialize', action='store_true',
+                        help="Serialize the DAGs of the DAG folder first")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Number of runs per command, the fastest one is reported")
+    args = parser.parse_args(argv)
+
+    if args.serialize:
+        dag_ids = serialize_dags()
+    else:
+        from airflow.models.serialized_dag import SerializedDagModel
+        from airflow.utils.db import create_session
+
+        with create_session() as session:
+            dag_ids = sorted(dag_id for dag_id, in session.query(SerializedDagModel.dag_id))
+    if not dag_ids:
+        print("No serialized DAGs, run with --serialize or let the scheduler "
+              "serialize them with [core] store_serialized_dags")
+        return 1
+
+    dag_id = args.dag_id or dag_ids[0]
+    task_id = args.task_id
+    if task_id is None:
+        from airflow.models import DagBag
+
+        task_id = sorted(DagBag(store_serialized_dags=True).get_dag(dag_id).task_ids)[0]
+
+    commands = [
+        ['list_dags'],
+        ['list_tasks', dag_id],
+        ['next_execution', dag_id],
+        ['dag_state', dag_id, args.execution_date],
+        ['task_state', dag_id, task_id, args.execution_date],
+        ['task_failed_deps', dag_id, task_id, args.execution_date],
+    ]
+    rows = []
+    for command in commands:
+        files_s = measure_command(command, from_files=True, repeat=args.repeat)
+        serialized_s = measure_command(command, from_files=False, repeat=args.repeat)
+        rows.append([command[0], files_s, serialized_s, files_s / serialized_s])
+
+    print("CLI commands over {} serialized DAGs".format(len(dag_ids)))
+    print(tabulate(rows, headers=['command', 'from files s', 'serialized s', 'speedup'],
+                   floatfmt='.2f'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
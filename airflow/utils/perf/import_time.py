@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Measures how long importing Airflow modules takes in a fresh interpreter,
+based on the output of ``python -X importtime``.
+
+Example::
+
+    python -m airflow.utils.perf.import_time --module airflow --top 20
+
+The modules which must not be loaded by ``import airflow`` are checked by
+``tests/test_import_time.py``.
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import namedtuple
+
+ImportTiming = namedtuple('ImportTiming', ['module', 'self_us', 'cumulative_us'])
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def parse_importtime(output):
+    """
+    Parses the ``-X importtime`` output written to stderr.
+
+    :param output: the stderr of the interpreter
+    :type output: str
+    :return: the timings, in the order modules finished importing
+    :rtype: list[ImportTiming]
+    """
+    timings = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us)))
+    return timings
+
+
+def measure_import(module, env=None):
+    """
+    Imports ``module`` in a fresh interpreter with ``-X importtime`` enabled.
+
+    :param module: the dotted name of the module to import
+    :type module: str
+    :param env: environment of the interpreter, defaults to ``os.environ``
+    :type env: dict
+    :return: the timings of all the modules imported along the way
+    :rtype: list[ImportTiming]
+    """
+    if sys.version_info < (3, 7):
+        raise RuntimeError("-X importtime requires Python 3.7 or later")
+
+    proc = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env if env is not None else os.environ.copy(),
+        universal_newlines=True,
+    )
+    _, stderr = proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError("Importing {} failed:\n{}".format(module, stderr))
+    return parse_importtime(stderr)
+
+
+def total_import_us(timings, module):
+    """Returns the cumulative import time of ``module`` in microseconds."""
+    for timing in timings:
+        if timing.module == module:
+            return timing.cumulative_us
+    raise ValueError("{} was not imported".format(module))
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--module', action='append',
+                        help="Module to import, can be repeated. Defaults to airflow "
+                             "and airflow.bin.cli")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="Number of fresh interpreters to start per module")
+    parser.add_argument('--top', type=int, default=15,
+                        help="Number of the slowest imported modules to show")
+    args = parser.parse_args(argv)
+
+    for module in args.module or ['airflow', 'airflow.bin.cli']:
+        runs = [measure_import(module) for _ in range(args.repeat)]
+        median_ms = _median([total_import_us(run, module) for run in runs]) / 1000.0
+
+        print("{}: median {:.1f} ms over {} runs".format(module, median_ms, args.repeat))
+        slowest = sorted(runs[-1], key=lambda timing: timing.self_us, reverse=True)
+        for timing in slowest[:args.top]:
+            print("    {:>10.1f} ms  {}".format(timing.self_us / 1000.0, timing.module))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Measures how many tasks the scheduler schedules per second, over a folder of
+generated DAGs of a given shape.
+
+Example::
+
+    python -m airflow.utils.perf.scheduler_throughput --shape tiny --dags 200 --runs 2
+    python -m airflow.utils.perf.scheduler_throughput --shape chain --tasks 100 \\
+        --sql-alchemy-conn postgresql://localhost/airflow_perf --upgrade-db
+
+The shapes are ``tiny`` (many DAGs of a few tasks), ``huge`` (a few DAGs of
+many tasks with random, seeded dependencies), ``fanout`` (a root task, many
+parallel tasks and a join task) and ``chain`` (tasks depending on each
+other in a line). Every DAG has ``--runs`` daily runs, from a fixed start
+date, so that runs over the same arguments schedule the same task instances.
+
+The scheduler runs in this process with an executor that marks the task
+instances successful as soon as they are started, until all of them are
+done. It runs against the configured metadata database, or the one given
+with ``--sql-alchemy-conn``; the dag runs and task instances of the
+generated DAGs are deleted before every run, nothing else is touched. The
+scheduler still sleeps between its loops as it does in production, which
+the tasks per second include but the loop durations do not.
+
+The report gives the tasks finished per second, the percentiles of the
+duration of the scheduling loops, from harvesting the DAG parsing results
+to processing the executor events, and the number of queries run by the
+scheduling loops and by the DAG file processors.
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from tabulate import tabulate
+
+SHAPES = ('tiny', 'huge', 'fanout', 'chain')
+
+# The number of DAGs and of tasks per DAG of each shape, unless given
+DEFAULT_SIZES = {
+    'tiny': (100, 2),
+    'huge': (2, 500),
+    'fanout': (5, 100),
+    'chain': (5, 50),
+}
+
+DAG_ID_PREFIX = 'perf_'
+
+DAG_FILE_TEMPLATE = '''\
+# Generated by airflow.utils.perf.scheduler_throughput
+import random
+from datetime import datetime, timedelta
+
+from airflow.models import DAG
+from airflow.operators.dummy_operator import DummyOperator
+
+SHAPE = {shape!r}
+NUM_TASKS = {num_tasks!r}
+SEED = {seed!r}
+
+dag = DAG(
+    {dag_id!r},
+    start_date=datetime({start_date.year}, {start_date.month}, {start_date.day}),
+    end_date=datetime({end_date.year}, {end_date.month}, {end_date.day}),
+    schedule_interval='@daily',
+    max_active_runs={runs!r},
+    is_paused_upon_creation=False,
+)
+tasks = [DummyOperator(task_id='task_{{}}'.format(i), dag=dag) for i in range(NUM_TASKS)]
+
+if SHAPE in ('tiny', 'chain'):
+    for upstream, downstream in zip(tasks, tasks[1:]):
+        upstream >> downstream
+elif SHAPE == 'fanout' and NUM_TASKS > 2:
+    tasks[0] >> tasks[1:-1] >> tasks[-1]
+elif SHAPE == 'huge':
+    rand = random.Random(SEED)
+    for i, task in enumerate(tasks[1:], 1):
+        for upstream in rand.sample(tasks[max(0, i - 50):i], min(i, rand.randint(1, 3))):
+            upstream >> task
+'''
+
+
+def generate_dag_folder(folder, shape, num_dags, num_tasks, runs, seed=0):
+    """
+    Writes the DAG files of a shape to a folder, one DAG per file.
+
+    :param folder: the folder of the DAG files
+    :type folder: str
+    :param shape: one of :data:`SHAPES`
+    :type shape: str
+    :param num_dags: the number of DAGs
+    :type num_dags: int
+    :param num_tasks: the number of tasks per DAG
+    :type num_tasks: int
+    :param runs: the number of daily runs of every DAG
+    :type runs: int
+    :param seed: the seed of the dependencies of the ``huge`` DAGs
+    :type seed: int
+    :return: the IDs of the DAGs
+    :rtype: list[str]
+    """
+    from airflow.utils import timezone
+
+    if shape not in SHAPES:
+        raise ValueError("Unknown shape {}, expected one of {}".format(shape, SHAPES))
+    start_date = timezone.datetime(2020, 1, 1)
+    end_date = start_date + timedelta(days=runs - 1)
+    dag_ids = []
+    for i in range(num_dags):
+        dag_id = '{}{}_{}'.format(DAG_ID_PREFIX, shape, i)
+        with open(os.path.join(folder, dag_id + '.py'), 'w') as dag_file:
+            dag_file.write(DAG_FILE_TEMPLATE.format(
+                shape=shape, num_tasks=num_tasks, seed=seed + i, dag_id=dag_id,
+                start_date=start_date, end_date=end_date, runs=runs))
+        dag_ids.append(dag_id)
+    return dag_ids
+
+
+def reset_dags(dag_ids):
+    """
+    Deletes the DAG models, dag runs and task instances of the DAGs, so that
+    the scheduler starts from scratch.
+
+    :param dag_ids: the IDs of the DAGs
+    :type dag_ids: list[str]
+    """
+    from airflow.models import DagModel, DagRun, TaskInstance
+    from airflow.models.serialized_dag import SerializedDagModel
+    from airflow.utils.db import create_session
+    from airflow.utils.helpers import chunks
+
+    with create_session() as session:
+        for chunk in chunks(dag_ids, 100):
+            for model in (TaskInstance, DagRun, SerializedDagModel, DagModel):
+                session.query(model).filter(model.dag_id.in_(chunk)) \
+                    .delete(synchronize_session=False)
+
+
+class QueryCounter(object):
+    """
+    Counts the queries run through SQLAlchemy, by the scheduler in this
+    process and by the DAG file processors it forks.
+    """
+
+    def __init__(self):
+        import multiprocessing
+
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self.scheduler_queries = 0
+        self._processor_queries = multiprocessing.Value('l', 0)
+
+    @property
+    def processor_queries(self):
+        return self._processor_queries.value
+
+    def _on_execute(self, *args, **kwargs):
+        if os.getpid() != self._pid:
+            with self._processor_queries.get_lock():
+                self._processor_queries.value += 1
+        elif not getattr(self._local, 'paused', False):
+            self.scheduler_queries += 1
+
+    def start(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        # Listening on the class catches the engines the processors create
+        event.listen(Engine, 'before_cursor_execute', self._on_execute)
+
+    def stop(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        event.remove(Engine, 'before_cursor_execute', self._on_execute)
+
+    def pause(self):
+        """Stops counting the queries of this thread, e.g. of the stub executor"""
+        self._local.paused = True
+
+    def resume(self):
+        self._local.paused = False
+
+
+def _make_executor(query_counter):
+    from sqlalchemy import and_, or_
+
+    from airflow.executors.base_executor import BaseExecutor
+    from airflow.models import TaskInstance as TI
+    from airflow.utils import timezone
+    from airflow.utils.db import create_session
+    from airflow.utils.helpers import chunks
+    from airflow.utils.state import State
+
+    class InstantExecutor(BaseExecutor):
+        """
+        Marks the task instances successful as soon as they are started,
+        as ``airflow run`` would, without running anything.
+        """
+
+        def __init__(self):
+            super(InstantExecutor, self).__init__()
+            self.finished = 0
+            self.last_finish_time = None
+            self._started = []
+
+        def execute_async(self, key, command, queue=None, executor_config=None):
+            self._started.append(key)
+
+        def sync(self):
+            if not self._started:
+                return
+            keys, self._started = self._started, []
+            now = timezone.utcnow()
+            query_counter.pause()
+            try:
+                with create_session() as session:
+                    for chunk in chunks(keys, 100):
+                        session.query(TI).filter(or_(*[
+                            and_(TI.dag_id == dag_id,
+                                 TI.task_id == task_id,
+                                 TI.execution_date == execution_date)
+                            for dag_id, task_id, execution_date, _ in chunk
+                        ])).update({
+                            TI.state: State.SUCCESS,
+                            TI.start_date: now,
+                            TI.end_date: now,
+                            TI.duration: 0,
+                            TI._try_number: TI._try_number + 1,
+                        }, synchronize_session=False)
+            finally:
+                query_counter.resume()
+            for key in keys:
+                self.success(key)
+            self.finished += len(keys)
+            self.last_finish_time = time.time()
+
+        def end(self):
+            self.heartbeat()
+
+        def terminate(self):
+            pass
+
+    return InstantExecutor()
+
+
+class LoopRecorder(object):
+    """
+    Records the duration and the queries of the scheduling loops of a
+    scheduler job and ends its loop once all the task instances are done.
+
+    The steps of the loop are wrapped on the job instance rather than
+    overridden in a subclass, as the job rows must keep the ``SchedulerJob``
+    type.
+    """
+
+    def __init__(self, job, query_counter, num_tasks):
+        self.job = job
+        self.query_counter = query_counter
+        self.num_tasks = num_tasks
+        self.first_loop_time = None
+        self.loop_durations = []
+        self.loop_queries = []
+        self._loop_start = None
+        self._get_simple_dags = job._get_simple_dags
+        self._validate_and_run_task_instances = job._validate_and_run_task_instances
+        job._get_simple_dags = self.get_simple_dags
+        job._validate_and_run_task_instances = self.validate_and_run_task_instances
+
+    def get_simple_dags(self):
+        self._loop_start = (time.time(), self.query_counter.scheduler_queries)
+        if self.first_loop_time is None:
+            self.first_loop_time = self._loop_start[0]
+        return self._get_simple_dags()
+
+    def validate_and_run_task_instances(self, simple_dag_bag):
+        result = self._validate_and_run_task_instances(simple_dag_bag)
+        start_time, start_queries = self._loop_start
+        self.loop_durations.append(time.time() - start_time)
+        self.loop_queries.append(self.query_counter.scheduler_queries - start_queries)
+        if self.job.executor.finished >= self.num_tasks:
+            # Ends the scheduler loop after this iteration
+            self.job.run_duration = 0
+        return result
+
+
+def percentile(values, percent):
+    """
+    Returns the nearest-rank percentile of the values.
+
+    :param values: the values
+    :type values: list[float]
+    :param percent: the percentile, between 0 and 100
+    :type percent: float
+    """
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    rank = int(round(percent / 100.0 * (len(ordered) - 1)))
+    return ordered[rank]
+
+
+def run_benchmark(dag_folder, dag_ids, num_tasks, timeout=600):
+    """
+    Runs the scheduler over a DAG folder until the given number of task
+    instances are done, or for at most ``timeout`` seconds.
+
+    :param dag_folder: the folder of the DAG files
+    :type dag_folder: str
+    :param dag_ids: the IDs of the DAGs of the folder
+    :type dag_ids: list[str]
+    :param num_tasks: the number of task instances to wait for
+    :type num_tasks: int
+    :param timeout: the maximum duration of the run, in seconds
+    :type timeout: int
+    :return: the measurements of the run
+    :rtype: dict
+    """
+    from airflow.jobs import SchedulerJob
+
+    reset_dags(dag_ids)
+    query_counter = QueryCounter()
+    executor = _make_executor(query_counter)
+    job = SchedulerJob(executor=executor, subdir=dag_folder, num_runs=-1,
+                       run_duration=timeout, processor_poll_interval=0)
+    recorder = LoopRecorder(job, query_counter, num_tasks)
+    query_counter.start()
+    try:
+        job.run()
+    finally:
+        query_counter.stop()
+
+    finish_time = executor.last_finish_time or time.time()
+    elapsed = finish_time - (recorder.first_loop_time or finish_time)
+    return {
+        'finished': executor.finished,
+        'elapsed': elapsed,
+        'tasks_per_second': executor.finished / elapsed if elapsed else float('nan'),
+        'loops': len(recorder.loop_durations),
+        'loop_durations': recorder.loop_durations,
+        'loop_queries': recorder.loop_queries,
+        'scheduler_queries': sum(recorder.loop_queries),
+        'processor_queries': query_counter.processor_queries,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--shape', choices=SHAPES, default='tiny',
+                        help="Shape of the generated DAGs")
+    parser.add_argument('--dags', type=int,
+                        help="Number of DAGs, defaults to a number fitting the shape")
+    parser.add_argument('--tasks', type=int,
+                        help="Number of tasks per DAG, defaults to a number fitting the shape")
+    parser.add_argument('--runs', type=int, default=1, help="Number of runs per DAG")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Seed of the dependencies of the huge DAGs")
+    parser.add_argument('--timeout', type=int, default=600,
+                        help="Maximum duration of the run in seconds")
+    parser.add_argument('--dag-folder',
+                        help="Folder to write the DAG files to, a temporary one by default")
+    parser.add_argument('--sql-alchemy-conn',
+                        help="Metadata database to run against, [core] "
+                             "sql_alchemy_conn by default")
+    parser.add_argument('--upgrade-db', action='store_true',
+                        help="Create or upgrade the tables of the metadata database first")
+    args = parser.parse_args(argv)
+
+    if args.sql_alchemy_conn:
+        # Set before airflow is imported, as the engine is made on import
+        os.environ['AIRFLOW__CORE__SQL_ALCHEMY_CONN'] = args.sql_alchemy_conn
+    os.environ['AIRFLOW__CORE__LOAD_EXAMPLES'] = 'False'
+
+    from airflow import settings
+    from airflow.configuration import conf
+
+    if args.upgrade_db:
+        from airflow.utils import db
+
+        db.upgradedb()
+
+    default_dags, default_tasks = DEFAULT_SIZES[args.shape]
+    num_dags = args.dags or default_dags
+    num_tasks = args.tasks or default_tasks
+
+    dag_folder = args.dag_folder or tempfile.mkdtemp(prefix='airflow_perf_')
+    try:
+        dag_ids = generate_dag_folder(dag_folder, args.shape, num_dags, num_tasks,
+                                      args.runs, seed=args.seed)
+        expected = num_dags * num_tasks * args.runs
+        result = run_benchmark(dag_folder, dag_ids, expected, timeout=args.timeout)
+    finally:
+        if not args.dag_folder:
+            shutil.rmtree(dag_folder, ignore_errors=True)
+
+    print("Scheduler over {} {} DAGs of {} tasks, {} runs each, on {}".format(
+        num_dags, args.shape, num_tasks, args.runs, settings.engine.dialect.name))
+    print("parallelism={}, dag_concurrency={}, max_threads={}, max_tis_per_query={}".format(
+        conf.getint('core', 'parallelism'), conf.getint('core', 'dag_concurrency'),
+        conf.getint('scheduler', 'max_threads'),
+        conf.getint('scheduler', 'max_tis_per_query')))
+    durations = [d * 1000 for d in result['loop_durations']]
+    print(tabulate([
+        ['task instances done', '{} / {}'.format(result['finished'], expected)],
+        ['elapsed s', '{:.2f}'.format(result['elapsed'])],
+        ['tasks per second', '{:.2f}'.format(result['tasks_per_second'])],
+        ['scheduling loops', result['loops']],
+        ['loop p50 ms', '{:.1f}'.format(percentile(durations, 50))],
+        ['loop p90 ms', '{:.1f}'.format(percentile(durations, 90))],
+        ['loop p99 ms', '{:.1f}'.format(percentile(durations, 99))],
+        ['loop max ms', '{:.1f}'.format(max(durations) if durations else float('nan'))],
+        ['scheduler queries', result['scheduler_queries']],
+        ['queries per loop p50', percentile(result['loop_queries'], 50)],
+        ['queries per loop max', max(result['loop_queries'] or [0])],
+        ['DAG processor queries', result['processor_queries']],
+    ]))
+    return 0 if result['finished'] >= expected else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Measures how long serializing and deserializing DAGs takes, over the example
+DAGs with every task copied a number of times.
+
+Example::
+
+    python -m airflow.utils.perf.serialization --scale 1 --scale 100 --repeat 3
+
+Every scale reports the time to serialize the DAGs with and without the
+JSON schema validation, the size of the JSON and of its compressed form as
+stored with ``[core] compress_serialized_dags``, the time to deserialize
+them and the time to then read all the attributes of their tasks.
+"""
+from __future__ import print_function
+
+import argparse
+import copy
+import sys
+import time
+import zlib
+
+from tabulate import tabulate
+
+
+def scale_dag(dag, scale):
+    """
+    Returns a copy of ``dag`` with ``scale`` copies of every task, the
+    copies of a task depend on the copies of its upstream tasks.
+
+    :param dag: the DAG to scale up
+    :type dag: airflow.models.DAG
+    :param scale: the number of copies of every task
+    :type scale: int
+    :rtype: airflow.models.DAG
+    """
+    scaled = copy.deepcopy(dag)
+    if scale <= 1:
+        return scaled
+
+    def copy_id(task_id, i):
+        return '{}__{}'.format(task_id, i)
+
+    for i in range(1, scale):
+        for task in dag.tasks:
+            task_copy = copy.deepcopy(task, {id(dag): scaled})
+            task_copy.task_id = copy_id(task.task_id, i)
+            task_copy._upstream_task_ids = {
+                copy_id(task_id, i) for task_id in task.upstream_task_ids}
+            task_copy._downstream_task_ids = {
+                copy_id(task_id, i) for task_id in task.downstream_task_ids}
+            scaled.task_dict[task_copy.task_id] = task_copy
+    return scaled
+
+
+def _read_task_attributes(dags):
+    from airflow.models import BaseOperator
+
+    fields = BaseOperator.get_serialized_fields()
+    for dag in dags:
+        for task in dag.tasks:
+            for field in fields:
+                getattr(task, field, None)
+
+
+def _best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        result = func()
+        timings.append(time.time() - start)
+    return min(timings), result
+
+
+def measure(dags, repeat=3):
+    """
+    Measures the serialization of ``dags``.
+
+    :param dags: the DAGs to serialize
+    :type dags: list[airflow.models.DAG]
+    :param repeat: the number of runs, the fastest one is reported
+    :type repeat: int
+    :return: the timings in seconds and sizes in bytes
+    :rtype: dict
+    """
+    from airflow.serialization.serialized_objects import SerializedDAG
+    from airflow.settings import json
+
+    validated_s, _ = _best_of(repeat, lambda: [
+        SerializedDAG.to_dict(dag, validate=True) for dag in dags])
+    serialize_s, serialized = _best_of(repeat, lambda: [
+        SerializedDAG.to_dict(dag, validate=False) for dag in dags])
+    blobs = [json.dumps(data).encode('utf-8') for data in serialized]
+    compress_s, compressed = _best_of(repeat, lambda: [zlib.compress(blob) for blob in blobs])
+    deserialize_s, deserialized = _best_of(repeat, lambda: [
+        SerializedDAG.from_dict(data) for data in serialized])
+    read_s, _ = _best_of(1, lambda: _read_task_attributes(deserialized))
+    return {
+        'tasks': sum(len(dag.tasks) for dag in dags),
+        'serialize_validated_s': validated_s,
+        'serialize_s': serialize_s,
+        'json_bytes': sum(len(blob) for blob in blobs),
+        'compressed_bytes': sum(len(blob) for blob in compressed),
+        'compress_s': compress_s,
+        'deserialize_s': deserialize_s,
+        'read_attributes_s': read_s,
+    }
+
+
+def load_example_dags():
+    """Returns the example DAGs shipped with Airflow, without their subdags"""
+    from airflow.models import DagBag
+
+    dagbag = DagBag(dag_folder='/dev/null', include_examples=True)
+    return [dag for dag in dagbag.dags.values() if not dag.is_subdag]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, action='append',
+                        help="Number of copies of every task, can be repeated. "
+                             "Defaults to 1, 10 and 100")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Number of runs per measure, the fastest one is reported")
+    args = parser.parse_args(argv)
+
+    dags = load_example_dags()
+    rows = []
+    for scale in args.scale or [1, 10, 100]:
+        result = measure([scale_dag(dag, scale) for dag in dags], repeat=args.repeat)
+        rows.append([
+            scale,
+            result['tasks'],
+            result['serialize_validated_s'] * 1000,
+            result['serialize_s'] * 1000,
+            result['json_bytes'] / 1024.0,
+            result['compressed_bytes'] / 1024.0,
+            result['compress_s'] * 1000,
+            result['deserialize_s'] * 1000,
+            result['read_attributes_s'] * 1000,
+        ])
+
+    print("Serialization of {} example DAGs".format(len(dags)))
+    print(tabulate(rows, headers=[
+        'scale', 'tasks', 'serialize+validate ms', 'serialize ms', 'json KiB',
+        'compressed KiB', 'compress ms', 'deserialize ms', 'read attrs ms',
+    ], floatfmt='.1f'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
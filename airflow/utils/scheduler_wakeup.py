@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Wakeups of the schedulers when a task instance finishes, enabled with
+``[scheduler] event_driven_wakeups``.
+
+A task instance that reaches a final state notifies the schedulers with the
+ID of its DAG, so that they process the DAG file again right away to
+schedule the downstream tasks, rather than at their next loop. On Postgres
+the notifications go through ``NOTIFY``, on the other databases through a
+datagram socket on the host of the scheduler, ``[scheduler]
+wakeup_socket``, so only the task instances run on that host wake it up.
+"""
+import errno
+import os
+import select
+import socket
+import time
+
+from sqlalchemy import text
+
+from airflow import settings
+from airflow.configuration import conf
+from airflow.utils.log.logging_mixin import LoggingMixin
+
+CHANNEL = 'airflow_scheduler'
+
+log = LoggingMixin().log
+
+
+def wakeups_enabled():
+    return conf.getboolean('scheduler', 'event_driven_wakeups', fallback=False)
+
+
+def _uses_notify(engine):
+    # LISTEN needs a connection that can be waited on, as psycopg2 ones can
+    return engine.dialect.name == 'postgresql' and engine.driver == 'psycopg2'
+
+
+def _socket_path():
+    return conf.get('scheduler', 'wakeup_socket',
+                    fallback=os.path.join(settings.AIRFLOW_HOME, 'scheduler_wakeup.sock'))
+
+
+def _root_dag_id(dag):
+    while dag.parent_dag is not None:
+        dag = dag.parent_dag
+    return dag.dag_id
+
+
+def notify_scheduler(dag, session):
+    """
+    Wakes the schedulers up to process the file of ``dag`` again. Meant to
+    be called once the state of a task instance of the DAG is committed,
+    failures are only logged as the schedulers poll anyway.
+
+    :param dag: the DAG of the task instance, or one of its subdags
+    :type dag: airflow.models.DAG
+    """
+    if dag is None or not wakeups_enabled():
+        return
+    dag_id = _root_dag_id(dag)
+    try:
+        if _uses_notify(session.get_bind()):
+            session.execute(text('SELECT pg_notify(:channel, :payload)'),
+                            {'channel': CHANNEL, 'payload': dag_id})
+            session.commit()
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            try:
+                sock.setblocking(False)
+                sock.sendto(dag_id.encode('utf-8'), _socket_path())
+            finally:
+                sock.close()
+    except (socket.error, IOError) as e:
+        # No scheduler listening on this host, or its socket buffer is full
+        log.debug("Could not wake the scheduler up: %s", e)
+    except Exception:
+        log.warning("Could not wake the scheduler up", exc_info=True)
+
+
+class SchedulerWakeup(LoggingMixin):
+    """
+    Receives the notifications of :func:`notify_scheduler`, through a
+    ``LISTEN`` connection on Postgres and a datagram socket otherwise.
+    """
+
+    def __init__(self):
+        self._pg_conn = None
+        self._socket = None
+        self._socket_path = None
+
+    def start(self):
+        if _uses_notify(settings.engine):
+            self._listen()
+            return
+        try:
+            self._bind()
+        except (socket.error, OSError):
+            self.log.warning("Could not bind the socket for scheduler wakeups, "
+                             "waking up on a fixed interval", exc_info=True)
+
+    def _listen(self):
+        try:
+            conn = settings.engine.raw_connection()
+            # The connection stays out of the pool, it only waits for notifications
+            conn.detach()
+            conn.connection.autocommit = True
+            cursor = conn.cursor()
+            cursor.execute('LISTEN {}'.format(CHANNEL))
+            cursor.close()
+            self._pg_conn = conn
+        except Exception:
+            self.log.warning("Could not LISTEN for scheduler wakeups", exc_info=True)
+
+    def _bind(self):
+        path = _socket_path()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        if os.path.exists(path):
+            try:
+                sock.connect(path)
+            except socket.error as e:
+                if e.errno != errno.ECONNREFUSED:
+                    raise
+                # Left over by a scheduler that did not exit cleanly
+                os.remove(path)
+            else:
+                self.log.warning("Another scheduler receives the wakeups of %s, "
+                                 "waking up on a fixed interval", path)
+                sock.close()
+                return
+            sock.close()
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(path)
+        sock.setblocking(False)
+        self._socket = sock
+        self._socket_path = path
+
+    def wait(self, timeout, waitables=()):
+        """
+        Waits for a notification, or for one of ``waitables`` to be readable,
+        for at most ``timeout`` seconds.
+
+        :param timeout: the maximum number of seconds to wait
+        :type timeout: float
+        :param waitables: other objects to wait on, anything with a ``fileno``
+        :type waitables: list
+        :return: the IDs of the DAGs notified since the last call
+        :rtype: set[str]
+        """
+        readers = list(waitables)
+        if self._pg_conn is None and _uses_notify(settings.engine):
+            # Reconnects after the database went away
+            self._listen()
+        if self._pg_conn is not None:
+            readers.append(self._pg_conn.connection)
+        if self._socket is not None:
+            readers.append(self._socket)
+        if readers:
+            try:
+                select.select(readers, [], [], timeout)
+            except (select.error, IOError, OSError, ValueError) as e:
+                # Interrupted by a signal, or a waitable was closed meanwhile
+                self.log.debug("Wait for wakeups interrupted: %s", e)
+        elif timeout > 0:
+            time.sleep(timeout)
+        return self._receive()
+
+    def _receive(self):
+        dag_ids = set()
+        if self._pg_conn is not None:
+            try:
+                conn = self._pg_conn.connection
+                conn.poll()
+                while conn.notifies:
+                    dag_ids.add(conn.notifies.pop(0).payload)
+            except Exception:
+                self.log.warning("Lost the LISTEN connection for scheduler wakeups",
+                                 exc_info=True)
+                self._close_pg_conn()
+        if self._socket is not None:
+            while True:
+                try:
+                    data = self._socket.recv(4096)
+                except socket.error as e:
+                    if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                        self.log.warning("Could not read scheduler wakeups: %s", e)
+                    break
+                dag_ids.add(data.decode('utf-8'))
+        return dag_ids
+
+    def _close_pg_conn(self):
+        try:
+            self._pg_conn.close()
+        except Exception:
+            pass
+        self._pg_conn = None
+
+    def close(self):
+        if self._pg_conn is not None:
+            self._close_pg_conn()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            try:
+                os.remove(self._socket_path)
+            except OSError:
+                pass
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Splitting of the DAG files among the schedulers running at the same time.
+
+Every scheduler heartbeats its row of the ``job`` table, the running
+schedulers with a recent heartbeat are the members among which the files
+are split. A file belongs to the member with the highest hash of the
+member and the file (rendezvous hashing), so when a scheduler joins or
+leaves, only the files it owns, or is going to own, move.
+"""
+import hashlib
+import os
+from datetime import timedelta
+
+from airflow.configuration import conf
+from airflow.utils import timezone
+from airflow.utils.db import provide_session
+from airflow.utils.state import State
+
+SCHEDULER_JOB_TYPE = 'SchedulerJob'
+
+
+def _weight(member, key):
+    digest = hashlib.md5('{}:{}'.format(member, key).encode('utf-8')).hexdigest()
+    return int(digest[:16], 16)
+
+
+def get_owner(key, members):
+    """
+    Returns the member that owns ``key``, None if there are no members.
+
+    :param key: the key to find the owner of, e.g. a DAG file
+    :type key: str
+    :param members: the ids of the members
+    :type members: list[int]
+    """
+    if not members:
+        return None
+    return max(members, key=lambda member: (_weight(member, key), member))
+
+
+def get_owned_file_paths(file_paths, dag_directory, member, members):
+    """
+    Returns the paths in ``file_paths`` owned by ``member``. The files are
+    hashed on their path relative to ``dag_directory``, so that schedulers
+    with the DAGs folder at different locations agree on their owners.
+    """
+    members = set(members) | {member}
+    return [
+        file_path for file_path in file_paths
+        if get_owner(os.path.relpath(file_path, dag_directory), members) == member
+    ]
+
+
+@provide_session
+def get_live_scheduler_ids(session=None):
+    """
+    Returns the sorted ids of the running scheduler jobs that heartbeated
+    within ``[scheduler] scheduler_health_check_threshold`` seconds.
+
+    :rtype: list[int]
+    """
+    from airflow.jobs.base_job import BaseJob
+
+    threshold = conf.getint('scheduler', 'scheduler_health_check_threshold')
+    limit_dttm = timezone.utcnow() - timedelta(seconds=threshold)
+    rows = (
+        session
+        .query(BaseJob.id)
+        .filter(BaseJob.job_type == SCHEDULER_JOB_TYPE,
+                BaseJob.state == State.RUNNING,
+                BaseJob.latest_heartbeat >= limit_dttm)
+        .all()
+    )
+    return sorted(job_id for job_id, in rows)
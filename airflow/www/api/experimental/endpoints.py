@@ -21,15 +21,17 @@ from flask import (
 )
 
 import airflow.api
+from airflow.api.common.experimental import DEFAULT_PAGE_LIMIT
 from airflow.api.common.experimental import delete_dag as delete
 from airflow.api.common.experimental import pool as pool_api
 from airflow.api.common.experimental import trigger_dag as trigger
-from airflow.api.common.experimental.get_dag_runs import get_dag_runs
+from airflow.api.common.experimental.get_dag_runs import get_dag_runs, get_dag_runs_page
 from airflow.api.common.experimental.get_task import get_task
 from airflow.api.common.experimental.get_task_instance import get_task_instance
+from airflow.api.common.experimental.get_task_instance_states import get_task_instance_states
 from airflow.api.common.experimental.get_code import get_code
 from airflow.api.common.experimental.get_dag_run_state import get_dag_run_state
-from airflow.exceptions import AirflowException
+from airflow.exceptions import AirflowBadRequest, AirflowException
 from airflow.utils import timezone
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.strings import to_boolean
@@ -43,6 +45,42 @@ requires_authentication = airflow.api.API_AUTH.api_auth.requires_authentication
 api_experimental = Blueprint('api_experimental', __name__)
 
 
+def _page_args():
+    """
+    Returns the ``limit`` and ``cursor`` query string parameters of a list
+    request, both None when the whole list is requested.
+    """
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit')
+    if limit is None:
+        return (DEFAULT_PAGE_LIMIT, cursor) if cursor else (None, None)
+    try:
+        return int(limit), cursor
+    except ValueError:
+        raise AirflowBadRequest("The limit must be an integer: {}".format(limit))
+
+
+def _paged_response(payload, next_cursor):
+    """The cursor of the next page, if any, is sent in the X-Next-Cursor header"""
+    response = jsonify(payload)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
+
+
+def _parse_execution_date(item):
+    execution_date = item.get('execution_date')
+    if execution_date is None:
+        return None
+    try:
+        return timezone.parse(execution_date)
+    except ValueError:
+        raise AirflowBadRequest(
+            'Given execution date, {}, could not be identified '
+            'as a date. Example date format: 2015-11-16T14:34:15+00:00'.format(
+                execution_date))
+
+
 @csrf.exempt
 @api_experimental.route('/dags/<string:dag_id>/dag_runs', methods=['POST'])
 @requires_authentication
@@ -121,6 +159,9 @@ def dag_runs(dag_id):
     """
     Returns a list of Dag Runs for a specific DAG ID.
     :query param state: a query string parameter '?state=queued|running|success...'
+    :query param limit: the maximum number of runs returned, all the runs are
+        returned unless a limit or a cursor is given
+    :query param cursor: the X-Next-Cursor header of the previous page
 
     :param dag_id: String identifier of a DAG
     :return: List of DAG runs of a DAG with requested state,
@@ -128,14 +169,116 @@ def dag_runs(dag_id):
     """
     try:
         state = request.args.get('state')
-        dagruns = get_dag_runs(dag_id, state, run_url_route='airflow.graph')
+        limit, cursor = _page_args()
+        if limit is None:
+            dagruns = get_dag_runs(dag_id, state, run_url_route='airflow.graph')
+            next_cursor = None
+        else:
+            dagruns, next_cursor = get_dag_runs_page(
+                dag_id, state, run_url_route='airflow.graph', limit=limit, cursor=cursor)
     except AirflowException as err:
         _log.info(err)
         response = jsonify(error="{}".format(err))
         response.status_code = 400
         return response
 
-    return jsonify(dagruns)
+    return _paged_response(dagruns, next_cursor)
+
+
+@csrf.exempt
+@api_experimental.route('/dag_runs', methods=['POST'])
+@requires_authentication
+def trigger_dags():
+    """
+    Triggers many dag runs, possibly of different Dags, at once. The data is
+    a list of dag runs under ``dag_runs``, each with a ``dag_id`` and the
+    same optional fields as when triggering a single dag run.
+
+    The dag runs are triggered independently, the result of each one is
+    returned in order, with an ``error`` for the ones that were not created.
+    """
+    data = request.get_json(force=True)
+    items = data.get('dag_runs') if isinstance(data, dict) else None
+    if not isinstance(items, list) or \
+            not all(isinstance(item, dict) and item.get('dag_id') for item in items):
+        response = jsonify(error="Expected a list of dag runs with a dag_id under 'dag_runs'")
+        response.status_code = 400
+        return response
+
+    requested = []
+    results = [None] * len(items)
+    for i, item in enumerate(items):
+        try:
+            execution_date = _parse_execution_date(item)
+        except AirflowBadRequest as err:
+            results[i] = {'dag_id': item['dag_id'], 'error': "{}".format(err)}
+            continue
+        replace_microseconds = (execution_date is None)
+        if 'replace_microseconds' in item:
+            replace_microseconds = to_boolean(item['replace_microseconds'])
+        requested.append((i, {
+            'dag_id': item['dag_id'],
+            'run_id': item.get('run_id'),
+            'conf': item.get('conf'),
+            'execution_date': execution_date,
+            'replace_microseconds': replace_microseconds,
+        }))
+
+    triggered = trigger.trigger_dags([dag_run for _, dag_run in requested])
+    for (i, dag_run), dr in zip(requested, triggered):
+        if isinstance(dr, AirflowException):
+            results[i] = {'dag_id': dag_run['dag_id'], 'error': "{}".format(dr)}
+        else:
+            results[i] = {
+                'dag_id': dr.dag_id,
+                'run_id': dr.run_id,
+                'execution_date': dr.execution_date.isoformat(),
+                'message': "Created {}".format(dr),
+            }
+
+    if getattr(g, 'user', None):
+        _log.info("User %s triggered %s dag runs", g.user,
+                  sum(1 for result in results if 'error' not in result))
+
+    return jsonify(dag_runs=results)
+
+
+@csrf.exempt
+@api_experimental.route('/task_instances/states', methods=['POST'])
+@requires_authentication
+def task_instance_states():
+    """
+    Returns the states of many task instances at once. The data is a list
+    of task instances under ``task_instances``, each with its ``dag_id``,
+    ``task_id`` and either the ``execution_date`` or the ``run_id`` of its
+    dag run.
+    """
+    data = request.get_json(force=True)
+    items = data.get('task_instances') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not all(
+            isinstance(item, dict) and item.get('dag_id') and item.get('task_id') and
+            (item.get('execution_date') or item.get('run_id')) for item in items):
+        response = jsonify(error="Expected a list of task instances with a dag_id, a "
+                                 "task_id and an execution_date or a run_id under "
+                                 "'task_instances'")
+        response.status_code = 400
+        return response
+
+    keys = []
+    try:
+        for item in items:
+            key = {'dag_id': item['dag_id'], 'task_id': item['task_id'],
+                   'execution_date': _parse_execution_date(item)}
+            if item.get('run_id'):
+                key['run_id'] = item['run_id']
+            keys.append(key)
+    except AirflowBadRequest as err:
+        _log.info(err)
+        response = jsonify(error="{}".format(err))
+        response.status_code = err.status_code
+        return response
+
+    return jsonify(task_instances=get_task_instance_states(keys))
 
 
 @api_experimental.route('/test', methods=['GET'])
@@ -307,16 +450,20 @@ def get_pool(name):
 @api_experimental.route('/pools', methods=['GET'])
 @requires_authentication
 def get_pools():
-    """Get all pools."""
+    """Get all pools, or a page of them when a limit or a cursor is given."""
     try:
-        pools = pool_api.get_pools()
+        limit, cursor = _page_args()
+        if limit is None:
+            pools, next_cursor = pool_api.get_pools(), None
+        else:
+            pools, next_cursor = pool_api.get_pools_page(limit, cursor)
     except AirflowException as err:
         _log.error(err)
         response = jsonify(error="{}".format(err))
         response.status_code = err.status_code
         return response
     else:
-        return jsonify([p.to_json() for p in pools])
+        return _paged_response([p.to_json() for p in pools], next_cursor)
 
 
 @csrf.exempt
@@ -56,7 +56,7 @@ from pygments.formatters import HtmlFormatter
 import six
 from six.moves.urllib.parse import quote, unquote
 
-from sqlalchemy import or_, desc, and_, union_all
+from sqlalchemy import or_, desc
 from wtforms import (
     Form, SelectField, TextAreaField, PasswordField,
     StringField, IntegerField, validators)
@@ -572,27 +572,16 @@ class Airflow(AirflowViewMixin, BaseView):
     @login_required
     @provide_session
     def dag_stats(self, session=None):
-        dr = models.DagRun
         dm = models.DagModel
-        dag_ids = session.query(dm.dag_id)
+        dag_ids = [dag_id for (dag_id, ) in session.query(dm.dag_id)]
 
-        dag_state_stats = (
-            session.query(dr.dag_id, dr.state, sqla.func.count(dr.state)).group_by(dr.dag_id, dr.state)
-        )
-
-        data = {}
-        for (dag_id, ) in dag_ids:
-            data[dag_id] = {}
-        for dag_id, state, count in dag_state_stats:
-            if dag_id not in data:
-                data[dag_id] = {}
-            data[dag_id][state] = count
+        data = models.DagStats.get_counts(models.DagStats.DAG_RUN, session=session)
 
         payload = {}
-        for dag_id, d in data.items():
+        for dag_id in set(dag_ids).union(data):
             payload[dag_id] = []
             for state in State.dag_states:
-                count = d.get(state, 0)
+                count = data.get(dag_id, {}).get(state, 0)
                 payload[dag_id].append({
                     'state': state,
                     'count': count,
@@ -605,8 +594,6 @@ class Airflow(AirflowViewMixin, BaseView):
     @login_required
     @provide_session
     def task_stats(self, session=None):
-        TI = models.TaskInstance
-        DagRun = models.DagRun
         Dag = models.DagModel
 
         # Filter by get parameters
@@ -614,65 +601,18 @@ class Airflow(AirflowViewMixin, BaseView):
             unquote(dag_id) for dag_id in request.args.get('dag_ids', '').split(',') if dag_id
         }
 
-        LastDagRun = (
-            session.query(DagRun.dag_id, sqla.func.max(DagRun.execution_date).label('execution_date'))
-                .join(Dag, Dag.dag_id == DagRun.dag_id)
-                .filter(DagRun.state != State.RUNNING)
-                .filter(Dag.is_active == True)  # noqa: E712
-                .filter(Dag.is_subdag == False)  # noqa: E712
-                .group_by(DagRun.dag_id)
-        )
-
-        RunningDagRun = (
-            session.query(DagRun.dag_id, DagRun.execution_date)
-                .join(Dag, Dag.dag_id == DagRun.dag_id)
-                .filter(DagRun.state == State.RUNNING)
-                .filter(Dag.is_active == True)  # noqa: E712
-                .filter(Dag.is_subdag == False)  # noqa: E712
-        )
-
-        if selected_dag_ids:
-            LastDagRun = LastDagRun.filter(DagRun.dag_id.in_(selected_dag_ids))
-            RunningDagRun = RunningDagRun.filter(DagRun.dag_id.in_(selected_dag_ids))
-
-        LastDagRun = LastDagRun.subquery('last_dag_run')
-        RunningDagRun = RunningDagRun.subquery('running_dag_run')
-
-        # Select all task_instances from active dag_runs.
-        # If no dag_run is active, return task instances from most recent dag_run.
-        LastTI = (
-            session.query(TI.dag_id.label('dag_id'), TI.state.label('state'))
-            .join(LastDagRun, and_(
-                LastDagRun.c.dag_id == TI.dag_id,
-                LastDagRun.c.execution_date == TI.execution_date))
-        )
-        RunningTI = (
-            session.query(TI.dag_id.label('dag_id'), TI.state.label('state'))
-            .join(RunningDagRun, and_(
-                RunningDagRun.c.dag_id == TI.dag_id,
-                RunningDagRun.c.execution_date == TI.execution_date))
-        )
-
-        if selected_dag_ids:
-            LastTI = LastTI.filter(TI.dag_id.in_(selected_dag_ids))
-            RunningTI = RunningTI.filter(TI.dag_id.in_(selected_dag_ids))
-
-        UnionTI = union_all(LastTI, RunningTI).alias('union_ti')
-        qry = (
-            session.query(UnionTI.c.dag_id, UnionTI.c.state, sqla.func.count())
-            .group_by(UnionTI.c.dag_id, UnionTI.c.state)
-        )
+        dag_ids = selected_dag_ids or {dag_id for (dag_id,) in session.query(Dag.dag_id)}
 
-        data = {}
-        for dag_id, state, count in qry:
-            if dag_id not in data:
-                data[dag_id] = {}
-            data[dag_id][state] = count
+        # Task instance counts of the running and most recent DAG runs, kept
+        # up to date by the scheduler, leaving out those of subdags
+        subdag_ids = {
+            dag_id for (dag_id,) in session.query(Dag.dag_id)
+            .filter(Dag.is_subdag == True)  # noqa: E712
+        }
+        data = models.DagStats.get_counts(
+            models.DagStats.TASK_INSTANCE, dag_ids - subdag_ids, session=session)
 
         payload = {}
-
-        dag_ids = selected_dag_ids or {dag_id for (dag_id,) in session.query(Dag.dag_id)}
-
         for dag_id in dag_ids:
             payload[dag_id] = []
             for state in State.task_states:
@@ -2801,13 +2741,20 @@ class DagRunModelView(ModelViewOnly):
         deleted = set(session.query(models.DagRun)
                       .filter(models.DagRun.id.in_(ids))
                       .all())
+        dirty_ids = []
+        transitions = []
+        for row in deleted:
+            dirty_ids.append(row.dag_id)
+            transitions.append((row.dag_id, row.state))
         session.query(models.DagRun) \
             .filter(models.DagRun.id.in_(ids)) \
             .delete(synchronize_session='fetch')
+        for dag_id, state in transitions:
+            models.DagStats.record_dag_run_transition(
+                dag_id, state, models.DagStats.ABSENT, session=session)
         session.commit()
-        dirty_ids = []
-        for row in deleted:
-            dirty_ids.append(row.dag_id)
+        # The deleted runs may have to be scheduled again
+        models.DagModel.reset_next_dagrun(dirty_ids, session=session)
 
     @action('set_running', "Set state to 'running'", None)
     @provide_session
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Series for the duration, tries, landing times and gantt charts.
+
+The series are built from column-only aggregate queries instead of loading
+every task instance of the requested runs into ORM objects, downsampled to
+the resolution of the chart and cached per DAG. A cache entry is keyed on
+the latest ``updated_at`` and the number of task instances in the window,
+so it is never served once one of the underlying rows changes.
+"""
+import calendar
+import threading
+from collections import OrderedDict, defaultdict
+
+from sqlalchemy import and_, func
+
+from airflow.configuration import conf
+from airflow.models import TaskFail, TaskInstance
+from airflow.utils import timezone
+from airflow.utils.state import State
+
+DURATION = 'duration'
+TRIES = 'tries'
+LANDING_TIMES = 'landing_times'
+
+DEFAULT_MAX_POINTS = conf.getint('webserver', 'chart_max_points', fallback=600)
+MAX_POINTS_LIMIT = 5000
+
+
+def epoch_ms(dttm):
+    """Milliseconds since the epoch of an aware datetime, as nvd3 expects"""
+    return calendar.timegm(dttm.utctimetuple()) * 1000
+
+
+def downsample(points, max_points):
+    """
+    Reduces a series of ``(x, y)`` points sorted on ``x`` to at most
+    ``max_points`` points with the Largest-Triangle-Three-Buckets algorithm,
+    which keeps the visual shape (peaks and troughs) of the series.
+
+    :param points: the points of the series, sorted on x
+    :type points: list[tuple]
+    :param max_points: the maximum number of points to return
+    :type max_points: int
+    :rtype: list[tuple]
+    """
+    num_points = len(points)
+    if max_points is None or max_points < 3 or num_points <= max_points:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = float(num_points - 2) / (max_points - 2)
+    selected = 0
+    for i in range(max_points - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, num_points)
+        next_bucket = points[end:next_end] or [points[-1]]
+        avg_x = sum(p[0] for p in next_bucket) / float(len(next_bucket))
+        avg_y = sum(p[1] for p in next_bucket) / float(len(next_bucket))
+
+        selected_x, selected_y = points[selected][0], points[selected][1]
+        max_area = -1
+        for j in range(start, end):
+            area = abs((selected_x - avg_x) * (points[j][1] - selected_y) -
+                       (selected_x - points[j][0]) * (avg_y - selected_y))
+            if area > max_area:
+                max_area = area
+                candidate = j
+        sampled.append(points[candidate])
+        selected = candidate
+    sampled.append(points[-1])
+    return sampled
+
+
+class ChartDataCache(object):
+    """
+    Thread safe, size bounded LRU cache of chart series. Keys contain the
+    version of the data they were computed from, so entries never need to
+    be invalidated, stale ones simply fall out of the cache.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                value = self._entries.pop(key)
+                self._entries[key] = value
+                return value
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+cache = ChartDataCache(conf.getint('webserver', 'chart_data_cache_size', fallback=128))
+
+
+def _ti_filter(dag, min_date, base_date, model=TaskInstance):
+    """Filter on the task instances of ``dag`` between the two dates"""
+    clauses = [
+        model.dag_id == dag.dag_id,
+        model.execution_date >= min_date,
+        model.execution_date <= base_date,
+    ]
+    # Only restrict on the task ids when looking at a subset of the DAG,
+    # a large IN list is more expensive than dropping the odd removed task
+    if dag.partial:
+        clauses.append(model.task_id.in_(dag.task_ids))
+    return and_(*clauses)
+
+
+def _data_version(dag, min_date, base_date, session):
+    """
+    Cheap summary of the task instances in the window: latest update, row
+    count and latest execution date.
+    """
+    TI = TaskInstance
+    return session.query(
+        func.max(TI.updated_at),
+        func.count(),
+        func.max(TI.execution_date),
+    ).filter(_ti_filter(dag, min_date, base_date)).one()
+
+
+def _duration_series(dag, min_date, base_date, session):
+    TI = TaskInstance
+    TF = TaskFail
+    fails = (
+        session.query(TF.task_id,
+                      TF.execution_date,
+                      func.sum(TF.duration).label('fail_duration'))
+        .filter(_ti_filter(dag, min_date, base_date, model=TF))
+        .group_by(TF.task_id, TF.execution_date)
+        .subquery()
+    )
+    rows = (
+        session.query(TI.task_id, TI.execution_date, TI.duration, fails.c.fail_duration)
+        .outerjoin(fails, and_(fails.c.task_id == TI.task_id,
+                               fails.c.execution_date == TI.execution_date))
+        .filter(_ti_filter(dag, min_date, base_date), TI.duration > 0)
+        .order_by(TI.task_id, TI.execution_date)
+    )
+    series = defaultdict(list)
+    cum_series = defaultdict(list)
+    for task_id, execution_date, duration, fail_duration in rows:
+        x = epoch_ms(execution_date)
+        series[task_id].append((x, float(duration)))
+        cum_series[task_id].append((x, float(duration + (fail_duration or 0))))
+    return {'series': series, 'cum_series': cum_series}
+
+
+def _tries_series(dag, min_date, base_date, session):
+    TI = TaskInstance
+    rows = (
+        session.query(TI.task_id, TI.execution_date, TI._try_number)
+        .filter(_ti_filter(dag, min_date, base_date))
+        .order_by(TI.task_id, TI.execution_date)
+    )
+    series = defaultdict(list)
+    for task_id, execution_date, try_number in rows:
+        # y value should reflect completed tries to have a 0 baseline.
+        series[task_id].append((epoch_ms(execution_date), try_number or 0))
+    return {'series': series}
+
+
+def _landing_times_series(dag, min_date, base_date, session):
+    TI = TaskInstance
+    rows = (
+        session.query(TI.task_id, TI.execution_date, TI.end_date)
+        .filter(_ti_filter(dag, min_date, base_date), TI.end_date.isnot(None))
+        .order_by(TI.task_id, TI.execution_date)
+    )
+    # every task of a run shares the same schedule, only compute it once per run
+    landing_base = {}
+    series = defaultdict(list)
+    for task_id, execution_date, end_date in rows:
+        if execution_date not in landing_base:
+            ts = execution_date
+            if dag.schedule_interval:
+                ts = dag.following_schedule(ts) or ts
+            landing_base[execution_date] = ts
+        secs = (end_date - landing_base[execution_date]).total_seconds()
+        series[task_id].append((epoch_ms(execution_date), secs))
+    return {'series': series}
+
+
+_BUILDERS = {
+    DURATION: _duration_series,
+    TRIES: _tries_series,
+    LANDING_TIMES: _landing_times_series,
+}
+
+
+def get_series(kind, dag, min_date, base_date, max_points=None, session=None):
+    """
+    Returns the series of the ``kind`` chart for the tasks of ``dag`` between
+    ``min_date`` and ``base_date``, downsampled to ``max_points`` per task.
+
+    :return: a dict with the task id to points mappings of the chart
+        (``series`` and, for the duration chart, ``cum_series``) and the
+        ``max_date``, the latest execution date in the window
+    """
+    max_points = min(max_points or DEFAULT_MAX_POINTS, MAX_POINTS_LIMIT)
+    updated_at, count, max_date = _data_version(dag, min_date, base_date, session)
+    key = (kind, dag.dag_id, frozenset(dag.task_ids), str(dag.schedule_interval),
+           min_date, base_date, max_points, updated_at, count)
+
+    def compute():
+        data = _BUILDERS[kind](dag, min_date, base_date, session)
+        task_ids = dag.task_ids
+        result = {'max_date': max_date}
+        for name, series in data.items():
+            result[name] = OrderedDict(
+                (task_id, downsample(series[task_id], max_points))
+                for task_id in task_ids if series.get(task_id))
+        return result
+
+    return cache.get_or_compute(key, compute)
+
+
+def get_gantt_items(dag, execution_date, session=None):
+    """
+    Returns the bars of the gantt chart of one run as ``(task_id, start_date,
+    end_date, state, try_number)`` tuples, with all reschedules of one
+    attempt combined into one bar, along with the ordered task ids.
+    """
+    TI = TaskInstance
+    TF = TaskFail
+    tis = (
+        session.query(TI.task_id, TI.start_date, TI.end_date, TI.state, TI._try_number)
+        .filter(_ti_filter(dag, execution_date, execution_date),
+                TI.start_date.isnot(None), TI.state.isnot(None))
+        .order_by(TI.start_date)
+        .all()
+    )
+    task_ids = set(dag.task_ids)
+    tis = [ti for ti in tis if ti.task_id in task_ids]
+    ti_fails = (
+        session.query(TF.task_id, TF.start_date, TF.end_date)
+        .filter(_ti_filter(dag, execution_date, execution_date, model=TF),
+                TF.task_id.in_([ti.task_id for ti in tis]))
+        .order_by(TF.task_id, TF.start_date)
+        .all()
+    ) if tis else []
+
+    items = []
+    for task_id, start_date, end_date, state, try_number in tis:
+        # the raw try_number reflects the currently running try_number
+        # or the try_number of the last complete run
+        # https://issues.apache.org/jira/browse/AIRFLOW-2143
+        items.append((task_id, start_date, end_date or timezone.utcnow(), state,
+                      try_number))
+
+    try_count = 1
+    prev_task_id = None
+    for task_id, start_date, end_date in ti_fails:
+        try_count = try_count + 1 if task_id == prev_task_id else 1
+        prev_task_id = task_id
+        items.append((task_id, start_date, end_date or timezone.utcnow(), State.FAILED,
+                      try_count))
+
+    return items, [ti.task_id for ti in tis]
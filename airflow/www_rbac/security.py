@@ -98,14 +98,18 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):
         'can_log',
         'can_get_logs_with_metadata',
         'can_tries',
+        'can_tries_data',
         'can_graph',
         'can_tree',
         'can_task',
         'can_task_instances',
         'can_xcom',
         'can_gantt',
+        'can_gantt_data',
         'can_landing_times',
+        'can_landing_times_data',
         'can_duration',
+        'can_duration_data',
         'can_blocked',
         'can_rendered',
         'can_pickle_info',
@@ -19,14 +19,12 @@
 #
 
 import copy
-import itertools
 import json
 import logging
 import math
 import os
 import socket
 import traceback
-from collections import defaultdict
 from datetime import timedelta
 from urllib.parse import unquote
 
@@ -46,7 +44,7 @@ from flask_babel import lazy_gettext
 import lazy_object_proxy
 from pygments import highlight, lexers
 from pygments.formatters import HtmlFormatter
-from sqlalchemy import or_, desc, and_, union_all
+from sqlalchemy import or_, desc
 from wtforms import SelectField, validators
 
 import airflow
@@ -55,7 +53,8 @@ from airflow import settings, configuration
 from airflow.configuration import conf
 from airflow.api.common.experimental.mark_tasks import (set_dag_run_state_to_success,
                                                         set_dag_run_state_to_failed)
-from airflow.models import Connection, DagModel, DagRun, errors, Log, SlaMiss, TaskFail, XCom
+from airflow.models import (Connection, DagModel, DagRun, errors, Log,
+                            RenderedTaskInstanceFields, SlaMiss, XCom)
 from airflow.settings import STORE_SERIALIZED_DAGS
 from airflow.ti_deps.dep_context import RUNNING_DEPS, SCHEDULER_QUEUED_DEPS, DepContext
 from airflow.utils import timezone
@@ -64,7 +63,7 @@ from airflow.utils.db import provide_session
 from airflow.utils.helpers import alchemy_to_dict, render_log_filename
 from airflow.utils.state import State
 from airflow._vendor import nvd3
-from airflow.www_rbac import utils as wwwutils
+from airflow.www_rbac import chart_data, utils as wwwutils
 from airflow.www_rbac.app import app, appbuilder
 from airflow.www_rbac.decorators import action_logging, gzipped, has_dag_access
 from airflow.www_rbac.forms import (DateTimeForm, DateTimeWithNumRunsForm,
@@ -132,6 +131,116 @@ def get_date_time_num_runs_dag_runs_form_data(request, session, dag):
     }
 
 
+def get_chart_series(request, session, kind):
+    """
+    Returns the DAG, the root task regex, the number of runs and the
+    downsampled series of the ``kind`` chart requested in ``request``.
+    The DAG is None if it can't be found.
+    """
+    default_dag_run = conf.getint('webserver', 'default_dag_run_display_number')
+    dag_id = request.args.get('dag_id')
+    dag = dagbag.get_dag(dag_id)
+    base_date = request.args.get('base_date')
+    num_runs = request.args.get('num_runs')
+    num_runs = int(num_runs) if num_runs else default_dag_run
+    root = request.args.get('root')
+
+    if dag is None:
+        return None, root, num_runs, None
+
+    if base_date:
+        base_date = pendulum.parse(base_date)
+    else:
+        base_date = dag.latest_execution_date or timezone.utcnow()
+
+    dates = dag.date_range(base_date, num=-abs(num_runs))
+    min_date = dates[0] if dates else timezone.utc_epoch()
+
+    if root:
+        dag = dag.sub_dag(
+            task_regex=root,
+            include_upstream=True,
+            include_downstream=False)
+
+    data = chart_data.get_series(
+        kind, dag, min_date, base_date,
+        max_points=request.args.get('max_points', type=int),
+        session=session)
+    return dag, root, num_runs, data
+
+
+def scale_series(series, unit=None):
+    """
+    Splits the points of every task of ``series`` in x and y values, scaling
+    the y values from seconds to ``unit`` if given.
+    """
+    for task_id, points in series.items():
+        x = [point[0] for point in points]
+        y = [point[1] for point in points]
+        if unit:
+            y = scale_time_units(y, unit)
+        yield task_id, x, y
+
+
+def series_time_unit(series):
+    """The most relevant time unit for all the values of ``series``"""
+    return infer_time_unit([point[1] for points in series.values() for point in points])
+
+
+def chart_json_response(request, session, kind, scale=True):
+    dag, _, _, data = get_chart_series(request, session, kind)
+    if dag is None:
+        return wwwutils.json_response({})
+
+    payload = {'dag_id': dag.dag_id, 'max_date': data['max_date']}
+    for name in ('series', 'cum_series'):
+        if name not in data:
+            continue
+        y_unit = series_time_unit(data[name]) if scale else None
+        payload[name] = {
+            'y_unit': y_unit,
+            'data': [
+                {'key': task_id, 'values': [{'x': v[0], 'y': v[1]} for v in zip(x, y)]}
+                for task_id, x, y in scale_series(data[name], y_unit)
+            ],
+        }
+    return wwwutils.json_response(payload)
+
+
+def get_gantt_data(dag, dttm, session):
+    gantt_bar_items, task_names = chart_data.get_gantt_items(dag, dttm, session=session)
+
+    task_types = {}
+    extra_links = {}
+    for t in dag.tasks:
+        task_types[t.task_id] = t.task_type
+        extra_links[t.task_id] = t.extra_links
+
+    tasks = []
+    for task_id, start_date, end_date, state, try_count in gantt_bar_items:
+        tasks.append({
+            'startDate': wwwutils.epoch(start_date),
+            'endDate': wwwutils.epoch(end_date),
+            'isoStart': start_date.isoformat()[:-4],
+            'isoEnd': end_date.isoformat()[:-4],
+            'taskName': task_id,
+            'taskType': task_types[task_id],
+            'duration': (end_date - start_date).total_seconds(),
+            'status': state,
+            'executionDate': dttm.isoformat(),
+            'try_number': try_count,
+            'extraLinks': extra_links[task_id],
+        })
+
+    states = {task['status']: task['status'] for task in tasks}
+    return {
+        'taskNames': task_names,
+        'tasks': tasks,
+        'taskStatus': states,
+        'height': len(task_names) * 25 + 25,
+    }
+
+
 ######################################################################################
 #                                    BaseViews
 ######################################################################################
@@ -302,46 +411,32 @@ class Airflow(AirflowBaseView):
     @has_access
     @provide_session
     def dag_stats(self, session=None):
-        dr = models.DagRun
-
         filter_dag_ids = appbuilder.sm.get_accessible_dag_ids()
 
-        dag_state_stats = session.query(dr.dag_id, dr.state, sqla.func.count(dr.state))\
-            .group_by(dr.dag_id, dr.state)
-
         payload = {}
         if filter_dag_ids:
-            if 'all_dags' not in filter_dag_ids:
-                dag_state_stats = dag_state_stats.filter(dr.dag_id.in_(filter_dag_ids))
-            data = {}
-            for dag_id, state, count in dag_state_stats:
-                if dag_id not in data:
-                    data[dag_id] = {}
-                data[dag_id][state] = count
-
             if 'all_dags' in filter_dag_ids:
                 filter_dag_ids = [dag_id for dag_id, in session.query(models.DagModel.dag_id)]
 
+            data = models.DagStats.get_counts(
+                models.DagStats.DAG_RUN, filter_dag_ids, session=session)
+
             for dag_id in filter_dag_ids:
-                if 'all_dags' in filter_dag_ids or dag_id in filter_dag_ids:
-                    payload[dag_id] = []
-                    for state in State.dag_states:
-                        count = data.get(dag_id, {}).get(state, 0)
-                        payload[dag_id].append({
-                            'state': state,
-                            'count': count,
-                            'dag_id': dag_id,
-                            'color': State.color(state)
-                        })
+                payload[dag_id] = []
+                for state in State.dag_states:
+                    count = data.get(dag_id, {}).get(state, 0)
+                    payload[dag_id].append({
+                        'state': state,
+                        'count': count,
+                        'dag_id': dag_id,
+                        'color': State.color(state)
+                    })
         return wwwutils.json_response(payload)
 
     @expose('/task_stats')
     @has_access
     @provide_session
     def task_stats(self, session=None):
-        TI = models.TaskInstance
-        DagRun = models.DagRun
-        Dag = models.DagModel
         allowed_dag_ids = set(appbuilder.sm.get_accessible_dag_ids())
 
         if not allowed_dag_ids:
@@ -360,61 +455,10 @@ class Airflow(AirflowBaseView):
         else:
             filter_dag_ids = allowed_dag_ids
 
-        LastDagRun = (
-            session.query(
-                        DagRun.dag_id,
-                        sqla.func.max(DagRun.execution_date).label('execution_date'))
-                   .join(Dag, Dag.dag_id == DagRun.dag_id)
-                   .filter(DagRun.state != State.RUNNING)
-                   .filter(Dag.is_active == True)  # noqa
-                   .group_by(DagRun.dag_id)
-        )
-
-        RunningDagRun = (
-            session.query(DagRun.dag_id, DagRun.execution_date)
-                   .join(Dag, Dag.dag_id == DagRun.dag_id)
-                   .filter(DagRun.state == State.RUNNING)
-                   .filter(Dag.is_active == True)  # noqa
-        )
-
-        if selected_dag_ids:
-            LastDagRun = LastDagRun.filter(DagRun.dag_id.in_(filter_dag_ids))
-            RunningDagRun = RunningDagRun.filter(DagRun.dag_id.in_(filter_dag_ids))
-
-        LastDagRun = LastDagRun.subquery('last_dag_run')
-        RunningDagRun = RunningDagRun.subquery('running_dag_run')
-
-        # Select all task_instances from active dag_runs.
-        # If no dag_run is active, return task instances from most recent dag_run.
-        LastTI = (
-            session.query(TI.dag_id.label('dag_id'), TI.state.label('state'))
-                   .join(LastDagRun,
-                         and_(LastDagRun.c.dag_id == TI.dag_id,
-                              LastDagRun.c.execution_date == TI.execution_date))
-        )
-        RunningTI = (
-            session.query(TI.dag_id.label('dag_id'), TI.state.label('state'))
-                   .join(RunningDagRun,
-                         and_(RunningDagRun.c.dag_id == TI.dag_id,
-                              RunningDagRun.c.execution_date == TI.execution_date))
-        )
-
-        if selected_dag_ids:
-            LastTI = LastTI.filter(TI.dag_id.in_(filter_dag_ids))
-            RunningTI = RunningTI.filter(TI.dag_id.in_(filter_dag_ids))
-
-        UnionTI = union_all(LastTI, RunningTI).alias('union_ti')
-
-        qry = (
-            session.query(UnionTI.c.dag_id, UnionTI.c.state, sqla.func.count())
-                   .group_by(UnionTI.c.dag_id, UnionTI.c.state)
-        )
-
-        data = {}
-        for dag_id, state, count in qry:
-            if dag_id not in data:
-                data[dag_id] = {}
-            data[dag_id][state] = count
+        # Task instance counts of the running and most recent DAG runs, kept
+        # up to date by the scheduler
+        data = models.DagStats.get_counts(
+            models.DagStats.TASK_INSTANCE, filter_dag_ids, session=session)
 
         payload = {}
         for dag_id in filter_dag_ids:
@@ -433,7 +477,7 @@ class Airflow(AirflowBaseView):
     @has_access
     @provide_session
     def last_dagruns(self, session=None):
-        DagRun = models.DagRun
+        DagModel = models.DagModel
 
         allowed_dag_ids = appbuilder.sm.get_accessible_dag_ids()
 
@@ -453,11 +497,11 @@ class Airflow(AirflowBaseView):
             return wwwutils.json_response({})
 
         query = session.query(
-            DagRun.dag_id, sqla.func.max(DagRun.execution_date).label('last_run')
-        ).group_by(DagRun.dag_id)
+            DagModel.dag_id, DagModel.last_dagrun_execution_date.label('last_run')
+        ).filter(DagModel.last_dagrun_execution_date.isnot(None))
 
         # Filter to only ask for accessible and selected dags
-        query = query.filter(DagRun.dag_id.in_(filter_dag_ids))
+        query = query.filter(DagModel.dag_id.in_(filter_dag_ids))
 
         resp = {
             r.dag_id.replace('.', '__dot__'): {
@@ -545,19 +589,28 @@ class Airflow(AirflowBaseView):
         dttm = pendulum.parse(execution_date)
         form = DateTimeForm(data={'execution_date': dttm})
         root = request.args.get('root', '')
-        # Loads dag from file
-        logging.info("Processing DAG file to render template.")
-        dag = dagbag.get_dag(dag_id, from_file_only=True)
+        dag = dagbag.get_dag(dag_id)
         task = copy.copy(dag.get_task(task_id))
         ti = models.TaskInstance(task=task, execution_date=dttm)
-        try:
-            ti.render_templates()
-        except Exception as e:
-            flash("Error rendering template: " + str(e), "error")
+        # The fields rendered when the task instance ran, if it did
+        rendered_fields = RenderedTaskInstanceFields.get_templated_fields(ti)
+        if rendered_fields is None:
+            # Loads dag from file
+            logging.info("Processing DAG file to render template.")
+            dag = dagbag.get_dag(dag_id, from_file_only=True)
+            task = copy.copy(dag.get_task(task_id))
+            ti = models.TaskInstance(task=task, execution_date=dttm)
+            try:
+                ti.render_templates()
+            except Exception as e:
+                flash("Error rendering template: " + str(e), "error")
+            rendered_fields = {
+                template_field: getattr(task, template_field)
+                for template_field in task.__class__.template_fields
+            }
         title = "Rendered Template"
         html_dict = {}
-        for template_field in task.__class__.template_fields:
-            content = getattr(task, template_field)
+        for template_field, content in rendered_fields.items():
             if template_field in wwwutils.get_attr_renderer():
                 html_dict[template_field] = \
                     wwwutils.get_attr_renderer()[template_field](content)
@@ -1494,73 +1547,24 @@ class Airflow(AirflowBaseView):
     @action_logging
     @provide_session
     def duration(self, session=None):
-        default_dag_run = conf.getint('webserver', 'default_dag_run_display_number')
-        dag_id = request.args.get('dag_id')
-        dag = dagbag.get_dag(dag_id)
-        base_date = request.args.get('base_date')
-        num_runs = request.args.get('num_runs')
-        num_runs = int(num_runs) if num_runs else default_dag_run
+        dag, root, num_runs, data = get_chart_series(
+            request, session, chart_data.DURATION)
 
         if dag is None:
-            flash('DAG "{0}" seems to be missing.'.format(dag_id), "error")
+            flash('DAG "{0}" seems to be missing.'.format(request.args.get('dag_id')),
+                  "error")
             return redirect(url_for('Airflow.index'))
 
-        if base_date:
-            base_date = pendulum.parse(base_date)
-        else:
-            base_date = dag.latest_execution_date or timezone.utcnow()
-
-        dates = dag.date_range(base_date, num=-abs(num_runs))
-        min_date = dates[0] if dates else timezone.utc_epoch()
-
-        root = request.args.get('root')
-        if root:
-            dag = dag.sub_dag(
-                task_regex=root,
-                include_upstream=True,
-                include_downstream=False)
-
         chart_height = wwwutils.get_chart_height(dag)
         chart = nvd3.lineChart(
             name="lineChart", x_is_date=True, height=chart_height, width="1200")
         cum_chart = nvd3.lineChart(
             name="cumLineChart", x_is_date=True, height=chart_height, width="1200")
 
-        y = defaultdict(list)
-        x = defaultdict(list)
-        cum_y = defaultdict(list)
-
-        tis = dag.get_task_instances(
-            start_date=min_date, end_date=base_date, session=session)
-        TF = TaskFail
-        ti_fails = (
-            session.query(TF)
-                   .filter(TF.dag_id == dag.dag_id,  # noqa
-                           TF.execution_date >= min_date,
-                           TF.execution_date <= base_date,
-                           TF.task_id.in_([t.task_id for t in dag.tasks]))
-                   .all()  # noqa
-        )
-
-        fails_totals = defaultdict(int)
-        for tf in ti_fails:
-            dict_key = (tf.dag_id, tf.task_id, tf.execution_date)
-            if tf.duration:
-                fails_totals[dict_key] += tf.duration
-
-        for ti in tis:
-            if ti.duration:
-                dttm = wwwutils.epoch(ti.execution_date)
-                x[ti.task_id].append(dttm)
-                y[ti.task_id].append(float(ti.duration))
-                fails_dict_key = (ti.dag_id, ti.task_id, ti.execution_date)
-                fails_total = fails_totals[fails_dict_key]
-                cum_y[ti.task_id].append(float(ti.duration + fails_total))
-
         # determine the most relevant time unit for the set of task instance
         # durations for the DAG
-        y_unit = infer_time_unit([d for t in y.values() for d in t])
-        cum_y_unit = infer_time_unit([d for t in cum_y.values() for d in t])
+        y_unit = series_time_unit(data['series'])
+        cum_y_unit = series_time_unit(data['cum_series'])
         # update the y Axis on both charts to have the correct time units
         chart.create_y_axis('yAxis', format='.02f', custom_format=False,
                             label='Duration ({})'.format(y_unit))
@@ -1569,20 +1573,14 @@ class Airflow(AirflowBaseView):
                                 label='Duration ({})'.format(cum_y_unit))
         cum_chart.axislist['yAxis']['axisLabelDistance'] = '40'
 
-        for task in dag.tasks:
-            if x[task.task_id]:
-                chart.add_serie(name=task.task_id, x=x[task.task_id],
-                                y=scale_time_units(y[task.task_id], y_unit))
-                cum_chart.add_serie(name=task.task_id, x=x[task.task_id],
-                                    y=scale_time_units(cum_y[task.task_id],
-                                                       cum_y_unit))
-
-        dates = sorted(list({ti.execution_date for ti in tis}))
-        max_date = max([ti.execution_date for ti in tis]) if dates else None
+        for task_id, x, y in scale_series(data['series'], y_unit):
+            chart.add_serie(name=task_id, x=x, y=y)
+        for task_id, x, y in scale_series(data['cum_series'], cum_y_unit):
+            cum_chart.add_serie(name=task_id, x=x, y=y)
 
         session.commit()
 
-        form = DateTimeWithNumRunsForm(data={'base_date': max_date,
+        form = DateTimeWithNumRunsForm(data={'base_date': data['max_date'],
                                              'num_runs': num_runs})
         chart.buildcontent()
         cum_chart.buildcontent()
@@ -1601,60 +1599,42 @@ class Airflow(AirflowBaseView):
             cum_chart=cum_chart.htmlcontent
         )
 
+    @expose('/duration_data')
+    @has_dag_access(can_dag_read=True)
+    @has_access
+    @provide_session
+    def duration_data(self, session=None):
+        """
+        Per task durations, and durations including failed tries, of the
+        requested runs, downsampled to ``max_points`` points per task.
+        """
+        return chart_json_response(request, session, chart_data.DURATION)
+
     @expose('/tries')
     @has_dag_access(can_dag_read=True)
     @has_access
     @action_logging
     @provide_session
     def tries(self, session=None):
-        default_dag_run = conf.getint('webserver', 'default_dag_run_display_number')
-        dag_id = request.args.get('dag_id')
-        dag = dagbag.get_dag(dag_id)
-        base_date = request.args.get('base_date')
-        num_runs = request.args.get('num_runs')
-        num_runs = int(num_runs) if num_runs else default_dag_run
-
-        if base_date:
-            base_date = pendulum.parse(base_date)
-        else:
-            base_date = dag.latest_execution_date or timezone.utcnow()
-
-        dates = dag.date_range(base_date, num=-abs(num_runs))
-        min_date = dates[0] if dates else timezone.utc_epoch()
+        dag, root, num_runs, data = get_chart_series(
+            request, session, chart_data.TRIES)
 
-        root = request.args.get('root')
-        if root:
-            dag = dag.sub_dag(
-                task_regex=root,
-                include_upstream=True,
-                include_downstream=False)
+        if dag is None:
+            flash('DAG "{0}" seems to be missing.'.format(request.args.get('dag_id')),
+                  "error")
+            return redirect(url_for('Airflow.index'))
 
         chart_height = wwwutils.get_chart_height(dag)
         chart = nvd3.lineChart(
             name="lineChart", x_is_date=True, y_axis_format='d', height=chart_height,
             width="1200")
 
-        for task in dag.tasks:
-            y = []
-            x = []
-            for ti in task.get_task_instances(start_date=min_date,
-                                              end_date=base_date,
-                                              session=session):
-                dttm = wwwutils.epoch(ti.execution_date)
-                x.append(dttm)
-                # y value should reflect completed tries to have a 0 baseline.
-                y.append(ti.prev_attempted_tries)
-            if x:
-                chart.add_serie(name=task.task_id, x=x, y=y)
-
-        tis = dag.get_task_instances(
-            start_date=min_date, end_date=base_date, session=session)
-        tries = sorted(list({ti.try_number for ti in tis}))
-        max_date = max([ti.execution_date for ti in tis]) if tries else None
+        for task_id, x, y in scale_series(data['series']):
+            chart.add_serie(name=task_id, x=x, y=y)
 
         session.commit()
 
-        form = DateTimeWithNumRunsForm(data={'base_date': max_date,
+        form = DateTimeWithNumRunsForm(data={'base_date': data['max_date'],
                                              'num_runs': num_runs})
 
         chart.buildcontent()
@@ -1668,73 +1648,48 @@ class Airflow(AirflowBaseView):
             chart=chart.htmlcontent
         )
 
+    @expose('/tries_data')
+    @has_dag_access(can_dag_read=True)
+    @has_access
+    @provide_session
+    def tries_data(self, session=None):
+        """
+        Per task number of completed tries of the requested runs, downsampled
+        to ``max_points`` points per task.
+        """
+        return chart_json_response(request, session, chart_data.TRIES, scale=False)
+
     @expose('/landing_times')
     @has_dag_access(can_dag_read=True)
     @has_access
     @action_logging
     @provide_session
     def landing_times(self, session=None):
-        default_dag_run = conf.getint('webserver', 'default_dag_run_display_number')
-        dag_id = request.args.get('dag_id')
-        dag = dagbag.get_dag(dag_id)
-        base_date = request.args.get('base_date')
-        num_runs = request.args.get('num_runs')
-        num_runs = int(num_runs) if num_runs else default_dag_run
+        dag, root, num_runs, data = get_chart_series(
+            request, session, chart_data.LANDING_TIMES)
 
-        if base_date:
-            base_date = pendulum.parse(base_date)
-        else:
-            base_date = dag.latest_execution_date or timezone.utcnow()
-
-        dates = dag.date_range(base_date, num=-abs(num_runs))
-        min_date = dates[0] if dates else timezone.utc_epoch()
-
-        root = request.args.get('root')
-        if root:
-            dag = dag.sub_dag(
-                task_regex=root,
-                include_upstream=True,
-                include_downstream=False)
+        if dag is None:
+            flash('DAG "{0}" seems to be missing.'.format(request.args.get('dag_id')),
+                  "error")
+            return redirect(url_for('Airflow.index'))
 
         chart_height = wwwutils.get_chart_height(dag)
         chart = nvd3.lineChart(
             name="lineChart", x_is_date=True, height=chart_height, width="1200")
-        y = {}
-        x = {}
-        for task in dag.tasks:
-            task_id = task.task_id
-            y[task_id] = []
-            x[task_id] = []
-            for ti in task.get_task_instances(start_date=min_date, end_date=base_date):
-                ts = ti.execution_date
-                if dag.schedule_interval and dag.following_schedule(ts):
-                    ts = dag.following_schedule(ts)
-                if ti.end_date:
-                    dttm = wwwutils.epoch(ti.execution_date)
-                    secs = (ti.end_date - ts).total_seconds()
-                    x[task_id].append(dttm)
-                    y[task_id].append(secs)
 
         # determine the most relevant time unit for the set of landing times
         # for the DAG
-        y_unit = infer_time_unit([d for t in y.values() for d in t])
+        y_unit = series_time_unit(data['series'])
         # update the y Axis to have the correct time units
         chart.create_y_axis('yAxis', format='.02f', custom_format=False,
                             label='Landing Time ({})'.format(y_unit))
         chart.axislist['yAxis']['axisLabelDistance'] = '40'
-        for task in dag.tasks:
-            if x[task.task_id]:
-                chart.add_serie(name=task.task_id, x=x[task.task_id],
-                                y=scale_time_units(y[task.task_id], y_unit))
-
-        tis = dag.get_task_instances(
-            start_date=min_date, end_date=base_date, session=session)
-        dates = sorted(list({ti.execution_date for ti in tis}))
-        max_date = max([ti.execution_date for ti in tis]) if dates else None
+        for task_id, x, y in scale_series(data['series'], y_unit):
+            chart.add_serie(name=task_id, x=x, y=y)
 
         session.commit()
 
-        form = DateTimeWithNumRunsForm(data={'base_date': max_date,
+        form = DateTimeWithNumRunsForm(data={'base_date': data['max_date'],
                                              'num_runs': num_runs})
         chart.buildcontent()
         return self.render_template(
@@ -1747,6 +1702,17 @@ class Airflow(AirflowBaseView):
             form=form,
         )
 
+    @expose('/landing_times_data')
+    @has_dag_access(can_dag_read=True)
+    @has_access
+    @provide_session
+    def landing_times_data(self, session=None):
+        """
+        Per task landing times of the requested runs, downsampled to
+        ``max_points`` points per task.
+        """
+        return chart_json_response(request, session, chart_data.LANDING_TIMES)
+
     @expose('/paused', methods=['POST'])
     @has_dag_access(can_dag_edit=True)
     @has_access
@@ -1806,78 +1772,7 @@ class Airflow(AirflowBaseView):
         form = DateTimeWithNumRunsWithDagRunsForm(data=dt_nr_dr_data)
         form.execution_date.choices = dt_nr_dr_data['dr_choices']
 
-        tis = [
-            ti for ti in dag.get_task_instances(dttm, dttm, session=session)
-            if ti.start_date and ti.state]
-        tis = sorted(tis, key=lambda ti: ti.start_date)
-        TF = TaskFail
-        ti_fails = list(itertools.chain(*[(
-            session
-            .query(TF)
-            .filter(TF.dag_id == ti.dag_id,
-                    TF.task_id == ti.task_id,
-                    TF.execution_date == ti.execution_date)
-            .all()
-        ) for ti in tis]))
-
-        # determine bars to show in the gantt chart
-        # all reschedules of one attempt are combinded into one bar
-        gantt_bar_items = []
-        for ti in tis:
-            end_date = ti.end_date or timezone.utcnow()
-            # prev_attempted_tries will reflect the currently running try_number
-            # or the try_number of the last complete run
-            # https://issues.apache.org/jira/browse/AIRFLOW-2143
-            try_count = ti.prev_attempted_tries
-            gantt_bar_items.append((ti.task_id, ti.start_date, end_date, ti.state, try_count))
-
-        tf_count = 0
-        try_count = 1
-        prev_task_id = ""
-        for tf in ti_fails:
-            end_date = tf.end_date or timezone.utcnow()
-            if tf_count != 0 and tf.task_id == prev_task_id:
-                try_count = try_count + 1
-            else:
-                try_count = 1
-            prev_task_id = tf.task_id
-            gantt_bar_items.append((tf.task_id, tf.start_date, end_date, State.FAILED, try_count))
-            tf_count = tf_count + 1
-
-        task_types = {}
-        extra_links = {}
-        for t in dag.tasks:
-            task_types[t.task_id] = t.task_type
-            extra_links[t.task_id] = t.extra_links
-
-        tasks = []
-        for gantt_bar_item in gantt_bar_items:
-            task_id = gantt_bar_item[0]
-            start_date = gantt_bar_item[1]
-            end_date = gantt_bar_item[2]
-            state = gantt_bar_item[3]
-            try_count = gantt_bar_item[4]
-            tasks.append({
-                'startDate': wwwutils.epoch(start_date),
-                'endDate': wwwutils.epoch(end_date),
-                'isoStart': start_date.isoformat()[:-4],
-                'isoEnd': end_date.isoformat()[:-4],
-                'taskName': task_id,
-                'taskType': task_types[ti.task_id],
-                'duration': (end_date - start_date).total_seconds(),
-                'status': state,
-                'executionDate': dttm.isoformat(),
-                'try_number': try_count,
-                'extraLinks': extra_links[ti.task_id],
-            })
-
-        states = {task['status']: task['status'] for task in tasks}
-        data = {
-            'taskNames': [ti.task_id for ti in tis],
-            'tasks': tasks,
-            'taskStatus': states,
-            'height': len(tis) * 25 + 25,
-        }
+        data = get_gantt_data(dag, dttm, session)
 
         session.commit()
 
@@ -1892,6 +1787,28 @@ class Airflow(AirflowBaseView):
             root=root,
         )
 
+    @expose('/gantt_data')
+    @has_dag_access(can_dag_read=True)
+    @has_access
+    @provide_session
+    def gantt_data(self, session=None):
+        """The bars of the gantt chart of the requested run"""
+        dag_id = request.args.get('dag_id')
+        dag = dagbag.get_dag(dag_id)
+        if dag is None:
+            return wwwutils.json_response({})
+
+        root = request.args.get('root')
+        if root:
+            dag = dag.sub_dag(
+                task_regex=root,
+                include_upstream=True,
+                include_downstream=False)
+
+        dt_nr_dr_data = get_date_time_num_runs_dag_runs_form_data(request, session, dag)
+        return wwwutils.json_response(
+            get_gantt_data(dag, dt_nr_dr_data['dttm'], session))
+
     @expose('/extra_links')
     @has_dag_access(can_dag_read=True)
     @has_access
@@ -2399,6 +2316,8 @@ class DagRunModelView(AirflowModelView):
         dirty_ids = []
         for item in items:
             dirty_ids.append(item.dag_id)
+        # The deleted runs may have to be scheduled again
+        models.DagModel.reset_next_dagrun(dirty_ids, session=session)
         return redirect(self.get_redirect())
 
     @action('set_running', "Set state to 'running'", '', single=False)
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from airflow.contrib.kubernetes.pod_cache import PodCache
+from airflow.models import DAG, TaskInstance
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.db import create_session
+from airflow.utils.state import State
+
+try:
+    from kubernetes.client import V1ListMeta, V1ObjectMeta, V1Pod, V1PodList, V1PodStatus
+    from kubernetes.client.rest import ApiException
+    from airflow.contrib.executors.kubernetes_executor import (
+        AirflowKubernetesScheduler, KubernetesExecutor, KubernetesJobWatcher)
+except ImportError:
+    AirflowKubernetesScheduler = None
+
+DEFAULT_DATE = timezone.datetime(2016, 1, 1)
+TEST_DAG_ID = 'test_kubernetes_executor'
+WORKER_UUID = 'worker-uuid'
+NAMESPACE = 'airflow'
+
+
+def make_pod(name, phase, labels, resource_version=None):
+    return V1Pod(
+        metadata=V1ObjectMeta(name=name, labels=labels, resource_version=resource_version),
+        status=V1PodStatus(phase=phase),
+    )
+
+
+def task_labels(task_id, execution_date=DEFAULT_DATE, **labels):
+    labels.update(
+        dag_id=AirflowKubernetesScheduler._make_safe_label_value(TEST_DAG_ID),
+        task_id=AirflowKubernetesScheduler._make_safe_label_value(task_id),
+        execution_date=AirflowKubernetesScheduler._datetime_to_label_safe_datestring(
+            execution_date),
+        **{'airflow-worker': WORKER_UUID}
+    )
+    return labels
+
+
+class FakeKubeConfig(object):
+    kube_namespace = NAMESPACE
+    kube_client_request_args = {}
+    delete_worker_pods = True
+
+
+class FakeKubeClient(object):
+    """The calls of the executor to the Kubernetes API, on an in memory list of pods"""
+
+    def __init__(self, pods=()):
+        self.pods = list(pods)
+        self.list_calls = []
+        self.deleted = []
+
+    def list_namespaced_pod(self, namespace, label_selector=None, **kwargs):
+        self.list_calls.append((namespace, label_selector))
+        selected = dict([label_selector.split('=', 1)]) if label_selector else {}
+        items = [
+            pod for pod in self.pods
+            if all(pod.metadata.labels.get(k) == v for k, v in selected.items())
+        ]
+        return V1PodList(items=items, metadata=V1ListMeta(resource_version='100'))
+
+    def delete_namespaced_pod(self, name, namespace, body=None, **kwargs):
+        if name not in [pod.metadata.name for pod in self.pods]:
+            raise ApiException(status=404, reason='Not Found')
+        self.pods = [pod for pod in self.pods if pod.metadata.name != name]
+        self.deleted.append(name)
+
+
+class FakeWatch(object):
+    """A pod watch stream replaying the given events"""
+
+    def __init__(self, events):
+        self.events = events
+        self.stream_kwargs = None
+
+    def stream(self, func, namespace, **kwargs):
+        self.stream_kwargs = kwargs
+        return iter(self.events)
+
+
+class FakeQueue(list):
+
+    def put(self, item):
+        self.append(item)
+
+
+def make_scheduler(kube_client):
+    # Without the watcher process and the multiprocessing manager
+    scheduler = AirflowKubernetesScheduler.__new__(AirflowKubernetesScheduler)
+    scheduler.kube_config = FakeKubeConfig()
+    scheduler.namespace = NAMESPACE
+    scheduler.kube_client = kube_client
+    scheduler.result_queue = FakeQueue()
+    scheduler.worker_uuid = WORKER_UUID
+    scheduler.pod_cache = PodCache()
+    return scheduler
+
+
+@unittest.skipIf(AirflowKubernetesScheduler is None, 'kubernetes python package is not installed')
+class TestKubernetesJobWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.watcher_queue = FakeQueue()
+        self.watcher = KubernetesJobWatcher(
+            NAMESPACE, self.watcher_queue, '10', WORKER_UUID, FakeKubeConfig())
+
+    def _run(self, events):
+        fake_watch = FakeWatch(events)
+        with mock.patch('airflow.contrib.executors.kubernetes_executor.watch.Watch',
+                        return_value=fake_watch):
+            resource_version = self.watcher._run(
+                FakeKubeClient(), '10', WORKER_UUID, FakeKubeConfig())
+        return resource_version, fake_watch
+
+    def test_events_are_passed_on_with_their_type(self):
+        labels = task_labels('task')
+        resource_version, fake_watch = self._run([
+            {'type': 'ADDED', 'object': make_pod('pod-1', 'Pending', labels, '11')},
+            {'type': 'MODIFIED', 'object': make_pod('pod-1', 'Running', labels, '12')},
+            {'type': 'MODIFIED', 'object': make_pod('pod-1', 'Succeeded', labels, '13')},
+            {'type': 'DELETED', 'object': make_pod('pod-1', 'Succeeded', labels, '14')},
+        ])
+
+        self.assertEqual(self.watcher_queue, [
+            ('pod-1', 'Pending', labels, '11', 'ADDED'),
+            ('pod-1', 'Running', labels, '12', 'MODIFIED'),
+            ('pod-1', 'Succeeded', labels, '13', 'MODIFIED'),
+            ('pod-1', 'Succeeded', labels, '14', 'DELETED'),
+        ])
+        self.assertEqual(resource_version, '14')
+        self.assertEqual(fake_watch.stream_kwargs, {
+            'label_selector': 'airflow-worker={}'.format(WORKER_UUID),
+            'resource_version': '10',
+        })
+
+    def test_too_old_resource_version_restarts_from_zero(self):
+        resource_version, _ = self._run([
+            {'type': 'ADDED', 'object': make_pod('pod-1', 'Pending', task_labels('task'), '11')},
+            {'type': 'ERROR', 'object': make_pod('pod-1', None, {}),
+             'raw_object': {'code': 410, 'reason': 'Gone', 'message': 'too old'}},
+        ])
+
+        self.assertEqual(len(self.watcher_queue), 1)
+        self.assertEqual(resource_version, '0')
+
+
+@unittest.skipIf(AirflowKubernetesScheduler is None, 'kubernetes python package is not installed')
+class TestAirflowKubernetesScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.kube_client = FakeKubeClient([make_pod('pod-1', 'Running', task_labels('task'))])
+        self.scheduler = make_scheduler(self.kube_client)
+
+    def test_watcher_events_update_the_pod_cache(self):
+        labels = task_labels('task')
+        self.scheduler.process_watcher_task(('pod-1', 'Pending', labels, '11', 'ADDED'))
+        self.scheduler.process_watcher_task(('pod-1', 'Running', labels, '12', 'MODIFIED'))
+
+        self.assertEqual(
+            self.scheduler.pod_cache.get_pods(
+                labels['dag_id'], labels['task_id'], labels['execution_date']),
+            [('pod-1', 'Running')])
+        self.assertEqual(self.scheduler.pod_cache.resource_version, '12')
+        self.assertEqual(self.scheduler.result_queue, [])
+
+    def test_deleted_event_removes_the_pod_from_the_cache(self):
+        labels = task_labels('task')
+        self.scheduler.process_watcher_task(('pod-1', 'Running', labels, '11', 'ADDED'))
+        self.scheduler.process_watcher_task(('pod-1', 'Running', labels, '12', 'DELETED'))
+
+        self.assertNotIn('pod-1', self.scheduler.pod_cache)
+        self.assertEqual(self.scheduler.result_queue, [])
+
+    def test_terminal_event_finishes_the_task(self):
+        key = (TEST_DAG_ID, 'task', DEFAULT_DATE, 1)
+        with mock.patch.object(AirflowKubernetesScheduler, '_labels_to_key', return_value=key):
+            self.scheduler.process_watcher_task(
+                ('pod-1', 'Failed', task_labels('task'), '13', 'MODIFIED'))
+
+        self.assertEqual(self.scheduler.result_queue, [(key, State.FAILED, 'pod-1', '13')])
+        self.assertIn('pod-1', self.scheduler.pod_cache)
+
+    def test_delete_pod_removes_it_from_the_cache(self):
+        self.scheduler.pod_cache.update('ADDED', 'pod-1', 'Running', task_labels('task'))
+        self.scheduler.pod_cache.update('ADDED', 'pod-2', 'Running', task_labels('task'))
+
+        self.scheduler.delete_pod('pod-1')
+        # Already deleted from the cluster
+        self.scheduler.delete_pod('pod-2')
+
+        self.assertEqual(self.kube_client.deleted, ['pod-1'])
+        self.assertEqual(len(self.scheduler.pod_cache), 0)
+
+
+@unittest.skipIf(AirflowKubernetesScheduler is None, 'kubernetes python package is not installed')
+class TestKubernetesExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self._clear_task_instances()
+        self.dag = DAG(TEST_DAG_ID, start_date=DEFAULT_DATE)
+        self.tasks = {
+            task_id: DummyOperator(task_id=task_id, dag=self.dag)
+            for task_id in ('launched', 'not_launched', 'other_worker', 'running')
+        }
+
+    def tearDown(self):
+        self._clear_task_instances()
+
+    @staticmethod
+    def _clear_task_instances():
+        with create_session() as session:
+            session.query(TaskInstance).filter(
+                TaskInstance.dag_id == TEST_DAG_ID).delete(synchronize_session=False)
+
+    def _make_task_instances(self, states):
+        with create_session() as session:
+            for task_id, state in states.items():
+                ti = TaskInstance(self.tasks[task_id], DEFAULT_DATE)
+                ti.state = state
+                session.merge(ti)
+
+    def _get_states(self):
+        with create_session() as session:
+            return dict(
+                session.query(TaskInstance.task_id, TaskInstance.state)
+                .filter(TaskInstance.dag_id == TEST_DAG_ID))
+
+    def _make_executor(self, kube_client):
+        executor = KubernetesExecutor.__new__(KubernetesExecutor)
+        executor.kube_config = FakeKubeConfig()
+        executor.kube_client = kube_client
+        executor.worker_uuid = WORKER_UUID
+        executor.kube_scheduler = make_scheduler(kube_client)
+        return executor
+
+    def test_clear_not_launched_queued_tasks(self):
+        self._make_task_instances({
+            'launched': State.QUEUED,
+            'not_launched': State.QUEUED,
+            'other_worker': State.QUEUED,
+            'running': State.RUNNING,
+        })
+        other_worker_labels = task_labels('other_worker')
+        other_worker_labels['airflow-worker'] = 'other-uuid'
+        kube_client = FakeKubeClient([
+            make_pod('pod-1', 'Running', task_labels('launched', try_number='1')),
+            make_pod('pod-2', 'Running', other_worker_labels),
+            make_pod('pod-3', 'Running', task_labels('not_launched', DEFAULT_DATE.replace(day=2))),
+        ])
+        executor = self._make_executor(kube_client)
+
+        executor.clear_not_launched_queued_tasks()
+
+        # A single list call for all the queued task instances
+        self.assertEqual(kube_client.list_calls,
+                         [(NAMESPACE, 'airflow-worker={}'.format(WORKER_UUID))])
+        self.assertEqual(self._get_states(), {
+            'launched': State.QUEUED,
+            'not_launched': State.NONE,
+            'other_worker': State.NONE,
+            'running': State.RUNNING,
+        })
+        self.assertEqual(len(executor.kube_scheduler.pod_cache), 2)
+        self.assertEqual(executor.kube_scheduler.pod_cache.resource_version, '100')
+
+    def test_clear_not_launched_queued_tasks_without_queued_tasks(self):
+        self._make_task_instances({'running': State.RUNNING})
+        kube_client = FakeKubeClient()
+
+        self._make_executor(kube_client).clear_not_launched_queued_tasks()
+
+        self.assertEqual(kube_client.list_calls, [])
+        self.assertEqual(self._get_states(), {'running': State.RUNNING})
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import gc
+import unittest
+
+try:
+    from airflow.contrib.hooks.bigquery_hook import BigQueryCursor
+except ImportError:
+    BigQueryCursor = None
+
+PROJECT_ID = 'project'
+JOB_ID = 'job'
+FIELDS = [
+    {'name': 'id', 'type': 'INTEGER'},
+    {'name': 'score', 'type': 'FLOAT'},
+    {'name': 'active', 'type': 'BOOLEAN'},
+    {'name': 'name', 'type': 'STRING'},
+]
+
+
+def make_page(rows, page_token=None):
+    page = {
+        'schema': {'fields': FIELDS},
+        'rows': [{'f': [{'v': value} for value in row]} for row in rows],
+    }
+    if page_token:
+        page['pageToken'] = page_token
+    return page
+
+
+PAGES = {
+    None: make_page([['1', '1.5', 'true', 'a'], ['2', None, 'false', None]], 'page-2'),
+    'page-2': make_page([['3', '2.5', None, 'c']], 'page-3'),
+    'page-3': make_page([['4', '-1', 'true', 'd']]),
+}
+
+
+class FakeRequest(object):
+
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self, num_retries=0):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class FakeService(object):
+    """The getQueryResults calls of the cursor, on in memory pages of results"""
+
+    def __init__(self, pages=None):
+        self.pages = PAGES if pages is None else pages
+        self.page_tokens = []
+
+    def jobs(self):
+        return self
+
+    def getQueryResults(self, projectId, jobId, pageToken=None):  # noqa: N802,N803
+        assert (projectId, jobId) == (PROJECT_ID, JOB_ID)
+        self.page_tokens.append(pageToken)
+        return FakeRequest(self.pages[pageToken])
+
+
+@unittest.skipIf(BigQueryCursor is None, 'BigQuery dependencies are not installed')
+class TestBigQueryCursor(unittest.TestCase):
+
+    def _make_cursor(self, prefetch_pages=0, pages=None):
+        self.service = FakeService(pages)
+        self.prefetch_service = FakeService(pages)
+        cursor = BigQueryCursor(self.service, PROJECT_ID, prefetch_pages=prefetch_pages,
+                                service_factory=lambda: self.prefetch_service)
+        cursor.job_id = JOB_ID
+        return cursor
+
+    def test_prefetching_is_disabled_by_default(self):
+        cursor = BigQueryCursor(FakeService(), PROJECT_ID)
+        self.assertEqual(cursor.prefetch_pages, 0)
+
+    def test_fetch_batches_casts_each_column(self):
+        for prefetch_pages in 0, 2:
+            cursor = self._make_cursor(prefetch_pages)
+            self.assertEqual(list(cursor.fetch_batches()), [
+                [[1, 2], [1.5, None], [True, False], ['a', None]],
+                [[3], [2.5], [None], ['c']],
+                [[4], [-1.0], [True], ['d']],
+            ])
+            self.assertIsNone(cursor.job_id)
+
+    def test_prefetcher_uses_its_own_service(self):
+        cursor = self._make_cursor(prefetch_pages=1)
+        self.assertEqual(len(cursor.fetchall()), 4)
+        self.assertEqual(self.service.page_tokens, [])
+        self.assertEqual(self.prefetch_service.page_tokens, [None, 'page-2', 'page-3'])
+
+        cursor = self._make_cursor(prefetch_pages=0)
+        self.assertEqual(len(cursor.fetchall()), 4)
+        self.assertEqual(self.service.page_tokens, [None, 'page-2', 'page-3'])
+        self.assertEqual(self.prefetch_service.page_tokens, [])
+
+    def test_fetchmany_across_pages(self):
+        for prefetch_pages in 0, 1:
+            cursor = self._make_cursor(prefetch_pages)
+            self.assertEqual(cursor.fetchone(), [1, 1.5, True, 'a'])
+            self.assertEqual(cursor.fetchmany(2), [[2, None, False, None], [3, 2.5, None, 'c']])
+            self.assertEqual(cursor.fetchmany(5), [[4, -1.0, True, 'd']])
+            self.assertEqual(cursor.fetchmany(5), [])
+
+    def test_prefetcher_exception_is_raised(self):
+        pages = dict(PAGES)
+        pages['page-2'] = ValueError('page 2 failed')
+        cursor = self._make_cursor(prefetch_pages=2, pages=pages)
+
+        batches = cursor.fetch_batches()
+        self.assertEqual(next(batches)[0], [1, 2])
+        with self.assertRaises(ValueError):
+            next(batches)
+        self.assertIsNone(cursor._prefetcher)
+
+    def test_abandoned_cursor_stops_its_prefetcher(self):
+        cursor = self._make_cursor(prefetch_pages=1)
+        cursor.fetchone()
+        prefetcher = cursor._prefetcher
+        self.assertTrue(prefetcher.is_alive())
+
+        del cursor
+        gc.collect()
+        prefetcher.join(5)
+        self.assertFalse(prefetcher.is_alive())
+
+    def test_close_stops_the_prefetcher(self):
+        cursor = self._make_cursor(prefetch_pages=1)
+        cursor.fetchone()
+        prefetcher = cursor._prefetcher
+
+        cursor.close()
+        self.assertFalse(prefetcher.is_alive())
+        self.assertIsNone(cursor._prefetcher)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+from tempfile import NamedTemporaryFile
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+try:
+    from airflow.contrib.hooks.gcs_hook import GoogleCloudStorageHook
+except ImportError:
+    GoogleCloudStorageHook = None
+
+BUCKET = 'bucket'
+
+
+class FakeBlob(object):
+
+    def __init__(self, objects, name):
+        self.objects = objects
+        self.name = name
+        self.content_type = None
+
+    def upload_from_file(self, file_obj, size=None, content_type=None):
+        data = file_obj.read(size) if size is not None else file_obj.read()
+        self.objects[self.name] = (data, content_type)
+
+    def compose(self, sources):
+        data = b''.join(self.objects[source.name][0] for source in sources)
+        self.objects[self.name] = (data, self.content_type)
+
+    def exists(self):
+        return self.name in self.objects
+
+    def delete(self):
+        del self.objects[self.name]
+
+
+class FakeClient(object):
+    """The calls of the hook to a storage client, on in memory objects of a bucket"""
+
+    def __init__(self, objects):
+        self.objects = objects
+
+    def bucket(self, name):
+        assert name == BUCKET
+        return self
+
+    def blob(self, blob_name, chunk_size=None):
+        return FakeBlob(self.objects, blob_name)
+
+
+@unittest.skipIf(GoogleCloudStorageHook is None, 'google-cloud-storage package is not installed')
+class TestGoogleCloudStorageHook(unittest.TestCase):
+
+    def setUp(self):
+        # A user's object named like the components of the previous versions
+        self.objects = {'data.csv_component_0': (b'user data', 'text/plain')}
+        self.client = FakeClient(self.objects)
+        self.hook = GoogleCloudStorageHook.__new__(GoogleCloudStorageHook)
+        self.hook._conn = self.client
+        patches = [
+            mock.patch('airflow.contrib.hooks.gcs_hook.storage.Client', return_value=self.client),
+            mock.patch.object(GoogleCloudStorageHook, '_get_credentials', return_value=None),
+            mock.patch.object(GoogleCloudStorageHook, 'project_id', 'project'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_upload_composite(self):
+        data = b''.join(str(i).encode('ascii') for i in range(1000))
+        with NamedTemporaryFile() as temp_file:
+            temp_file.write(data)
+            temp_file.flush()
+            self.hook.upload(BUCKET, 'data.csv', temp_file.name, mime_type='text/csv',
+                             num_components=4)
+
+        self.assertEqual(self.objects, {
+            'data.csv': (data, 'text/csv'),
+            'data.csv_component_0': (b'user data', 'text/plain'),
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
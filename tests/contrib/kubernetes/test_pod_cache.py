@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+from collections import namedtuple
+
+from airflow.contrib.kubernetes.pod_cache import PodCache
+
+# The parts of the kubernetes client objects read by the cache
+FakePodList = namedtuple('FakePodList', 'items metadata')
+FakeListMeta = namedtuple('FakeListMeta', 'resource_version')
+FakePod = namedtuple('FakePod', 'metadata status')
+FakePodMeta = namedtuple('FakePodMeta', 'name labels')
+FakePodStatus = namedtuple('FakePodStatus', 'phase')
+
+EXECUTION_DATE = '2016-01-01T00_00_00_plus_00_00'
+
+
+def task_labels(dag_id='dag', task_id='task', execution_date=EXECUTION_DATE, **labels):
+    labels.update(dag_id=dag_id, task_id=task_id, execution_date=execution_date)
+    return labels
+
+
+def fake_pod(name, phase, labels):
+    return FakePod(FakePodMeta(name, labels), FakePodStatus(phase))
+
+
+class TestPodCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = PodCache()
+
+    def test_populate(self):
+        self.cache.update('ADDED', 'stale', 'Running', task_labels(task_id='stale'))
+        self.cache.populate(FakePodList(
+            items=[
+                fake_pod('pod-1', 'Running', task_labels(try_number='1')),
+                fake_pod('pod-2', 'Pending', task_labels(task_id='other')),
+            ],
+            metadata=FakeListMeta('42'),
+        ))
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertNotIn('stale', self.cache)
+        self.assertEqual(self.cache.get_pods('dag', 'task', EXECUTION_DATE),
+                         [('pod-1', 'Running')])
+        self.assertEqual(self.cache.get_pods('dag', 'stale', EXECUTION_DATE), [])
+        self.assertEqual(self.cache.resource_version, '42')
+
+    def test_get_pods_by_labels(self):
+        self.cache.update('ADDED', 'pod-1', 'Failed', task_labels(try_number='1'))
+        self.cache.update('ADDED', 'pod-2', 'Running', task_labels(try_number='2'))
+        self.cache.update('ADDED', 'pod-3', 'Running', task_labels(execution_date='other'))
+
+        self.assertEqual(sorted(self.cache.get_pods('dag', 'task', EXECUTION_DATE)),
+                         [('pod-1', 'Failed'), ('pod-2', 'Running')])
+        self.assertEqual(self.cache.get_pods('dag', 'task', EXECUTION_DATE, try_number='2'),
+                         [('pod-2', 'Running')])
+        self.assertEqual(self.cache.get_pods('dag', 'task', 'other'), [('pod-3', 'Running')])
+
+    def test_pods_without_task_labels_are_not_indexed(self):
+        self.cache.update('ADDED', 'pod-1', 'Running', {'dag_id': 'dag'})
+        self.cache.update('ADDED', 'pod-2', 'Running', None)
+
+        self.assertIn('pod-1', self.cache)
+        self.assertIn('pod-2', self.cache)
+        self.assertEqual(self.cache.get_pods('dag', 'task', EXECUTION_DATE), [])
+
+    def test_modified_event_moves_the_pod_in_the_index(self):
+        self.cache.update('ADDED', 'pod-1', 'Pending', task_labels())
+        self.cache.update('MODIFIED', 'pod-1', 'Running', task_labels(task_id='other'), '7')
+
+        self.assertEqual(self.cache.get_pods('dag', 'task', EXECUTION_DATE), [])
+        self.assertEqual(self.cache.get_pods('dag', 'other', EXECUTION_DATE),
+                         [('pod-1', 'Running')])
+        self.assertEqual(self.cache.resource_version, '7')
+
+    def test_deleted_event_removes_the_pod(self):
+        self.cache.update('ADDED', 'pod-1', 'Running', task_labels())
+        self.cache.update('DELETED', 'pod-1', 'Succeeded', task_labels(), '8')
+
+        self.assertNotIn('pod-1', self.cache)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.get_pods('dag', 'task', EXECUTION_DATE), [])
+        self.assertEqual(self.cache.resource_version, '8')
+
+    def test_remove(self):
+        self.cache.update('ADDED', 'pod-1', 'Running', task_labels())
+        self.cache.update('ADDED', 'pod-2', 'Running', task_labels())
+        self.cache.remove('pod-1')
+        self.cache.remove('unknown')
+
+        self.assertEqual(self.cache.get_pods('dag', 'task', EXECUTION_DATE),
+                         [('pod-2', 'Running')])
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+try:
+    from hmsclient.genthrift.hive_metastore.ttypes import NoSuchObjectException, Partition
+    from airflow.hooks import hive_hooks
+    from airflow.hooks.hive_hooks import HiveMetastoreHook, MetastoreClientPool
+except ImportError:
+    hive_hooks = None
+
+
+class FakeHMSClient(object):
+    """The calls of the hooks to a metastore client, on in memory partitions"""
+
+    def __init__(self, partitions=(), missing_table=False):
+        # The values of the existing partitions
+        self.partitions = set(partitions)
+        self.missing_table = missing_table
+        self.opened = False
+        self.closed = False
+        self.healthy = True
+        self.health_checks = 0
+        self.get_partitions_calls = []
+
+    def open(self):
+        self.opened = True
+
+    def close(self):
+        self.closed = True
+
+    def get_database(self, name):
+        self.health_checks += 1
+        if not self.healthy:
+            raise EOFError('connection closed')
+
+    def get_partitions_by_names(self, db_name, tbl_name, names):
+        self.get_partitions_calls.append((db_name, tbl_name, list(names)))
+        if self.missing_table:
+            raise NoSuchObjectException(message='{}.{} not found'.format(db_name, tbl_name))
+        values = [tuple(part.split('=', 1)[1] for part in name.split('/')) for name in names]
+        # The metastore returns the values unquoted
+        values = [tuple(v.replace('%20', ' ') for v in vals) for vals in values]
+        return [Partition(values=list(vals)) for vals in values if vals in self.partitions]
+
+
+@unittest.skipIf(hive_hooks is None, 'hmsclient package is not installed')
+class TestMetastoreClientPool(unittest.TestCase):
+
+    def setUp(self):
+        self.clients = []
+        self.pool = MetastoreClientPool(self._new_client, max_idle=2, health_check_interval=60)
+
+    def _new_client(self):
+        client = FakeHMSClient()
+        self.clients.append(client)
+        return client
+
+    def test_clients_are_reused(self):
+        with self.pool.client() as client:
+            self.assertTrue(client.opened)
+        with self.pool.client() as other_client:
+            self.assertIs(other_client, client)
+        self.assertEqual(len(self.clients), 1)
+        self.assertFalse(client.closed)
+
+    def test_at_most_max_idle_clients_are_kept(self):
+        clients = [self.pool.acquire() for _ in range(3)]
+        for client in clients:
+            self.pool.release(client)
+        self.assertEqual([client.closed for client in clients], [False, False, True])
+
+        self.pool.clear()
+        self.assertTrue(all(client.closed for client in clients))
+
+    def test_client_is_closed_after_an_error(self):
+        with self.assertRaises(ValueError):
+            with self.pool.client() as client:
+                raise ValueError('thrift error')
+        self.assertTrue(client.closed)
+
+        with self.pool.client() as other_client:
+            self.assertIsNot(other_client, client)
+
+    @mock.patch('airflow.hooks.hive_hooks.time.time')
+    def test_health_check_after_idle_time(self, mock_time):
+        mock_time.return_value = 1000
+        with self.pool.client() as client:
+            pass
+
+        # Used again soon, without a health check
+        mock_time.return_value = 1030
+        with self.pool.client() as other_client:
+            self.assertIs(other_client, client)
+        self.assertEqual(client.health_checks, 0)
+
+        # Unused for longer than the interval, checked first
+        mock_time.return_value = 1100
+        with self.pool.client() as other_client:
+            self.assertIs(other_client, client)
+        self.assertEqual(client.health_checks, 1)
+
+        # Broken meanwhile, replaced by a new client
+        client.healthy = False
+        mock_time.return_value = 1200
+        with self.pool.client() as other_client:
+            self.assertIsNot(other_client, client)
+        self.assertTrue(client.closed)
+        self.assertEqual(len(self.clients), 2)
+
+
+@unittest.skipIf(hive_hooks is None, 'hmsclient package is not installed')
+class TestHiveMetastoreHook(unittest.TestCase):
+
+    def setUp(self):
+        hive_hooks._metastore_client_pools.clear()
+        self.client = FakeHMSClient(partitions=[
+            ('2015-01-01', 'paris'), ('2015-01-01', 'new york'), ('2015-01-02', 'paris')])
+        self.hook = HiveMetastoreHook()
+        self.hook.get_metastore_client = lambda: self.client
+
+    def tearDown(self):
+        hive_hooks._metastore_client_pools.clear()
+
+    def test_client_pools_are_kept_per_process(self):
+        with mock.patch('airflow.hooks.hive_hooks.os.getpid', return_value=1):
+            pool = self.hook.get_client_pool()
+            self.assertIs(HiveMetastoreHook().get_client_pool(), pool)
+            self.assertIsNot(HiveMetastoreHook('other_metastore').get_client_pool(), pool)
+            with pool.client():
+                pass
+
+        # In a forked process
+        with mock.patch('airflow.hooks.hive_hooks.os.getpid', return_value=2):
+            child_pool = self.hook.get_client_pool()
+        self.assertIsNot(child_pool, pool)
+        self.assertEqual(list(hive_hooks._metastore_client_pools), [(2, 'metastore_default')])
+        # The clients of the parent are left to it
+        self.assertFalse(self.client.closed)
+
+    @mock.patch('airflow.hooks.hive_hooks.HiveMetastoreHook.MAX_PART_COUNT', 2)
+    def test_check_for_named_partitions(self):
+        names = [
+            'ds=2015-01-01/city=paris',
+            'ds=2015-01-01/city=new%20york',
+            'ds=2015-01-01/city=london',
+            'ds=2015-01-02/city=paris',
+            'ds=2015-01-03/city=paris',
+        ]
+
+        existing = self.hook.check_for_named_partitions('airflow', 'static_babynames', names)
+
+        self.assertEqual(existing, {
+            'ds=2015-01-01/city=paris',
+            'ds=2015-01-01/city=new%20york',
+            'ds=2015-01-02/city=paris',
+        })
+        self.assertEqual(self.client.get_partitions_calls, [
+            ('airflow', 'static_babynames', names[0:2]),
+            ('airflow', 'static_babynames', names[2:4]),
+            ('airflow', 'static_babynames', names[4:5]),
+        ])
+
+    def test_check_for_named_partitions_of_missing_table(self):
+        self.client.missing_table = True
+
+        self.assertEqual(
+            self.hook.check_for_named_partitions('airflow', 'missing', ['ds=2015-01-01']),
+            set())
+        # The client is still usable
+        self.assertFalse(self.client.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+import unittest
+from tempfile import NamedTemporaryFile
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+try:
+    from moto import mock_s3
+    from airflow.hooks.S3_hook import S3Hook
+except ImportError:
+    mock_s3 = None
+
+BUCKET = 'airflow-test-bucket'
+
+
+@unittest.skipIf(mock_s3 is None, 'moto package is not installed')
+class TestS3Hook(unittest.TestCase):
+
+    def setUp(self):
+        self.env = mock.patch.dict(os.environ, {
+            'AWS_ACCESS_KEY_ID': 'testing',
+            'AWS_SECRET_ACCESS_KEY': 'testing',
+            'AWS_DEFAULT_REGION': 'us-east-1',
+        })
+        self.env.start()
+        self.s3 = mock_s3()
+        self.s3.start()
+        self.hook = S3Hook(aws_conn_id=None, max_workers=4)
+        self.hook.create_bucket(BUCKET)
+
+    def tearDown(self):
+        self.s3.stop()
+        self.env.stop()
+
+    def _load_keys(self, keys, data='data'):
+        client = self.hook.get_conn()
+        for key in keys:
+            client.put_object(Bucket=BUCKET, Key=key, Body=data.encode('utf-8'))
+
+    def test_iter_keys_fetches_all_the_pages(self):
+        keys = sorted('dir/key_{:02d}'.format(i) for i in range(25))
+        self._load_keys(keys + ['other/key'])
+
+        self.assertEqual(list(self.hook.iter_keys(BUCKET, 'dir/', page_size=10)), keys)
+        self.assertEqual(
+            list(self.hook.iter_keys(BUCKET, 'dir/', page_size=10, max_items=15)), keys[:15])
+        self.assertIsNone(self.hook.list_keys(BUCKET, 'missing/'))
+
+    def test_iter_prefixes_fetches_all_the_pages(self):
+        self._load_keys(['dir_{}/key'.format(i) for i in range(5)] + ['key'])
+
+        self.assertEqual(
+            list(self.hook.iter_prefixes(BUCKET, '', '/', page_size=2)),
+            ['dir_{}/'.format(i) for i in range(5)])
+
+    def test_load_files(self):
+        with NamedTemporaryFile() as temp_file:
+            temp_file.write(b'new data')
+            temp_file.flush()
+            self.hook.load_files([(temp_file.name, 'key_{}'.format(i)) for i in range(3)],
+                                 BUCKET)
+            self.assertEqual(self.hook.read_key('key_2', BUCKET), 'new data')
+
+            with self.assertRaises(ValueError):
+                self.hook.load_files([(temp_file.name, 'key_3'), (temp_file.name, 'key_1')],
+                                     BUCKET, replace=False)
+
+            self.hook.load_string('old data', 'key_1', BUCKET, replace=True)
+            self.hook.load_files([(temp_file.name, 's3://{}/key_1'.format(BUCKET))],
+                                 replace=True)
+            self.assertEqual(self.hook.read_key('key_1', BUCKET), 'new data')
+
+    def test_copy_objects(self):
+        self._load_keys(['source_1', 'source_2'], 'source data')
+        self._load_keys(['dest_2'], 'dest data')
+
+        with self.assertRaises(ValueError):
+            self.hook.copy_objects([('source_1', 'dest_1'), ('source_2', 'dest_2')],
+                                   BUCKET, BUCKET, replace=False)
+        self.assertEqual(self.hook.read_key('dest_2', BUCKET), 'dest data')
+
+        self.hook.copy_objects([('source_1', 'dest_1'), ('source_2', 'dest_2')], BUCKET, BUCKET)
+        self.assertEqual(self.hook.read_key('dest_1', BUCKET), 'source data')
+        self.assertEqual(self.hook.read_key('dest_2', BUCKET), 'source data')
+
+    @mock.patch('airflow.hooks.S3_hook.MAX_KEYS_PER_DELETE', 10)
+    def test_delete_objects_in_chunks(self):
+        keys = ['key_{:02d}'.format(i) for i in range(25)]
+        self._load_keys(keys)
+
+        response = self.hook.delete_objects(BUCKET, keys)
+
+        self.assertEqual(sorted(d['Key'] for d in response['Deleted']), keys)
+        self.assertNotIn('Errors', response)
+        self.assertIsNone(self.hook.list_keys(BUCKET))
+
+    def test_delete_single_object(self):
+        self._load_keys(['key'])
+
+        response = self.hook.delete_objects(BUCKET, 'key')
+
+        self.assertEqual(response['Deleted'], [{'Key': 'key'}])
+        self.assertIsNone(self.hook.list_keys(BUCKET))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+from datetime import timedelta
+
+from airflow.models import DAG, DagModel, DagRun, DagStats, TaskInstance
+from airflow.models.taskinstance import clear_task_instances
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.db import create_session
+from airflow.utils.state import State
+
+DEFAULT_DATE = timezone.datetime(2016, 1, 1)
+TEST_DAG_ID = 'test_dag_stats'
+
+
+class TestDagStats(unittest.TestCase):
+
+    def setUp(self):
+        self._clear()
+        self.dag = DAG(TEST_DAG_ID, start_date=DEFAULT_DATE)
+        self.task_1 = DummyOperator(task_id='task_1', dag=self.dag)
+        self.task_2 = DummyOperator(task_id='task_2', dag=self.dag)
+        with create_session() as session:
+            session.add(DagModel(dag_id=TEST_DAG_ID, is_active=True))
+
+    def tearDown(self):
+        self._clear()
+
+    @staticmethod
+    def _clear():
+        with create_session() as session:
+            for model in DagStats, TaskInstance, DagRun, DagModel:
+                session.query(model).filter(model.dag_id == TEST_DAG_ID).delete(
+                    synchronize_session=False)
+
+    def _create_dagrun(self, days=0, state=State.RUNNING):
+        execution_date = DEFAULT_DATE + timedelta(days=days)
+        return self.dag.create_dagrun(
+            run_id='run_{}'.format(days), execution_date=execution_date, state=state)
+
+    def _get_ti(self, task, days=0):
+        with create_session() as session:
+            return session.query(TaskInstance).filter(
+                TaskInstance.dag_id == TEST_DAG_ID,
+                TaskInstance.task_id == task.task_id,
+                TaskInstance.execution_date == DEFAULT_DATE + timedelta(days=days),
+            ).one()
+
+    def assertCounts(self, dag_runs, task_instances):
+        """Checks the non zero counters against those computed from scratch"""
+        for stat_type, expected, actual in (
+            (DagStats.DAG_RUN, dag_runs, DagStats._count_dag_runs),
+            (DagStats.TASK_INSTANCE, task_instances, DagStats._count_task_instances),
+        ):
+            with create_session() as session:
+                actual = {state: count for _, state, count in actual([TEST_DAG_ID], session)}
+            counts = DagStats.get_counts(stat_type, [TEST_DAG_ID]).get(TEST_DAG_ID, {})
+            counts = {state: count for state, count in counts.items() if count}
+            self.assertEqual(counts, expected)
+            self.assertEqual(actual, expected)
+
+    def test_task_instance_transitions_are_counted(self):
+        self._create_dagrun()
+        self.assertCounts({State.RUNNING: 1}, {None: 2})
+
+        ti = self._get_ti(self.task_1)
+        with create_session() as session:
+            ti.set_state(State.RUNNING, session=session)
+        self.assertCounts({State.RUNNING: 1}, {None: 1, State.RUNNING: 1})
+
+        with create_session() as session:
+            ti.set_state(State.SUCCESS, session=session)
+            ti_2 = session.merge(self._get_ti(self.task_2))
+            ti_2.state = State.UP_FOR_RETRY
+        self.assertCounts({State.RUNNING: 1}, {State.SUCCESS: 1, State.UP_FOR_RETRY: 1})
+
+    def test_mark_and_clear_dag_run(self):
+        self._create_dagrun(0, State.SUCCESS)
+        dag_run = self._create_dagrun(1)
+        self.assertCounts({State.RUNNING: 1, State.SUCCESS: 1}, {None: 4})
+
+        with create_session() as session:
+            dag_run = session.merge(dag_run)
+            dag_run.state = State.SUCCESS
+            for ti in dag_run.get_task_instances(session=session):
+                ti.state = State.SUCCESS
+        # The tasks of the now latest run are counted, those of the other one aren't
+        self.assertCounts({State.SUCCESS: 2}, {State.SUCCESS: 2})
+
+        with create_session() as session:
+            tis = dag_run.get_task_instances(session=session)
+            clear_task_instances(tis[:1], session, dag=self.dag)
+        self.assertCounts({State.RUNNING: 1, State.SUCCESS: 1}, {None: 3, State.SUCCESS: 1})
+
+    def test_failed_dag_run_merged_back_to_running(self):
+        dag_run = self._create_dagrun(0, State.FAILED)
+        self._create_dagrun(1, State.SUCCESS)
+        self.assertCounts({State.FAILED: 1, State.SUCCESS: 1}, {None: 2})
+
+        # As done by the submit of a flattened SubDagOperator
+        with create_session() as session:
+            dag_run.state = State.RUNNING
+            session.merge(dag_run)
+        self.assertCounts({State.RUNNING: 1, State.SUCCESS: 1}, {None: 4})
+
+    def test_deleted_dag_run(self):
+        dag_run = self._create_dagrun()
+        with create_session() as session:
+            session.delete(session.merge(dag_run))
+        self.assertCounts({}, {})
+
+    def test_rolled_back_changes_are_not_counted(self):
+        self._create_dagrun()
+        with create_session() as session:
+            ti = session.merge(self._get_ti(self.task_1))
+            ti.state = State.RUNNING
+            session.flush()
+            session.rollback()
+        self.assertCounts({State.RUNNING: 1}, {None: 2})
+
+    def test_record_task_instance_transitions_of_bulk_updates(self):
+        self._create_dagrun(0, State.SUCCESS)
+        self._create_dagrun(1, State.SUCCESS)
+        with create_session() as session:
+            for days in 0, 1:
+                session.query(TaskInstance).filter(
+                    TaskInstance.dag_id == TEST_DAG_ID,
+                    TaskInstance.execution_date == DEFAULT_DATE + timedelta(days=days),
+                ).update({TaskInstance.state: State.SKIPPED}, synchronize_session=False)
+            # Only the task instances of the latest run are counted
+            DagStats.record_task_instance_transitions([
+                (TEST_DAG_ID, DEFAULT_DATE + timedelta(days=days), None, State.SKIPPED)
+                for days in (0, 0, 1, 1)
+            ], session=session)
+        self.assertCounts({State.SUCCESS: 2}, {State.SKIPPED: 2})
+
+    def test_incr_inserts_missing_counter(self):
+        with create_session() as session:
+            DagStats.incr(TEST_DAG_ID, DagStats.DAG_RUN, State.RUNNING, session=session)
+            DagStats.incr(TEST_DAG_ID, DagStats.DAG_RUN, State.RUNNING, 2, session=session)
+            # Nothing to insert for a negative count
+            DagStats.incr(TEST_DAG_ID, DagStats.DAG_RUN, State.FAILED, -1, session=session)
+        self.assertEqual(DagStats.get_counts(DagStats.DAG_RUN, [TEST_DAG_ID]),
+                         {TEST_DAG_ID: {State.RUNNING: 3}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+
+from airflow.models import DAG, DagModel
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.operators.subdag_operator import SubDagOperator, get_flattening_root
+from airflow.utils import timezone
+from airflow.utils.db import create_session
+
+DEFAULT_DATE = timezone.datetime(2016, 1, 1)
+TEST_DAG_ID = 'test_subdag_operator'
+
+
+class TestFlattenedSubDag(unittest.TestCase):
+
+    def setUp(self):
+        self._clear_dag_models()
+
+    def tearDown(self):
+        self._clear_dag_models()
+
+    @staticmethod
+    def _clear_dag_models():
+        with create_session() as session:
+            session.query(DagModel).filter(
+                DagModel.dag_id.like(TEST_DAG_ID + '%')).delete(synchronize_session=False)
+
+    @staticmethod
+    def _make_dags(flatten):
+        dag = DAG(TEST_DAG_ID, start_date=DEFAULT_DATE, is_paused_upon_creation=False)
+        subdag = DAG(TEST_DAG_ID + '.section', start_date=DEFAULT_DATE)
+        DummyOperator(task_id='a', dag=subdag)
+        SubDagOperator(task_id='section', subdag=subdag, dag=dag, flatten=flatten)
+        # As done by the DagBag when the subdags are collected
+        subdag.parent_dag = dag
+        subdag.is_subdag = True
+        return dag, subdag
+
+    @staticmethod
+    def _is_paused(dag_id):
+        with create_session() as session:
+            return session.query(DagModel.is_paused).filter(DagModel.dag_id == dag_id).scalar()
+
+    def test_get_flattening_root(self):
+        dag, subdag = self._make_dags(flatten=True)
+        self.assertIs(get_flattening_root(subdag), dag)
+        self.assertIsNone(get_flattening_root(dag))
+
+        _, subdag = self._make_dags(flatten=False)
+        self.assertIsNone(get_flattening_root(subdag))
+
+    def test_flattened_subdag_is_paused_with_its_root(self):
+        dag, subdag = self._make_dags(flatten=True)
+        # e.g. created paused under dags_are_paused_at_creation
+        with create_session() as session:
+            session.add(DagModel(dag_id=subdag.dag_id, is_paused=True))
+
+        dag.sync_to_db()
+
+        self.assertFalse(self._is_paused(dag.dag_id))
+        self.assertFalse(self._is_paused(subdag.dag_id))
+
+        DagModel.get_dagmodel(dag.dag_id).set_is_paused(True, including_subdags=False)
+        subdag.sync_to_db()
+        self.assertTrue(self._is_paused(subdag.dag_id))
+
+    def test_subdag_is_paused_on_its_own(self):
+        dag, subdag = self._make_dags(flatten=False)
+        with create_session() as session:
+            session.add(DagModel(dag_id=subdag.dag_id, is_paused=True))
+
+        dag.sync_to_db()
+
+        self.assertFalse(self._is_paused(dag.dag_id))
+        self.assertTrue(self._is_paused(subdag.dag_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
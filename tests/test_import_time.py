@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import json
+import subprocess
+import sys
+import unittest
+
+# Loaded lazily, when first used
+MODELS_AND_PLUGINS = [
+    'airflow.models', 'airflow.operators', 'airflow.sensors', 'airflow.hooks',
+    'airflow.executors', 'airflow.macros', 'airflow.plugins_manager',
+]
+WEB_APPS = [
+    'flask_admin', 'airflow.www', 'airflow.www_rbac', 'airflow.api.client',
+]
+
+
+def imported_modules(code):
+    """Returns the modules imported by running ``code`` in a fresh interpreter"""
+    output = subprocess.check_output([
+        sys.executable, '-c',
+        code + '\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))',
+    ], universal_newlines=True)
+    return set(json.loads(output.splitlines()[-1]))
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'Lazy loading requires Python 3.7 or later')
+class TestImportTime(unittest.TestCase):
+
+    def test_import_airflow_does_not_load_models_plugins_or_web_apps(self):
+        modules = imported_modules('import airflow')
+
+        self.assertEqual(modules & set(MODELS_AND_PLUGINS + WEB_APPS), set())
+
+    def test_cli_does_not_load_web_apps(self):
+        modules = imported_modules('import airflow.bin.cli')
+
+        self.assertEqual(modules & set(WEB_APPS), set())
+
+    def test_lazy_attributes_are_loaded_when_accessed(self):
+        modules = imported_modules(
+            'from airflow import DAG\n'
+            'from airflow.models.dag import DAG as ModelsDAG\n'
+            'assert DAG is ModelsDAG')
+
+        self.assertIn('airflow.models', modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
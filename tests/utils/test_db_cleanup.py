@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import unittest
+from datetime import timedelta
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from airflow.exceptions import AirflowConfigException
+from airflow.models import DAG, DagRun, TaskFail, TaskInstance, TaskReschedule, XCom
+from airflow.operators.dummy_operator import DummyOperator
+from airflow.utils import db_cleanup, timezone
+from airflow.utils.db import create_session
+from airflow.utils.state import State
+
+DEFAULT_DATE = timezone.datetime(2016, 1, 1)
+TEST_DAG_ID = 'test_db_cleanup'
+MODELS = [TaskReschedule, TaskFail, XCom, TaskInstance, DagRun]
+
+
+class TestDbCleanup(unittest.TestCase):
+
+    def setUp(self):
+        self._clear()
+        self.dag = DAG(TEST_DAG_ID, start_date=DEFAULT_DATE)
+        self.task = DummyOperator(task_id='task', dag=self.dag)
+
+    def tearDown(self):
+        self._clear()
+
+    @staticmethod
+    def _clear():
+        with create_session() as session:
+            for model in MODELS:
+                session.query(model).filter(model.dag_id == TEST_DAG_ID).delete(
+                    synchronize_session=False)
+
+    def _make_run(self, days, run_state, ti_state):
+        execution_date = DEFAULT_DATE + timedelta(days=days)
+        with create_session() as session:
+            session.add(DagRun(dag_id=TEST_DAG_ID, run_id='run_{}'.format(days),
+                               execution_date=execution_date, state=run_state))
+            ti = TaskInstance(self.task, execution_date)
+            ti.state = ti_state
+            session.add(ti)
+            session.flush()
+            session.add(TaskReschedule(self.task, execution_date, 1, execution_date,
+                                       execution_date, execution_date, resume_token='42'))
+            session.add(TaskFail(self.task, execution_date, execution_date, execution_date))
+        XCom.set(key='key', value='value', execution_date=execution_date,
+                 task_id=self.task.task_id, dag_id=TEST_DAG_ID)
+        return execution_date
+
+    @staticmethod
+    def _execution_dates(model):
+        with create_session() as session:
+            return {
+                execution_date for execution_date, in
+                session.query(model.execution_date).filter(model.dag_id == TEST_DAG_ID)
+            }
+
+    def test_rows_of_running_latest_and_active_runs_are_kept(self):
+        finished = self._make_run(0, State.SUCCESS, State.SUCCESS)
+        running = self._make_run(1, State.RUNNING, State.SUCCESS)
+        rescheduled = self._make_run(2, State.FAILED, State.UP_FOR_RESCHEDULE)
+        latest = self._make_run(3, State.SUCCESS, State.SUCCESS)
+
+        with mock.patch.object(db_cleanup, 'get_retention_days',
+                               return_value={t: 1 for t in db_cleanup.CLEANUP_TABLES}):
+            db_cleanup.run_cleanup(tables=['task_reschedule', 'task_fail', 'xcom',
+                                           'task_instance', 'dag_run'])
+
+        self.assertEqual(self._execution_dates(DagRun), {running, rescheduled, latest})
+        self.assertEqual(self._execution_dates(TaskInstance), {running, rescheduled, latest})
+        for model in (TaskReschedule, XCom, TaskFail):
+            self.assertEqual(self._execution_dates(model), {running, rescheduled, latest})
+        self.assertNotIn(finished, self._execution_dates(TaskInstance))
+
+    @staticmethod
+    def _get_retention_days(overrides):
+        with mock.patch.object(db_cleanup.conf, 'getint', return_value=90), \
+                mock.patch.object(db_cleanup.conf, 'get', return_value=overrides):
+            return db_cleanup.get_retention_days()
+
+    def test_child_table_cannot_outlive_its_parent(self):
+        with self.assertRaises(AirflowConfigException):
+            self._get_retention_days('xcom:30, task_instance:10')
+        with self.assertRaises(AirflowConfigException):
+            self._get_retention_days('dag_run:30')
+        with self.assertRaises(AirflowConfigException):
+            # task_reschedule and task_fail keep the default retention
+            self._get_retention_days('xcom:5, task_instance:10')
+        retention = self._get_retention_days(
+            'xcom:5, task_fail:10, task_reschedule:10, task_instance:10')
+        self.assertEqual(retention['xcom'], 5)
+        self.assertEqual(retention['task_instance'], 10)
+        self.assertEqual(retention['dag_run'], 90)
+
+    def test_heartbeat_after_every_batch(self):
+        for days in range(3):
+            self._make_run(days, State.SUCCESS, State.SUCCESS)
+        heartbeat = mock.Mock()
+
+        with mock.patch.object(db_cleanup, 'get_retention_days',
+                               return_value={t: 1 for t in db_cleanup.CLEANUP_TABLES}):
+            counts = db_cleanup.run_cleanup(tables=['task_fail'], batch_size=1,
+                                            heartbeat=heartbeat)
+
+        # The latest run is kept
+        self.assertEqual(counts['task_fail'], 2)
+        self.assertEqual(heartbeat.call_count, 2)